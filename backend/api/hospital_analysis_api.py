@@ -11,7 +11,6 @@ Designed for single hospital deployment with enterprise-grade features.
 import sys
 import os
 import asyncio
-import uuid
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
 from pathlib import Path
@@ -24,13 +23,18 @@ import logging
 from fastapi import FastAPI, HTTPException, Header, Depends, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel, Field, validator
 import uvicorn
 
 # Import our hospital intelligence system
 from applications.hospital_intelligence.working_hospital_system import HospitalIntelligenceSystem, HospitalAnalysisRequest
 from database.hospital_db import get_database, HospitalDatabase
+from security.api_keys import ApiKeyStore
+from security.audit_pipeline import AuditPipeline, PostgresAuditSink, default_sinks
+from security.rate_limiting import RateLimiter, RateLimitMiddleware, RedisRateLimitStore, api_key_client_key
+from services.shared.request_metrics import RequestInstrumentationMiddleware, RequestMetrics, metrics_response
+from services.shared.stage_timing import add_stage_observer, span, track_stages
 
 # Setup logging
 logging.basicConfig(
@@ -54,6 +58,11 @@ app = FastAPI(
 
 # Security configuration
 HOSPITAL_API_KEY = os.getenv('HOSPITAL_API_KEY', 'hospital_secure_key_2025_production')
+API_KEY_STORE = ApiKeyStore(pepper=os.getenv('API_KEY_PEPPER'))
+API_KEY_STORE.add_key(HOSPITAL_API_KEY, "Hospital System", ["read", "write", "admin"])
+# Security audit trail: logged (and appended to AUDIT_LOG_PATH when set) always,
+# written to the audit_logs table once the database is up
+AUDIT_PIPELINE = AuditPipeline(sinks=default_sinks(os.getenv('AUDIT_LOG_PATH')))
 ALLOWED_HOSTS = ["localhost", "127.0.0.1", "hospital.internal", "*.hospital.local"]
 
 # Add security middleware
@@ -66,6 +75,28 @@ app.add_middleware(
  allow_headers=["*"],
 )
 
+# Per-client rate limiting, shared across workers through Redis when configured.
+# Verified API keys get their own allowance; anything else is limited per address
+RATE_LIMIT_REDIS_URL = os.getenv('RATE_LIMIT_REDIS_URL')
+app.add_middleware(
+ RateLimitMiddleware,
+ limiter=RateLimiter(
+ max_requests=int(os.getenv('RATE_LIMIT_REQUESTS', '100')),
+ time_window=60,
+ store=RedisRateLimitStore.from_url(RATE_LIMIT_REDIS_URL, asynchronous=True) if RATE_LIMIT_REDIS_URL else None
+ ),
+ key_func=api_key_client_key(API_KEY_STORE),
+ exempt_paths=("/health", "/metrics", "/docs", "/redoc", "/openapi.json")
+)
+
+# Request IDs, access log and Prometheus metrics (outermost, so 429s are counted too)
+REQUEST_METRICS = RequestMetrics()
+app.add_middleware(RequestInstrumentationMiddleware, metrics=REQUEST_METRICS, access_logger=logger)
+add_stage_observer(REQUEST_METRICS.observe_stage)
+
+# Per-stage timings in analysis responses (they always reach /metrics)
+INCLUDE_STAGE_TIMINGS = os.getenv('INCLUDE_STAGE_TIMINGS', 'false').lower() in ('1', 'true', 'yes')
+
 # Initialize hospital intelligence system
 hospital_system = HospitalIntelligenceSystem()
 
@@ -151,6 +182,7 @@ class HospitalAnalysisAPIResponse(BaseModel):
  # System metadata
  api_version: str = Field(default="1.0.0", description="API version")
  hospital_name: str = Field(..., description="Hospital name from request")
+ stage_timings: Optional[Dict[str, float]] = Field(None, description="Seconds per pipeline stage (when enabled)")
 
 class AnalysisHistoryResponse(BaseModel):
  """Response model for analysis history"""
@@ -171,8 +203,13 @@ class HealthCheckResponse(BaseModel):
 # Authentication dependency
 async def verify_api_key(x_api_key: str = Header(alias="X-API-Key")):
  """Verify API key authentication"""
- if x_api_key != HOSPITAL_API_KEY:
+ if API_KEY_STORE.verify(x_api_key) is None:
  logger.warning(f"Invalid API key attempted: {x_api_key[:10]}...")
+ AUDIT_PIPELINE.record("security_events", {
+ "event_type": "INVALID_API_KEY",
+ "details": {"api_key_prefix": x_api_key[:10]},
+ "timestamp": datetime.now(timezone.utc)
+ })
  raise HTTPException(
  status_code=status.HTTP_401_UNAUTHORIZED,
  detail="Invalid API key",
@@ -180,33 +217,6 @@ async def verify_api_key(x_api_key: str = Header(alias="X-API-Key")):
  )
  return True
 
-# Request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
- """Log all API requests for audit trail"""
- start_time = datetime.now(timezone.utc)
-
- # Generate request ID for tracking
- request_id = str(uuid.uuid4())
-
- # Log request
- logger.info(f"Request {request_id}: {request.method} {request.url}")
-
- # Process request
- response = await call_next(request)
-
- # Calculate processing time
- processing_time = (datetime.now(timezone.utc) - start_time).total_seconds()
-
- # Log response
- logger.info(f"Request {request_id}: Completed in {processing_time:.3f}s with status {response.status_code}")
-
- # Add headers for tracking
- response.headers["X-Request-ID"] = request_id
- response.headers["X-Processing-Time"] = str(processing_time)
-
- return response
-
 # API Endpoints
 
 @app.get("/health", response_model=HealthCheckResponse, tags=["System"])
@@ -292,7 +302,9 @@ async def analyze_hospital(
  accreditations=request.accreditations or []
  )
 
+ with track_stages(label="analysis") as timer:
  # Perform analysis using hospital intelligence system
+ with span("analysis"):
  analysis_result = await hospital_system.analyze_hospital_comprehensive(analysis_request.dict())
 
  # Calculate processing time
@@ -329,7 +341,8 @@ async def analyze_hospital(
  risk_factors=analysis_result.get("risk_factors", []),
  performance_metrics=analysis_result.get("performance_metrics", {}),
  comparative_analysis=analysis_result.get("comparative_analysis", {}),
- hospital_name=request.hospital_name
+ hospital_name=request.hospital_name,
+ stage_timings=timer.as_dict() if INCLUDE_STAGE_TIMINGS and timer is not None else None
  )
 
  logger.info(f"Analysis {analysis_id} completed successfully in {processing_duration:.3f}s")
@@ -427,6 +440,12 @@ async def get_hospital_history(
  detail="Failed to retrieve hospital history"
  )
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+ """Prometheus scrape endpoint"""
+ body, content_type = metrics_response(REQUEST_METRICS.registry)
+ return Response(content=body, media_type=content_type)
+
 @app.get("/statistics", tags=["System"])
 async def get_system_statistics(authenticated: bool = Depends(verify_api_key)):
  """
@@ -481,10 +500,13 @@ async def general_exception_handler(request: Request, exc: Exception):
 async def startup_event():
  """Initialize system on startup"""
  logger.info("Starting Hospital Intelligence API")
+ await API_KEY_STORE.start()
+ await AUDIT_PIPELINE.start()
  try:
  # Initialize database
  db = await get_database()
  logger.info("Database connection established")
+ AUDIT_PIPELINE.add_sink(PostgresAuditSink(db.pool))
  except Exception as e:
  logger.error(f"Failed to initialize database: {e}")
  raise
@@ -493,6 +515,9 @@ async def startup_event():
 async def shutdown_event():
  """Cleanup on shutdown"""
  logger.info("Shutting down Hospital Intelligence API")
+ await API_KEY_STORE.stop()
+ # Flush the audit trail while the database pool is still open
+ await AUDIT_PIPELINE.stop()
  try:
  from database.hospital_db import hospital_db
  await hospital_db.close()
@@ -53,6 +53,7 @@ try:
  IntelligentHospitalInput,
  HospitalTier
  )
+ from services.shared.stage_timing import span, track_stages
  logger.info("Successfully imported benchmarking services")
 except ImportError as e:
  logger.error(f"Failed to import benchmarking services: {e}")
@@ -232,6 +233,9 @@ class HospitalAnalysisResult:
  confidence_level: float
  validation_notes: List[str]
 
+ # Seconds per pipeline stage (when enabled with include_stage_timings)
+ stage_timings: Dict[str, float] = field(default_factory=dict)
+
 
 class HospitalIntelligenceSystem:
  """
@@ -247,8 +251,10 @@ class HospitalIntelligenceSystem:
 
  Args:
  config: Optional system configuration parameters
+ (``include_stage_timings`` adds per-stage timings to results)
  """
  self.config = config or {}
+ self.include_stage_timings = bool(self.config.get("include_stage_timings", False))
  self.system_version = "2.0.0"
  self.analysis_count = 0
 
@@ -280,7 +286,9 @@ class HospitalIntelligenceSystem:
  logger.info(f"Starting analysis {analysis_id} for {request.name} (Request: {request.request_id})")
 
  try:
+ with track_stages(label="analysis") as timer:
  # Create intelligent benchmarking input
+ with span("input"):
  intelligent_input = self._create_intelligent_input(request)
 
  # Execute core analysis
@@ -291,6 +299,7 @@ class HospitalIntelligenceSystem:
  processing_duration = (datetime.now(timezone.utc) - analysis_start).total_seconds()
 
  # Generate comprehensive result
+ with span("report"):
  analysis_result = self._generate_comprehensive_result(
  analysis_id=analysis_id,
  request=request,
@@ -299,6 +308,9 @@ class HospitalIntelligenceSystem:
  analysis_timestamp=analysis_start
  )
 
+ if timer is not None and self.include_stage_timings:
+ analysis_result.stage_timings = timer.as_dict()
+
  logger.info(f"Analysis {analysis_id} completed successfully in {processing_duration:.2f}s")
  return analysis_result
 
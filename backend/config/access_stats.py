@@ -0,0 +1,58 @@
+"""
+Configuration Access Statistics
+Contention-free per-key access counters for configuration reads.
+
+Each thread increments its own private dict, so the read path never takes a
+lock. Totals are merged across threads only when statistics are requested.
+"""
+
+import threading
+from collections import Counter
+from typing import Dict, List
+
+
+class ThreadLocalAccessCounter:
+    """Per-thread access counters merged on demand"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._registry_lock = threading.Lock()
+        self._shards: List[Dict[str, int]] = []
+        self._generation = 0
+
+    def _shard(self) -> Dict[str, int]:
+        """Return the calling thread's counter dict, registering it on first use"""
+        local = self._local
+        if getattr(local, 'generation', None) != self._generation:
+            shard: Dict[str, int] = {}
+            with self._registry_lock:
+                self._shards.append(shard)
+                local.generation = self._generation
+            local.counts = shard
+        return local.counts
+
+    def increment(self, key: str) -> None:
+        """Count one access to ``key`` (no locking after the first call per thread)"""
+        counts = self._shard()
+        counts[key] = counts.get(key, 0) + 1
+
+    def snapshot(self) -> Dict[str, int]:
+        """Merge all thread shards into a single key -> count mapping"""
+        with self._registry_lock:
+            shards = list(self._shards)
+
+        merged: Counter = Counter()
+        for shard in shards:
+            # dict.copy() is atomic under the GIL, so concurrent writers are safe
+            merged.update(shard.copy())
+        return dict(merged)
+
+    def total(self) -> int:
+        """Total number of recorded accesses"""
+        return sum(self.snapshot().values())
+
+    def clear(self) -> None:
+        """Discard all counts; threads start new shards on their next access"""
+        with self._registry_lock:
+            self._shards = []
+            self._generation += 1
@@ -18,6 +18,8 @@ from contextlib import contextmanager
 from pydantic import BaseModel, Field, validator
 from pydantic_settings import BaseSettings
 
+from .config_view import FlatConfigView
+
 
 class Environment(str, Enum):
  """Application environment types."""
@@ -258,6 +260,7 @@ class ConfigManager:
 
  self._config: Optional[ApplicationConfig] = None
  self._sources: List[ConfigSource] = []
+ self._view: FlatConfigView = FlatConfigView.empty()
  self._logger = logging.getLogger(__name__)
 
  # Initialize configuration
@@ -310,6 +313,7 @@ class ConfigManager:
  # Create configuration instance
  try:
  self._config = ApplicationConfig(**config_data)
+ self._rebuild_view()
  self._logger.info(
  f"Configuration loaded successfully for {self.environment.value} environment"
  )
@@ -396,6 +400,23 @@ class ConfigManager:
  # Return as string
  return value
 
+ def _rebuild_view(self) -> None:
+ """Publish a flattened view of the validated configuration."""
+ self._view = FlatConfigView(self._config.model_dump())
+
+ def get(self, key: str, default: Any = None) -> Any:
+ """
+ Get configuration value by dot-notation key.
+
+ Args:
+ key: Configuration key (e.g., 'database.pool_size')
+ default: Default value if key not found
+
+ Returns:
+ Configuration value or default
+ """
+ return self._view.get(key, default)
+
  @property
  def config(self) -> ApplicationConfig:
  """Get current configuration."""
@@ -446,6 +467,7 @@ class ConfigManager:
  def update_feature_flag(self, feature_name: str, enabled: bool) -> None:
  """Update feature flag at runtime."""
  self.config.feature_flags[feature_name] = enabled
+ self._rebuild_view()
  self._logger.info(f"Feature '{feature_name}' {'enabled' if enabled else 'disabled'}")
 
  def reload_configuration(self) -> None:
@@ -526,6 +548,7 @@ class ConfigManager:
  if hasattr(self.config, key):
  original_values[key] = getattr(self.config, key)
  setattr(self.config, key, value)
+ self._rebuild_view()
 
  yield self.config
 
@@ -533,6 +556,7 @@ class ConfigManager:
  # Restore original values
  for key, value in original_values.items():
  setattr(self.config, key, value)
+ self._rebuild_view()
 
 
 # Global configuration manager instance
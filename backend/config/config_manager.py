@@ -15,12 +15,15 @@ from typing import Dict, Any, Optional, List, Union, Callable
 from datetime import datetime, timedelta
 from pathlib import Path
 from dataclasses import dataclass, field
-from collections import defaultdict
 import jsonschema
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from abc import ABC, abstractmethod
 
+from .access_stats import ThreadLocalAccessCounter
+from .config_view import FlatConfigView
+from .subscriptions import ConfigChangeEvent, ConfigSubscriptionRegistry, diff_config_views
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -206,11 +209,20 @@ class ConfigurationManager:
  self._reload_callbacks: List[Callable[[str, Any], None]] = []
  self._reload_queue: Dict[str, datetime] = {}
 
- # Performance tracking
- self._access_stats: Dict[str, int] = defaultdict(int)
+ # Performance tracking (per-thread counters, merged on demand)
+ self._access_stats = ThreadLocalAccessCounter()
  self._cache_hits = 0
  self._cache_misses = 0
 
+ # Merged, pre-flattened view of the current environment. Immutable once
+ # published; writers build a new view under self._lock and swap the reference
+ self._view: FlatConfigView = FlatConfigView.empty()
+ self._view_version = 0
+ self._defer_view_rebuild = False
+
+ # Key-prefix change subscriptions (delivered off the writer thread)
+ self._subscriptions = ConfigSubscriptionRegistry()
+
  # Initialize system
  self._initialize()
 
@@ -234,6 +246,9 @@ class ConfigurationManager:
  # Initialize validation schemas
  self._initialize_schemas()
 
+ # Build the flattened view used by get()
+ self._rebuild_view()
+
  # Start file watching for hot-reload
  self._start_file_watching()
 
@@ -435,9 +450,14 @@ class ConfigurationManager:
  Returns:
  Configuration value or default
  """
- with self._lock:
- self._access_stats[key] += 1
+ self._access_stats.increment(key)
+
+ # Lock-free fast path: the current environment is served from the
+ # published view (validated once per rebuild, so no per-read validation)
+ if environment is None or environment == self.environment:
+ return self._view.get(key, default)
 
+ with self._lock:
  # Check cache first
  if use_cache:
  cached_value = self._get_cached_value(key, environment)
@@ -503,6 +523,9 @@ class ConfigurationManager:
  # Update metadata
  self._configurations[target_env].last_modified = datetime.now()
 
+ if not self._defer_view_rebuild:
+ self._rebuild_view()
+
  # Update cache
  self._cache_value(key, value, target_env)
 
@@ -537,8 +560,14 @@ class ConfigurationManager:
  results = {}
 
  with self._lock:
+ # Rebuild the view once for the whole batch rather than per key
+ self._defer_view_rebuild = True
+ try:
  for key, value in updates.items():
  results[key] = self.set(key, value, environment, persist=False, validate=validate)
+ finally:
+ self._defer_view_rebuild = False
+ self._rebuild_view()
 
  # Persist all changes at once if requested
  if persist and any(results.values()):
@@ -559,11 +588,11 @@ class ConfigurationManager:
  """
  with self._lock:
  try:
- # Clear cache
- self._clear_cache()
-
+ # Cache entries are evicted per changed key when the new view is
+ # published rather than dropping the whole cache up front
  if environment:
  # Reload specific environment
+ self._evict_environment_cache(environment)
  source = self._sources.get(environment)
  if source:
  data = source.load()
@@ -574,9 +603,14 @@ class ConfigurationManager:
  last_modified=source.get_last_modified()
  )
  else:
- # Reload all configurations
+ # Reload all configurations. The view diff only covers the current
+ # environment, so entries resolved for any other one are evicted here
  self._load_base_configuration()
  self._load_environment_configuration()
+ self._evict_other_environments_cache(self.environment)
+
+ # Publish the merged view for the reloaded layers
+ self._rebuild_view()
 
  logger.info(f"Reloaded configuration for: {environment or 'all environments'}")
  return True
@@ -614,7 +648,13 @@ class ConfigurationManager:
  'misses': self._cache_misses,
  'hit_rate': self._cache_hits / (self._cache_hits + self._cache_misses) if (self._cache_hits + self._cache_misses) > 0 else 0
  },
- 'access_stats': dict(self._access_stats),
+ 'access_stats': self._access_stats.snapshot(),
+ 'view_stats': {
+ 'keys': len(self._view),
+ 'version': self._view.version,
+ 'built_at': self._view.built_at.isoformat()
+ },
+ 'subscriptions': self._subscriptions.get_stats(),
  'file_watching': self._file_observer is not None and self._file_observer.is_alive()
  }
 
@@ -654,6 +694,29 @@ class ConfigurationManager:
  else:
  return json.dumps(export_data, indent=2, sort_keys=True)
 
+ def subscribe(self, prefix: str, callback: Callable[[ConfigChangeEvent], Any],
+ loop: Optional[asyncio.AbstractEventLoop] = None) -> int:
+ """
+ Subscribe to changes at or below a dotted key prefix
+
+ Callbacks receive a ConfigChangeEvent listing the changed keys and
+ their new values. They run on a dispatcher thread, or on ``loop`` when
+ given (required for coroutine callbacks), never on the writer's thread.
+
+ Args:
+ prefix: Dotted key prefix such as 'competitive_analysis' ('' for all)
+ callback: Callable or coroutine function to invoke on change
+ loop: Optional asyncio loop to deliver the event on
+
+ Returns:
+ Subscription id to pass to unsubscribe()
+ """
+ return self._subscriptions.subscribe(prefix, callback, loop)
+
+ def unsubscribe(self, subscription_id: int) -> bool:
+ """Remove a prefix subscription"""
+ return self._subscriptions.unsubscribe(subscription_id)
+
  def register_change_callback(self, callback: Callable[[str, Any], None]):
  """Register callback for configuration changes"""
  self._reload_callbacks.append(callback)
@@ -689,6 +752,9 @@ class ConfigurationManager:
  self._file_observer.stop()
  self._file_observer.join(timeout=5)
 
+ # Drain pending change notifications
+ self._subscriptions.shutdown()
+
  # Clear caches
  self._cache.clear()
 
@@ -792,6 +858,42 @@ class ConfigurationManager:
 
  return default
 
+ def _rebuild_view(self):
+ """Merge the current environment's layers into a fresh flattened view"""
+ # Lowest to highest priority, mirroring _resolve_configuration_value
+ layers = []
+ for config_name in ['base', 'env_vars']:
+ if config_name in self._configurations:
+ layers.append((None, self._configurations[config_name].config_data))
+
+ for config_name, config in self._configurations.items():
+ if config_name.startswith('service_'):
+ layers.append((config_name.replace('service_', ''), config.config_data))
+
+ for config_name in [self.environment, 'user']:
+ if config_name in self._configurations:
+ layers.append((None, self._configurations[config_name].config_data))
+
+ self._view_version += 1
+ view = FlatConfigView.from_layers(layers, version=self._view_version)
+
+ # Validate schema-backed sections once per rebuild instead of per read
+ for schema_name in self._schemas:
+ value = view.get(schema_name)
+ if value is not None:
+ validation_result = self._validate_value(schema_name, value)
+ if not validation_result['valid']:
+ logger.warning(f"Configuration validation failed for {schema_name}: {validation_result['errors']}")
+
+ # Reference assignment publishes the new view atomically
+ previous_view, self._view = self._view, view
+
+ # Only keys that actually changed are evicted and notified
+ changed_keys = diff_config_views(previous_view, view)
+ if changed_keys:
+ self._invalidate_cache_keys(changed_keys)
+ self._subscriptions.publish(changed_keys, view)
+
  def _get_nested_value(self, data: Dict[str, Any], key: str) -> Any:
  """Get value from nested dictionary using dot notation"""
  keys = key.split('.')
@@ -927,6 +1029,27 @@ class ConfigurationManager:
  with self._cache_lock:
  self._cache.clear()
 
+ def _invalidate_cache_keys(self, keys):
+ """Evict cached entries whose configuration key changed"""
+ with self._cache_lock:
+ stale = [cache_key for cache_key, entry in self._cache.items() if entry.key in keys]
+ for cache_key in stale:
+ del self._cache[cache_key]
+
+ def _evict_environment_cache(self, environment: str):
+ """Evict all cached entries resolved for a specific environment"""
+ with self._cache_lock:
+ stale = [cache_key for cache_key, entry in self._cache.items() if entry.environment == environment]
+ for cache_key in stale:
+ del self._cache[cache_key]
+
+ def _evict_other_environments_cache(self, environment: str):
+ """Evict all cached entries resolved for any environment but ``environment``"""
+ with self._cache_lock:
+ stale = [cache_key for cache_key, entry in self._cache.items() if entry.environment != environment]
+ for cache_key in stale:
+ del self._cache[cache_key]
+
 # Global configuration manager instance
 _config_manager: Optional[ConfigurationManager] = None
 
@@ -0,0 +1,122 @@
+"""
+Flattened Configuration View
+Merged, pre-flattened snapshot of layered configuration data.
+
+The configuration managers resolve dotted keys such as ``database.pool.size``
+by walking several nested layers on every lookup. A ``FlatConfigView`` does
+that work once per (re)load: layers are deep-merged in priority order and
+every dotted path - leaves and intermediate sections alike - is precomputed,
+so ``get`` is a single dict lookup.
+"""
+
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Sequence, Tuple
+
+# A layer is (mount_prefix, data). Layers mounted under a prefix (for example
+# service configurations) are merged as if they were nested under that key.
+ConfigLayer = Tuple[Optional[str], Mapping[str, Any]]
+
+_MISSING = object()
+
+
+def merge_config_trees(target: Dict[str, Any], source: Mapping[str, Any]) -> Dict[str, Any]:
+    """Deep merge ``source`` into ``target`` without sharing nested dicts with ``source``"""
+    for key, value in source.items():
+        if isinstance(value, Mapping):
+            existing = target.get(key)
+            if not isinstance(existing, dict):
+                existing = {}
+                target[key] = existing
+            merge_config_trees(existing, value)
+        else:
+            target[key] = value
+    return target
+
+
+def flatten_config_tree(tree: Mapping[str, Any], prefix: str = "",
+                        into: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Flatten a nested configuration tree into dotted keys
+
+    Every section is recorded as well as its leaves, so both
+    ``get('database')`` and ``get('database.host')`` resolve directly.
+    Lists are treated as leaf values.
+    """
+    flat = into if into is not None else {}
+    for key, value in tree.items():
+        path = f"{prefix}{key}"
+        flat[path] = value
+        if isinstance(value, dict):
+            flatten_config_tree(value, f"{path}.", flat)
+    return flat
+
+
+class FlatConfigView:
+    """
+    Immutable, pre-flattened view over merged configuration layers.
+
+    Instances are never modified after construction; managers build a new
+    view on every reload and swap the reference, which is atomic in CPython.
+    Section values are the merged dicts themselves and should be treated as
+    read-only by callers.
+    """
+
+    __slots__ = ("_tree", "_values", "built_at", "version")
+
+    def __init__(self, tree: Dict[str, Any], version: int = 0):
+        self._tree = tree
+        self._values = MappingProxyType(flatten_config_tree(tree))
+        self.built_at = datetime.now()
+        self.version = version
+
+    @classmethod
+    def from_layers(cls, layers: Iterable[ConfigLayer], version: int = 0) -> "FlatConfigView":
+        """Build a view from layers ordered from lowest to highest priority"""
+        tree: Dict[str, Any] = {}
+        for mount, data in layers:
+            if not data:
+                continue
+            if mount:
+                merge_config_trees(tree, {mount: data})
+            else:
+                merge_config_trees(tree, data)
+        return cls(tree, version)
+
+    @classmethod
+    def empty(cls) -> "FlatConfigView":
+        """Create a view with no configuration"""
+        return cls({})
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Resolve a dotted key with a single dict lookup"""
+        return self._values.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def values(self) -> Mapping[str, Any]:
+        """Read-only mapping of every dotted key to its value"""
+        return self._values
+
+    @property
+    def tree(self) -> Dict[str, Any]:
+        """Merged nested configuration tree the view was built from"""
+        return self._tree
+
+    def keys_with_prefix(self, prefix: str) -> Sequence[str]:
+        """Return all dotted keys at or below ``prefix``"""
+        if not prefix:
+            return list(self._values)
+        nested = f"{prefix}."
+        return [key for key in self._values if key == prefix or key.startswith(nested)]
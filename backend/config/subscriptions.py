@@ -0,0 +1,210 @@
+"""
+Configuration Change Subscriptions
+Key-prefix subscriptions with asynchronous, targeted change delivery.
+
+Services subscribe to the dotted prefixes they read (``competitive_analysis``,
+``database.pool``). When a new configuration view is published the manager
+diffs it against the previous one and only subscribers whose prefix changed
+are notified. Delivery happens on a dedicated dispatcher thread, or on the
+subscriber's asyncio loop, so writers and reloads never wait on callbacks.
+"""
+
+import asyncio
+import inspect
+import itertools
+import logging
+import queue
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .config_view import FlatConfigView
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class ConfigChangeEvent:
+    """Changes delivered to a prefix subscriber"""
+    prefix: str
+    changed_keys: List[str]
+    values: Dict[str, Any]
+    version: int
+    changed_at: datetime = field(default_factory=datetime.now)
+
+
+@dataclass
+class ConfigSubscription:
+    """Registered interest in a configuration key prefix"""
+    subscription_id: int
+    prefix: str
+    callback: Callable[[ConfigChangeEvent], Any]
+    loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def diff_config_views(old: FlatConfigView, new: FlatConfigView) -> Set[str]:
+    """
+    Return every dotted key whose value was added, removed or changed.
+
+    Because views include section keys, a leaf change also reports each of
+    its ancestor sections, which lets prefix matching be a set lookup.
+    """
+    old_values, new_values = old.values, new.values
+    changed = {key for key in old_values if key not in new_values}
+    for key, value in new_values.items():
+        previous = old_values.get(key, _MISSING)
+        if previous is _MISSING or previous != value:
+            changed.add(key)
+    return changed
+
+
+class ConfigSubscriptionRegistry:
+    """Prefix subscription registry with an asynchronous dispatcher thread"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_prefix: Dict[str, Dict[int, ConfigSubscription]] = {}
+        self._ids = itertools.count(1)
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._delivered = 0
+        self._failed = 0
+
+    def subscribe(self, prefix: str, callback: Callable[[ConfigChangeEvent], Any],
+                  loop: Optional[asyncio.AbstractEventLoop] = None) -> int:
+        """
+        Register ``callback`` for changes at or below ``prefix``
+
+        Args:
+            prefix: Dotted key prefix ('' subscribes to every change)
+            callback: Callable or coroutine function receiving a ConfigChangeEvent
+            loop: Event loop to deliver on; required for coroutine callbacks
+
+        Returns:
+            Subscription id for unsubscribe()
+        """
+        if inspect.iscoroutinefunction(callback) and loop is None:
+            raise ValueError("Coroutine callbacks require an event loop")
+
+        with self._lock:
+            subscription = ConfigSubscription(next(self._ids), prefix, callback, loop)
+            self._by_prefix.setdefault(prefix, {})[subscription.subscription_id] = subscription
+        return subscription.subscription_id
+
+    def unsubscribe(self, subscription_id: int) -> bool:
+        """Remove a subscription; returns False if it was not registered"""
+        with self._lock:
+            for prefix, subscriptions in self._by_prefix.items():
+                if subscriptions.pop(subscription_id, None) is not None:
+                    if not subscriptions:
+                        del self._by_prefix[prefix]
+                    return True
+        return False
+
+    def publish(self, changed_keys: Set[str], view: FlatConfigView) -> int:
+        """
+        Queue change events for subscribers whose prefix is affected
+
+        Returns:
+            Number of subscribers notified
+        """
+        if not changed_keys:
+            return 0
+
+        with self._lock:
+            affected = [
+                (prefix, list(subscriptions.values()))
+                for prefix, subscriptions in self._by_prefix.items()
+                if prefix == '' or prefix in changed_keys
+            ]
+
+        notified = 0
+        for prefix, subscriptions in affected:
+            if prefix:
+                nested = f"{prefix}."
+                keys = sorted(k for k in changed_keys if k == prefix or k.startswith(nested))
+            else:
+                keys = sorted(changed_keys)
+            event = ConfigChangeEvent(
+                prefix=prefix,
+                changed_keys=keys,
+                values={key: view.get(key) for key in keys},
+                version=view.version
+            )
+            for subscription in subscriptions:
+                self._queue.put((subscription, event))
+                notified += 1
+
+        if notified:
+            self._ensure_worker()
+        return notified
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Subscription and delivery statistics"""
+        with self._lock:
+            subscriptions = sum(len(subs) for subs in self._by_prefix.values())
+            prefixes = sorted(self._by_prefix)
+        return {
+            'subscriptions': subscriptions,
+            'prefixes': prefixes,
+            'pending': self._queue.qsize(),
+            'delivered': self._delivered,
+            'failed': self._failed
+        }
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until all queued events have been delivered"""
+        done = threading.Event()
+        self._queue.put((None, done))
+        self._ensure_worker()
+        return done.wait(timeout)
+
+    def shutdown(self, timeout: float = 5.0):
+        """Stop the dispatcher thread after draining queued events"""
+        worker = self._worker
+        if worker and worker.is_alive():
+            self._queue.put(None)
+            worker.join(timeout=timeout)
+        self._worker = None
+
+    def _ensure_worker(self):
+        """Start the dispatcher thread lazily"""
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="config-change-dispatcher", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self):
+        """Dispatcher loop delivering events off the writer's thread"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            subscription, event = item
+            if subscription is None:
+                # Idle marker queued by wait_until_idle()
+                event.set()
+                continue
+
+            try:
+                self._deliver(subscription, event)
+                self._delivered += 1
+            except Exception as e:
+                self._failed += 1
+                logger.error(f"Error delivering configuration change for '{subscription.prefix}': {e}")
+
+    def _deliver(self, subscription: ConfigSubscription, event: ConfigChangeEvent):
+        """Invoke a subscriber on its own loop or on the dispatcher thread"""
+        callback = subscription.callback
+        if subscription.loop is None:
+            callback(event)
+        elif inspect.iscoroutinefunction(callback):
+            asyncio.run_coroutine_threadsafe(callback(event), subscription.loop)
+        else:
+            subscription.loop.call_soon_threadsafe(callback, event)
@@ -18,6 +18,8 @@ from dataclasses import dataclass
 import json
 import logging
 
+from services.shared.stage_timing import timed
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -100,6 +102,7 @@ class HospitalDatabase:
  await connection.execute(create_table_sql)
  logger.info("Database tables created successfully")
 
+ @timed("db.save_analysis")
  async def save_analysis(self, analysis_result: Dict[str, Any]) -> str:
  """
  Save hospital analysis results to database
@@ -152,6 +155,7 @@ class HospitalDatabase:
  logger.error(f"Failed to save analysis: {e}")
  raise
 
+ @timed("db.hospital_history")
  async def get_hospital_history(self, hospital_name: str, limit: int = 50) -> List[HospitalAnalysisRecord]:
  """
  Get historical analyses for a hospital
@@ -203,6 +207,7 @@ class HospitalDatabase:
  logger.error(f"Failed to retrieve hospital history: {e}")
  raise
 
+ @timed("db.analysis_by_id")
  async def get_analysis_by_id(self, analysis_id: str) -> Optional[HospitalAnalysisRecord]:
  """Get specific analysis by ID"""
  try:
@@ -240,6 +245,7 @@ class HospitalDatabase:
  logger.error(f"Failed to retrieve analysis {analysis_id}: {e}")
  raise
 
+ @timed("db.statistics")
  async def get_analysis_statistics(self) -> Dict[str, Any]:
  """Get database statistics for monitoring"""
  try:
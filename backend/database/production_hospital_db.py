@@ -675,6 +675,55 @@ class ProductionHospitalDatabase:
             logger.error(f"Failed to calculate percentiles: {e}")
             return {}
 
+    async def get_peer_benchmark_metrics(self) -> List[Dict[str, Any]]:
+        """Latest metrics of every active hospital, keyed like enriched hospital records"""
+        try:
+            select_sql = """
+            SELECT h.hospital_type, h.tier, h.bed_count,
+                   f.annual_revenue, f.operating_margin, f.government_scheme_percentage,
+                   o.occupancy_rate, o.average_length_of_stay
+            FROM hospitals h
+            LEFT JOIN LATERAL (
+                SELECT * FROM hospital_financial_metrics 
+                WHERE hospital_id = h.id 
+                ORDER BY created_at DESC LIMIT 1
+            ) f ON true
+            LEFT JOIN LATERAL (
+                SELECT * FROM hospital_operational_metrics 
+                WHERE hospital_id = h.id 
+                ORDER BY created_at DESC LIMIT 1
+            ) o ON true
+            WHERE h.is_active = true
+            """
+            
+            def as_float(value, scale=1.0):
+                return float(value) * scale if value is not None else None
+            
+            async with self.pool.acquire() as connection:
+                rows = await connection.fetch(select_sql)
+            
+            metrics = []
+            for row in rows:
+                revenue = as_float(row['annual_revenue'])
+                metrics.append({
+                    'hospital_type': row['hospital_type'],
+                    'city_tier': row['tier'],
+                    'total_revenue': revenue,
+                    'revenue_per_bed': revenue / row['bed_count'] if revenue is not None and row['bed_count'] else None,
+                    # Stored as fractions; enrichment works in percent
+                    'profit_margin': as_float(row['operating_margin'], 100),
+                    'government_scheme_dependency': as_float(row['government_scheme_percentage'], 100),
+                    'bed_occupancy_rate': as_float(row['occupancy_rate'], 100),
+                    'average_length_of_stay': as_float(row['average_length_of_stay'])
+                })
+            
+            logger.info(f"Loaded peer benchmark metrics for {len(metrics)} hospitals")
+            return metrics
+            
+        except Exception as e:
+            logger.error(f"Failed to load peer benchmark metrics: {e}")
+            raise
+
     # ============================================================================
     # REPORTING AND ANALYTICS
     # ============================================================================
@@ -0,0 +1,175 @@
+"""
+Hospital API Key Store
+======================
+
+API keys held only as salted PBKDF2 hashes.
+
+Each key is indexed by a peppered HMAC digest, so finding its record is a
+single dict lookup however many keys exist; unknown keys are rejected
+without running the slow hash. A known key's salted hash is checked with a
+constant-time comparison the first time it is seen, after which its digest
+sits in a small LRU cache of verified keys. ``last_used`` timestamps are
+collected in memory and applied in batches by ``flush_last_used`` (or the
+background flusher), not written on every request.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import secrets
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+LastUsedCallback = Callable[[Dict[str, datetime]], Union[None, Awaitable[None]]]
+
+
+@dataclass
+class ApiKeyRecord:
+    """Stored API key: lookup digest, salted hash and grants (no plaintext)"""
+    key_id: str
+    name: str
+    permissions: FrozenSet[str]
+    salt: bytes = field(repr=False)
+    key_hash: bytes = field(repr=False)
+    created: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    last_used: Optional[datetime] = None
+
+    def has_permission(self, permission: str) -> bool:
+        return permission in self.permissions or "admin" in self.permissions
+
+
+class ApiKeyStore:
+    """Salted-hash API key store with a verified-key LRU cache"""
+
+    def __init__(self, pepper: Optional[Union[str, bytes]] = None, iterations: int = 100_000,
+                 cache_size: int = 1024):
+        """
+        Args:
+            pepper: Secret for the lookup digest; must be stable for keys
+                persisted across restarts. A random one is used if omitted.
+            iterations: PBKDF2-SHA256 iterations for the salted hash
+            cache_size: Verified keys kept in the LRU cache
+        """
+        if isinstance(pepper, str):
+            pepper = pepper.encode()
+        self._pepper = pepper or secrets.token_bytes(32)
+        self.iterations = iterations
+        self.cache_size = cache_size
+        self._records: Dict[str, ApiKeyRecord] = {}
+        self._verified: "OrderedDict[str, ApiKeyRecord]" = OrderedDict()
+        self._last_used: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def add_key(self, api_key: str, name: str, permissions: Iterable[str]) -> ApiKeyRecord:
+        """Store an existing key; only its digest and salted hash are kept"""
+        if not api_key:
+            raise ValueError("API key must not be empty")
+        salt = secrets.token_bytes(16)
+        record = ApiKeyRecord(
+            key_id=self._lookup_digest(api_key),
+            name=name,
+            permissions=frozenset(permissions),
+            salt=salt,
+            key_hash=self._hash(api_key, salt),
+        )
+        with self._lock:
+            self._records[record.key_id] = record
+            self._verified.pop(record.key_id, None)
+        return record
+
+    def issue_key(self, name: str, permissions: Iterable[str]) -> Tuple[str, ApiKeyRecord]:
+        """Generate and store a new key; the plaintext is returned once"""
+        api_key = secrets.token_urlsafe(32)
+        return api_key, self.add_key(api_key, name, permissions)
+
+    def revoke(self, key_id: str) -> bool:
+        with self._lock:
+            self._verified.pop(key_id, None)
+            self._last_used.pop(key_id, None)
+            return self._records.pop(key_id, None) is not None
+
+    def records(self) -> List[ApiKeyRecord]:
+        return list(self._records.values())
+
+    def verify(self, api_key: Optional[str]) -> Optional[ApiKeyRecord]:
+        """Record for a valid key (marking it used), or None"""
+        if not api_key:
+            return None
+        key_id = self._lookup_digest(api_key)
+
+        with self._lock:
+            record = self._verified.get(key_id)
+            if record is not None:
+                self._verified.move_to_end(key_id)
+            else:
+                record = self._records.get(key_id)
+        if record is None:
+            return None
+
+        if key_id not in self._verified:
+            if not hmac.compare_digest(self._hash(api_key, record.salt), record.key_hash):
+                return None
+            with self._lock:
+                if self._records.get(key_id) is not record:
+                    return None  # revoked or replaced meanwhile
+                self._verified[key_id] = record
+                if len(self._verified) > self.cache_size:
+                    self._verified.popitem(last=False)
+
+        self._last_used[key_id] = datetime.now(timezone.utc)
+        return record
+
+    async def flush_last_used(self, on_flush: Optional[LastUsedCallback] = None) -> Dict[str, datetime]:
+        """Apply collected ``last_used`` times to the records in one batch"""
+        with self._lock:
+            updates, self._last_used = self._last_used, {}
+            for key_id, used_at in updates.items():
+                record = self._records.get(key_id)
+                if record is not None:
+                    record.last_used = used_at
+        if updates and on_flush is not None:
+            result = on_flush(updates)
+            if asyncio.iscoroutine(result):
+                await result
+        return updates
+
+    async def start(self, interval: float = 30.0, on_flush: Optional[LastUsedCallback] = None) -> None:
+        """Flush ``last_used`` every ``interval`` seconds in the background"""
+        if self._flusher is not None and not self._flusher.done():
+            return
+
+        async def run():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await self.flush_last_used(on_flush)
+                except Exception as e:
+                    logger.warning(f"API key last_used flush failed: {e}")
+
+        self._flusher = asyncio.ensure_future(run())
+
+    async def stop(self, on_flush: Optional[LastUsedCallback] = None) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush_last_used(on_flush)
+
+    def _lookup_digest(self, api_key: str) -> str:
+        return hmac.new(self._pepper, api_key.encode(), hashlib.sha256).hexdigest()
+
+    def _hash(self, api_key: str, salt: bytes) -> bytes:
+        return hashlib.pbkdf2_hmac("sha256", api_key.encode(), salt, self.iterations)
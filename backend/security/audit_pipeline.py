@@ -0,0 +1,294 @@
+"""
+Hospital Audit Pipeline
+=======================
+
+Bounded, non-blocking audit trail for security and HIPAA events.
+
+``record`` only appends to bounded deques - a ring buffer of recent events
+per category for ``get_audit_log``-style queries and one pending queue per
+sink - so it never blocks or awaits on the request path. A background
+writer, started on the first ``record`` inside an event loop, drains each
+sink's queue in batches and hands them to the sink (the application log,
+the ``audit_logs`` table, an append-only JSONL file) in one transaction or
+write. Sinks are tracked separately: a failing sink retries only its own
+batch, so the others never see duplicates, and when a sink falls behind
+only its own new events are dropped (never the ring buffers') and counted
+in ``metrics``. Outside an event loop, with no writer running, ``record``
+writes through synchronously.
+"""
+
+import asyncio
+import ipaddress
+import itertools
+import json
+import logging
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# (category, event) as recorded
+AuditRecord = Tuple[str, Dict[str, Any]]
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class LoggingAuditSink:
+    """Writes audit batches to the application log, one line per event"""
+
+    def __init__(self, logger_name: str = "security.audit"):
+        self.logger = logging.getLogger(logger_name)
+
+    async def write_batch(self, records: Sequence[AuditRecord]) -> None:
+        await asyncio.to_thread(self._log, records)
+
+    def _log(self, records: Sequence[AuditRecord]) -> None:
+        for category, event in records:
+            self.logger.info("%s: %s", category, json.dumps(event, default=_json_default))
+
+
+class JsonlAuditSink:
+    """Appends audit batches to a local JSON-lines file"""
+
+    def __init__(self, path: Union[str, Path], fsync: bool = True):
+        self.path = Path(path)
+        self.fsync = fsync
+
+    async def write_batch(self, records: Sequence[AuditRecord]) -> None:
+        lines = "".join(
+            json.dumps({"category": category, **event}, default=_json_default) + "\n"
+            for category, event in records
+        )
+        await asyncio.to_thread(self._append, lines)
+
+    def _append(self, lines: str) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as handle:
+            handle.write(lines)
+            handle.flush()
+            if self.fsync:
+                os.fsync(handle.fileno())
+
+
+class PostgresAuditSink:
+    """Inserts audit batches into the ``audit_logs`` table in one transaction"""
+
+    INSERT_SQL = """
+    INSERT INTO audit_logs (user_id, action, table_name, new_values, ip_address, session_id, created_at)
+    VALUES ($1, $2, $3, $4::jsonb, $5::text::inet, $6, $7)
+    """
+
+    def __init__(self, pool: Any):
+        self.pool = pool
+
+    async def write_batch(self, records: Sequence[AuditRecord]) -> None:
+        rows = [self.to_row(category, event) for category, event in records]
+        async with self.pool.acquire() as connection:
+            async with connection.transaction():
+                await connection.executemany(self.INSERT_SQL, rows)
+
+    @staticmethod
+    def to_row(category: str, event: Dict[str, Any]) -> Tuple:
+        details = event.get("details") or {}
+        ip_address = event.get("ip_address") or details.get("client_ip")
+        try:
+            ip_address = str(ipaddress.ip_address(ip_address)) if ip_address else None
+        except ValueError:
+            ip_address = None
+        timestamp = event.get("timestamp")
+        return (
+            event.get("user_id") or details.get("api_key_name"),
+            str(event.get("action") or event.get("event_type") or "UNKNOWN")[:50],
+            category[:50],
+            json.dumps(event, default=_json_default),
+            ip_address,
+            event.get("session_id"),
+            timestamp if isinstance(timestamp, datetime) else datetime.now(timezone.utc),
+        )
+
+
+def default_sinks(log_path: Optional[Union[str, Path]] = None) -> List[Any]:
+    """The application log, plus a JSONL file when ``log_path`` is set"""
+    sinks: List[Any] = [LoggingAuditSink()]
+    if log_path:
+        sinks.append(JsonlAuditSink(log_path))
+    return sinks
+
+
+class AuditPipeline:
+    """Ring buffer of recent audit events plus a batching background writer"""
+
+    def __init__(self, sinks: Iterable[Any] = (), buffer_size: int = 1000,
+                 queue_size: int = 10_000, batch_size: int = 500, flush_interval: float = 1.0):
+        self.sinks: List[Any] = []
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self.buffer_size = buffer_size
+        # One ring buffer per category so a burst of one kind of event
+        # cannot evict another; entries carry a sequence number for merging
+        self._recent: Dict[str, Deque[Tuple[int, Dict[str, Any]]]] = {}
+        self._sequence = itertools.count()
+        # Pending events per sink, parallel to ``sinks``
+        self._pending: List[Deque[AuditRecord]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._stats = {
+            "recorded": 0, "written": 0, "dropped": 0, "batches": 0,
+            "write_failures": 0, "pending_high_watermark": 0, "last_flush_seconds": None,
+        }
+        for sink in sinks:
+            self.add_sink(sink)
+
+    def record(self, category: str, event: Dict[str, Any]) -> None:
+        """Record one event without blocking; safe from any thread"""
+        item = (category, event)
+        recent = self._recent.get(category)
+        if recent is None:
+            recent = self._recent.setdefault(category, deque(maxlen=self.buffer_size))
+        recent.append((next(self._sequence), event))
+        self._stats["recorded"] += 1
+        if not self.sinks:
+            return
+
+        pending = 0
+        for queue in self._pending:
+            if len(queue) >= self.queue_size:
+                self._stats["dropped"] += 1
+                continue
+            queue.append(item)
+            pending = max(pending, len(queue))
+        if pending > self._stats["pending_high_watermark"]:
+            self._stats["pending_high_watermark"] = pending
+
+        if self._writer_running() or self._start_writer_in_running_loop():
+            if pending >= self.batch_size:
+                self._wake()
+        else:
+            # No loop to write from (scripts, sync callers): write through
+            asyncio.run(self._drain())
+
+    def recent_events(self, limit: int = 100, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Most recent events, oldest first, optionally for one category"""
+        if limit <= 0:
+            return []
+        if category is not None:
+            items = list(self._recent.get(category, ()))
+        else:
+            items = sorted((item for recent in list(self._recent.values()) for item in recent),
+                           key=lambda item: item[0])
+        return [event for _, event in items[-limit:]]
+
+    def add_sink(self, sink: Any) -> None:
+        """Persist future batches to ``sink`` as well, e.g. once a pool exists"""
+        self._pending.append(deque())
+        self.sinks.append(sink)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Counters for monitoring backpressure and writer health"""
+        return {
+            **self._stats,
+            "pending": max((len(queue) for queue in self._pending), default=0),
+            "queue_capacity": self.queue_size,
+            "buffered": sum(len(recent) for recent in list(self._recent.values())),
+            "writer_running": self._writer_running(),
+        }
+
+    async def start(self) -> None:
+        """Start the background writer on the running loop"""
+        if not self._writer_running():
+            self._start_writer(asyncio.get_running_loop())
+
+    async def stop(self) -> None:
+        """Stop the writer after flushing everything still pending"""
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        await self._drain()
+
+    async def flush(self) -> bool:
+        """Write one batch of pending events to each sink; False if any sink failed"""
+        ok = True
+        for sink, queue in zip(list(self.sinks), list(self._pending)):
+            if queue and not await self._flush_sink(sink, queue):
+                ok = False
+        return ok
+
+    async def _flush_sink(self, sink: Any, queue: Deque[AuditRecord]) -> bool:
+        batch = [queue.popleft() for _ in range(min(self.batch_size, len(queue)))]
+        started = time.monotonic()
+        try:
+            await sink.write_batch(batch)
+        except asyncio.CancelledError:
+            queue.extendleft(reversed(batch))
+            raise
+        except Exception as e:
+            self._stats["write_failures"] += 1
+            logger.error(f"Audit batch of {len(batch)} events failed in {type(sink).__name__}: {e}")
+            # Requeue for this sink only, ahead of newer events, dropping what no longer fits
+            room = max(0, self.queue_size - len(queue))
+            self._stats["dropped"] += max(0, len(batch) - room)
+            queue.extendleft(reversed(batch[:room]))
+            return False
+
+        self._stats["written"] += len(batch)
+        self._stats["batches"] += 1
+        self._stats["last_flush_seconds"] = round(time.monotonic() - started, 4)
+        return True
+
+    async def _drain(self) -> None:
+        while any(self._pending) and await self.flush():
+            pass
+
+    async def _run(self) -> None:
+        backoff = self.flush_interval
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=backoff)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            failed = False
+            while any(self._pending) and not failed:
+                failed = not await self.flush()
+            backoff = min(backoff * 2, 60.0) if failed else self.flush_interval
+
+    def _writer_running(self) -> bool:
+        return self._writer is not None and not self._writer.done()
+
+    def _start_writer_in_running_loop(self) -> bool:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        self._start_writer(loop)
+        return True
+
+    def _start_writer(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._writer = loop.create_task(self._run())
+
+    def _wake(self) -> None:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._wakeup.set()
+        elif self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
@@ -22,6 +22,11 @@ from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
 
+from .api_keys import ApiKeyStore
+from .audit_pipeline import AuditPipeline, PostgresAuditSink, default_sinks
+from .field_encryption import FieldEncryptor, decrypt_legacy, is_envelope, migrate_legacy
+from .rate_limiting import RateLimiter, RedisRateLimitStore
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -34,7 +39,9 @@ class SecurityConfig:
  session_timeout: int = 3600 # 1 hour
  max_request_size: int = 10_000_000 # 10MB
  rate_limit_requests: int = 100 # requests per minute
+ rate_limit_redis_url: Optional[str] = None # shared limits across workers
  enable_audit_logging: bool = True
+ audit_log_path: Optional[str] = None # append-only JSONL audit trail
  hipaa_compliance: bool = True
 
 class HospitalAuthentication:
@@ -43,17 +50,14 @@ class HospitalAuthentication:
  Supports API key authentication with audit logging
  """
 
- def __init__(self, config: SecurityConfig):
+ def __init__(self, config: SecurityConfig, audit_pipeline: Optional[AuditPipeline] = None,
+ key_store: Optional[ApiKeyStore] = None):
  self.config = config
- self.valid_api_keys = {
- config.api_key: {
- "name": "Hospital System",
- "permissions": ["read", "write", "admin"],
- "created": datetime.now(timezone.utc),
- "last_used": None
- }
- }
- self.audit_log = []
+ # Keys are held as salted hashes only; API_KEY_PEPPER keeps lookups stable across restarts
+ self.key_store = key_store or ApiKeyStore(pepper=os.getenv("API_KEY_PEPPER"))
+ if config.api_key:
+ self.key_store.add_key(config.api_key, "Hospital System", ["read", "write", "admin"])
+ self.audit_pipeline = audit_pipeline or AuditPipeline(sinks=default_sinks())
 
  def verify_api_key(self, api_key: str, client_ip: str = None) -> Dict[str, Any]:
  """
@@ -71,7 +75,8 @@ class HospitalAuthentication:
  return self._create_auth_result(False, "Missing API key")
 
  # Check if API key is valid
- if api_key not in self.valid_api_keys:
+ key_record = self.key_store.verify(api_key)
+ if key_record is None:
  self._log_security_event("INVALID_API_KEY", {
  "api_key_prefix": api_key[:10] + "...",
  "client_ip": client_ip,
@@ -79,20 +84,17 @@ class HospitalAuthentication:
  })
  return self._create_auth_result(False, "Invalid API key")
 
- # Update last used timestamp
- self.valid_api_keys[api_key]["last_used"] = datetime.now(timezone.utc)
-
  # Log successful authentication
  if self.config.enable_audit_logging:
  self._log_security_event("SUCCESSFUL_AUTH", {
  "client_ip": client_ip,
  "timestamp": datetime.now(timezone.utc),
- "api_key_name": self.valid_api_keys[api_key]["name"]
+ "api_key_name": key_record.name
  })
 
  return self._create_auth_result(True, "Authentication successful", {
- "permissions": self.valid_api_keys[api_key]["permissions"],
- "name": self.valid_api_keys[api_key]["name"]
+ "permissions": sorted(key_record.permissions),
+ "name": key_record.name
  })
 
  except Exception as e:
@@ -115,14 +117,15 @@ class HospitalAuthentication:
  "details": details,
  "timestamp": datetime.now(timezone.utc)
  }
- self.audit_log.append(event)
+ self.audit_pipeline.record("security_events", event)
 
- # Log to file for persistence
+ # Successful authentications are persisted by the audit pipeline only
+ if event_type != "SUCCESSFUL_AUTH":
  logger.info(f"Security Event: {event_type} - {details}")
 
  def get_audit_log(self, limit: int = 100) -> List[Dict[str, Any]]:
  """Get recent security audit log entries"""
- return self.audit_log[-limit:]
+ return self.audit_pipeline.recent_events(limit, "security_events")
 
 class InputValidator:
  """
@@ -317,58 +320,76 @@ class HIPAACompliance:
  Includes encryption, audit logging, and data protection
  """
 
- def __init__(self, encryption_key: bytes = None):
+ def __init__(self, encryption_key: bytes = None, audit_pipeline: Optional[AuditPipeline] = None):
  """Initialize HIPAA compliance system"""
- if encryption_key:
- self.cipher = Fernet(encryption_key)
- else:
+ if not encryption_key:
  # Generate new key if none provided
- self.cipher = Fernet(Fernet.generate_key())
+ encryption_key = Fernet.generate_key()
 
- self.audit_trail = []
+ # Fernet is kept only to read values written before envelope encryption
+ self.cipher = Fernet(encryption_key)
+ self.field_encryptor = FieldEncryptor.from_secret(encryption_key)
+
+ self.audit_pipeline = audit_pipeline or AuditPipeline(sinks=default_sinks())
 
- def encrypt_sensitive_data(self, data: Union[str, Dict]) -> str:
+ def encrypt_sensitive_data(self, data: Any, context: str = "phi") -> bytes:
  """
  Encrypt sensitive data (PHI)
 
  Args:
- data: Data to encrypt
+ data: JSON-serializable data to encrypt
+ context: Field the value belongs to; decryption must pass the same
 
  Returns:
- Encrypted data as string
+ Encrypted envelope bytes for a BYTEA column
  """
  try:
- if isinstance(data, dict):
- data_str = str(data) # Convert dict to string
- else:
- data_str = str(data)
-
- encrypted = self.cipher.encrypt(data_str.encode())
- return base64.b64encode(encrypted).decode()
+ return self.field_encryptor.encrypt(data, context)
 
  except Exception as e:
  logger.error(f"Encryption failed: {e}")
  raise
 
- def decrypt_sensitive_data(self, encrypted_data: str) -> str:
+ def decrypt_sensitive_data(self, encrypted_data: Union[bytes, str], context: str = "phi") -> Any:
  """
  Decrypt sensitive data
 
  Args:
- encrypted_data: Encrypted data string
+ encrypted_data: Envelope bytes, or a legacy base64 Fernet string
+ context: Field the value was encrypted for
 
  Returns:
  Decrypted data
  """
  try:
- encrypted_bytes = base64.b64decode(encrypted_data.encode())
- decrypted = self.cipher.decrypt(encrypted_bytes)
- return decrypted.decode()
+ if is_envelope(encrypted_data):
+ return self.field_encryptor.decrypt(encrypted_data, context)
+ return decrypt_legacy(encrypted_data, self.cipher)
 
  except Exception as e:
  logger.error(f"Decryption failed: {e}")
  raise
 
+ def encrypt_many(self, values: List[Any], context: str = "phi") -> List[bytes]:
+ """Encrypt a batch of field values under one data key"""
+ return self.field_encryptor.encrypt_many(values, context)
+
+ def decrypt_many(self, encrypted_values: List[bytes], context: str = "phi") -> List[Any]:
+ """Decrypt a batch of envelopes, unwrapping each data key once"""
+ return self.field_encryptor.decrypt_many(encrypted_values, context)
+
+ async def encrypt_many_async(self, values: List[Any], context: str = "phi") -> List[bytes]:
+ """encrypt_many on the default executor, for large exports"""
+ return await self.field_encryptor.encrypt_many_async(values, context)
+
+ async def decrypt_many_async(self, encrypted_values: List[bytes], context: str = "phi") -> List[Any]:
+ """decrypt_many on the default executor, for large exports"""
+ return await self.field_encryptor.decrypt_many_async(encrypted_values, context)
+
+ def migrate_legacy_ciphertexts(self, legacy_values: List[str], context: str = "phi") -> List[bytes]:
+ """Re-encrypt base64 Fernet strings from the old format as envelopes"""
+ return migrate_legacy(legacy_values, self.cipher, self.field_encryptor, context)
+
  def create_audit_entry(self, action: str, user_id: str, data_accessed: str, 
  ip_address: str = None) -> Dict[str, Any]:
  """
@@ -393,16 +414,14 @@ class HIPAACompliance:
  "compliance_version": "1.0"
  }
 
- self.audit_trail.append(audit_entry)
-
- # Log to file for persistence
- logger.info(f"HIPAA Audit: {audit_entry}")
+ # Persisted in batches by the audit pipeline's writer
+ self.audit_pipeline.record("hipaa_audit", audit_entry)
 
  return audit_entry
 
  def get_audit_trail(self, limit: int = 100) -> List[Dict[str, Any]]:
  """Get recent audit trail entries"""
- return self.audit_trail[-limit:]
+ return self.audit_pipeline.recent_events(limit, "hipaa_audit")
 
  def validate_data_retention(self, data_age_days: int) -> bool:
  """
@@ -418,77 +437,14 @@ class HIPAACompliance:
  max_retention_days = 365 * 6 # 6 years
  return data_age_days <= max_retention_days
 
-class RateLimiter:
- """
- Rate limiting for API endpoints
- Prevents abuse and ensures system stability
- """
-
- def __init__(self, max_requests: int = 100, time_window: int = 60):
- """
- Initialize rate limiter
-
- Args:
- max_requests: Maximum requests allowed
- time_window: Time window in seconds
- """
- self.max_requests = max_requests
- self.time_window = time_window
- self.request_counts = {} # {client_id: [timestamp, ...]}
-
- def is_allowed(self, client_id: str) -> bool:
- """
- Check if request is allowed for client
-
- Args:
- client_id: Client identifier (IP address, API key, etc.)
-
- Returns:
- True if request is allowed
- """
- now = datetime.now(timezone.utc)
-
- # Initialize if new client
- if client_id not in self.request_counts:
- self.request_counts[client_id] = []
-
- # Remove old requests outside time window
- cutoff_time = now - timedelta(seconds=self.time_window)
- self.request_counts[client_id] = [
- timestamp for timestamp in self.request_counts[client_id]
- if timestamp > cutoff_time
- ]
-
- # Check if under limit
- if len(self.request_counts[client_id]) < self.max_requests:
- self.request_counts[client_id].append(now)
- return True
-
- return False
-
- def get_client_stats(self, client_id: str) -> Dict[str, Any]:
- """Get rate limiting stats for client"""
- if client_id not in self.request_counts:
- return {
- "requests_made": 0,
- "requests_remaining": self.max_requests,
- "reset_time": datetime.now(timezone.utc) + timedelta(seconds=self.time_window)
- }
-
- current_requests = len(self.request_counts[client_id])
- return {
- "requests_made": current_requests,
- "requests_remaining": max(0, self.max_requests - current_requests),
- "reset_time": min(self.request_counts[client_id]) + timedelta(seconds=self.time_window)
- }
-
 # Initialize security components for hospital deployment
-def create_hospital_security(api_key: str = None) -> Dict[str, Any]:
+def create_hospital_security(api_key: str = None, db_pool: Any = None) -> Dict[str, Any]:
  """
  Create hospital security configuration
 
  Args:
  api_key: API key for authentication
+ db_pool: asyncpg pool; audit events are also written to its audit_logs table
 
  Returns:
  Dictionary with security components
@@ -501,22 +457,34 @@ def create_hospital_security(api_key: str = None) -> Dict[str, Any]:
  config = SecurityConfig(
  api_key=api_key,
  encryption_key=Fernet.generate_key(),
+ rate_limit_redis_url=os.getenv("RATE_LIMIT_REDIS_URL"),
  enable_audit_logging=True,
+ audit_log_path=os.getenv("AUDIT_LOG_PATH"),
  hipaa_compliance=True
  )
 
  # Initialize security components
- auth = HospitalAuthentication(config)
+ # Shared audit trail, logged by default. The writer starts on the first event
+ # recorded inside an event loop; `await audit_pipeline.stop()` flushes on shutdown
+ audit_pipeline = AuditPipeline(sinks=default_sinks(config.audit_log_path))
+ if db_pool is not None:
+ audit_pipeline.add_sink(PostgresAuditSink(db_pool))
+
+ auth = HospitalAuthentication(config, audit_pipeline)
  validator = InputValidator()
- hipaa = HIPAACompliance(config.encryption_key)
- rate_limiter = RateLimiter(max_requests=100, time_window=60)
+ hipaa = HIPAACompliance(config.encryption_key, audit_pipeline)
+ rate_limit_store = (
+ RedisRateLimitStore.from_url(config.rate_limit_redis_url) if config.rate_limit_redis_url else None
+ )
+ rate_limiter = RateLimiter(max_requests=config.rate_limit_requests, time_window=60, store=rate_limit_store)
 
  return {
  "config": config,
  "authentication": auth,
  "validator": validator,
  "hipaa": hipaa,
- "rate_limiter": rate_limiter
+ "rate_limiter": rate_limiter,
+ "audit_pipeline": audit_pipeline
  }
 
 # Example usage
@@ -0,0 +1,204 @@
+"""
+PHI Field Encryption
+====================
+
+Envelope encryption for PHI fields, stored as raw bytes (BYTEA).
+
+Each ``encrypt_many`` call draws one random AES-256 data key, wraps it once
+with the master key, and encrypts every value in the batch with AES-GCM
+under a fresh nonce. Values are canonical JSON, so dicts, lists, numbers and
+strings round-trip exactly, and the field context (e.g. column name) is
+bound in as associated data so a ciphertext cannot be moved to another
+field. Each blob is self-contained:
+
+    version (1) | master key id (1) | wrap nonce (12) | wrapped data key (48)
+    | nonce (12) | ciphertext + tag
+
+``decrypt_many`` unwraps each distinct data key once per call. Large
+batches are split across a thread pool; the ``*_async`` variants run on the
+loop's executor so exports never stall the event loop.
+
+Legacy values from ``HIPAACompliance.encrypt_sensitive_data`` (base64 text
+of a Fernet token over ``str(value)``) are read by ``decrypt_legacy`` and
+rewritten by ``migrate_legacy``.
+"""
+
+import ast
+import asyncio
+import base64
+import json
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+ENVELOPE_VERSION = 1
+NONCE_SIZE = 12
+KEY_SIZE = 32
+_WRAPPED_KEY_SIZE = KEY_SIZE + 16
+_HEADER_SIZE = 2 + NONCE_SIZE + _WRAPPED_KEY_SIZE
+_MIN_ENVELOPE_SIZE = _HEADER_SIZE + NONCE_SIZE + 16
+
+
+class FieldEncryptionError(Exception):
+    """Raised when a value cannot be encrypted or a blob cannot be decrypted"""
+    pass
+
+
+def canonical_json(value: Any) -> bytes:
+    """Deterministic JSON encoding used as the plaintext of every field"""
+    try:
+        return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False,
+                          allow_nan=False).encode("utf-8")
+    except (TypeError, ValueError) as e:
+        raise FieldEncryptionError(f"Value is not JSON serializable: {e}")
+
+
+def is_envelope(value: Any) -> bool:
+    """True for blobs produced by FieldEncryptor (as opposed to legacy text)"""
+    return (isinstance(value, (bytes, bytearray, memoryview)) and len(value) >= _MIN_ENVELOPE_SIZE
+            and value[0] == ENVELOPE_VERSION)
+
+
+class FieldEncryptor:
+    """AES-GCM envelope encryption with per-batch data keys"""
+
+    def __init__(self, master_keys: Mapping[int, bytes], active_key_id: Optional[int] = None,
+                 parallel_threshold: int = 4096, max_workers: Optional[int] = None):
+        """
+        Args:
+            master_keys: 32-byte master keys by id (0-255); older ids stay
+                listed so their blobs remain readable after rotation
+            active_key_id: Id that wraps new data keys (highest by default)
+            parallel_threshold: Batch size above which work is split
+                across a thread pool
+            max_workers: Thread pool size (default: CPU count)
+        """
+        if not master_keys:
+            raise ValueError("At least one master key is required")
+        for key_id, key in master_keys.items():
+            if not 0 <= key_id <= 255 or len(key) != KEY_SIZE:
+                raise ValueError("Master keys need ids 0-255 and 32 bytes of key material")
+        self._master = {key_id: AESGCM(bytes(key)) for key_id, key in master_keys.items()}
+        self.active_key_id = max(master_keys) if active_key_id is None else active_key_id
+        if self.active_key_id not in self._master:
+            raise ValueError(f"Unknown active master key id {self.active_key_id}")
+        self.parallel_threshold = parallel_threshold
+        self.max_workers = max_workers or os.cpu_count() or 4
+
+    @classmethod
+    def from_secret(cls, secret: Union[str, bytes], key_id: int = 0, **options) -> "FieldEncryptor":
+        """Derive the master key from an existing secret (e.g. the Fernet key) with HKDF"""
+        if isinstance(secret, str):
+            secret = secret.encode()
+        master_key = HKDF(algorithm=hashes.SHA256(), length=KEY_SIZE, salt=None,
+                          info=b"hospital-phi-field-encryption").derive(secret)
+        return cls({key_id: master_key}, **options)
+
+    def encrypt(self, value: Any, context: str = "") -> bytes:
+        return self.encrypt_many([value], context)[0]
+
+    def decrypt(self, blob: bytes, context: str = "") -> Any:
+        return self.decrypt_many([blob], context)[0]
+
+    def encrypt_many(self, values: Sequence[Any], context: str = "") -> List[bytes]:
+        """Encrypt a batch of values under one new data key"""
+        if not values:
+            return []
+        plaintexts = [canonical_json(value) for value in values]
+        data_key = AESGCM.generate_key(bit_length=KEY_SIZE * 8)
+        wrap_nonce = os.urandom(NONCE_SIZE)
+        header = (bytes((ENVELOPE_VERSION, self.active_key_id)) + wrap_nonce
+                  + self._master[self.active_key_id].encrypt(wrap_nonce, data_key, None))
+        cipher = AESGCM(data_key)
+        aad = context.encode("utf-8")
+
+        def encrypt_chunk(chunk: Sequence[bytes]) -> List[bytes]:
+            blobs = []
+            for plaintext in chunk:
+                nonce = os.urandom(NONCE_SIZE)
+                blobs.append(header + nonce + cipher.encrypt(nonce, plaintext, aad))
+            return blobs
+
+        return self._map_chunks(encrypt_chunk, plaintexts)
+
+    def decrypt_many(self, blobs: Sequence[Union[bytes, memoryview]], context: str = "") -> List[Any]:
+        """Decrypt blobs, unwrapping each distinct data key once"""
+        if not blobs:
+            return []
+        blobs = [bytes(blob) for blob in blobs]
+        ciphers: Dict[bytes, AESGCM] = {}
+        for blob in blobs:
+            header = blob[:_HEADER_SIZE]
+            if header not in ciphers:
+                ciphers[header] = AESGCM(self._unwrap(blob))
+        aad = context.encode("utf-8")
+
+        def decrypt_chunk(chunk: Sequence[bytes]) -> List[Any]:
+            values = []
+            for blob in chunk:
+                nonce = blob[_HEADER_SIZE:_HEADER_SIZE + NONCE_SIZE]
+                try:
+                    plaintext = ciphers[blob[:_HEADER_SIZE]].decrypt(nonce, blob[_HEADER_SIZE + NONCE_SIZE:], aad)
+                except Exception:
+                    raise FieldEncryptionError("Field authentication failed (wrong key or context)")
+                values.append(json.loads(plaintext))
+            return values
+
+        return self._map_chunks(decrypt_chunk, blobs)
+
+    async def encrypt_many_async(self, values: Sequence[Any], context: str = "",
+                                 executor: Optional[Executor] = None) -> List[bytes]:
+        return await asyncio.get_running_loop().run_in_executor(executor, self.encrypt_many, values, context)
+
+    async def decrypt_many_async(self, blobs: Sequence[bytes], context: str = "",
+                                 executor: Optional[Executor] = None) -> List[Any]:
+        return await asyncio.get_running_loop().run_in_executor(executor, self.decrypt_many, blobs, context)
+
+    def _unwrap(self, blob: bytes) -> bytes:
+        if not is_envelope(blob):
+            raise FieldEncryptionError("Not an encrypted field envelope")
+        master = self._master.get(blob[1])
+        if master is None:
+            raise FieldEncryptionError(f"Unknown master key id {blob[1]}")
+        try:
+            return master.decrypt(blob[2:2 + NONCE_SIZE], blob[2 + NONCE_SIZE:_HEADER_SIZE], None)
+        except Exception:
+            raise FieldEncryptionError("Data key unwrap failed")
+
+    def _map_chunks(self, function, items: Sequence) -> List:
+        if len(items) <= self.parallel_threshold or self.max_workers < 2:
+            return function(items)
+        size = max(self.parallel_threshold // 4, -(-len(items) // self.max_workers))
+        chunks = [items[i:i + size] for i in range(0, len(items), size)]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as pool:
+            results: List = []
+            for chunk_result in pool.map(function, chunks):
+                results.extend(chunk_result)
+            return results
+
+
+def decrypt_legacy(token: str, fernet: Fernet) -> Any:
+    """
+    Read a value written by the old ``encrypt_sensitive_data``
+
+    Those tokens are base64 text over a Fernet token over ``str(value)``;
+    dict and list reprs are parsed back with ``ast.literal_eval``.
+    """
+    text = fernet.decrypt(base64.b64decode(token)).decode()
+    if text and text[0] in "{[(":
+        try:
+            return ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            pass
+    return text
+
+
+def migrate_legacy(tokens: Iterable[str], fernet: Fernet, encryptor: FieldEncryptor,
+                   context: str = "") -> List[bytes]:
+    """Re-encrypt legacy tokens as envelopes (one data key for the batch)"""
+    return encryptor.encrypt_many([decrypt_legacy(token, fernet) for token in tokens], context)
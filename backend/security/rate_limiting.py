@@ -0,0 +1,333 @@
+"""
+Hospital API Rate Limiting
+==========================
+
+Generic cell rate algorithm (GCRA) limiter with O(1) state per client.
+
+Each client is tracked by a single "theoretical arrival time" (TAT): the
+moment its allowance would be fully restored. A request advances the TAT
+by one emission interval (``time_window / max_requests``) and is allowed
+while the TAT stays within one window of now, which is equivalent to a
+sliding window of ``max_requests`` per ``time_window`` with bursts up to
+the full limit. Clients whose TAT has passed are indistinguishable from
+new ones, so they are evicted.
+
+The in-memory store serves a single process. For multi-worker gunicorn
+deployments the Redis store keeps the TAT in Redis and updates it in one
+Lua script, with a key TTL doing the idle eviction.
+"""
+
+import inspect
+import json
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .api_keys import ApiKeyStore
+
+logger = logging.getLogger(__name__)
+
+# (allowed, tat, now) in seconds on the store's clock
+StoreResult = Tuple[bool, float, float]
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of one rate limit check"""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float   # seconds until the full allowance is restored
+    retry_after: float   # seconds until the next request would be allowed
+
+    def headers(self) -> Dict[str, str]:
+        """RateLimit header fields (IETF draft) plus Retry-After when limited"""
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+class InMemoryRateLimitStore:
+    """
+    Per-process TAT table with idle-client eviction
+
+    Entries are kept in least-recently-updated order; expired entries are
+    dropped from the front on each update, and the least recently seen
+    client is dropped once ``max_clients`` is reached.
+    """
+
+    def __init__(self, max_clients: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.max_clients = max_clients
+        self.clock = clock
+        self._tats: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    def update(self, key: str, emission_interval: float, window: float) -> StoreResult:
+        with self._lock:
+            now = self.clock()
+            self._evict_idle(now)
+            tat = max(self._tats.get(key, now), now)
+            new_tat = tat + emission_interval
+            if new_tat - window > now:
+                return False, tat, now
+
+            self._tats[key] = new_tat
+            self._tats.move_to_end(key)
+            if len(self._tats) > self.max_clients:
+                self._tats.popitem(last=False)
+            return True, new_tat, now
+
+    def peek(self, key: str) -> Tuple[float, float]:
+        with self._lock:
+            now = self.clock()
+            return max(self._tats.get(key, now), now), now
+
+    def _evict_idle(self, now: float) -> None:
+        tats = self._tats
+        while tats:
+            key, tat = next(iter(tats.items()))
+            if tat > now:
+                break
+            del tats[key]
+
+
+class RedisRateLimitStore:
+    """
+    TAT table shared through Redis
+
+    Works with both ``redis.Redis`` and ``redis.asyncio.Redis`` clients; with
+    an async client, use ``RateLimiter.check_async``. Time comes from the
+    Redis server so workers on different hosts agree.
+    """
+
+    # Times are integer microseconds on the Redis clock
+    GCRA_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000000 + tonumber(clock[2])
+local interval = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+if ARGV[3] == '1' then return {2, tat, now} end
+local new_tat = tat + interval
+if new_tat - window > now then return {0, tat, now} end
+redis.call('SET', KEYS[1], string.format('%d', new_tat), 'PX', math.max(1, math.ceil((new_tat - now) / 1000)))
+return {1, new_tat, now}
+"""
+
+    def __init__(self, client: Any, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(self.GCRA_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "ratelimit:", asynchronous: bool = False) -> "RedisRateLimitStore":
+        """Store on a new client; ``asynchronous`` selects ``redis.asyncio``"""
+        if asynchronous:
+            import redis.asyncio as redis
+        else:
+            import redis
+
+        return cls(redis.Redis.from_url(url), prefix)
+
+    def update(self, key: str, emission_interval: float, window: float) -> Union[StoreResult, Awaitable[StoreResult]]:
+        return self._call(key, emission_interval, window, peek=False)
+
+    def peek(self, key: str) -> Union[Tuple[float, float], Awaitable[Tuple[float, float]]]:
+        result = self._call(key, 0.0, 0.0, peek=True)
+        if inspect.isawaitable(result):
+            async def resolve():
+                _, tat, now = await result
+                return tat, now
+            return resolve()
+        _, tat, now = result
+        return tat, now
+
+    def _call(self, key, emission_interval, window, peek):
+        reply = self._script(
+            keys=[self.prefix + key],
+            args=[int(emission_interval * 1_000_000), int(window * 1_000_000), "1" if peek else "0"],
+        )
+        if inspect.isawaitable(reply):
+            async def resolve():
+                return self._decode(await reply)
+            return resolve()
+        return self._decode(reply)
+
+    @staticmethod
+    def _decode(reply: List[int]) -> StoreResult:
+        status, tat, now = (int(value) for value in reply)
+        return status == 1, tat / 1_000_000, now / 1_000_000
+
+
+class RateLimiter:
+    """
+    Rate limiting for API endpoints
+    Prevents abuse and ensures system stability
+    """
+
+    def __init__(self, max_requests: int = 100, time_window: int = 60,
+                 store: Optional[Union[InMemoryRateLimitStore, RedisRateLimitStore]] = None):
+        """
+        Initialize rate limiter
+
+        Args:
+            max_requests: Maximum requests allowed
+            time_window: Time window in seconds
+            store: TAT store; defaults to a per-process in-memory store
+        """
+        if max_requests < 1 or time_window <= 0:
+            raise ValueError("max_requests and time_window must be positive")
+        self.max_requests = max_requests
+        self.time_window = time_window
+        self.emission_interval = time_window / max_requests
+        self.store = store if store is not None else InMemoryRateLimitStore()
+
+    def check(self, client_id: str) -> RateLimitDecision:
+        """Record a request for ``client_id`` and return the decision"""
+        result = _synchronous(self.store.update(client_id, self.emission_interval, self.time_window))
+        return self._decision(*result)
+
+    async def check_async(self, client_id: str) -> RateLimitDecision:
+        """``check`` for use from async code, with sync or async stores"""
+        result = self.store.update(client_id, self.emission_interval, self.time_window)
+        if inspect.isawaitable(result):
+            result = await result
+        return self._decision(*result)
+
+    def is_allowed(self, client_id: str) -> bool:
+        """
+        Check if request is allowed for client
+
+        Args:
+            client_id: Client identifier (IP address, API key, etc.)
+
+        Returns:
+            True if request is allowed
+        """
+        return self.check(client_id).allowed
+
+    def get_client_stats(self, client_id: str) -> Dict[str, Any]:
+        """Get rate limiting stats for client"""
+        tat, now = _synchronous(self.store.peek(client_id))
+        remaining = self._remaining(tat, now)
+        return {
+            "requests_made": self.max_requests - remaining,
+            "requests_remaining": remaining,
+            "reset_time": datetime.now(timezone.utc) + timedelta(seconds=max(0.0, tat - now)),
+        }
+
+    def _remaining(self, tat: float, now: float) -> int:
+        # Small epsilon absorbs float error in tat - now
+        return max(0, min(self.max_requests,
+                          int((self.time_window - (tat - now)) / self.emission_interval + 1e-9)))
+
+    def _decision(self, allowed: bool, tat: float, now: float) -> RateLimitDecision:
+        return RateLimitDecision(
+            allowed=allowed,
+            limit=self.max_requests,
+            remaining=self._remaining(tat, now) if allowed else 0,
+            reset_after=max(0.0, tat - now),
+            retry_after=0.0 if allowed else max(0.0, tat + self.emission_interval - self.time_window - now),
+        )
+
+
+def _synchronous(result: Any) -> Any:
+    if inspect.isawaitable(result):
+        if inspect.iscoroutine(result):
+            result.close()
+        raise TypeError("Rate limit store is asynchronous; use check_async")
+    return result
+
+
+def default_client_key(scope: Dict[str, Any]) -> str:
+    """Client address; headers are not trusted before authentication has run"""
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+
+def api_key_client_key(key_store: ApiKeyStore) -> Callable[[Dict[str, Any]], str]:
+    """
+    Key function limiting each verified API key separately
+
+    A key that verifies against ``key_store`` is identified by its lookup
+    digest, so plaintext keys never reach the TAT table or Redis. Missing
+    or made-up keys fall back to the client address and cannot be rotated
+    to get a fresh allowance.
+    """
+    def client_key(scope: Dict[str, Any]) -> str:
+        for name, value in scope.get("headers") or ():
+            if name == b"x-api-key" and value:
+                record = key_store.verify(value.decode("latin-1"))
+                if record is not None:
+                    return "key:" + record.key_id
+                break
+        return default_client_key(scope)
+
+    return client_key
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware enforcing a RateLimiter on HTTP requests
+
+    Every response carries RateLimit-Limit/Remaining/Reset headers; limited
+    requests get a 429 JSON response with Retry-After. Add it with
+    ``app.add_middleware(RateLimitMiddleware, limiter=...)``.
+    """
+
+    def __init__(self, app: Callable, limiter: RateLimiter,
+                 key_func: Callable[[Dict[str, Any]], str] = default_client_key,
+                 exempt_paths: Iterable[str] = ("/health",)):
+        self.app = app
+        self.limiter = limiter
+        self.key_func = key_func
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            decision = await self.limiter.check_async(self.key_func(scope))
+        except Exception as e:
+            # Fail open: an unavailable shared store must not take the API down
+            logger.warning(f"Rate limit check failed, allowing request: {e}")
+            await self.app(scope, receive, send)
+            return
+
+        rate_headers = [(name.lower().encode("latin-1"), value.encode("latin-1"))
+                        for name, value in decision.headers().items()]
+
+        if not decision.allowed:
+            body = json.dumps({"detail": "Rate limit exceeded"}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [(b"content-type", b"application/json"),
+                            (b"content-length", str(len(body)).encode())] + rate_headers,
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message = dict(message)
+                message["headers"] = list(message.get("headers") or []) + rate_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -25,6 +25,7 @@ from dataclasses import dataclass
 from enum import Enum
 
 from .lifecycle_benchmarking_engine import LifecycleAwareBenchmarkingEngine
+from ..shared.stage_timing import span, timed
 
 
 class HospitalTier(str, Enum):
@@ -116,6 +117,7 @@ class IntelligentLifecycleBenchmarkingEngine:
  print("Intelligent Lifecycle-Aware Benchmarking Engine initialized")
  print("REVOLUTIONARY approach: Hospital age drives benchmark targets")
 
+ @timed("benchmarking")
  async def analyze_hospital_intelligently(self, hospital: IntelligentHospitalInput) -> IntelligentBenchmarkResult:
  """
  Execute INTELLIGENT lifecycle-aware benchmarking analysis
@@ -172,15 +174,19 @@ class IntelligentLifecycleBenchmarkingEngine:
  print(f"Velocity Score: {lifecycle_result.velocity_score:.1f}/100")
 
  # Generate INTELLIGENT stage-appropriate targets
+ with span("targets"):
  intelligent_targets = self._generate_intelligent_targets(hospital, lifecycle_result)
 
  # Create progression roadmap
+ with span("roadmap"):
  progression_plan = self._create_progression_roadmap(lifecycle_result)
 
  # Generate intelligent recommendations
+ with span("recommendations"):
  intelligent_recommendations = self._generate_intelligent_recommendations(hospital, lifecycle_result)
 
  # Create growth forecast
+ with span("projection"):
  forecast = self._create_intelligent_forecast(hospital, lifecycle_result)
 
  # Compile intelligent benchmark result
@@ -13,6 +13,8 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import math
 
+from ..shared.stage_timing import span, timed
+
 class HospitalLifecycleStage(str, Enum):
  """Hospital lifecycle stages based on age and maturity"""
  STARTUP = "startup" # 0-2 years
@@ -278,6 +280,7 @@ class LifecycleAwareBenchmarkingEngine:
  }
  }
 
+ @timed("lifecycle")
  async def analyze_hospital_lifecycle(self, hospital_data: Dict[str, Any]) -> LifecycleBenchmarkResult:
  """
  Complete lifecycle-aware benchmarking analysis
@@ -286,31 +289,39 @@ class LifecycleAwareBenchmarkingEngine:
  print(f"\nAnalyzing lifecycle stage for {hospital_data['name']}...")
 
  # 1. Determine lifecycle profile
+ with span("profile"):
  lifecycle_profile = self._create_lifecycle_profile(hospital_data)
 
  # 2. Calculate growth velocity
+ with span("velocity_tier"):
  velocity_tier = self._calculate_growth_velocity(hospital_data, lifecycle_profile)
 
  # 3. Generate dynamic benchmarks
+ with span("velocity_benchmarks"):
  velocity_benchmarks = self._generate_velocity_benchmarks(lifecycle_profile, velocity_tier)
 
  # 4. Create progression roadmap
+ with span("roadmap"):
  progression_roadmap = self._create_progression_roadmap(lifecycle_profile, hospital_data)
 
  # 5. Calculate scores and recommendations
+ with span("velocity_scoring"):
  velocity_score = self._calculate_velocity_score(hospital_data, velocity_benchmarks)
  stage_readiness = self._assess_stage_readiness(lifecycle_profile, hospital_data)
 
  # 6. Generate acceleration and progression plans
+ with span("acceleration_plan"):
  acceleration_plan = self._create_velocity_acceleration_plan(
  hospital_data, lifecycle_profile, velocity_benchmarks
  )
 
+ with span("progression_plan"):
  progression_plan = self._create_stage_progression_plan(
  lifecycle_profile, progression_roadmap
  )
 
  # 7. Create growth projections
+ with span("projection"):
  growth_forecast = self._project_growth_trajectory(
  hospital_data, lifecycle_profile, velocity_tier
  )
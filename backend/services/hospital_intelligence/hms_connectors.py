@@ -14,6 +14,8 @@ from enum import Enum
 import xml.etree.ElementTree as ET
 from abc import ABC, abstractmethod
 
+from ..shared.xml_streaming import aiter_xml_records, compile_record_extractor, iter_xml_records
+
 logger = logging.getLogger(__name__)
 
 class HMSType(Enum):
@@ -398,9 +400,37 @@ class MedeilConnector(BaseHMSConnector):
  except:
  return None
 
+def _optional_int(text: Optional[str]) -> int:
+ try:
+ return int(text)
+ except (TypeError, ValueError):
+ return 0
+
+def _element_text(text: Optional[str]) -> Optional[str]:
+ return text
+
 class EHospitalConnector(BaseHMSConnector):
  """Connector for eHospital (NIC) - Government hospital system"""
 
+ PATIENT_RECORD_TAG = 'Patient'
+
+ def __init__(self, config: HMSConnectionConfig):
+ super().__init__(config)
+ # Field extractor for <Patient> elements, compiled once per connector
+ self._patient_extractor = compile_record_extractor({
+ 'patient_id': ('PatientId', _element_text, ''),
+ 'admission_id': ('AdmissionNo', _element_text, None),
+ 'name': ('PatientName', _element_text, ''),
+ 'age': ('Age', _optional_int, 0),
+ 'gender': ('Gender', _element_text, ''),
+ 'admission_date': ('AdmissionDate', self._parse_ehospital_date, None),
+ 'discharge_date': ('DischargeDate', self._parse_ehospital_date, None),
+ 'department': ('Department', _element_text, ''),
+ 'doctor_name': ('DoctorName', _element_text, ''),
+ 'bed_number': ('BedNumber', _element_text, None),
+ 'room_type': ('RoomType', _element_text, '')
+ })
+
  async def connect(self) -> bool:
  """Connect to eHospital system"""
  try:
@@ -478,8 +508,11 @@ class EHospitalConnector(BaseHMSConnector):
 
  async with self.session.post(soap_url, data=soap_body, headers=headers) as response:
  if response.status == 200:
- xml_response = await response.text()
- return self._parse_ehospital_xml_response(xml_response)
+ # Parse patients as the SOAP body streams in
+ records = aiter_xml_records(
+ response.content.iter_chunked(64 * 1024), self.PATIENT_RECORD_TAG, self._patient_extractor
+ )
+ return [self._build_patient_record(fields) async for fields in records]
  return []
 
  except Exception as e:
@@ -534,36 +567,25 @@ class EHospitalConnector(BaseHMSConnector):
  def _parse_ehospital_xml_response(self, xml_response: str) -> List[PatientRecord]:
  """Parse eHospital XML response to patient records"""
  try:
- root = ET.fromstring(xml_response)
- patients = []
-
- # Navigate XML structure based on eHospital schema
- for patient_elem in root.findall('.//Patient'):
- patient = PatientRecord(
- patient_id=patient_elem.find('PatientId').text if patient_elem.find('PatientId') is not None else '',
- admission_id=patient_elem.find('AdmissionNo').text if patient_elem.find('AdmissionNo') is not None else None,
- name=patient_elem.find('PatientName').text if patient_elem.find('PatientName') is not None else '',
- age=int(patient_elem.find('Age').text) if patient_elem.find('Age') is not None else 0,
- gender=patient_elem.find('Gender').text if patient_elem.find('Gender') is not None else '',
- admission_date=self._parse_ehospital_date(patient_elem.find('AdmissionDate').text if patient_elem.find('AdmissionDate') is not None else None),
- discharge_date=self._parse_ehospital_date(patient_elem.find('DischargeDate').text if patient_elem.find('DischargeDate') is not None else None),
- department=patient_elem.find('Department').text if patient_elem.find('Department') is not None else '',
- doctor_name=patient_elem.find('DoctorName').text if patient_elem.find('DoctorName') is not None else '',
+ return [
+ self._build_patient_record(fields)
+ for fields in iter_xml_records(xml_response, self.PATIENT_RECORD_TAG, self._patient_extractor)
+ ]
+
+ except Exception as e:
+ logger.error(f"Error parsing eHospital XML response: {str(e)}")
+ return []
+
+ def _build_patient_record(self, fields: Dict[str, Any]) -> PatientRecord:
+ """Create a PatientRecord from extracted eHospital patient fields"""
+ return PatientRecord(
  diagnosis=[], # Would need to parse diagnosis elements
  procedures=[], # Would need to parse procedure elements
- bed_number=patient_elem.find('BedNumber').text if patient_elem.find('BedNumber') is not None else None,
- room_type=patient_elem.find('RoomType').text if patient_elem.find('RoomType') is not None else '',
  insurance_details={},
  total_bill=None,
- payment_status='unknown'
+ payment_status='unknown',
+ **fields
  )
- patients.append(patient)
-
- return patients
-
- except Exception as e:
- logger.error(f"Error parsing eHospital XML response: {str(e)}")
- return []
 
  def _parse_ehospital_bed_status(self, xml_response: str) -> Dict[str, Any]:
  """Parse eHospital bed status XML"""
@@ -11,6 +11,7 @@ in this context as the service is designed for maximum flexibility.
 import json
 import logging
 import threading
+import weakref
 from typing import Dict, Any, List, Optional, Tuple, Set, Union, cast
 from datetime import datetime, timedelta
 from collections import defaultdict
@@ -47,6 +48,25 @@ class CompetitiveAnalysisService:
  self._competitive_config: Optional[Dict[str, Any]] = None
  self._config_loaded = False
 
+ # Refresh the lazy copy when competitive_analysis.* changes. The registry
+ # only holds a weak reference, and the subscription is dropped by close()
+ # or when the service is garbage collected
+ self._config_subscription = None
+ self._unsubscribe = None
+ subscribe = getattr(self.config_manager, 'subscribe', None)
+ if callable(subscribe):
+ handler = weakref.WeakMethod(self._on_config_changed)
+
+ def on_config_changed(event):
+ callback = handler()
+ if callback is not None:
+ callback(event)
+
+ self._config_subscription = subscribe('competitive_analysis', on_config_changed)
+ self._unsubscribe = weakref.finalize(
+ self, self.config_manager.unsubscribe, self._config_subscription
+ )
+
  logger.info("CompetitiveAnalysisService initialized with lazy configuration loading")
 
  @property
@@ -58,6 +78,20 @@ class CompetitiveAnalysisService:
  self._config_loaded = True
  return self._competitive_config or {}
 
+ def close(self) -> None:
+ """Stop receiving configuration change events"""
+ if self._unsubscribe is not None:
+ self._unsubscribe()
+ self._config_subscription = None
+
+ def _on_config_changed(self, event) -> None:
+ """Drop the cached configuration copy and config-dependent analyses"""
+ with self.lock:
+ self._competitive_config = None
+ self._config_loaded = False
+ self.analysis_cache.clear()
+ logger.info(f"Competitive analysis configuration changed: {len(event.changed_keys)} keys updated")
+
  def _load_competitive_configuration(self) -> Dict[str, Any]:
  """Load competitive analysis configuration"""
  try:
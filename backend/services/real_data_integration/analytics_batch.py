@@ -0,0 +1,228 @@
+"""
+Analytics Batch Collection
+Concurrent per-platform collection and incremental consolidation for analytics batches
+
+Platforms are collected concurrently under a global cap, each with its own
+timeout, and their results are folded into the consolidated view as each one
+completes. The consolidated output matches a sequential run over the target
+platforms in order: when two platforms report the same hospital metric, the
+platform listed later still wins, regardless of which finished first.
+Columnar results (``AnalyticsPointView``) are merged straight from their
+arrays; data point objects are only iterated for other result types.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .analytics_columns import AnalyticsColumns
+
+logger = logging.getLogger(__name__)
+
+PlatformCollector = Callable[[str], Awaitable[Dict[str, Any]]]
+CompletionCallback = Callable[[str, Dict[str, Any]], None]
+
+
+class AnalyticsConsolidator:
+    """
+    Merges platform collection results into the consolidated batch view
+
+    ``add_platform`` can be called in any completion order; ``rank`` is the
+    platform's position in the batch and decides which value is kept when
+    platforms overlap.
+    """
+
+    def __init__(self):
+        # hospital_id -> {"metrics": {key: (rank, entry)}, "data_sources": [...], "last_updated": datetime}
+        self._hospitals: Dict[str, Dict[str, Any]] = {}
+        self._data_sources: List[Tuple[int, int, Dict[str, Any]]] = []
+        self.platforms_merged = 0
+
+    def add_platform(self, platform_id: str, result: Dict[str, Any], rank: int = 0) -> int:
+        """Merge one platform's result; returns the number of data points merged"""
+        if not result.get("success") or not result.get("collected_data"):
+            return 0
+
+        merged = 0
+        for source_index, (source_id, source_data) in enumerate(result["collected_data"].items()):
+            data_points = source_data.get("data_points", [])
+            self._data_sources.append((rank, source_index, {
+                "platform_id": platform_id,
+                "source_id": source_id,
+                "data_points_count": len(data_points)
+            }))
+            columns = getattr(data_points, "columns", None)
+            if columns is not None:
+                self._add_columns(columns, rank)
+            else:
+                for data_point in data_points:
+                    self._add_point(data_point, rank)
+            merged += len(data_points)
+
+        self.platforms_merged += 1
+        return merged
+
+    def _hospital(self, hospital_id: str) -> Dict[str, Any]:
+        hospital = self._hospitals.get(hospital_id)
+        if hospital is None:
+            hospital = self._hospitals[hospital_id] = {
+                "metrics": {},
+                "data_sources": [],
+                "last_updated": None
+            }
+        return hospital
+
+    def _add_columns(self, columns: AnalyticsColumns, rank: int) -> None:
+        """
+        Merge columnar points with the same result as ``_add_point`` per row
+
+        Rows are reduced to the last one per (hospital, metric) with array
+        operations, so Python objects are built once per metric kept rather
+        than once per collected point.
+        """
+        if not len(columns):
+            return
+
+        sources = columns.sources
+        categories = np.array([source.metric_category for source in sources], dtype=object)
+        metric_keys = categories[columns.source] + "_" + columns.metric
+
+        # Pairs in first-seen order (dict insertion order), each with its last row
+        pair_codes, _ = pd.factorize(columns.hospital + "\x00" + metric_keys, sort=False)
+        last_rows = np.zeros(pair_codes.max() + 1, dtype=np.int64)
+        np.maximum.at(last_rows, pair_codes, np.arange(len(pair_codes)))
+
+        for row in last_rows.tolist():
+            hospital = self._hospital(columns.hospital[row])
+            metric_key = metric_keys[row]
+            existing = hospital["metrics"].get(metric_key)
+            if existing is None or existing[0] <= rank:
+                source = sources[columns.source[row]]
+                hospital["metrics"][metric_key] = (rank, {
+                    "value": str(columns.metric_value(row)),
+                    "measurement_date": columns.timestamp[row].item().isoformat(),
+                    "data_source": source.data_source,
+                    "confidence_score": source.confidence_score
+                })
+
+        hospital_sources = pd.DataFrame({"hospital": columns.hospital, "source": columns.source})
+        for hospital_id, source_code in hospital_sources.drop_duplicates().itertuples(index=False, name=None):
+            data_source = sources[source_code].data_source
+            data_sources = self._hospitals[hospital_id]["data_sources"]
+            if data_source not in data_sources:
+                data_sources.append(data_source)
+
+        latest = pd.Series(columns.timestamp).groupby(columns.hospital, sort=False).max()
+        for hospital_id, measured in latest.items():
+            hospital = self._hospitals[hospital_id]
+            measured = measured.to_pydatetime()
+            if hospital["last_updated"] is None or measured > hospital["last_updated"]:
+                hospital["last_updated"] = measured
+
+    def _add_point(self, data_point: Any, rank: int) -> None:
+        hospital = self._hospital(data_point.hospital_id)
+
+        metric_key = f"{data_point.metric_category}_{data_point.metric_name}"
+        existing = hospital["metrics"].get(metric_key)
+        if existing is None or existing[0] <= rank:
+            hospital["metrics"][metric_key] = (rank, {
+                "value": str(data_point.metric_value),
+                "measurement_date": data_point.measurement_date.isoformat(),
+                "data_source": data_point.data_source,
+                "confidence_score": data_point.confidence_score
+            })
+
+        if data_point.data_source not in hospital["data_sources"]:
+            hospital["data_sources"].append(data_point.data_source)
+
+        last_updated = hospital["last_updated"]
+        if last_updated is None or data_point.measurement_date > last_updated:
+            hospital["last_updated"] = data_point.measurement_date
+
+    def result(self) -> Dict[str, Any]:
+        """Consolidated view in the shape of ``_consolidate_analytics_data``"""
+        hospitals: Dict[str, Any] = {}
+        for hospital_id, hospital in self._hospitals.items():
+            last_updated = hospital["last_updated"]
+            hospitals[hospital_id] = {
+                "hospital_id": hospital_id,
+                "metrics": {key: entry for key, (_, entry) in hospital["metrics"].items()},
+                "data_sources": list(hospital["data_sources"]),
+                "last_updated": last_updated.isoformat() if isinstance(last_updated, datetime) else last_updated
+            }
+
+        return {
+            "hospitals": hospitals,
+            "metrics_summary": _summarize_metrics(hospitals),
+            "data_sources": [entry for _, _, entry in sorted(self._data_sources, key=lambda item: item[:2])],
+            "quality_overview": {}
+        }
+
+
+def _summarize_metrics(hospitals: Dict[str, Any]) -> Dict[str, Any]:
+    values_by_metric: Dict[str, List[float]] = {}
+    for hospital in hospitals.values():
+        for metric_key, metric in hospital["metrics"].items():
+            values = values_by_metric.setdefault(metric_key, [])
+            try:
+                values.append(float(metric["value"]))
+            except (ValueError, TypeError):
+                pass
+
+    summary = {}
+    for metric_key, values in values_by_metric.items():
+        if values:
+            summary[metric_key] = {
+                "hospitals_reporting": len(values),
+                "min_value": min(values),
+                "max_value": max(values),
+                "average_value": sum(values) / len(values),
+                "total_hospitals": len(hospitals)
+            }
+    return summary
+
+
+async def collect_platforms_concurrently(platform_ids: Iterable[str],
+                                         collect: PlatformCollector,
+                                         max_concurrency: int = 4,
+                                         timeout_for: Optional[Callable[[str], Optional[float]]] = None,
+                                         on_complete: Optional[CompletionCallback] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Run ``collect`` for every platform with at most ``max_concurrency`` in flight
+
+    Each collection is bounded by ``timeout_for(platform_id)`` seconds (None
+    for no limit); a timeout or exception becomes a failed result for that
+    platform only. ``on_complete`` is called as each platform finishes.
+    Results are returned in ``platform_ids`` order.
+    """
+    platform_ids = list(platform_ids)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(platform_id: str) -> Tuple[str, Dict[str, Any]]:
+        async with semaphore:
+            timeout = timeout_for(platform_id) if timeout_for else None
+            started = time.monotonic()
+            try:
+                result = await asyncio.wait_for(collect(platform_id), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Analytics collection for {platform_id} timed out after {timeout}s")
+                result = {"success": False, "platform_id": platform_id,
+                          "error": f"Collection timed out after {timeout}s", "timed_out": True}
+            except Exception as e:
+                result = {"success": False, "platform_id": platform_id, "error": str(e)}
+            result.setdefault("collection_seconds", round(time.monotonic() - started, 3))
+            return platform_id, result
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for finished in asyncio.as_completed([run(platform_id) for platform_id in platform_ids]):
+        platform_id, result = await finished
+        results[platform_id] = result
+        if on_complete is not None:
+            on_complete(platform_id, result)
+
+    return {platform_id: results[platform_id] for platform_id in platform_ids}
@@ -0,0 +1,325 @@
+"""
+Columnar Analytics Data Points
+NumPy-backed hospital/metric/timestamp/value columns for collected analytics
+
+Dashboard exports are converted a whole column at a time: metric values are
+cleaned and parsed with vectorized pandas string operations, measurement
+dates with one ``to_datetime`` call, and the result is stored as parallel
+arrays instead of one ``AnalyticsDataPoint`` per cell. Values are held as
+float64 for aggregation; the digits of values that float64 cannot
+reproduce (numeric text, integers beyond 2**53) are kept alongside, so
+``metric_value`` returns exactly what ``_convert_metric_value`` did.
+``AnalyticsPointView`` materializes data points lazily for code that still
+iterates them.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+_INTEGER_TEXT = r"[+-]?\d+"
+
+# Integers float64 represents exactly
+_EXACT_INT_LIMIT = 2 ** 53
+
+# Text values treated as missing by the data quality score
+INVALID_TEXT_VALUES = ("N/A", "", "null")
+
+
+@dataclass(frozen=True)
+class PointSource:
+    """Attributes shared by every data point from one converted export"""
+    data_source: str
+    metric_category: str
+    platform_type: Any
+    confidence_score: int = 100
+
+
+@dataclass
+class MetricColumn:
+    """One metric's parsed values; rows where ``present`` is False are dropped"""
+    values: np.ndarray           # float64, NaN where the value is not numeric
+    integral: np.ndarray         # bool, value came from an integer
+    present: np.ndarray          # bool, the source cell was not null
+    text: Dict[int, str]         # row -> original text of non-numeric values
+    digits: np.ndarray           # object, exact numeric text where float64 is not enough, else None
+    textual: np.ndarray          # bool, value was a string (integer text converts to int)
+
+
+def parse_metric_column(raw: Union[Sequence[Any], pd.Series, np.ndarray]) -> MetricColumn:
+    """
+    Vectorized counterpart of ``_convert_metric_value`` for a whole column
+
+    Numbers are kept as float64 with a flag marking integer origin, numeric
+    strings are parsed after stripping thousands separators and percent
+    signs (their cleaned text is kept as the exact digits), and anything
+    else keeps its text.
+    """
+    series = raw if isinstance(raw, pd.Series) else pd.Series(raw)
+    series = series.reset_index(drop=True)
+    count = len(series)
+    kind = series.dtype.kind
+    no_digits = np.full(count, None, dtype=object)
+    not_textual = np.zeros(count, dtype=bool)
+
+    if kind in "iu":
+        integers = series.to_numpy()
+        beyond_float = np.flatnonzero((integers >= _EXACT_INT_LIMIT) | (integers <= -_EXACT_INT_LIMIT))
+        no_digits[beyond_float] = [str(value) for value in integers[beyond_float].tolist()]
+        return MetricColumn(integers.astype(np.float64), np.ones(count, dtype=bool),
+                            np.ones(count, dtype=bool), {}, no_digits, not_textual)
+    if kind == "f":
+        values = series.to_numpy(dtype=np.float64)
+        return MetricColumn(values, np.zeros(count, dtype=bool), ~np.isnan(values), {},
+                            no_digits, not_textual)
+
+    present = series.notna().to_numpy()
+    as_text = series.astype(str)
+    cleaned = as_text.str.replace(",", "", regex=False).str.replace("%", "", regex=False).str.strip()
+    has_point = cleaned.str.contains(".", regex=False).to_numpy()
+    is_integer = cleaned.str.fullmatch(_INTEGER_TEXT).to_numpy(dtype=bool)
+
+    parsed = pd.to_numeric(cleaned.where(has_point | is_integer), errors="coerce")
+    values = parsed.to_numpy(dtype=np.float64, na_value=np.nan)
+    numeric = present & ~np.isnan(values)
+
+    text_rows = np.flatnonzero(present & ~numeric)
+    text = dict(zip(text_rows.tolist(), as_text.to_numpy()[text_rows].tolist()))
+    digits = cleaned.to_numpy(dtype=object)
+    digits[~numeric] = None
+    textual = np.fromiter((isinstance(value, str) for value in series), dtype=bool, count=count)
+    return MetricColumn(values, numeric & ~has_point, present, text, digits, textual)
+
+
+def parse_timestamps(raw: Optional[Union[Sequence[Any], pd.Series]], count: int,
+                     default: Optional[datetime] = None) -> np.ndarray:
+    """Measurement dates as datetime64[us]; unparseable or missing dates fall back to ``default``"""
+    fallback = np.datetime64(default or datetime.utcnow(), "us")
+    if raw is None:
+        return np.full(count, fallback, dtype="datetime64[us]")
+
+    parsed = pd.to_datetime(pd.Series(raw).reset_index(drop=True), errors="coerce", format="mixed")
+    if getattr(parsed.dt, "tz", None) is not None:
+        parsed = parsed.dt.tz_convert("UTC").dt.tz_localize(None)
+    stamps = parsed.to_numpy(dtype="datetime64[us]", copy=True)
+    stamps[np.isnat(stamps)] = fallback
+    return stamps
+
+
+class AnalyticsColumns:
+    """
+    Collected analytics as parallel arrays
+
+    ``hospital`` and ``metric`` hold strings, ``timestamp`` datetime64[us]
+    and ``value`` float64 (NaN for non-numeric values, whose text is kept in
+    ``text`` by row). ``digits`` holds the exact numeric text of rows that
+    float64 cannot reproduce and ``textual`` marks values parsed from
+    strings. ``source`` indexes into ``sources`` for the attributes shared
+    by every point of one export.
+    """
+
+    __slots__ = ("hospital", "metric", "timestamp", "value", "integral", "source", "sources", "text",
+                 "digits", "textual")
+
+    def __init__(self, hospital: np.ndarray, metric: np.ndarray, timestamp: np.ndarray,
+                 value: np.ndarray, integral: np.ndarray, source: np.ndarray,
+                 sources: Sequence[PointSource], text: Optional[Dict[int, str]] = None,
+                 digits: Optional[np.ndarray] = None, textual: Optional[np.ndarray] = None):
+        self.hospital = hospital
+        self.metric = metric
+        self.timestamp = timestamp
+        self.value = value
+        self.integral = integral
+        self.source = source
+        self.sources: Tuple[PointSource, ...] = tuple(sources)
+        self.text: Dict[int, str] = text or {}
+        self.digits = digits if digits is not None else np.full(len(value), None, dtype=object)
+        self.textual = textual if textual is not None else np.zeros(len(value), dtype=bool)
+
+    @classmethod
+    def empty(cls) -> "AnalyticsColumns":
+        return cls(np.empty(0, dtype=object), np.empty(0, dtype=object),
+                   np.empty(0, dtype="datetime64[us]"), np.empty(0, dtype=np.float64),
+                   np.empty(0, dtype=bool), np.empty(0, dtype=np.int32), ())
+
+    @classmethod
+    def from_wide(cls, hospitals: Union[Sequence[Any], pd.Series], timestamps: np.ndarray,
+                  fields: Mapping[str, Union[Sequence[Any], pd.Series, np.ndarray]],
+                  source: PointSource) -> "AnalyticsColumns":
+        """
+        Unpivot one row-per-hospital export into one row per (hospital, metric)
+
+        Args:
+            hospitals: Hospital identifier per export row
+            timestamps: Measurement date per export row (from parse_timestamps)
+            fields: Standard metric name -> raw values per export row
+            source: Attributes shared by every resulting point
+
+        Points are ordered row by row, then in ``fields`` order, as the
+        per-row converters produced them.
+        """
+        hospital_ids = pd.Series(hospitals).reset_index(drop=True).astype(str).to_numpy(dtype=object)
+        row_count = len(hospital_ids)
+
+        parts: List[Tuple[np.ndarray, int, MetricColumn]] = []
+        for field_index, raw in enumerate(fields.values()):
+            column = parse_metric_column(raw)
+            parts.append((np.flatnonzero(column.present), field_index, column))
+
+        if not parts or row_count == 0:
+            return cls.empty()
+
+        rows = np.concatenate([part_rows for part_rows, _, _ in parts])
+        field_codes = np.concatenate([np.full(len(part_rows), field_index, dtype=np.int32)
+                                      for part_rows, field_index, _ in parts])
+        values = np.concatenate([column.values[part_rows] for part_rows, _, column in parts])
+        integral = np.concatenate([column.integral[part_rows] for part_rows, _, column in parts])
+        digits = np.concatenate([column.digits[part_rows] for part_rows, _, column in parts])
+        textual = np.concatenate([column.textual[part_rows] for part_rows, _, column in parts])
+
+        # Non-numeric text, keyed by position in the concatenated (pre-sort) order
+        text_by_position: Dict[int, str] = {}
+        offset = 0
+        for part_rows, _, column in parts:
+            if column.text:
+                positions = np.searchsorted(part_rows, list(column.text))
+                for position, row in zip(positions.tolist(), column.text):
+                    text_by_position[offset + position] = column.text[row]
+            offset += len(part_rows)
+
+        order = np.lexsort((field_codes, rows))
+        rows = rows[order]
+        metric_names = np.array(list(fields), dtype=object)
+
+        text: Dict[int, str] = {}
+        if text_by_position:
+            inverse = np.empty_like(order)
+            inverse[order] = np.arange(len(order))
+            text = {int(inverse[position]): value for position, value in text_by_position.items()}
+
+        return cls(
+            hospital=hospital_ids[rows],
+            metric=metric_names[field_codes[order]],
+            timestamp=np.asarray(timestamps, dtype="datetime64[us]")[rows],
+            value=values[order],
+            integral=integral[order],
+            source=np.zeros(len(rows), dtype=np.int32),
+            sources=(source,),
+            text=text,
+            digits=digits[order],
+            textual=textual[order]
+        )
+
+    @classmethod
+    def concat(cls, parts: Sequence["AnalyticsColumns"]) -> "AnalyticsColumns":
+        """Join several exports, keeping each one's shared attributes"""
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return cls.empty()
+        if len(parts) == 1:
+            return parts[0]
+
+        sources: List[PointSource] = []
+        codes = []
+        text: Dict[int, str] = {}
+        offset = 0
+        for part in parts:
+            codes.append(part.source + len(sources))
+            sources.extend(part.sources)
+            text.update({offset + row: value for row, value in part.text.items()})
+            offset += len(part)
+
+        return cls(
+            hospital=np.concatenate([part.hospital for part in parts]),
+            metric=np.concatenate([part.metric for part in parts]),
+            timestamp=np.concatenate([part.timestamp for part in parts]),
+            value=np.concatenate([part.value for part in parts]),
+            integral=np.concatenate([part.integral for part in parts]),
+            source=np.concatenate(codes),
+            sources=sources,
+            text=text,
+            digits=np.concatenate([part.digits for part in parts]),
+            textual=np.concatenate([part.textual for part in parts])
+        )
+
+    def __len__(self) -> int:
+        return len(self.hospital)
+
+    def metric_value(self, row: int) -> Union[Decimal, int, str]:
+        """Value of one row as the per-value converter returned it"""
+        text = self.text.get(row)
+        if text is not None:
+            return text
+        digits = self.digits[row]
+        if digits is not None:
+            if not self.integral[row]:
+                return Decimal(digits)
+            return int(digits) if self.textual[row] else Decimal(int(digits))
+        value = float(self.value[row])
+        return Decimal(int(value)) if self.integral[row] else Decimal(repr(value))
+
+    def hospitals_covered(self) -> List[str]:
+        return np.unique(self.hospital).tolist() if len(self) else []
+
+    def metric_names(self) -> List[str]:
+        return np.unique(self.metric).tolist() if len(self) else []
+
+    def invalid_count(self) -> int:
+        """Rows whose value is one of the placeholder texts for missing data"""
+        return sum(1 for value in self.text.values() if value in INVALID_TEXT_VALUES)
+
+    def recent_count(self, now: datetime, days: int = 7) -> int:
+        """Rows measured within ``days`` whole days of ``now``"""
+        age = np.datetime64(now, "us") - self.timestamp
+        return int(np.count_nonzero(age < np.timedelta64(days + 1, "D")))
+
+
+class AnalyticsPointView(Sequence):
+    """Read-only sequence of data points materialized on access from AnalyticsColumns"""
+
+    __slots__ = ("columns", "_factory")
+
+    def __init__(self, columns: AnalyticsColumns, point_factory: Callable[..., Any]):
+        self.columns = columns
+        self._factory = point_factory
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._point(row) for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("analytics data point index out of range")
+        return self._point(index)
+
+    def __iter__(self) -> Iterator[Any]:
+        columns = self.columns
+        timestamps = columns.timestamp.tolist()
+        for row, (hospital_id, metric_name, source_code) in enumerate(
+                zip(columns.hospital, columns.metric, columns.source.tolist())):
+            yield self._build(row, hospital_id, metric_name, timestamps[row], columns.sources[source_code])
+
+    def _point(self, row: int) -> Any:
+        columns = self.columns
+        return self._build(row, columns.hospital[row], columns.metric[row],
+                           columns.timestamp[row].item(), columns.sources[columns.source[row]])
+
+    def _build(self, row: int, hospital_id: str, metric_name: str,
+               measurement_date: datetime, source: PointSource) -> Any:
+        return self._factory(
+            hospital_id=hospital_id,
+            metric_name=metric_name,
+            metric_value=self.columns.metric_value(row),
+            metric_category=source.metric_category,
+            measurement_date=measurement_date,
+            data_source=source.data_source,
+            platform_type=source.platform_type,
+            confidence_score=source.confidence_score
+        )
@@ -0,0 +1,422 @@
+"""
+Columnar Claims Aggregation Engine
+Single-pass monthly metrics for PM-JAY, CGHS and ESI claims
+
+Transactions are converted once into typed NumPy columns - amounts as
+fixed-point integer paise, statuses and flags as small integer codes,
+months and patients as factorized integer keys. Every monthly metric for
+every loaded scheme is then produced by one sort-based group-by pass,
+instead of a list-comprehension pass per metric per month.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, AsyncIterable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+TransactionSource = Union[AsyncIterable[Dict[str, Any]], Iterable[Dict[str, Any]]]
+
+# Month label used for schemes whose claims are not bucketed by date
+ALL_PERIODS = "all"
+
+_STATUS_OTHER, _STATUS_APPROVED, _STATUS_REJECTED = 0, 1, 2
+_NO_DAYS = np.iinfo(np.int32).min
+
+
+@dataclass(frozen=True)
+class ClaimsSchemeSpec:
+    """Field layout and output shape for one scheme's claim records"""
+    name: str
+    patient_field: str
+    billed_field: str
+    approved_field: str
+    approved_status: str
+    date_field: Optional[str] = None
+    received_field: Optional[str] = None
+    rejected_status: Optional[str] = None
+    approved_date_field: Optional[str] = None
+    settled_date_field: Optional[str] = None
+    admission_field: Optional[str] = None
+    procedure_field: Optional[str] = None
+
+
+PMJAY_SPEC = ClaimsSchemeSpec(
+    name="pmjay",
+    date_field="transactionDate",
+    patient_field="beneficiaryId",
+    billed_field="billedAmount",
+    approved_field="approvedAmount",
+    received_field="settledAmount",
+    approved_status="approved",
+    rejected_status="rejected",
+    approved_date_field="approvedDate",
+    settled_date_field="settledDate",
+    admission_field="admissionType",
+    procedure_field="procedureType"
+)
+
+CGHS_SPEC = ClaimsSchemeSpec(
+    name="cghs",
+    date_field="treatmentDate",
+    patient_field="cghs_number",
+    billed_field="billAmount",
+    approved_field="approvedAmount",
+    approved_status="approved"
+)
+
+ESI_SPEC = ClaimsSchemeSpec(
+    name="esi",
+    patient_field="esi_number",
+    billed_field="claimedAmount",
+    approved_field="settledAmount",
+    approved_status="settled"
+)
+
+DEFAULT_SCHEME_SPECS: Dict[str, ClaimsSchemeSpec] = {
+    spec.name: spec for spec in (PMJAY_SPEC, CGHS_SPEC, ESI_SPEC)
+}
+
+
+def to_paise(value: Any) -> int:
+    """Convert a rupee amount (int, float or numeric string) to integer paise"""
+    if value is None or value == "":
+        return 0
+    if isinstance(value, bool):
+        return int(value) * 100
+    if isinstance(value, int):
+        return value * 100
+    return int((Decimal(str(value)) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def paise_to_decimal(paise: int) -> Decimal:
+    """Exact rupee Decimal for an integer paise amount"""
+    return Decimal(int(paise)).scaleb(-2)
+
+
+def _has_utc_offset(value: str) -> bool:
+    time_part = value[10:]
+    return time_part.endswith("Z") or "+" in time_part or "-" in time_part
+
+
+def _to_naive_utc(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _parse_datetimes(values: List[Optional[str]]) -> np.ndarray:
+    """Parse ISO timestamps into datetime64[s] (UTC for offset values), NaT where missing"""
+    cleaned = [value if value else None for value in values]
+    if not any(_has_utc_offset(value) for value in cleaned if value):
+        try:
+            return np.array(cleaned, dtype="datetime64[s]")
+        except ValueError:
+            pass
+    # Offsets (numpy's own offset parsing is deprecated) or unusual ISO
+    # forms: parse with the stdlib and normalise aware values to UTC
+    parsed = [
+        np.datetime64(_to_naive_utc(value), "s") if value else np.datetime64("NaT")
+        for value in cleaned
+    ]
+    return np.array(parsed, dtype="datetime64[s]")
+
+
+class ClaimsFrame:
+    """Typed, columnar claims for a single scheme"""
+
+    __slots__ = ("spec", "months", "month_codes", "patients", "patient_codes", "billed",
+                 "approved", "received", "status", "reimbursement_days", "emergency", "surgery")
+
+    def __init__(self, spec: ClaimsSchemeSpec, records: List[Dict[str, Any]]):
+        self.spec = spec
+        count = len(records)
+
+        # Factorize months and patients into integer codes
+        if spec.date_field:
+            month_labels = [(record.get(spec.date_field) or "")[:7] for record in records]
+        else:
+            month_labels = [ALL_PERIODS] * count
+        self.months, self.month_codes = self._factorize(month_labels)
+        self.patients, self.patient_codes = self._factorize(
+            [record.get(spec.patient_field) for record in records]
+        )
+
+        # Fixed-point amounts
+        self.billed = np.fromiter((to_paise(r.get(spec.billed_field, 0)) for r in records), np.int64, count)
+        self.approved = np.fromiter((to_paise(r.get(spec.approved_field, 0)) for r in records), np.int64, count)
+        if spec.received_field:
+            self.received = np.fromiter((to_paise(r.get(spec.received_field, 0)) for r in records), np.int64, count)
+        else:
+            self.received = np.zeros(count, np.int64)
+
+        status_map = {spec.approved_status: _STATUS_APPROVED}
+        if spec.rejected_status:
+            status_map[spec.rejected_status] = _STATUS_REJECTED
+        self.status = np.fromiter((status_map.get(r.get("status"), _STATUS_OTHER) for r in records), np.int8, count)
+
+        # Settlement turnaround in whole days (timedelta.days semantics)
+        self.reimbursement_days = np.full(count, _NO_DAYS, np.int32)
+        if spec.approved_date_field and spec.settled_date_field:
+            approved_dates = [r.get(spec.approved_date_field) for r in records]
+            settled_dates = [r.get(spec.settled_date_field) for r in records]
+            both = np.array([bool(a) and bool(s) for a, s in zip(approved_dates, settled_dates)], dtype=bool)
+            if both.any():
+                index = np.flatnonzero(both)
+                start = _parse_datetimes([approved_dates[i] for i in index])
+                end = _parse_datetimes([settled_dates[i] for i in index])
+                seconds = (end - start).astype(np.int64)
+                self.reimbursement_days[index] = np.floor_divide(seconds, 86400)
+
+        if spec.admission_field:
+            self.emergency = np.fromiter(
+                (r.get(spec.admission_field) == "emergency" for r in records), bool, count
+            )
+        else:
+            self.emergency = np.zeros(count, bool)
+
+        if spec.procedure_field:
+            self.surgery = np.fromiter(
+                ("surgery" in (r.get(spec.procedure_field) or "").lower() for r in records), bool, count
+            )
+        else:
+            self.surgery = np.zeros(count, bool)
+
+    def __len__(self) -> int:
+        return len(self.billed)
+
+    @staticmethod
+    def _factorize(labels: List[Any]) -> Tuple[List[Any], np.ndarray]:
+        """Map labels to dense integer codes"""
+        index: Dict[Any, int] = {}
+        codes = np.fromiter((index.setdefault(label, len(index)) for label in labels), np.int64, len(labels))
+        return list(index), codes
+
+
+class ClaimsAggregationEngine:
+    """Loads scheme claims into columnar frames and aggregates all months in one pass"""
+
+    def __init__(self, specs: Optional[Dict[str, ClaimsSchemeSpec]] = None, chunk_size: int = 10000):
+        self.specs = specs or DEFAULT_SCHEME_SPECS
+        self.chunk_size = chunk_size
+        self._frames: List[ClaimsFrame] = []
+
+    def load(self, scheme: str, records: Iterable[Dict[str, Any]],
+             months: Optional[Iterable[str]] = None) -> int:
+        """
+        Convert records for ``scheme`` into columnar chunks
+
+        Args:
+            scheme: Scheme name ('pmjay', 'cghs', 'esi')
+            records: Claim records
+            months: 'YYYY-MM' months to keep (None keeps every record)
+
+        Returns:
+            Number of records loaded
+        """
+        spec = self.specs[scheme]
+        keep = self._month_filter(spec, months)
+        loaded = 0
+        chunk: List[Dict[str, Any]] = []
+        for record in records:
+            if keep is not None and not keep(record):
+                continue
+            chunk.append(record)
+            if len(chunk) >= self.chunk_size:
+                loaded += self._add_frame(spec, chunk)
+                chunk = []
+        if chunk:
+            loaded += self._add_frame(spec, chunk)
+        return loaded
+
+    async def load_stream(self, scheme: str, records: TransactionSource,
+                          months: Optional[Iterable[str]] = None) -> int:
+        """Like load(), consuming an async stream chunk by chunk"""
+        if not hasattr(records, "__aiter__"):
+            return self.load(scheme, records, months)
+
+        spec = self.specs[scheme]
+        keep = self._month_filter(spec, months)
+        loaded = 0
+        chunk: List[Dict[str, Any]] = []
+        async for record in records:
+            if keep is not None and not keep(record):
+                continue
+            chunk.append(record)
+            if len(chunk) >= self.chunk_size:
+                loaded += self._add_frame(spec, chunk)
+                chunk = []
+        if chunk:
+            loaded += self._add_frame(spec, chunk)
+        return loaded
+
+    @staticmethod
+    def _month_filter(spec: ClaimsSchemeSpec,
+                      months: Optional[Iterable[str]]) -> Optional[Callable[[Dict[str, Any]], bool]]:
+        """Predicate keeping records dated in ``months`` (None when not filtering)"""
+        if months is None or not spec.date_field:
+            return None
+        wanted = set(months)
+        date_field = spec.date_field
+        return lambda record: (record.get(date_field) or "")[:7] in wanted
+
+    def _add_frame(self, spec: ClaimsSchemeSpec, records: List[Dict[str, Any]]) -> int:
+        self._frames.append(ClaimsFrame(spec, records))
+        return len(records)
+
+    def aggregate(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Compute metrics for every loaded scheme and month in one group-by pass
+
+        Returns:
+            scheme -> month ('YYYY-MM', or 'all' for undated schemes) -> metrics
+        """
+        frames = [frame for frame in self._frames if len(frame)]
+        if not frames:
+            return {}
+
+        # Global (scheme, month) and (scheme, patient) label tables
+        scheme_names = sorted({frame.spec.name for frame in frames})
+        scheme_index = {name: i for i, name in enumerate(scheme_names)}
+        group_labels: Dict[Tuple[str, str], int] = {}
+        patient_labels: Dict[Tuple[str, Any], int] = {}
+        group_columns, patient_columns = [], []
+        for frame in frames:
+            name = frame.spec.name
+            month_remap = np.array(
+                [group_labels.setdefault((name, month), len(group_labels)) for month in frame.months], np.int64
+            )
+            patient_remap = np.array(
+                [patient_labels.setdefault((name, patient), len(patient_labels)) for patient in frame.patients],
+                np.int64
+            )
+            group_columns.append(month_remap[frame.month_codes])
+            patient_columns.append(patient_remap[frame.patient_codes])
+
+        groups = np.concatenate(group_columns)
+        patients = np.concatenate(patient_columns)
+        billed = np.concatenate([frame.billed for frame in frames])
+        approved = np.concatenate([frame.approved for frame in frames])
+        received = np.concatenate([frame.received for frame in frames])
+        status = np.concatenate([frame.status for frame in frames])
+        days = np.concatenate([frame.reimbursement_days for frame in frames])
+        emergency = np.concatenate([frame.emergency for frame in frames])
+        surgery = np.concatenate([frame.surgery for frame in frames])
+
+        # One stable sort; every metric is a segmented reduction over it
+        order = np.argsort(groups, kind="stable")
+        sorted_groups = groups[order]
+        starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+        group_ids = sorted_groups[starts]
+
+        def segment_sum(values: np.ndarray) -> np.ndarray:
+            return np.add.reduceat(values[order].astype(np.int64), starts)
+
+        cases = np.diff(np.r_[starts, len(order)])
+        billed_sum = segment_sum(billed)
+        approved_sum = segment_sum(approved)
+        received_sum = segment_sum(received)
+        approved_count = segment_sum(status == _STATUS_APPROVED)
+        rejected_count = segment_sum(status == _STATUS_REJECTED)
+        emergency_count = segment_sum(emergency)
+        surgery_count = segment_sum(surgery)
+        has_days = days != _NO_DAYS
+        days_count = segment_sum(has_days)
+        days_sum = segment_sum(np.where(has_days, days, 0))
+
+        # Distinct patients per group from unique (group, patient) pairs
+        pair_keys = np.unique(groups * (len(patient_labels) + 1) + patients)
+        patient_counts = np.bincount(pair_keys // (len(patient_labels) + 1), minlength=len(group_labels))
+
+        label_by_group = {code: label for label, code in group_labels.items()}
+        results: Dict[str, Dict[str, Dict[str, Any]]] = {name: {} for name in scheme_names}
+        for position, group in enumerate(group_ids):
+            scheme, month = label_by_group[int(group)]
+            totals = {
+                "cases": int(cases[position]),
+                "patients": int(patient_counts[group]),
+                "billed": paise_to_decimal(billed_sum[position]),
+                "approved": paise_to_decimal(approved_sum[position]),
+                "received": paise_to_decimal(received_sum[position]),
+                "approved_count": int(approved_count[position]),
+                "rejected_count": int(rejected_count[position]),
+                "emergency": int(emergency_count[position]),
+                "surgery": int(surgery_count[position]),
+                "days_sum": int(days_sum[position]),
+                "days_count": int(days_count[position])
+            }
+            results[scheme][month] = _FORMATTERS.get(scheme, _format_pmjay)(totals)
+
+        return results
+
+    def monthly_metrics(self, scheme: str, months: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Metrics for selected months of one scheme ({} where a month has no claims)"""
+        scheme_results = self.aggregate().get(scheme, {})
+        return {month: scheme_results.get(month, {}) for month in months}
+
+
+def _rate(count: int, total: int) -> Decimal:
+    return Decimal(str(count * 100 / total)) if total > 0 else Decimal("0")
+
+
+def _format_pmjay(t: Dict[str, Any]) -> Dict[str, Any]:
+    total_cases = t["cases"]
+    billed, approved = t["billed"], t["approved"]
+    return {
+        "total_cases": total_cases,
+        "total_patients": t["patients"],
+        "total_billed": billed,
+        "total_approved": approved,
+        "total_received": t["received"],
+        "approval_rate": _rate(t["approved_count"], total_cases),
+        "rejection_rate": _rate(t["rejected_count"], total_cases),
+        "avg_reimbursement_days": int(t["days_sum"] / t["days_count"]) if t["days_count"] else 0,
+        "emergency_cases": t["emergency"],
+        "planned_cases": total_cases - t["emergency"],
+        "surgery_cases": t["surgery"],
+        "medical_cases": total_cases - t["surgery"],
+        "avg_case_value": approved / total_cases if total_cases > 0 else Decimal("0"),
+        "price_variance": (billed - approved) / billed * 100 if billed > 0 else Decimal("0")
+    }
+
+
+def _format_cghs(t: Dict[str, Any]) -> Dict[str, Any]:
+    total_cases = t["cases"]
+    return {
+        "total_cases": total_cases,
+        "total_patients": t["patients"],
+        "total_billed_amount": t["billed"],
+        "total_approved_amount": t["approved"],
+        "approval_rate": _rate(t["approved_count"], total_cases),
+        "average_case_value": t["approved"] / total_cases if total_cases > 0 else Decimal("0")
+    }
+
+
+def _format_esi(t: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "total_cases": t["cases"],
+        "total_patients": t["patients"],
+        "total_billed_amount": t["billed"],
+        "total_approved_amount": t["approved"],
+        "approval_rate": _rate(t["approved_count"], t["cases"])
+    }
+
+
+_FORMATTERS = {
+    "pmjay": _format_pmjay,
+    "cghs": _format_cghs,
+    "esi": _format_esi
+}
+
+
+def empty_scheme_metrics() -> Dict[str, Any]:
+    """Zero-valued metrics returned by CGHS and ESI processing when there are no claims"""
+    return {
+        "total_cases": 0,
+        "total_patients": 0,
+        "total_billed_amount": Decimal("0"),
+        "total_approved_amount": Decimal("0"),
+        "approval_rate": Decimal("0")
+    }
@@ -23,6 +23,17 @@ from ...models.hospital_benchmarks import (
 )
 from ...config.advanced_config_manager import ConfigManager
 from ...services.shared.error_handling import ApplicationError
+from .validation_plan import (
+ CompiledRule, RuleCounts, RulePlan,
+ check_data_completeness, check_data_freshness, check_hospital_name_format,
+ check_numeric_range, check_percentage_range, check_pincode_format,
+ check_positive_value, check_required, check_scheme_revenue_consistency,
+ compile_city_tier_check
+)
+from .location_index import (
+ DEFAULT_DIRECTORY_PATH, NormalizedLookup, PincodeIndex, PincodeLocation, load_pincode_index
+)
+from .peer_benchmarks import PeerBenchmarkCache, PeerDistributions
 
 
 class ValidationSeverity(Enum):
@@ -104,6 +115,10 @@ class DataQualityValidator:
  # Validation rules registry
  self.validation_rules: Dict[str, ValidationRule] = {}
 
+ # Compiled form of validation_rules, rebuilt when the rules change
+ self._rule_plan: Optional[RulePlan] = None
+ self._rule_plan_signature: Optional[Tuple] = None
+
  # Data enrichment sources
  self.enrichment_sources = {}
 
@@ -116,6 +131,17 @@ class DataQualityValidator:
  # Hospital specialty mappings
  self.specialty_mapping = self._load_specialty_mapping()
 
+ # Normalized, memoized lookups used by enrichment
+ self._city_tier_lookup = NormalizedLookup(self.city_tier_mapping)
+ self._hospital_type_lookup = NormalizedLookup(self.standardization_mappings["hospital_types"])
+ self._specialty_lookup = NormalizedLookup(self.specialty_mapping)
+
+ # Pincode location index, opened on first enrichment
+ self._pincode_index: Optional[PincodeIndex] = None
+
+ # Peer metric distributions for benchmark context, loaded on first enrichment
+ self._peer_benchmarks: Optional[PeerBenchmarkCache] = None
+
  # Initialize validation rules
  self._initialize_validation_rules()
 
@@ -477,57 +503,126 @@ class DataQualityValidator:
  validation_results = []
 
  try:
- # Run all validation rules
- for rule_id, rule in self.validation_rules.items():
- if not rule.enabled:
- continue
+ def collect_result(rule: ValidationRule, passed: bool, message: str,
+ value: Any, severity: ValidationSeverity) -> None:
+ validation_results.append(
+ self._make_validation_result(rule, passed, message, value, severity, hospital_data)
+ )
+
+ counts = self._get_rule_plan().evaluate(hospital_data, collect_result)
+
+ report = self._build_quality_report(
+ hospital_id, data_source, validation_start, counts, validation_results
+ )
+
+ self.logger.info(f"Data validation completed for {hospital_id}. Score: {report.overall_score}/100")
+
+ return report
+
+ except Exception as e:
+ self.logger.error(f"Data validation failed for {hospital_id}: {str(e)}")
+ raise DataQualityError(f"Data validation failed: {str(e)}")
+
+ async def validate_hospital_data_batch(self, records: List[Dict[str, Any]],
+ data_source: DataSource = DataSource.USER_INPUT,
+ id_field: str = "hospital_id") -> List[DataQualityReport]:
+ """
+ Validate many hospital records, evaluating each rule over whole columns
+
+ Reports match validate_hospital_data for each record; records without
+ ``id_field`` are identified by their position in the batch.
+ """
+
+ validation_start = datetime.utcnow()
+ results_by_record: List[List[ValidationResult]] = [[] for _ in records]
 
  try:
- result = await self._execute_validation_rule(rule, hospital_data)
- validation_results.append(result)
+ def collect_result(row: int, rule: ValidationRule, passed: bool, message: str,
+ value: Any, severity: ValidationSeverity) -> None:
+ results_by_record[row].append(
+ self._make_validation_result(rule, passed, message, value, severity, records[row])
+ )
+
+ counts_by_record = self._get_rule_plan().evaluate_batch(records, collect_result)
+
+ reports = [
+ self._build_quality_report(
+ str(record.get(id_field, index)), data_source, validation_start, counts, results
+ )
+ for index, (record, counts, results) in enumerate(zip(records, counts_by_record, results_by_record))
+ ]
+
+ self.logger.info(
+ f"Batch validation completed for {len(records)} records in "
+ f"{(datetime.utcnow() - validation_start).total_seconds():.2f}s"
+ )
+
+ return reports
 
  except Exception as e:
- self.logger.error(f"Validation rule {rule_id} failed: {str(e)}")
- # Create error result
- error_result = ValidationResult(
- rule_id=rule_id,
+ self.logger.error(f"Batch data validation failed: {str(e)}")
+ raise DataQualityError(f"Batch data validation failed: {str(e)}")
+
+ def _get_rule_plan(self) -> RulePlan:
+ """Compiled rule plan for the current validation_rules"""
+
+ signature = tuple(
+ (rule_id, id(rule), rule.enabled, rule.validation_function, rule.severity)
+ for rule_id, rule in self.validation_rules.items()
+ )
+ if self._rule_plan is None or signature != self._rule_plan_signature:
+ self._rule_plan = RulePlan(self.validation_rules.values(), ValidationSeverity.CRITICAL)
+ self._rule_plan_signature = signature
+ return self._rule_plan
+
+ def _make_validation_result(self, rule: ValidationRule, passed: bool, message: str,
+ value: Any, severity: ValidationSeverity,
+ data: Dict[str, Any]) -> ValidationResult:
+ """Validation result for one rule, with a suggested fix when it failed"""
+
+ result = ValidationResult(
+ rule_id=rule.rule_id,
  field_name=rule.field_name,
- severity=ValidationSeverity.CRITICAL,
- passed=False,
- message=f"Validation rule execution failed: {str(e)}"
+ severity=severity,
+ passed=passed,
+ message=message,
+ original_value=value
  )
- validation_results.append(error_result)
 
- # Calculate quality metrics
- total_validations = len(validation_results)
- passed_validations = len([r for r in validation_results if r.passed])
- failed_validations = total_validations - passed_validations
+ # Generate suggested fix for failed validations (not for rule errors)
+ if not passed and severity is rule.severity:
+ result.suggested_fix = self._generate_suggested_fix(rule, value, data)
+
+ return result
 
- # Count issues by severity
- critical_issues = len([r for r in validation_results if r.severity == ValidationSeverity.CRITICAL and not r.passed])
- high_issues = len([r for r in validation_results if r.severity == ValidationSeverity.HIGH and not r.passed])
- medium_issues = len([r for r in validation_results if r.severity == ValidationSeverity.MEDIUM and not r.passed])
- low_issues = len([r for r in validation_results if r.severity == ValidationSeverity.LOW and not r.passed])
+ def _build_quality_report(self, hospital_id: str, data_source: DataSource,
+ validation_start: datetime, counts: RuleCounts,
+ validation_results: List[ValidationResult]) -> DataQualityReport:
+ """Quality report with the overall score derived from severity counts"""
+
+ critical_issues = counts.failed_with(ValidationSeverity.CRITICAL)
+ high_issues = counts.failed_with(ValidationSeverity.HIGH)
+ medium_issues = counts.failed_with(ValidationSeverity.MEDIUM)
+ low_issues = counts.failed_with(ValidationSeverity.LOW)
 
  # Calculate overall quality score (1-100)
- if total_validations == 0:
+ if counts.total == 0:
  overall_score = 0
  else:
- base_score = int((passed_validations / total_validations) * 100)
+ base_score = int((counts.passed / counts.total) * 100)
 
  # Apply severity penalties
  penalty = (critical_issues * 20) + (high_issues * 10) + (medium_issues * 5) + (low_issues * 2)
  overall_score = max(1, min(100, base_score - penalty))
 
- # Create quality report
- report = DataQualityReport(
+ return DataQualityReport(
  hospital_id=hospital_id,
  data_source=data_source,
  validation_timestamp=validation_start,
  overall_score=overall_score,
- total_validations=total_validations,
- passed_validations=passed_validations,
- failed_validations=failed_validations,
+ total_validations=counts.total,
+ passed_validations=counts.passed,
+ failed_validations=counts.failed,
  critical_issues=critical_issues,
  high_issues=high_issues,
  medium_issues=medium_issues,
@@ -535,14 +630,6 @@ class DataQualityValidator:
  validation_results=validation_results
  )
 
- self.logger.info(f"Data validation completed for {hospital_id}. Score: {overall_score}/100")
-
- return report
-
- except Exception as e:
- self.logger.error(f"Data validation failed for {hospital_id}: {str(e)}")
- raise DataQualityError(f"Data validation failed: {str(e)}")
-
  async def _execute_validation_rule(self, rule: ValidationRule, 
  data: Dict[str, Any]) -> ValidationResult:
  """Execute a single validation rule"""
@@ -550,53 +637,8 @@ class DataQualityValidator:
  field_value = data.get(rule.field_name)
 
  try:
- if rule.validation_function == "validate_required":
- passed, message = self._validate_required(field_value)
-
- elif rule.validation_function == "validate_hospital_name_format":
- passed, message = self._validate_hospital_name_format(field_value)
-
- elif rule.validation_function == "validate_city_tier":
- passed, message = self._validate_city_tier(field_value, rule.parameters)
-
- elif rule.validation_function == "validate_pincode_format":
- passed, message = self._validate_pincode_format(field_value)
-
- elif rule.validation_function == "validate_percentage_range":
- passed, message = self._validate_percentage_range(field_value, rule.parameters)
-
- elif rule.validation_function == "validate_numeric_range":
- passed, message = self._validate_numeric_range(field_value, rule.parameters)
-
- elif rule.validation_function == "validate_positive_value":
- passed, message = self._validate_positive_value(field_value)
-
- elif rule.validation_function == "validate_scheme_revenue_consistency":
- passed, message = self._validate_scheme_revenue_consistency(data)
-
- elif rule.validation_function == "validate_data_completeness":
- passed, message = self._validate_data_completeness(data)
-
- elif rule.validation_function == "validate_data_freshness":
- passed, message = self._validate_data_freshness(field_value, rule.parameters)
-
- else:
- passed, message = False, f"Unknown validation function: {rule.validation_function}"
-
- result = ValidationResult(
- rule_id=rule.rule_id,
- field_name=rule.field_name,
- severity=rule.severity,
- passed=passed,
- message=message,
- original_value=field_value
- )
-
- # Generate suggested fix for failed validations
- if not passed:
- result.suggested_fix = self._generate_suggested_fix(rule, field_value, data)
-
- return result
+ passed, message = CompiledRule(rule).check(field_value, data)
+ return self._make_validation_result(rule, passed, message, field_value, rule.severity, data)
 
  except Exception as e:
  return ValidationResult(
@@ -610,178 +652,43 @@ class DataQualityValidator:
 
  def _validate_required(self, value: Any) -> Tuple[bool, str]:
  """Validate that required field has a value"""
- if value is None or value == "" or (isinstance(value, str) and value.strip() == ""):
- return False, "Required field is empty or missing"
- return True, "Required field validation passed"
+ return check_required(value)
 
  def _validate_hospital_name_format(self, value: Any) -> Tuple[bool, str]:
  """Validate hospital name format"""
- if not value or not isinstance(value, str):
- return False, "Hospital name must be a non-empty string"
-
- name = value.strip()
-
- # Check minimum length
- if len(name) < 3:
- return False, "Hospital name too short (minimum 3 characters)"
-
- # Check for suspicious patterns
- if name.lower() in ['test', 'demo', 'sample', 'example']:
- return False, "Hospital name appears to be test data"
-
- # Check for proper capitalization (basic check)
- if name.islower() or name.isupper():
- return False, "Hospital name should use proper capitalization"
-
- return True, "Hospital name format validation passed"
+ return check_hospital_name_format(value)
 
  def _validate_city_tier(self, value: Any, parameters: Dict[str, Any]) -> Tuple[bool, str]:
  """Validate city tier value"""
- if not value:
- return False, "City tier is required"
-
- valid_values = parameters.get("valid_values", [])
- value_str = str(value).lower().strip()
-
- if value_str not in [v.lower() for v in valid_values]:
- return False, f"Invalid city tier '{value}'. Valid values: {', '.join(valid_values)}"
-
- return True, "City tier validation passed"
+ return compile_city_tier_check(parameters.get("valid_values", []))(value)
 
  def _validate_pincode_format(self, value: Any) -> Tuple[bool, str]:
  """Validate Indian pincode format"""
- if not value:
- return False, "Pincode is required"
-
- pincode_str = str(value).strip()
-
- # Indian pincode must be exactly 6 digits
- if not re.match(r'^\d{6}$', pincode_str):
- return False, "Pincode must be exactly 6 digits"
-
- # Basic range validation (Indian pincodes start from 100000)
- pincode_int = int(pincode_str)
- if not (100000 <= pincode_int <= 999999):
- return False, "Invalid pincode range"
-
- return True, "Pincode format validation passed"
+ return check_pincode_format(value)
 
  def _validate_percentage_range(self, value: Any, parameters: Dict[str, Any]) -> Tuple[bool, str]:
  """Validate percentage value within range"""
- if value is None:
- return False, "Percentage value is required"
-
- try:
- num_value = float(value)
- min_val = parameters.get("min_value", 0)
- max_val = parameters.get("max_value", 100)
-
- if not (min_val <= num_value <= max_val):
- return False, f"Value {num_value}% is outside valid range ({min_val}%-{max_val}%)"
-
- return True, "Percentage range validation passed"
-
- except (ValueError, TypeError):
- return False, f"Invalid percentage value: {value}"
+ return check_percentage_range(value, parameters.get("min_value", 0), parameters.get("max_value", 100))
 
  def _validate_numeric_range(self, value: Any, parameters: Dict[str, Any]) -> Tuple[bool, str]:
  """Validate numeric value within range"""
- if value is None:
- return False, "Numeric value is required"
-
- try:
- num_value = float(value)
- min_val = parameters.get("min_value")
- max_val = parameters.get("max_value")
-
- if min_val is not None and num_value < min_val:
- return False, f"Value {num_value} is below minimum ({min_val})"
-
- if max_val is not None and num_value > max_val:
- return False, f"Value {num_value} is above maximum ({max_val})"
-
- return True, "Numeric range validation passed"
-
- except (ValueError, TypeError):
- return False, f"Invalid numeric value: {value}"
+ return check_numeric_range(value, parameters.get("min_value"), parameters.get("max_value"))
 
  def _validate_positive_value(self, value: Any) -> Tuple[bool, str]:
  """Validate that value is positive"""
- if value is None:
- return False, "Value is required"
-
- try:
- num_value = float(value)
- if num_value <= 0:
- return False, f"Value must be positive, got: {num_value}"
-
- return True, "Positive value validation passed"
-
- except (ValueError, TypeError):
- return False, f"Invalid numeric value: {value}"
+ return check_positive_value(value)
 
  def _validate_scheme_revenue_consistency(self, data: Dict[str, Any]) -> Tuple[bool, str]:
  """Validate government scheme revenue consistency"""
- try:
- total_revenue = float(data.get("total_revenue", 0))
- scheme_revenue = float(data.get("government_scheme_revenue", 0))
-
- if scheme_revenue > total_revenue:
- return False, "Government scheme revenue cannot exceed total revenue"
-
- # Check if scheme revenue percentage is reasonable
- if total_revenue > 0:
- scheme_percentage = (scheme_revenue / total_revenue) * 100
- if scheme_percentage > 80: # More than 80% seems unusual
- return False, f"Government scheme revenue ({scheme_percentage:.1f}%) seems unusually high"
-
- return True, "Scheme revenue consistency validation passed"
-
- except (ValueError, TypeError):
- return False, "Invalid revenue values for consistency check"
+ return check_scheme_revenue_consistency(data)
 
  def _validate_data_completeness(self, data: Dict[str, Any]) -> Tuple[bool, str]:
  """Validate essential data completeness"""
-
- essential_fields = [
- "hospital_name", "bed_occupancy_rate", "average_length_of_stay",
- "total_revenue", "patient_satisfaction_score"
- ]
-
- missing_fields = []
- for field in essential_fields:
- if field not in data or data[field] is None or data[field] == "":
- missing_fields.append(field)
-
- if missing_fields:
- return False, f"Missing essential fields: {', '.join(missing_fields)}"
-
- return True, "Data completeness validation passed"
+ return check_data_completeness(data)
 
  def _validate_data_freshness(self, value: Any, parameters: Dict[str, Any]) -> Tuple[bool, str]:
  """Validate data timestamp freshness"""
- if not value:
- return False, "Data timestamp is required"
-
- try:
- if isinstance(value, str):
- timestamp = datetime.fromisoformat(value.replace('Z', '+00:00'))
- elif isinstance(value, datetime):
- timestamp = value
- else:
- return False, "Invalid timestamp format"
-
- max_age_days = parameters.get("max_age_days", 90)
- cutoff_date = datetime.utcnow() - timedelta(days=max_age_days)
-
- if timestamp < cutoff_date:
- age_days = (datetime.utcnow() - timestamp).days
- return False, f"Data is {age_days} days old (maximum {max_age_days} days)"
-
- return True, "Data freshness validation passed"
-
- except (ValueError, TypeError):
- return False, "Invalid timestamp value"
+ return check_data_freshness(value, parameters.get("max_age_days", 90))
 
  def _generate_suggested_fix(self, rule: ValidationRule, 
  current_value: Any, 
@@ -818,14 +725,61 @@ class DataQualityValidator:
  hospital_id: str) -> Dict[str, Any]:
  """Enrich hospital data with additional information"""
 
+ try:
+ enriched_data = await self._enrich_record(hospital_data)
+
+ self.logger.info(
+ f"Data enrichment completed for {hospital_id}. Applied: {enriched_data['enrichments_applied']}"
+ )
+
+ return enriched_data
+
+ except Exception as e:
+ self.logger.error(f"Data enrichment failed for {hospital_id}: {str(e)}")
+ # Return original data if enrichment fails
+ return hospital_data
+
+ async def enrich_hospital_data_batch(self, records: List[Dict[str, Any]],
+ id_field: str = "hospital_id") -> List[Dict[str, Any]]:
+ """
+ Enrich many hospital records, resolving the pincode column in one pass
+
+ Each record is enriched exactly as by enrich_hospital_data, and a
+ record whose enrichment fails is returned unchanged.
+ """
+
+ enrichment_start = datetime.utcnow()
+ pincodes = list(dict.fromkeys(str(record["pincode"]) for record in records if "pincode" in record))
+ pincode_index = await self.load_pincode_index()
+ locations = dict(zip(pincodes, pincode_index.lookup_many(pincodes)))
+
+ enriched_records = []
+ failed = 0
+ for index, record in enumerate(records):
+ try:
+ enriched_records.append(await self._enrich_record(record, locations))
+ except Exception as e:
+ failed += 1
+ self.logger.error(f"Data enrichment failed for {record.get(id_field, index)}: {str(e)}")
+ enriched_records.append(record)
+
+ self.logger.info(
+ f"Batch enrichment completed for {len(records)} records ({failed} failed) in "
+ f"{(datetime.utcnow() - enrichment_start).total_seconds():.2f}s"
+ )
+
+ return enriched_records
+
+ async def _enrich_record(self, hospital_data: Dict[str, Any],
+ pincode_locations: Optional[Dict[str, Optional[PincodeLocation]]] = None) -> Dict[str, Any]:
+ """Apply enrichments to one record, using pre-resolved pincodes when given"""
+
  enriched_data = hospital_data.copy()
  enrichments_applied = []
 
- try:
  # City tier enrichment
  if "city" in enriched_data and "city_tier" not in enriched_data:
- city_name = enriched_data["city"].lower().strip()
- tier = self.city_tier_mapping.get(city_name)
+ tier = self._city_tier_lookup.get(enriched_data["city"])
  if tier:
  enriched_data["city_tier"] = tier
  enrichments_applied.append("city_tier_mapping")
@@ -833,10 +787,16 @@ class DataQualityValidator:
  # Pincode-based enrichment
  if "pincode" in enriched_data:
  pincode = str(enriched_data["pincode"])
- location_data = self._get_location_from_pincode(pincode)
- if location_data:
- enriched_data.update(location_data)
+ if pincode_locations is not None:
+ location = pincode_locations.get(pincode)
+ else:
+ location = (await self.load_pincode_index()).lookup(pincode)
+ if location:
+ enriched_data.update(location.as_enrichment())
  enrichments_applied.append("pincode_location_mapping")
+ if location.tier and "city_tier" not in enriched_data:
+ enriched_data["city_tier"] = location.tier
+ enrichments_applied.append("pincode_tier_mapping")
 
  # Hospital type standardization
  if "hospital_type" in enriched_data:
@@ -868,15 +828,8 @@ class DataQualityValidator:
 
  enriched_data["enrichments_applied"] = enrichments_applied
 
- self.logger.info(f"Data enrichment completed for {hospital_id}. Applied: {enrichments_applied}")
-
  return enriched_data
 
- except Exception as e:
- self.logger.error(f"Data enrichment failed for {hospital_id}: {str(e)}")
- # Return original data if enrichment fails
- return hospital_data
-
  def _standardize_hospital_name(self, name: str) -> str:
  """Standardize hospital name format"""
  if not name:
@@ -901,47 +854,49 @@ class DataQualityValidator:
  if not hospital_type:
  return hospital_type
 
- type_lower = hospital_type.lower().strip()
- return self.standardization_mappings["hospital_types"].get(type_lower, hospital_type)
+ return self._hospital_type_lookup.get(hospital_type, hospital_type)
 
  def _standardize_specialty(self, specialty: str) -> str:
  """Standardize medical specialty"""
  if not specialty:
  return specialty
 
- specialty_lower = specialty.lower().strip()
- return self.specialty_mapping.get(specialty_lower, specialty)
+ return self._specialty_lookup.get(specialty, specialty)
 
  def _get_location_from_pincode(self, pincode: str) -> Dict[str, Any]:
  """Get location information from pincode"""
 
- # This would integrate with postal code database
- # For now, return basic validation
-
- if not re.match(r'^\d{6}$', pincode):
- return {}
-
- # Basic state mapping based on pincode ranges
- pincode_int = int(pincode)
-
- if 100000 <= pincode_int <= 199999:
- return {"state": "Delhi", "region": "North"}
- elif 200000 <= pincode_int <= 299999:
- return {"state": "Uttar Pradesh", "region": "North"}
- elif 300000 <= pincode_int <= 399999:
- return {"state": "Rajasthan", "region": "West"}
- elif 400000 <= pincode_int <= 499999:
- return {"state": "Maharashtra", "region": "West"}
- elif 500000 <= pincode_int <= 599999:
- return {"state": "Telangana", "region": "South"}
- elif 600000 <= pincode_int <= 699999:
- return {"state": "Tamil Nadu", "region": "South"}
- elif 700000 <= pincode_int <= 799999:
- return {"state": "West Bengal", "region": "East"}
- elif 800000 <= pincode_int <= 899999:
- return {"state": "Bihar", "region": "East"}
-
- return {}
+ location = self._get_pincode_index().lookup(pincode)
+ return location.as_enrichment() if location else {}
+
+ async def load_pincode_index(self) -> PincodeIndex:
+ """Open the pincode index on a worker thread; compiling it reads and writes files"""
+
+ if self._pincode_index is None:
+ self._pincode_index = await asyncio.to_thread(self._open_pincode_index)
+
+ return self._pincode_index
+
+ def _get_pincode_index(self) -> PincodeIndex:
+ """Shared pincode index built from the configured directories (blocking on first use)"""
+
+ if self._pincode_index is None:
+ self._pincode_index = self._open_pincode_index()
+
+ return self._pincode_index
+
+ def _open_pincode_index(self) -> PincodeIndex:
+ # Extra directories (e.g. the India Post export) override the bundled prefixes
+ extra_directories = list(self.config.get("data_quality.pincode_directories", []))
+ if not extra_directories:
+ self.logger.warning(
+ "No data_quality.pincode_directories configured; the bundled directory only "
+ "covers pincode prefixes, so most pincodes will be enriched without a district"
+ )
+ return load_pincode_index(
+ [DEFAULT_DIRECTORY_PATH] + extra_directories,
+ cache_dir=self.config.get("data_quality.pincode_index_cache_dir")
+ )
 
  def _calculate_derived_metrics(self, data: Dict[str, Any]) -> Dict[str, Any]:
  """Calculate derived metrics from base data"""
@@ -996,17 +951,35 @@ class DataQualityValidator:
  context = {}
 
  try:
- # This would compare against peer hospitals
- # For now, add basic context
-
  city_tier = data.get("city_tier", "unknown")
  hospital_type = data.get("hospital_type", "unknown")
 
  context["benchmark_peer_group"] = f"{hospital_type}_{city_tier}"
  context["benchmark_timestamp"] = datetime.utcnow().isoformat()
 
+ # Percentile ranks against stored peer metrics
+ percentiles = {}
+ distributions = await self._get_peer_distributions()
+ peer_group = distributions.resolve_group(hospital_type, city_tier) if distributions else None
+ if peer_group:
+ percentiles = distributions.percentiles(peer_group, data)
+ context["benchmark_peer_scope"] = "_".join(peer_group)
+ context["benchmark_peer_count"] = distributions.peer_counts[peer_group]
+ context["benchmark_snapshot_at"] = distributions.built_at.isoformat()
+ if percentiles:
+ context["benchmark_percentiles"] = percentiles
+
  # Add performance indicators
- if "bed_occupancy_rate" in data:
+ if "bed_occupancy_rate" in percentiles:
+ occupancy_percentile = percentiles["bed_occupancy_rate"]
+ if occupancy_percentile >= 75:
+ context["occupancy_performance"] = "above_average"
+ elif occupancy_percentile >= 25:
+ context["occupancy_performance"] = "average"
+ else:
+ context["occupancy_performance"] = "below_average"
+ elif "bed_occupancy_rate" in data:
+ # No peer data; fall back to fixed thresholds
  occupancy = float(data["bed_occupancy_rate"] or 0)
  if occupancy >= 80:
  context["occupancy_performance"] = "above_average"
@@ -1020,6 +993,29 @@ class DataQualityValidator:
 
  return context
 
+ async def _get_peer_distributions(self) -> Optional[PeerDistributions]:
+ """Current peer metric distributions, or None when disabled or not yet loaded"""
+
+ if not self.config.get("data_quality.peer_benchmarks.enabled", True):
+ return None
+
+ if self._peer_benchmarks is None:
+ self._peer_benchmarks = PeerBenchmarkCache(
+ self._load_peer_benchmark_metrics,
+ refresh_seconds=self.config.get("data_quality.peer_benchmarks.refresh_seconds", 3600),
+ min_peers=self.config.get("data_quality.peer_benchmarks.min_peers", 5)
+ )
+
+ return await self._peer_benchmarks.get()
+
+ async def _load_peer_benchmark_metrics(self) -> List[Dict[str, Any]]:
+ """Load the latest stored metrics of all active hospitals"""
+
+ from ...database.production_hospital_db import get_database
+
+ database = await get_database()
+ return await database.get_peer_benchmark_metrics()
+
  async def standardize_data_format(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
  """Standardize data format for consistency"""
 
@@ -0,0 +1,212 @@
+"""
+Compiled Field Mappings
+Precompiled dotted-path extractors and typed converters for HMS and partner mappings
+
+Mappings such as ``{"bed_occupancy_rate": "census.occupancy_percentage"}``
+are compiled once into getter functions over precomputed key tuples, so
+transforming a record no longer re-splits every path or routes every value
+through ``str`` before conversion.
+"""
+
+import numbers
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+Getter = Callable[[Any], Any]
+Converter = Callable[[Any], Any]
+
+HMS_MAPPING_SECTIONS = (
+    "performance_metrics",
+    "financial_metrics",
+    "patient_data",
+    "staff_metrics",
+    "government_schemes"
+)
+
+_MISSING = object()
+
+
+def compile_path(path: str) -> Getter:
+    """
+    Compile a dotted path into a getter
+
+    Dict keys are looked up by name; on lists, numeric segments are used as
+    indexes. Any miss returns None, matching the integrators' original
+    ``_extract_nested_value``.
+    """
+    keys = tuple(path.split('.'))
+    indexes = tuple(int(key) if key.isdigit() else None for key in keys)
+
+    if len(keys) == 1 and indexes[0] is None:
+        key = keys[0]
+
+        def get_one(data: Any) -> Any:
+            return data.get(key) if isinstance(data, dict) else None
+        return get_one
+
+    if len(keys) == 2 and indexes == (None, None):
+        first, second = keys
+
+        def get_two(data: Any) -> Any:
+            if not isinstance(data, dict):
+                return None
+            section = data.get(first, _MISSING)
+            return section.get(second) if isinstance(section, dict) else None
+        return get_two
+
+    steps = tuple(zip(keys, indexes))
+
+    def get_path(data: Any) -> Any:
+        current = data
+        for key, index in steps:
+            if isinstance(current, dict):
+                current = current.get(key, _MISSING)
+                if current is _MISSING:
+                    return None
+            elif index is not None and isinstance(current, list):
+                if index >= len(current):
+                    return None
+                current = current[index]
+            else:
+                return None
+        return current
+
+    return get_path
+
+
+def _number_to_decimal(value: Any) -> Decimal:
+    return Decimal(value)
+
+
+def _float_to_decimal(value: float) -> Decimal:
+    # repr keeps the shortest round-tripping digits (Decimal(float) would not)
+    return Decimal(repr(value))
+
+
+def _integral_to_decimal(value: Any) -> Decimal:
+    # bool, numpy integers and other int-likes
+    return Decimal(int(value))
+
+
+def _real_to_decimal(value: Any) -> Decimal:
+    # float subclasses and numpy floats print their shortest round-tripping
+    # digits (numpy's repr is "np.float64(...)", so use str)
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        return Decimal(repr(float(value)))
+
+
+def _unchanged(value: Any) -> Any:
+    return value
+
+
+def _parse_numeric_string(value: str) -> Any:
+    try:
+        if '.' in value:
+            return Decimal(value)
+        return int(value) if value.isdigit() else value
+    except (ValueError, InvalidOperation):
+        return value
+
+
+_CONVERTERS_BY_TYPE: Dict[type, Converter] = {
+    int: _number_to_decimal,
+    float: _float_to_decimal,
+    str: _parse_numeric_string
+}
+
+
+def _converter_for(value_type: type) -> Converter:
+    """Resolve (and cache) the converter for a type outside the exact-type table"""
+    if issubclass(value_type, str):
+        converter = _parse_numeric_string
+    elif issubclass(value_type, numbers.Integral):
+        converter = _integral_to_decimal
+    elif issubclass(value_type, numbers.Real):
+        converter = _real_to_decimal
+    else:
+        converter = _unchanged
+    _CONVERTERS_BY_TYPE[value_type] = converter
+    return converter
+
+
+def convert_value(value: Any) -> Any:
+    """Numbers to Decimal, numeric strings to Decimal/int, anything else unchanged"""
+    converter = _CONVERTERS_BY_TYPE.get(type(value))
+    if converter is None:
+        converter = _converter_for(type(value))
+    return converter(value)
+
+
+class CompiledFieldMapping:
+    """A standard-field -> source-path mapping compiled for repeated use"""
+
+    __slots__ = ("fields",)
+
+    def __init__(self, mapping: Mapping[str, str],
+                 converters: Optional[Mapping[str, Converter]] = None):
+        converters = converters or {}
+        self.fields: Tuple[Tuple[str, Getter, Converter], ...] = tuple(
+            (field, compile_path(path), converters.get(field, convert_value))
+            for field, path in mapping.items()
+        )
+
+    def apply(self, record: Any, into: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Extract and convert every mapped field present in ``record``"""
+        result = {} if into is None else into
+        for field, get, convert in self.fields:
+            value = get(record)
+            if value is not None:
+                result[field] = convert(value)
+        return result
+
+    def apply_batch(self, records: Iterable[Any]) -> List[Dict[str, Any]]:
+        """Apply the mapping to many records"""
+        apply = self.apply
+        return [apply(record) for record in records]
+
+
+class CompiledHMSMapping:
+    """All sections of an HMSDataMapping compiled for repeated use"""
+
+    __slots__ = ("sections",)
+
+    def __init__(self, sections: Mapping[str, Mapping[str, str]]):
+        self.sections: Tuple[Tuple[str, CompiledFieldMapping], ...] = tuple(
+            (section, CompiledFieldMapping(sections.get(section) or {}))
+            for section in HMS_MAPPING_SECTIONS
+        )
+
+    def apply(self, raw_data: Any) -> Dict[str, Dict[str, Any]]:
+        """Standardize one raw HMS payload into the five mapping sections"""
+        return {section: mapping.apply(raw_data) for section, mapping in self.sections}
+
+    def apply_batch(self, records: Iterable[Any]) -> List[Dict[str, Dict[str, Any]]]:
+        """Standardize many raw HMS payloads"""
+        apply = self.apply
+        return [apply(record) for record in records]
+
+
+def _freeze(mapping: Mapping[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(mapping.items())
+
+
+@lru_cache(maxsize=256)
+def _compile_hms_sections(frozen: Tuple[Tuple[str, Tuple[Tuple[str, str], ...]], ...]) -> CompiledHMSMapping:
+    return CompiledHMSMapping({section: dict(items) for section, items in frozen})
+
+
+def compile_hms_mapping(mapping: Any) -> CompiledHMSMapping:
+    """
+    Compile an HMSDataMapping (or its dict form), reusing earlier compilations
+
+    Mappings are rebuilt from stored configuration on every collection, so
+    compiled forms are cached by content.
+    """
+    if isinstance(mapping, Mapping):
+        sections = {section: mapping.get(section) or {} for section in HMS_MAPPING_SECTIONS}
+    else:
+        sections = {section: getattr(mapping, section, None) or {} for section in HMS_MAPPING_SECTIONS}
+    return _compile_hms_sections(tuple((section, _freeze(sections[section])) for section in HMS_MAPPING_SECTIONS))
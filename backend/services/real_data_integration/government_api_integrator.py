@@ -7,7 +7,7 @@ import asyncio
 import logging
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, AsyncIterable, AsyncIterator
 from dataclasses import dataclass
 from enum import Enum
 import json
@@ -26,6 +26,9 @@ from ...models.hospital_benchmarks import (
 )
 from ...config.advanced_config_manager import ConfigManager
 from ...services.shared.error_handling import ApplicationError
+from .http_session_pool import HTTPSessionPool, get_session_pool
+from .paginated_fetcher import PaginatedFetcher
+from .claims_aggregation import ClaimsAggregationEngine, empty_scheme_metrics
 
 
 class GovernmentAPI(Enum):
@@ -67,9 +70,10 @@ class GovernmentAPIError(ApplicationError):
 class GovernmentDataIntegrator:
  """Production Government Health Data Integration Service"""
 
- def __init__(self, config: ConfigManager):
+ def __init__(self, config: ConfigManager, session_pool: Optional[HTTPSessionPool] = None):
  self.config = config
  self.logger = logging.getLogger(__name__)
+ self.session_pool = session_pool or get_session_pool()
 
  # Government API configurations
  self.api_configs = {
@@ -188,12 +192,12 @@ class GovernmentDataIntegrator:
  "quality_score": 3
  }
 
- # Collect transaction data
- transactions = await self._get_pmjay_transactions(hospital_id)
-
- # Calculate metrics
+ # Stream transactions straight into per-month accumulators
  current_month = datetime.now().strftime("%Y-%m")
- monthly_data = self._process_pmjay_transactions(transactions, current_month)
+ monthly_metrics = await self._process_pmjay_transactions(
+ self._stream_pmjay_transactions(hospital_id), [current_month]
+ )
+ monthly_data = monthly_metrics.get(current_month, {})
 
  return {
  "scheme": "ayushman_bharat",
@@ -265,10 +269,14 @@ class GovernmentDataIntegrator:
  return {"is_empaneled": False, "error": f"API error: {response.status}"}
 
  finally:
- await session.close()
+ self.session_pool.release(session)
 
  async def _get_pmjay_transactions(self, hospital_id: str) -> List[Dict[str, Any]]:
  """Get PM-JAY transaction data for hospital"""
+ return [txn async for txn in self._stream_pmjay_transactions(hospital_id)]
+
+ async def _stream_pmjay_transactions(self, hospital_id: str) -> AsyncIterator[Dict[str, Any]]:
+ """Stream PM-JAY transactions, prefetching pages concurrently"""
 
  session = await self._get_authenticated_session(GovernmentAPI.AYUSHMAN_BHARAT_PMJAY)
 
@@ -280,113 +288,49 @@ class GovernmentDataIntegrator:
  end_date = datetime.now()
  start_date = end_date - timedelta(days=90)
 
- params = {
+ page_size = 1000
+ base_params = {
  "hospitalCode": hospital_id,
  "fromDate": start_date.strftime("%Y-%m-%d"),
  "toDate": end_date.strftime("%Y-%m-%d"),
- "pageSize": 1000,
- "pageNumber": 1
+ "pageSize": page_size
  }
 
- all_transactions = []
-
- # Handle pagination
- while True:
+ async def fetch_page(page_number: int) -> Optional[List[Dict[str, Any]]]:
+ params = {**base_params, "pageNumber": page_number}
  async with session.get(url, params=params) as response:
  if response.status == 200:
  data = await response.json()
- transactions = data.get("transactions", [])
-
- if not transactions:
- break
-
- all_transactions.extend(transactions)
-
- # Check if more pages available
- if len(transactions) < params["pageSize"]:
- break
-
- params["pageNumber"] += 1
- else:
+ return data.get("transactions", [])
  self.logger.warning(f"PM-JAY transactions API error: {response.status}")
- break
-
- return all_transactions
-
- finally:
- await session.close()
-
- def _process_pmjay_transactions(self, transactions: List[Dict], 
- target_month: str) -> Dict[str, Any]:
- """Process PM-JAY transactions for monthly metrics"""
-
- monthly_transactions = []
-
- # Filter transactions for target month
- for txn in transactions:
- txn_date = txn.get("transactionDate", "")
- if txn_date.startswith(target_month):
- monthly_transactions.append(txn)
-
- if not monthly_transactions:
- return {}
-
- # Calculate metrics
- total_cases = len(monthly_transactions)
- total_patients = len(set(txn.get("beneficiaryId") for txn in monthly_transactions))
+ return None
 
- total_billed = sum(Decimal(str(txn.get("billedAmount", 0))) for txn in monthly_transactions)
- total_approved = sum(Decimal(str(txn.get("approvedAmount", 0))) for txn in monthly_transactions)
- total_received = sum(Decimal(str(txn.get("settledAmount", 0))) for txn in monthly_transactions)
-
- approved_cases = len([txn for txn in monthly_transactions if txn.get("status") == "approved"])
- rejected_cases = len([txn for txn in monthly_transactions if txn.get("status") == "rejected"])
-
- approval_rate = Decimal(str(approved_cases * 100 / total_cases)) if total_cases > 0 else Decimal("0")
- rejection_rate = Decimal(str(rejected_cases * 100 / total_cases)) if total_cases > 0 else Decimal("0")
-
- # Calculate reimbursement days
- reimbursement_days = []
- for txn in monthly_transactions:
- if txn.get("settledDate") and txn.get("approvedDate"):
- approved_date = datetime.fromisoformat(txn["approvedDate"])
- settled_date = datetime.fromisoformat(txn["settledDate"])
- days = (settled_date - approved_date).days
- reimbursement_days.append(days)
-
- avg_reimbursement_days = int(sum(reimbursement_days) / len(reimbursement_days)) if reimbursement_days else 0
-
- # Case type analysis
- emergency_cases = len([txn for txn in monthly_transactions if txn.get("admissionType") == "emergency"])
- planned_cases = total_cases - emergency_cases
+ # Bounded prefetch window; stays within the session's per-host limit
+ fetcher = PaginatedFetcher(
+ fetch_page,
+ page_size=page_size,
+ prefetch_pages=self.config.get("government_apis.pmjay.prefetch_pages", 4)
+ )
 
- surgery_cases = len([txn for txn in monthly_transactions if txn.get("procedureType", "").lower().find("surgery") != -1])
- medical_cases = total_cases - surgery_cases
+ async for txn in fetcher:
+ yield txn
 
- avg_case_value = total_approved / total_cases if total_cases > 0 else Decimal("0")
+ self.logger.debug(
+ f"PM-JAY pagination: {fetcher.stats.pages_consumed} pages, "
+ f"{fetcher.stats.records} transactions, {fetcher.stats.pages_discarded} prefetches discarded"
+ )
 
- # Price variance calculation
- if total_billed > 0:
- price_variance = ((total_billed - total_approved) / total_billed * 100)
- else:
- price_variance = Decimal("0")
+ finally:
+ self.session_pool.release(session)
 
- return {
- "total_cases": total_cases,
- "total_patients": total_patients,
- "total_billed": total_billed,
- "total_approved": total_approved,
- "total_received": total_received,
- "approval_rate": approval_rate,
- "rejection_rate": rejection_rate,
- "avg_reimbursement_days": avg_reimbursement_days,
- "emergency_cases": emergency_cases,
- "planned_cases": planned_cases,
- "surgery_cases": surgery_cases,
- "medical_cases": medical_cases,
- "avg_case_value": avg_case_value,
- "price_variance": price_variance
- }
+ async def _process_pmjay_transactions(self, transactions: AsyncIterable[Dict[str, Any]],
+ target_months: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+ """Process a PM-JAY transaction stream into per-month metrics in a single pass"""
+ engine = ClaimsAggregationEngine()
+ await engine.load_stream("pmjay", transactions, target_months)
+ if target_months is None:
+ return engine.aggregate().get("pmjay", {})
+ return engine.monthly_metrics("pmjay", target_months)
 
  async def _collect_cghs_data(self, hospital_id: str) -> Dict[str, Any]:
  """Collect CGHS (Central Government Health Scheme) data"""
@@ -448,43 +392,15 @@ class GovernmentDataIntegrator:
  }
  finally:
  if 'session' in locals():
- await session.close()
+ self.session_pool.release(session)
 
  def _process_cghs_transactions(self, transactions: List[Dict], 
  target_month: str) -> Dict[str, Any]:
  """Process CGHS transactions for monthly metrics"""
 
- monthly_transactions = [
- txn for txn in transactions 
- if txn.get("treatmentDate", "").startswith(target_month)
- ]
-
- if not monthly_transactions:
- return {
- "total_cases": 0,
- "total_patients": 0,
- "total_billed_amount": Decimal("0"),
- "total_approved_amount": Decimal("0"),
- "approval_rate": Decimal("0")
- }
-
- total_cases = len(monthly_transactions)
- total_patients = len(set(txn.get("cghs_number") for txn in monthly_transactions))
-
- total_billed = sum(Decimal(str(txn.get("billAmount", 0))) for txn in monthly_transactions)
- total_approved = sum(Decimal(str(txn.get("approvedAmount", 0))) for txn in monthly_transactions)
-
- approved_count = len([txn for txn in monthly_transactions if txn.get("status") == "approved"])
- approval_rate = Decimal(str(approved_count * 100 / total_cases)) if total_cases > 0 else Decimal("0")
-
- return {
- "total_cases": total_cases,
- "total_patients": total_patients,
- "total_billed_amount": total_billed,
- "total_approved_amount": total_approved,
- "approval_rate": approval_rate,
- "average_case_value": total_approved / total_cases if total_cases > 0 else Decimal("0")
- }
+ engine = ClaimsAggregationEngine()
+ engine.load("cghs", transactions, [target_month])
+ return engine.monthly_metrics("cghs", [target_month])[target_month] or empty_scheme_metrics()
 
  async def _collect_esi_data(self, hospital_id: str) -> Dict[str, Any]:
  """Collect ESI (Employee State Insurance) data"""
@@ -543,36 +459,14 @@ class GovernmentDataIntegrator:
  }
  finally:
  if 'session' in locals():
- await session.close()
+ self.session_pool.release(session)
 
  def _process_esi_claims(self, claims: List[Dict]) -> Dict[str, Any]:
  """Process ESI claims for metrics"""
 
- if not claims:
- return {
- "total_cases": 0,
- "total_patients": 0,
- "total_billed_amount": Decimal("0"),
- "total_approved_amount": Decimal("0"),
- "approval_rate": Decimal("0")
- }
-
- total_cases = len(claims)
- total_patients = len(set(claim.get("esi_number") for claim in claims))
-
- total_billed = sum(Decimal(str(claim.get("claimedAmount", 0))) for claim in claims)
- total_approved = sum(Decimal(str(claim.get("settledAmount", 0))) for claim in claims)
-
- approved_count = len([claim for claim in claims if claim.get("status") == "settled"])
- approval_rate = Decimal(str(approved_count * 100 / total_cases)) if total_cases > 0 else Decimal("0")
-
- return {
- "total_cases": total_cases,
- "total_patients": total_patients,
- "total_billed_amount": total_billed,
- "total_approved_amount": total_approved,
- "approval_rate": approval_rate
- }
+ engine = ClaimsAggregationEngine()
+ engine.load("esi", claims)
+ return engine.aggregate().get("esi", {}).get("all") or empty_scheme_metrics()
 
  async def _collect_state_schemes_data(self, hospital_id: str) -> Dict[str, Any]:
  """Collect State Government Health Schemes data"""
@@ -643,10 +537,9 @@ class GovernmentDataIntegrator:
  }
 
  async def _get_authenticated_session(self, api_type: GovernmentAPI) -> ClientSession:
- """Get authenticated session for government API"""
+ """Get pooled, authenticated session for government API"""
 
  config = self.api_configs[api_type]
- timeout = ClientTimeout(total=30, connect=10)
 
  headers = {
  "User-Agent": "VerticalLight-Gov-Integrator/1.0",
@@ -668,14 +561,16 @@ class GovernmentDataIntegrator:
  elif config["auth_type"] == "hmac":
  headers.update(self._generate_hmac_headers(creds))
 
- session = ClientSession(
+ # Keyed on the API and auth scheme so rotated keys and OAuth tokens refresh
+ # the headers of the existing keep-alive session instead of opening a new one
+ return await self.session_pool.get_session(
+ f"government:{api_type.value}",
+ creds.base_url,
  headers=headers,
- timeout=timeout,
- connector=aiohttp.TCPConnector(limit=5)
+ credential_id=f"auth:{config['auth_type']}",
+ per_host_limit=5
  )
 
- return session
-
  def _get_api_credentials(self, api_type: GovernmentAPI) -> GovernmentAPICredentials:
  """Get API credentials from configuration"""
 
@@ -795,7 +690,7 @@ class GovernmentDataIntegrator:
  return {"is_nabh_accredited": False, "error": str(e)}
  finally:
  if 'session' in locals():
- await session.close()
+ self.session_pool.release(session)
 
  async def _get_jci_accreditation(self, hospital_id: str) -> Dict[str, Any]:
  """Get JCI accreditation status (if available via API)"""
@@ -26,6 +26,9 @@ from ...models.hospital_benchmarks import (
 )
 from ...config.advanced_config_manager import ConfigManager
 from ...services.shared.error_handling import ApplicationError
+from ...services.shared.xml_streaming import element_to_dict, parse_xml_stream_to_dict
+from .http_session_pool import HTTPSessionPool, get_session_pool
+from .field_mapping import CompiledHMSMapping, compile_hms_mapping, compile_path, convert_value
 
 
 class HMSType(Enum):
@@ -126,11 +129,11 @@ class HMSAPIIntegrationError(ApplicationError):
 class HMSAPIIntegrator:
  """Production HMS API Integration Service"""
 
- def __init__(self, config: ConfigManager):
+ def __init__(self, config: ConfigManager, session_pool: Optional[HTTPSessionPool] = None):
  self.config = config
  self.logger = logging.getLogger(__name__)
  self.encryption_key = self._get_encryption_key()
- self.session_cache: Dict[str, ClientSession] = {}
+ self.session_pool = session_pool or get_session_pool()
  self.rate_limits: Dict[str, datetime] = {}
 
  def _get_encryption_key(self) -> bytes:
@@ -304,7 +307,7 @@ class HMSAPIIntegrator:
  return raw_data
 
  finally:
- await session.close()
+ self.session_pool.release(session)
 
  async def _collect_birlamedisoft_data(self, credentials: HMSCredentials) -> Dict[str, Any]:
  """Collect data from Birlamedisoft HMS API"""
@@ -376,7 +379,7 @@ class HMSAPIIntegrator:
  return raw_data
 
  finally:
- await session.close()
+ self.session_pool.release(session)
 
  async def _collect_hmis_plus_data(self, credentials: HMSCredentials) -> Dict[str, Any]:
  """Collect data from HMIS Plus (Government HMS) API"""
@@ -454,7 +457,7 @@ class HMSAPIIntegrator:
  return raw_data
 
  finally:
- await session.close()
+ self.session_pool.release(session)
 
  async def _collect_generic_hms_data(self, hms_type: HMSType, 
  credentials: HMSCredentials) -> Dict[str, Any]:
@@ -492,8 +495,11 @@ class HMSAPIIntegrator:
  if 'application/json' in content_type:
  data = await response.json()
  elif 'application/xml' in content_type or 'text/xml' in content_type:
- xml_content = await response.text()
- data = self._parse_xml_to_dict(xml_content)
+ try:
+ data = await parse_xml_stream_to_dict(response.content.iter_chunked(64 * 1024))
+ except ET.ParseError as e:
+ self.logger.error(f"Error parsing XML: {str(e)}")
+ data = {}
  else:
  # Assume JSON if not specified
  data = await response.json()
@@ -510,13 +516,11 @@ class HMSAPIIntegrator:
  return raw_data
 
  finally:
- await session.close()
+ self.session_pool.release(session)
 
  async def _get_authenticated_session(self, hms_type: HMSType, 
  credentials: HMSCredentials) -> ClientSession:
- """Get authenticated HTTP session for HMS API"""
-
- timeout = ClientTimeout(total=30, connect=10)
+ """Get pooled, authenticated HTTP session for HMS API"""
 
  # Base headers
  headers = {
@@ -542,15 +546,17 @@ class HMSAPIIntegrator:
  # OAuth token would be handled separately
  pass
 
- session = ClientSession(
+ # Shared keep-alive session per (HMS type, base URL, tenant); a rotated API
+ # key refreshes the headers of that session instead of opening another
+ return await self.session_pool.get_session(
+ f"hms:{hms_type.value}",
+ credentials.base_url,
  headers=headers,
  auth=auth,
- timeout=timeout,
- connector=aiohttp.TCPConnector(limit=10)
+ credential_id=f"tenant:{credentials.tenant_id or ''}",
+ per_host_limit=10
  )
 
- return session
-
  async def _test_hms_connection(self, hms_type: HMSType, 
  credentials: HMSCredentials) -> Dict[str, Any]:
  """Test HMS API connection and authentication"""
@@ -617,7 +623,7 @@ class HMSAPIIntegrator:
  }
  finally:
  if 'session' in locals():
- await session.close()
+ self.session_pool.release(session)
 
  def _get_hospital_hms_config(self, hospital_id: str) -> Optional[Dict[str, Any]]:
  """Get HMS configuration for a hospital"""
@@ -649,46 +655,10 @@ class HMSAPIIntegrator:
  mapping: HMSDataMapping) -> Dict[str, Any]:
  """Transform raw HMS data to standard format"""
 
- standardized = {
- "performance_metrics": {},
- "financial_metrics": {},
- "patient_data": {},
- "staff_metrics": {},
- "government_schemes": {}
- }
-
  try:
- # Transform performance metrics
- for std_field, hms_path in mapping.performance_metrics.items():
- value = self._extract_nested_value(raw_data, hms_path)
- if value is not None:
- standardized["performance_metrics"][std_field] = self._convert_data_type(value)
-
- # Transform financial metrics
- for std_field, hms_path in mapping.financial_metrics.items():
- value = self._extract_nested_value(raw_data, hms_path)
- if value is not None:
- standardized["financial_metrics"][std_field] = self._convert_data_type(value)
-
- # Transform patient data
- for std_field, hms_path in mapping.patient_data.items():
- value = self._extract_nested_value(raw_data, hms_path)
- if value is not None:
- standardized["patient_data"][std_field] = self._convert_data_type(value)
-
- # Transform staff metrics
- for std_field, hms_path in mapping.staff_metrics.items():
- value = self._extract_nested_value(raw_data, hms_path)
- if value is not None:
- standardized["staff_metrics"][std_field] = self._convert_data_type(value)
-
- # Transform government scheme data
- for std_field, hms_path in mapping.government_schemes.items():
- value = self._extract_nested_value(raw_data, hms_path)
- if value is not None:
- standardized["government_schemes"][std_field] = self._convert_data_type(value)
-
- return standardized
+ # Mapping paths and converters are compiled once per distinct mapping;
+ # every section (performance, financial, patient, staff, schemes) is filled
+ return mapping.compile().apply(raw_data)
 
  except Exception as e:
  self.logger.error(f"Error transforming HMS data: {str(e)}")
@@ -696,43 +666,11 @@ class HMSAPIIntegrator:
 
  def _extract_nested_value(self, data: Dict[str, Any], path: str) -> Any:
  """Extract value from nested dictionary using dot notation path"""
- try:
- keys = path.split('.')
- current = data
-
- for key in keys:
- if isinstance(current, dict) and key in current:
- current = current[key]
- elif isinstance(current, list) and key.isdigit():
- current = current[int(key)]
- else:
- return None
-
- return current
-
- except (KeyError, IndexError, TypeError):
- return None
+ return compile_path(path)(data)
 
  def _convert_data_type(self, value: Any) -> Union[Decimal, int, float, str]:
  """Convert data to appropriate type"""
- if value is None:
- return None
-
- # Convert to Decimal for financial data
- if isinstance(value, (int, float)):
- return Decimal(str(value))
-
- # Try to convert string numbers
- if isinstance(value, str):
- try:
- if '.' in value:
- return Decimal(value)
- else:
- return int(value) if value.isdigit() else value
- except (ValueError, TypeError):
- return value
-
- return value
+ return convert_value(value)
 
  async def _validate_data_quality(self, data: Dict[str, Any]) -> int:
  """Validate data quality and return score 1-10"""
@@ -810,47 +748,19 @@ class HMSAPIIntegrator:
  self.logger.error(f"Error parsing HMIS SOAP response: {str(e)}")
  return {}
 
- def _parse_xml_to_dict(self, xml_string: str) -> Dict[str, Any]:
- """Parse XML string to dictionary"""
- try:
- root = ET.fromstring(xml_string)
- return self._xml_element_to_dict(root)
- except Exception as e:
- self.logger.error(f"Error parsing XML: {str(e)}")
- return {}
-
  def _xml_element_to_dict(self, element) -> Dict[str, Any]:
  """Convert XML element to dictionary"""
- result = {}
-
- # Add element text
- if element.text and element.text.strip():
- if len(element) == 0:
- return element.text.strip()
-
- # Add attributes
- for key, value in element.attrib.items():
- result[f"@{key}"] = value
-
- # Add child elements
- for child in element:
- child_data = self._xml_element_to_dict(child)
-
- if child.tag in result:
- # Multiple elements with same tag
- if not isinstance(result[child.tag], list):
- result[child.tag] = [result[child.tag]]
- result[child.tag].append(child_data)
- else:
- result[child.tag] = child_data
-
- return result
+ return element_to_dict(element)
 
 
 # Data mapping extensions for different HMS types
 class HMSDataMapping:
  """Extended with class methods for different HMS types"""
 
+ def compile(self) -> CompiledHMSMapping:
+ """Compiled extractor for this mapping (cached by mapping content)"""
+ return compile_hms_mapping(self)
+
  def to_dict(self) -> Dict[str, Any]:
  """Convert to dictionary for storage"""
  return {
@@ -0,0 +1,332 @@
+"""
+Shared HTTP Session Pool for Real Data Integrations
+Persistent, keep-alive aiohttp sessions shared across HMS, government and partner syncs
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import aiohttp
+from aiohttp import BasicAuth, ClientSession, ClientTimeout, TraceConfig
+
+
+@dataclass
+class SessionPoolSettings:
+    """Connection pool tuning shared by all pooled sessions"""
+    total_connection_limit: int = 100
+    default_per_host_limit: int = 10
+    dns_cache_ttl_seconds: int = 300
+    keepalive_timeout_seconds: float = 30.0
+    total_timeout_seconds: float = 30.0
+    connect_timeout_seconds: float = 10.0
+    shutdown_grace_seconds: float = 0.25
+
+
+@dataclass
+class PoolMetrics:
+    """Connection reuse and wait statistics for one pooled session"""
+    leases: int = 0
+    active_leases: int = 0
+    requests: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    queued_waits: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+    @property
+    def reuse_ratio(self) -> float:
+        acquired = self.connections_created + self.connections_reused
+        return self.connections_reused / acquired if acquired else 0.0
+
+    @property
+    def average_wait_ms(self) -> float:
+        return (self.total_wait_seconds / self.queued_waits * 1000) if self.queued_waits else 0.0
+
+
+# (integration type, base URL, credential fingerprint or '' without a credential id)
+PoolKey = Tuple[str, str, str]
+
+
+@dataclass
+class _PooledSession:
+    key: PoolKey
+    session: ClientSession
+    connector: aiohttp.TCPConnector
+    loop: asyncio.AbstractEventLoop
+    metrics: PoolMetrics
+    fingerprint: str = ""
+    retired: bool = False
+
+
+class HTTPSessionPool:
+    """
+    Pool of persistent aiohttp sessions keyed by integration, base URL and credential.
+
+    Sessions keep connections alive, cache DNS lookups and cap concurrent
+    connections per host, so repeated syncs against the same system reuse
+    TCP/TLS connections instead of rebuilding a connector per collection.
+    Callers must hand sessions back with ``release`` instead of closing them.
+    """
+
+    def __init__(self, settings: Optional[SessionPoolSettings] = None):
+        self.settings = settings or SessionPoolSettings()
+        self.logger = logging.getLogger(__name__)
+        self._sessions: Dict[PoolKey, _PooledSession] = {}
+        self._by_session_id: Dict[int, _PooledSession] = {}
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    def credential_fingerprint(*parts: Any) -> str:
+        """Stable, non-reversible identifier for a credential set"""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(repr(part).encode())
+            digest.update(b"\x00")
+        return digest.hexdigest()[:16]
+
+    async def get_session(self, integration_type: str, base_url: str,
+                          headers: Optional[Mapping[str, str]] = None,
+                          auth: Optional[BasicAuth] = None,
+                          credential_id: Optional[str] = None,
+                          per_host_limit: Optional[int] = None) -> ClientSession:
+        """
+        Lease the pooled session for an integration endpoint
+
+        Args:
+            integration_type: Integration family, e.g. 'hms:medtech' or 'government:pmjay'
+            base_url: Base URL the session talks to
+            headers: Default headers; refreshed in place when tokens rotate
+            auth: Optional basic auth bound to the session
+            credential_id: Stable, non-secret identity of the credential (tenant, partner,
+                auth scheme); never the secret itself. Sessions are keyed on it, rotated
+                header secrets refresh its session in place and changed basic auth
+                replaces it. Without one the endpoint gets a single session, replaced
+                when the headers or auth change
+            per_host_limit: Maximum concurrent connections per host
+
+        Returns:
+            Shared ClientSession; return it with release()
+        """
+        headers = dict(headers or {})
+        if credential_id is None:
+            # Rotated tokens must not leave a session behind per old token
+            fingerprint = self.credential_fingerprint(sorted(headers.items()), auth)
+            key: PoolKey = (integration_type, base_url.rstrip('/'), "")
+        else:
+            # Header secrets are refreshed in place; basic auth is fixed per session
+            fingerprint = self.credential_fingerprint(auth)
+            key = (integration_type, base_url.rstrip('/'), self.credential_fingerprint(credential_id))
+
+        loop = asyncio.get_running_loop()
+        async with self._get_lock(loop):
+            pooled = self._sessions.get(key)
+            if (pooled is None or pooled.session.closed or pooled.loop is not loop
+                    or pooled.fingerprint != fingerprint):
+                if pooled is not None:
+                    self._discard(pooled)
+                pooled = self._create_session(key, fingerprint, headers, auth, per_host_limit, loop)
+            elif headers:
+                # Same credential, possibly a refreshed token or rotated key
+                pooled.session.headers.update(headers)
+
+            pooled.metrics.leases += 1
+            pooled.metrics.active_leases += 1
+            return pooled.session
+
+    def release(self, session: ClientSession) -> None:
+        """Return a leased session to the pool (the session stays open)"""
+        pooled = self._by_session_id.get(id(session))
+        if pooled is None:
+            # Not pooled - preserve the old close-after-use behaviour
+            if not session.closed:
+                asyncio.ensure_future(session.close())
+            return
+        pooled.metrics.active_leases = max(0, pooled.metrics.active_leases - 1)
+        if pooled.retired and not pooled.metrics.active_leases:
+            # Replaced while leased; close it now that the last lease is back
+            self._by_session_id.pop(id(session), None)
+            if not session.closed:
+                asyncio.ensure_future(session.close())
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Pool metrics: open connections, reuse ratio and connection wait time"""
+        pools = []
+        totals = PoolMetrics()
+        open_connections = 0
+
+        for (integration_type, base_url, _), pooled in self._sessions.items():
+            metrics = pooled.metrics
+            open_count = self._open_connections(pooled.connector)
+            open_connections += open_count
+
+            totals.leases += metrics.leases
+            totals.active_leases += metrics.active_leases
+            totals.requests += metrics.requests
+            totals.connections_created += metrics.connections_created
+            totals.connections_reused += metrics.connections_reused
+            totals.queued_waits += metrics.queued_waits
+            totals.total_wait_seconds += metrics.total_wait_seconds
+            totals.max_wait_seconds = max(totals.max_wait_seconds, metrics.max_wait_seconds)
+
+            pools.append({
+                "integration_type": integration_type,
+                "base_url": base_url,
+                "open_connections": open_count,
+                "per_host_limit": pooled.connector.limit_per_host,
+                "leases": metrics.leases,
+                "active_leases": metrics.active_leases,
+                "requests": metrics.requests,
+                "connections_created": metrics.connections_created,
+                "connections_reused": metrics.connections_reused,
+                "reuse_ratio": round(metrics.reuse_ratio, 4),
+                "queued_waits": metrics.queued_waits,
+                "average_wait_ms": round(metrics.average_wait_ms, 3),
+                "max_wait_ms": round(metrics.max_wait_seconds * 1000, 3),
+                "created_at": metrics.created_at.isoformat()
+            })
+
+        return {
+            "pool_count": len(pools),
+            "open_connections": open_connections,
+            "requests": totals.requests,
+            "reuse_ratio": round(totals.reuse_ratio, 4),
+            "average_wait_ms": round(totals.average_wait_ms, 3),
+            "max_wait_ms": round(totals.max_wait_seconds * 1000, 3),
+            "pools": pools
+        }
+
+    async def close(self) -> None:
+        """Gracefully close every pooled session"""
+        pooled_sessions = list({id(pooled): pooled for pooled in
+                                [*self._sessions.values(), *self._by_session_id.values()]}.values())
+        self._sessions.clear()
+        self._by_session_id.clear()
+
+        for pooled in pooled_sessions:
+            if pooled.metrics.active_leases:
+                self.logger.warning(
+                    f"Closing {pooled.key[0]} session with {pooled.metrics.active_leases} active leases"
+                )
+            if not pooled.session.closed:
+                await pooled.session.close()
+
+        if pooled_sessions:
+            # Give SSL transports time to close cleanly
+            await asyncio.sleep(self.settings.shutdown_grace_seconds)
+            self.logger.info(f"Closed {len(pooled_sessions)} pooled HTTP sessions")
+
+    def _get_lock(self, loop: asyncio.AbstractEventLoop) -> asyncio.Lock:
+        """asyncio.Lock bound to the running loop"""
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _create_session(self, key: PoolKey, fingerprint: str, headers: Dict[str, str],
+                        auth: Optional[BasicAuth], per_host_limit: Optional[int],
+                        loop: asyncio.AbstractEventLoop) -> _PooledSession:
+        """Create a keep-alive session with DNS caching and per-host limits"""
+        settings = self.settings
+        metrics = PoolMetrics()
+
+        connector = aiohttp.TCPConnector(
+            limit=settings.total_connection_limit,
+            limit_per_host=per_host_limit or settings.default_per_host_limit,
+            use_dns_cache=True,
+            ttl_dns_cache=settings.dns_cache_ttl_seconds,
+            keepalive_timeout=settings.keepalive_timeout_seconds
+        )
+        session = ClientSession(
+            headers=headers,
+            auth=auth,
+            timeout=ClientTimeout(total=settings.total_timeout_seconds,
+                                  connect=settings.connect_timeout_seconds),
+            connector=connector,
+            trace_configs=[self._build_trace_config(metrics)]
+        )
+
+        pooled = _PooledSession(key=key, session=session, connector=connector,
+                                loop=loop, metrics=metrics, fingerprint=fingerprint)
+        self._sessions[key] = pooled
+        self._by_session_id[id(session)] = pooled
+        self.logger.debug(f"Created pooled HTTP session for {key[0]} at {key[1]}")
+        return pooled
+
+    def _discard(self, pooled: _PooledSession) -> None:
+        """Forget a stale session (closed, replaced credentials, or bound to a finished event loop)"""
+        self._sessions.pop(pooled.key, None)
+        if pooled.metrics.active_leases and not pooled.session.closed and not pooled.loop.is_closed():
+            # Still in use; release() closes it once the last lease is returned
+            pooled.retired = True
+            return
+        self._by_session_id.pop(id(pooled.session), None)
+        if not pooled.session.closed and not pooled.loop.is_closed():
+            asyncio.run_coroutine_threadsafe(pooled.session.close(), pooled.loop)
+
+    @staticmethod
+    def _build_trace_config(metrics: PoolMetrics) -> TraceConfig:
+        """aiohttp trace hooks feeding the pool metrics"""
+        trace_config = TraceConfig()
+
+        async def on_request_start(session, context, params):
+            metrics.requests += 1
+
+        async def on_queued_start(session, context, params):
+            context.queued_at = time.perf_counter()
+
+        async def on_queued_end(session, context, params):
+            waited = time.perf_counter() - getattr(context, 'queued_at', time.perf_counter())
+            metrics.queued_waits += 1
+            metrics.total_wait_seconds += waited
+            metrics.max_wait_seconds = max(metrics.max_wait_seconds, waited)
+
+        async def on_connection_created(session, context, params):
+            metrics.connections_created += 1
+
+        async def on_connection_reused(session, context, params):
+            metrics.connections_reused += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_queued_start.append(on_queued_start)
+        trace_config.on_connection_queued_end.append(on_queued_end)
+        trace_config.on_connection_create_end.append(on_connection_created)
+        trace_config.on_connection_reuseconn.append(on_connection_reused)
+        return trace_config
+
+    @staticmethod
+    def _open_connections(connector: aiohttp.TCPConnector) -> int:
+        """Idle keep-alive plus in-use connections held by a connector"""
+        idle = sum(len(conns) for conns in getattr(connector, '_conns', {}).values())
+        acquired = len(getattr(connector, '_acquired', ()))
+        return idle + acquired
+
+
+# Global session pool shared by all integrators
+_session_pool: Optional[HTTPSessionPool] = None
+
+
+def get_session_pool(settings: Optional[SessionPoolSettings] = None) -> HTTPSessionPool:
+    """Get or create the global HTTP session pool"""
+    global _session_pool
+
+    if _session_pool is None:
+        _session_pool = HTTPSessionPool(settings)
+
+    return _session_pool
+
+
+async def shutdown_session_pool() -> None:
+    """Close all pooled sessions and drop the global pool"""
+    global _session_pool
+
+    if _session_pool is not None:
+        await _session_pool.close()
+        _session_pool = None
@@ -21,6 +21,8 @@ from .survey_data_collector import RealSurveyDataCollector, SurveyChannel
 from .partner_network_integrator import PartnerNetworkDataIntegrator, PartnerType
 from .third_party_analytics_integrator import ThirdPartyAnalyticsIntegrator, AnalyticsPlatform
 from .data_quality_validator import DataQualityValidator, DataSource, ValidationSeverity
+from .http_session_pool import get_session_pool
+from .integration_scheduler import IntegrationScheduler, PoolSettings
 
 from ...models.hospital_benchmarks import (
  Hospital, CityTier, HospitalType, SpecialtyType
@@ -88,6 +90,35 @@ class IntegrationPlan:
  consolidated_data: Optional[Dict[str, Any]] = None
 
 
+# Scheduler pool per integration method, with defaults sized to each
+# source's typical rate limits and response times
+SCHEDULER_POOLS = {
+ "hms_api": "hms",
+ "government_api": "government",
+ "partner_network": "partner",
+ "survey_collection": "survey",
+ "analytics_platforms": "analytics"
+}
+
+DEFAULT_POOL_SETTINGS = {
+ "hms": PoolSettings(initial_limit=4, max_limit=16, latency_target_seconds=30.0),
+ "government": PoolSettings(initial_limit=2, max_limit=8, latency_target_seconds=60.0),
+ "partner": PoolSettings(initial_limit=4, max_limit=8, latency_target_seconds=60.0),
+ "survey": PoolSettings(initial_limit=8, max_limit=32, latency_target_seconds=30.0),
+ "analytics": PoolSettings(initial_limit=2, max_limit=6, latency_target_seconds=120.0)
+}
+
+PRIORITY_RANK = {
+ IntegrationPriority.CRITICAL: 0,
+ IntegrationPriority.HIGH: 1,
+ IntegrationPriority.MEDIUM: 2,
+ IntegrationPriority.LOW: 3
+}
+
+# Wait before a failed task is queued on its pool again
+TASK_RETRY_DELAY_SECONDS = 5
+
+
 class RealDataIntegrationError(ApplicationError):
  """Real data integration orchestration errors"""
  pass
@@ -100,17 +131,23 @@ class RealDataIntegrationOrchestrator:
  self.config = config
  self.logger = logging.getLogger(__name__)
 
+ # Shared keep-alive HTTP sessions for all API-based integrators
+ self.session_pool = get_session_pool()
+
  # Initialize integration services
- self.hms_integrator = HMSAPIIntegrator(config)
- self.government_integrator = GovernmentDataIntegrator(config)
+ self.hms_integrator = HMSAPIIntegrator(config, self.session_pool)
+ self.government_integrator = GovernmentDataIntegrator(config, self.session_pool)
  self.survey_collector = RealSurveyDataCollector(config)
- self.partner_integrator = PartnerNetworkDataIntegrator(config)
+ self.partner_integrator = PartnerNetworkDataIntegrator(config, self.session_pool)
  self.analytics_integrator = ThirdPartyAnalyticsIntegrator(config)
  self.quality_validator = DataQualityValidator(config)
 
  # Active integration plans
  self.active_plans: Dict[str, IntegrationPlan] = {}
 
+ # Adaptive per-source task scheduler, created on first use
+ self._integration_scheduler: Optional[IntegrationScheduler] = None
+
  # Integration analytics
  self.integration_analytics = {
  "total_hospitals_processed": 0,
@@ -256,28 +293,28 @@ class RealDataIntegrationOrchestrator:
  try:
  plan.overall_status = "running"
 
- # Execute tasks by priority order
- priority_order = [
- IntegrationPriority.CRITICAL,
- IntegrationPriority.HIGH, 
- IntegrationPriority.MEDIUM,
- IntegrationPriority.LOW
- ]
-
- for priority in priority_order:
- priority_tasks = [t for t in plan.integration_tasks if t.priority == priority]
-
- if priority_tasks:
- self.logger.info(f"Executing {len(priority_tasks)} {priority.value} priority tasks")
+ # Queue every task on its source's pool; higher priorities are
+ # dequeued first, but no task waits for a whole priority level
+ scheduler = self._get_integration_scheduler()
 
- # Execute priority tasks in parallel
- task_results = await asyncio.gather(
- *[self._execute_integration_task(task) for task in priority_tasks],
- return_exceptions=True
+ async def run_task(task: IntegrationTask):
+ try:
+ # Retries are queued again by the scheduler, outside the pool slot
+ return task, await scheduler.run(
+ SCHEDULER_POOLS.get(task.integration_method, task.integration_method),
+ PRIORITY_RANK[task.priority],
+ lambda: self._execute_integration_task(task),
+ max_retries=task.max_retries,
+ retry_delay_seconds=TASK_RETRY_DELAY_SECONDS
  )
+ except Exception as e:
+ return task, e
 
- # Process results
- for task, result in zip(priority_tasks, task_results):
+ self.logger.info(f"Scheduling {len(plan.integration_tasks)} integration tasks for plan {plan_id}")
+
+ # Process results as tasks complete
+ for finished in asyncio.as_completed([run_task(task) for task in plan.integration_tasks]):
+ task, result = await finished
  if isinstance(result, Exception):
  self.logger.error(f"Task {task.task_id} failed: {str(result)}")
  task.status = "failed"
@@ -390,7 +427,7 @@ class RealDataIntegrationOrchestrator:
  return available_methods
 
  async def _execute_integration_task(self, task: IntegrationTask) -> Dict[str, Any]:
- """Execute individual integration task"""
+ """Execute one attempt of an integration task; the scheduler runs the retries"""
 
  task.status = "running"
 
@@ -428,9 +465,8 @@ class RealDataIntegrationOrchestrator:
 
  if task.retry_count <= task.max_retries:
  self.logger.warning(f"Task {task.task_id} failed, retrying ({task.retry_count}/{task.max_retries}): {str(e)}")
- # Schedule retry
- await asyncio.sleep(5)
- return await self._execute_integration_task(task)
+ task.status = "retrying"
+ raise
  else:
  self.logger.error(f"Task {task.task_id} failed permanently: {str(e)}")
  raise RealDataIntegrationError(f"Task execution failed: {str(e)}")
@@ -830,32 +866,21 @@ class RealDataIntegrationOrchestrator:
  }
 
  try:
- # Create integration plans for all hospitals
- plans = []
- for hospital_info in hospital_list:
- plan = await self.create_hospital_integration_plan(hospital_info)
- plans.append(plan)
-
- self.logger.info(f"Created {len(plans)} integration plans for batch processing")
+ scheduler = self._get_integration_scheduler()
+ max_active_plans = max(1, int(self.config.get("integration.scheduler.max_active_plans", 10)))
 
- # Execute plans with controlled concurrency
- semaphore = asyncio.Semaphore(5) # Limit concurrent executions
-
- async def execute_with_semaphore(plan):
- async with semaphore:
- return await self.execute_integration_plan(plan.plan_id)
-
- # Execute all plans
- plan_results = await asyncio.gather(
- *[execute_with_semaphore(plan) for plan in plans],
- return_exceptions=True
- )
+ async def integrate_hospital(hospital_info: Dict[str, Any]):
+ hospital_key = hospital_info.get("hospital_id") or hospital_info.get("hospital_name", "unknown")
+ try:
+ plan = await self.create_hospital_integration_plan(hospital_info)
+ return plan.hospital_id, await self.execute_integration_plan(plan.plan_id)
+ except Exception as e:
+ return hospital_key, e
 
- # Process results
- for plan, result in zip(plans, plan_results):
+ def record_result(hospital_id: str, result: Any) -> None:
  if isinstance(result, Exception):
  batch_results["failed_hospitals"] += 1
- batch_results["hospital_results"][plan.hospital_id] = {
+ batch_results["hospital_results"][hospital_id] = {
  "success": False,
  "error": str(result)
  }
@@ -865,7 +890,25 @@ class RealDataIntegrationOrchestrator:
  else:
  batch_results["failed_hospitals"] += 1
 
- batch_results["hospital_results"][plan.hospital_id] = result
+ batch_results["hospital_results"][hospital_id] = result
+
+ # Plans are created lazily: a hospital is only assessed and planned
+ # once an active plan slot is free and the source pools are not
+ # already backlogged
+ in_progress = set()
+ for hospital_info in hospital_list:
+ while len(in_progress) >= max_active_plans:
+ done, in_progress = await asyncio.wait(in_progress, return_when=asyncio.FIRST_COMPLETED)
+ for finished in done:
+ record_result(*finished.result())
+
+ await scheduler.wait_for_capacity()
+ in_progress.add(asyncio.ensure_future(integrate_hospital(hospital_info)))
+
+ for finished in asyncio.as_completed(in_progress):
+ record_result(*await finished)
+
+ batch_results["scheduler_pools"] = scheduler.stats()
 
  # Calculate batch analytics
  successful_results = [r for r in batch_results["hospital_results"].values() if r.get("success")]
@@ -894,6 +937,17 @@ class RealDataIntegrationOrchestrator:
 
  return batch_results
 
+ def _get_integration_scheduler(self) -> IntegrationScheduler:
+ """Adaptive task scheduler, with pool limits from integration.scheduler.pools.<pool>"""
+
+ if self._integration_scheduler is None:
+ pools = {}
+ for pool_name, defaults in DEFAULT_POOL_SETTINGS.items():
+ overrides = self.config.get(f"integration.scheduler.pools.{pool_name}", {}) or {}
+ pools[pool_name] = PoolSettings(**{**defaults.__dict__, **overrides})
+ self._integration_scheduler = IntegrationScheduler(pools)
+ return self._integration_scheduler
+
  def _analyze_batch_data_sources(self, successful_results: List[Dict[str, Any]]) -> Dict[str, Any]:
  """Analyze data source coverage across batch"""
 
@@ -950,6 +1004,7 @@ class RealDataIntegrationOrchestrator:
  else:
  return {
  "overall_analytics": self.integration_analytics,
+ "connection_pools": self.session_pool.get_metrics(),
  "active_plans": len(self.active_plans),
  "plan_summary": [
  {
@@ -993,4 +1048,11 @@ class RealDataIntegrationOrchestrator:
  "cleaned_plans": len(plans_to_remove),
  "archived_plans": archived_plans,
  "remaining_active_plans": len(self.active_plans)
- }
\ No newline at end of file
+ }
+
+ async def shutdown(self) -> None:
+ """Gracefully close pooled HTTP and SMTP connections and transfer threads"""
+ await self.session_pool.close()
+ self.partner_integrator.shutdown()
+ self.survey_collector.shutdown()
+ self.logger.info("Real data integration orchestrator shut down")
@@ -0,0 +1,204 @@
+"""
+Adaptive Integration Scheduler
+Per-source concurrency pools with priority queues and AIMD limits
+
+Integration tasks are queued on the pool of the source they call (HMS,
+government, partner, survey, analytics). Each pool starts the
+highest-priority queued task whenever it has a free slot, so a slow task
+never holds back unrelated work the way a priority wave barrier does.
+Pool limits adapt with additive-increase/multiplicative-decrease: each
+window of fast, successful tasks raises the limit by one, and errors or
+latency above the pool's target halve it (at most once per observed
+round trip). Retries are queued again as new jobs after a delay, so a
+failing source neither holds its slot while waiting nor hides attempts
+from the limit.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+JobFactory = Callable[[], Awaitable[Any]]
+RetryCallback = Callable[[int, Exception], None]
+
+
+@dataclass
+class PoolSettings:
+    """Concurrency bounds and latency target for one source pool"""
+    initial_limit: int = 4
+    min_limit: int = 1
+    max_limit: int = 16
+    latency_target_seconds: float = 30.0
+    decrease_factor: float = 0.5
+
+
+class AIMDLimit:
+    """Concurrency limit adjusted from observed latency and errors"""
+
+    SMOOTHING = 0.2
+
+    def __init__(self, settings: PoolSettings):
+        self.settings = settings
+        self.min_limit = max(1, settings.min_limit)
+        self.max_limit = max(self.min_limit, settings.max_limit)
+        self.limit = float(min(max(settings.initial_limit, self.min_limit), self.max_limit))
+        self.in_flight = 0
+        self.latency_ewma: Optional[float] = None
+        self.error_rate = 0.0
+        self._last_decrease = float("-inf")
+
+    @property
+    def available(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    def record(self, latency_seconds: float, success: bool) -> None:
+        alpha = self.SMOOTHING
+        if self.latency_ewma is None:
+            self.latency_ewma = latency_seconds
+        else:
+            self.latency_ewma += alpha * (latency_seconds - self.latency_ewma)
+        self.error_rate += alpha * ((0.0 if success else 1.0) - self.error_rate)
+
+        if success and latency_seconds <= self.settings.latency_target_seconds:
+            # +1 once a full window of ``limit`` tasks has succeeded
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            return
+
+        # Tasks that were already in flight when we backed off report the
+        # same congestion; only back off once per round trip
+        now = time.monotonic()
+        if now - self._last_decrease >= (self.latency_ewma or 0.0):
+            self.limit = max(self.min_limit, self.limit * self.settings.decrease_factor)
+            self._last_decrease = now
+
+
+class _SourcePool:
+    """Priority queue of jobs waiting for one source's AIMD limit"""
+
+    def __init__(self, name: str, settings: PoolSettings):
+        self.name = name
+        self.limit = AIMDLimit(settings)
+        self.queue: List[Tuple[int, int, JobFactory, asyncio.Future]] = []
+        self.completed = 0
+        self.failed = 0
+
+    def stats(self) -> Dict[str, Any]:
+        limit = self.limit
+        return {
+            "limit": int(limit.limit),
+            "in_flight": limit.in_flight,
+            "queued": len(self.queue),
+            "completed": self.completed,
+            "failed": self.failed,
+            "latency_ewma_seconds": round(limit.latency_ewma, 3) if limit.latency_ewma is not None else None,
+            "error_rate": round(limit.error_rate, 3)
+        }
+
+
+class IntegrationScheduler:
+    """Runs integration jobs on adaptive per-source pools in priority order"""
+
+    def __init__(self, pools: Optional[Mapping[str, PoolSettings]] = None,
+                 default_settings: Optional[PoolSettings] = None):
+        self.default_settings = default_settings or PoolSettings()
+        self._pools: Dict[str, _SourcePool] = {
+            name: _SourcePool(name, settings) for name, settings in (pools or {}).items()
+        }
+        self._sequence = itertools.count()
+        self._running: set = set()
+        self._capacity_waiters: List[asyncio.Future] = []
+
+    async def run(self, pool_name: str, priority: int, job: JobFactory, max_retries: int = 0,
+                  retry_delay_seconds: float = 0.0, on_retry: Optional[RetryCallback] = None) -> Any:
+        """
+        Queue ``job`` on ``pool_name`` and return its result
+
+        Lower ``priority`` values run first; equal priorities run in
+        submission order. A failed attempt releases its slot and is recorded
+        by the pool's limit; up to ``max_retries`` further attempts are
+        queued after ``retry_delay_seconds``, with ``on_retry(attempt, error)``
+        called before each wait.
+        """
+        pool = self._pool(pool_name)
+        attempt = 0
+        while True:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(pool.queue, (priority, next(self._sequence), job, future))
+            self._pump(pool)
+            try:
+                return await future
+            except Exception as e:
+                attempt += 1
+                if attempt > max_retries:
+                    raise
+                if on_retry is not None:
+                    on_retry(attempt, e)
+                await asyncio.sleep(retry_delay_seconds)
+
+    def backlog(self) -> int:
+        """Jobs queued but not yet started, across all pools"""
+        return sum(len(pool.queue) for pool in self._pools.values())
+
+    def capacity(self) -> int:
+        """Sum of the current pool limits"""
+        return sum(int(pool.limit.limit) for pool in self._pools.values())
+
+    async def wait_for_capacity(self) -> None:
+        """Wait until the backlog is smaller than the pools can currently run"""
+        while self.backlog() >= max(1, self.capacity()):
+            waiter = asyncio.get_running_loop().create_future()
+            self._capacity_waiters.append(waiter)
+            await waiter
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: pool.stats() for name, pool in self._pools.items()}
+
+    def _pool(self, name: str) -> _SourcePool:
+        pool = self._pools.get(name)
+        if pool is None:
+            pool = self._pools[name] = _SourcePool(name, self.default_settings)
+        return pool
+
+    def _pump(self, pool: _SourcePool) -> None:
+        while pool.queue and pool.limit.available:
+            _, _, job, future = heapq.heappop(pool.queue)
+            if future.cancelled():
+                continue
+            pool.limit.in_flight += 1
+            task = asyncio.ensure_future(self._run_job(pool, job, future))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run_job(self, pool: _SourcePool, job: JobFactory, future: asyncio.Future) -> None:
+        started = time.monotonic()
+        success = False
+        try:
+            result = await job()
+            success = True
+            if not future.done():
+                future.set_result(result)
+        except asyncio.CancelledError:
+            if not future.done():
+                future.cancel()
+            raise
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        finally:
+            pool.limit.in_flight -= 1
+            pool.limit.record(time.monotonic() - started, success)
+            if success:
+                pool.completed += 1
+            else:
+                pool.failed += 1
+            self._pump(pool)
+            self._notify_capacity()
+
+    def _notify_capacity(self) -> None:
+        waiters, self._capacity_waiters = self._capacity_waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
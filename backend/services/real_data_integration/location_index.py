@@ -0,0 +1,351 @@
+"""
+Pincode Location Index
+Sorted, memory-mapped pincode lookup for district, state and city tier
+
+The index is compiled from a pincode directory CSV into disjoint pincode
+ranges held in one structured NumPy array. A directory row may name a full
+six-digit pincode or a shorter prefix (postal circle, sorting district), and
+where rows overlap the most specific one wins, so the India Post directory
+can be layered over the bundled prefix table. Lookups bisect the range
+starts: one pincode costs O(log n) and a whole column is one
+``searchsorted``.
+
+The compiled array is cached on disk next to a JSON string table and opened
+with ``mmap_mode="r"``, so every worker on a host shares one page-cache copy.
+"""
+
+import csv
+import hashlib
+import heapq
+import json
+import logging
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT_VERSION = 1
+
+DEFAULT_DIRECTORY_PATH = Path(__file__).parent / "data" / "pincode_directory.csv"
+
+INDEX_DTYPE = np.dtype([
+    ("start", "<u4"),
+    ("end", "<u4"),
+    ("district", "<u2"),
+    ("state", "<u1"),
+    ("tier", "<u1"),
+])
+
+# Accepted header spellings, including the India Post directory export
+DIRECTORY_COLUMNS = {
+    "pincode": ("pincode", "pin_code", "pin"),
+    "district": ("district", "districtname", "district_name"),
+    "state": ("state", "statename", "state_name"),
+    "tier": ("tier", "city_tier"),
+}
+
+STATE_REGIONS = {
+    "delhi": "North", "haryana": "North", "punjab": "North", "chandigarh": "North",
+    "himachal pradesh": "North", "jammu and kashmir": "North", "ladakh": "North",
+    "uttar pradesh": "North", "uttarakhand": "North",
+    "rajasthan": "West", "gujarat": "West", "maharashtra": "West", "goa": "West",
+    "dadra and nagar haveli and daman and diu": "West",
+    "madhya pradesh": "Central", "chhattisgarh": "Central",
+    "telangana": "South", "andhra pradesh": "South", "karnataka": "South",
+    "tamil nadu": "South", "kerala": "South", "puducherry": "South", "lakshadweep": "South",
+    "west bengal": "East", "odisha": "East", "bihar": "East", "jharkhand": "East",
+    "andaman and nicobar islands": "East",
+    "assam": "Northeast", "sikkim": "Northeast", "arunachal pradesh": "Northeast",
+    "meghalaya": "Northeast", "manipur": "Northeast", "mizoram": "Northeast",
+    "nagaland": "Northeast", "tripura": "Northeast",
+}
+
+_PINCODE_PATTERN = re.compile(r"[0-9]{6}")
+_TIER_PATTERN = re.compile(r"(?:tier[_ ]?)?([1-4])", re.IGNORECASE)
+_LOWERCASE_WORDS = {"and", "of"}
+
+
+@dataclass(frozen=True)
+class PincodeLocation:
+    """Location attributes for one pincode range"""
+    state: str
+    region: Optional[str]
+    district: Optional[str]
+    tier: Optional[str]
+
+    def as_enrichment(self) -> Dict[str, str]:
+        """Fields merged into a hospital record by pincode enrichment"""
+        location = {"state": self.state}
+        if self.region:
+            location["region"] = self.region
+        if self.district:
+            location["district"] = self.district
+        return location
+
+
+def parse_pincode(value: Any) -> Optional[int]:
+    """Return ``value`` as an integer pincode if it is exactly six digits"""
+    text = str(value)
+    if _PINCODE_PATTERN.fullmatch(text):
+        return int(text)
+    return None
+
+
+def parse_pincodes(values: Sequence[Any]) -> np.ndarray:
+    """Vectorized ``parse_pincode``; invalid entries become -1"""
+    text = pd.Series(values, dtype=object).astype(str)
+    valid = text.str.fullmatch(_PINCODE_PATTERN.pattern).to_numpy(dtype=bool)
+    codes = np.full(len(text), -1, dtype=np.int64)
+    if valid.any():
+        codes[valid] = text[valid].astype(np.int64).to_numpy()
+    return codes
+
+
+def _display_name(value: str) -> str:
+    """Title-case the upper-case names used by the India Post directory"""
+    value = " ".join(value.split())
+    if not value.isupper():
+        return value
+    words = value.replace("&", "and").lower().split()
+    return " ".join(word if word in _LOWERCASE_WORDS and i else word.capitalize()
+                    for i, word in enumerate(words))
+
+
+def _region_for(state: str) -> Optional[str]:
+    return STATE_REGIONS.get(state.lower().replace("&", "and"))
+
+
+def _tier_code(value: Any) -> int:
+    match = _TIER_PATTERN.fullmatch(str(value or "").strip())
+    return int(match.group(1)) if match else 0
+
+
+class PincodeIndex:
+    """Disjoint pincode ranges searched by bisection"""
+
+    def __init__(self, table: np.ndarray, districts: Sequence[str], states: Sequence[str]):
+        self.table = table
+        self._starts = table["start"]
+        self._ends = table["end"]
+        self.districts = list(districts)
+        self.states = list(states)
+        self._regions = [_region_for(state) if state else None for state in self.states]
+        self._locations: Dict[int, PincodeLocation] = {}
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def lookup(self, pincode: Any) -> Optional[PincodeLocation]:
+        """Location for one pincode, or None if invalid or not covered"""
+        code = parse_pincode(pincode)
+        if code is None:
+            return None
+        row = int(np.searchsorted(self._starts, code, side="right")) - 1
+        if row < 0 or code > self._ends[row]:
+            return None
+        return self._location(row)
+
+    def find_many(self, pincodes: Sequence[Any]) -> np.ndarray:
+        """Range row for each pincode in a column; -1 where not found"""
+        codes = parse_pincodes(pincodes)
+        rows = np.searchsorted(self._starts, np.maximum(codes, 0), side="right") - 1
+        covered = (codes >= 0) & (rows >= 0)
+        covered[covered] = codes[covered] <= self._ends[rows[covered]]
+        return np.where(covered, rows, -1)
+
+    def lookup_many(self, pincodes: Sequence[Any]) -> List[Optional[PincodeLocation]]:
+        """``lookup`` for a whole column at once"""
+        rows = self.find_many(pincodes)
+        unique_rows, inverse = np.unique(rows, return_inverse=True)
+        resolved = [self._location(int(row)) if row >= 0 else None for row in unique_rows]
+        return [resolved[i] for i in inverse.ravel()]
+
+    def _location(self, row: int) -> PincodeLocation:
+        location = self._locations.get(row)
+        if location is None:
+            entry = self.table[row]
+            state_code = int(entry["state"])
+            tier = int(entry["tier"])
+            location = self._locations[row] = PincodeLocation(
+                state=self.states[state_code],
+                region=self._regions[state_code],
+                district=self.districts[int(entry["district"])] or None,
+                tier=str(tier) if tier else None,
+            )
+        return location
+
+    @classmethod
+    def build(cls, rows: Iterable[Mapping[str, Any]]) -> "PincodeIndex":
+        """
+        Compile directory rows into disjoint ranges
+
+        Each row needs ``pincode`` (six digits or a shorter prefix) and
+        ``state``; ``district`` and ``tier`` are optional. Narrower rows
+        override wider ones, and earlier rows win ties.
+        """
+        districts: Dict[str, int] = {"": 0}
+        states: Dict[str, int] = {"": 0}
+        entries = []
+        for order, row in enumerate(rows):
+            prefix = str(row.get("pincode") or "").strip()
+            state = _display_name(str(row.get("state") or ""))
+            if not (prefix.isascii() and prefix.isdigit() and len(prefix) <= 6) or not state:
+                continue
+            span = 10 ** (6 - len(prefix))
+            start = int(prefix) * span
+            district = _display_name(str(row.get("district") or ""))
+            attributes = (
+                districts.setdefault(district, len(districts)),
+                states.setdefault(state, len(states)),
+                _tier_code(row.get("tier")),
+            )
+            entries.append((start, start + span - 1, span, order, attributes))
+
+        if len(districts) > np.iinfo(INDEX_DTYPE["district"]).max + 1 or \
+                len(states) > np.iinfo(INDEX_DTYPE["state"]).max + 1:
+            raise ValueError("Pincode directory has too many distinct districts or states")
+
+        entries.sort(key=lambda entry: entry[0])
+        bounds = sorted({entry[0] for entry in entries} | {entry[1] + 1 for entry in entries})
+        segments: List[List[Any]] = []
+        active: List[Any] = []
+        position = 0
+        for low, next_low in zip(bounds, bounds[1:]):
+            while position < len(entries) and entries[position][0] <= low:
+                start, end, span, order, attributes = entries[position]
+                heapq.heappush(active, (span, order, end, attributes))
+                position += 1
+            while active and active[0][2] < low:
+                heapq.heappop(active)
+            if not active:
+                continue
+            attributes = active[0][3]
+            if segments and segments[-1][1] == low - 1 and segments[-1][2] == attributes:
+                segments[-1][1] = next_low - 1
+            else:
+                segments.append([low, next_low - 1, attributes])
+
+        table = np.empty(len(segments), dtype=INDEX_DTYPE)
+        for i, (start, end, (district, state, tier)) in enumerate(segments):
+            table[i] = (start, end, district, state, tier)
+        return cls(table, list(districts), list(states))
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the table and its string sidecar atomically"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        metadata = {"version": INDEX_FORMAT_VERSION, "districts": self.districts, "states": self.states}
+        # The sidecar goes first so a reader never opens a table without it
+        for target, write in ((path.with_suffix(".json"), lambda f: f.write(json.dumps(metadata).encode())),
+                              (path, lambda f: np.save(f, np.ascontiguousarray(self.table)))):
+            descriptor, temporary = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+            try:
+                with os.fdopen(descriptor, "wb") as handle:
+                    write(handle)
+                os.replace(temporary, target)
+            except BaseException:
+                Path(temporary).unlink(missing_ok=True)
+                raise
+
+    @classmethod
+    def open(cls, path: Union[str, Path], mmap: bool = True) -> "PincodeIndex":
+        """Open a saved index, memory-mapped by default"""
+        path = Path(path)
+        metadata = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+        if metadata.get("version") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported pincode index version in {path}")
+        table = np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False)
+        if table.dtype != INDEX_DTYPE:
+            raise ValueError(f"Unexpected pincode index layout in {path}")
+        return cls(table, metadata["districts"], metadata["states"])
+
+
+def read_pincode_directory(path: Union[str, Path]) -> List[Dict[str, str]]:
+    """Read a directory CSV into rows keyed by the ``DIRECTORY_COLUMNS`` names"""
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        reader = csv.DictReader(handle)
+        headers = {name.strip().lower(): name for name in reader.fieldnames or []}
+        columns = {
+            key: next((headers[alias] for alias in aliases if alias in headers), None)
+            for key, aliases in DIRECTORY_COLUMNS.items()
+        }
+        if columns["pincode"] is None or columns["state"] is None:
+            raise ValueError(f"Pincode directory {path} needs pincode and state columns")
+        return [
+            {key: (row.get(column) or "").strip() for key, column in columns.items() if column}
+            for row in reader
+        ]
+
+
+def load_pincode_index(directory_paths: Optional[Sequence[Union[str, Path]]] = None,
+                       cache_dir: Optional[Union[str, Path]] = None) -> PincodeIndex:
+    """
+    Return the index for ``directory_paths``, compiling it once per host
+
+    Later directories take precedence over earlier ones at equal
+    specificity. The compiled table is cached under ``cache_dir`` (the
+    system temp directory by default) keyed by the directories' contents;
+    if the cache cannot be written the index is kept in memory instead.
+    """
+    paths = tuple(str(Path(path).resolve()) for path in (directory_paths or [DEFAULT_DIRECTORY_PATH]))
+    return _load_cached(paths, str(cache_dir) if cache_dir else None)
+
+
+@lru_cache(maxsize=8)
+def _load_cached(paths: tuple, cache_dir: Optional[str]) -> PincodeIndex:
+    digest = hashlib.sha1(str(INDEX_FORMAT_VERSION).encode())
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    cache_root = Path(cache_dir) if cache_dir else Path(tempfile.gettempdir()) / "vertical-light"
+    index_path = cache_root / f"pincode_index-{digest.hexdigest()[:16]}.npy"
+
+    if index_path.exists():
+        try:
+            return PincodeIndex.open(index_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Rebuilding unreadable pincode index {index_path}: {str(e)}")
+
+    rows: List[Dict[str, str]] = []
+    for path in reversed(paths):
+        rows.extend(read_pincode_directory(path))
+    index = PincodeIndex.build(rows)
+    try:
+        index.save(index_path)
+        return PincodeIndex.open(index_path)
+    except OSError as e:
+        logger.warning(f"Could not cache pincode index at {index_path}: {str(e)}")
+        return index
+
+
+class NormalizedLookup:
+    """
+    Case- and whitespace-insensitive mapping lookup
+
+    Keys are normalized once up front, and each raw value's result is
+    memoized, so repeated values (the common case for cities, hospital
+    types and specialties) cost a single dict probe.
+    """
+
+    MAX_MEMO_SIZE = 65536
+
+    def __init__(self, mapping: Mapping[str, str]):
+        self._mapping = {key.lower().strip(): value for key, value in mapping.items()}
+        self._memo: Dict[Any, Optional[str]] = {}
+
+    def get(self, raw: Any, default: Any = None) -> Any:
+        try:
+            result = self._memo[raw]
+        except KeyError:
+            result = self._mapping.get(raw.lower().strip())
+            if len(self._memo) >= self.MAX_MEMO_SIZE:
+                self._memo.clear()
+            self._memo[raw] = result
+        return default if result is None else result
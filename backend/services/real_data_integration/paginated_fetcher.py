@@ -0,0 +1,94 @@
+"""
+Concurrent Page Prefetching for Paginated APIs
+Bounded-window page prefetch that yields records as an async stream
+"""
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, List, Optional, Tuple
+
+# Returns the records on a page, or None when the page could not be fetched
+PageFetcher = Callable[[int], Awaitable[Optional[List[Any]]]]
+
+
+@dataclass
+class PaginationStats:
+    """Counters for one paginated fetch"""
+    pages_requested: int = 0
+    pages_consumed: int = 0
+    pages_discarded: int = 0
+    records: int = 0
+
+
+class PaginatedFetcher:
+    """
+    Prefetch up to ``prefetch_pages`` pages concurrently and stream their records in order.
+
+    The total page count is unknown up front, so pages are requested
+    speculatively within the window. Iteration stops at the first empty,
+    failed (None) or short page; requests already in flight past that point
+    are cancelled and counted as discarded.
+    """
+
+    def __init__(self, fetch_page: PageFetcher, page_size: int, prefetch_pages: int = 4,
+                 start_page: int = 1, max_pages: Optional[int] = None):
+        if page_size < 1:
+            raise ValueError("page_size must be positive")
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.prefetch_pages = max(1, prefetch_pages)
+        self.start_page = start_page
+        self.max_pages = max_pages
+        self.stats = PaginationStats()
+        self.logger = logging.getLogger(__name__)
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self.records()
+
+    async def records(self) -> AsyncIterator[Any]:
+        """Yield individual records across all pages"""
+        async for page in self.pages():
+            for record in page:
+                yield record
+
+    async def pages(self) -> AsyncIterator[List[Any]]:
+        """Yield pages in order while keeping the prefetch window full"""
+        pending: Deque[Tuple[int, asyncio.Task]] = deque()
+        next_page = self.start_page
+        last_page = None if self.max_pages is None else self.start_page + self.max_pages - 1
+
+        def fill_window():
+            nonlocal next_page
+            while len(pending) < self.prefetch_pages and (last_page is None or next_page <= last_page):
+                pending.append((next_page, asyncio.ensure_future(self.fetch_page(next_page))))
+                self.stats.pages_requested += 1
+                next_page += 1
+
+        try:
+            fill_window()
+            while pending:
+                page_number, task = pending.popleft()
+                page = await task
+
+                if not page:
+                    if page is None:
+                        self.logger.warning(f"Stopping pagination: page {page_number} could not be fetched")
+                    break
+
+                self.stats.pages_consumed += 1
+                self.stats.records += len(page)
+                yield page
+
+                if len(page) < self.page_size:
+                    break
+                fill_window()
+        finally:
+            # Cancel speculative requests beyond the last page
+            leftovers = [task for _, task in pending]
+            self.stats.pages_discarded += len(leftovers)
+            for task in leftovers:
+                task.cancel()
+            if leftovers:
+                await asyncio.gather(*leftovers, return_exceptions=True)
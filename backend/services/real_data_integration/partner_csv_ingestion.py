@@ -0,0 +1,131 @@
+"""
+Chunked CSV Ingestion for Partner Network Files
+Typed, column-pruned, bounded-memory reading of partner CSV exports
+"""
+
+import logging
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+HOSPITAL_ID_COLUMN = "hospital_id"
+
+
+@dataclass
+class CSVIngestionPlan:
+    """
+    Columns and dtypes to read from a partner CSV file
+
+    ``columns`` is the set of header names the partner mapping can use; a
+    mapping path such as ``census.occupancy_percentage`` matches either a
+    flat ``census.occupancy_percentage`` column or a ``census`` column.
+    An empty ``columns`` set reads every column.
+    """
+    columns: Set[str] = field(default_factory=set)
+    dtypes: Dict[str, str] = field(default_factory=dict)
+    chunk_size: int = 50000
+
+    @classmethod
+    def from_mapping(cls, mapping: Mapping[str, str], chunk_size: int = 50000,
+                     numeric_dtype: str = "float64",
+                     dtype_overrides: Optional[Mapping[str, str]] = None) -> "CSVIngestionPlan":
+        """Build a plan from a partner field mapping (standard field -> partner path)"""
+        columns = {HOSPITAL_ID_COLUMN}
+        dtypes = {HOSPITAL_ID_COLUMN: "str"}
+        for partner_path in mapping.values():
+            columns.add(partner_path)
+            columns.add(partner_path.split('.', 1)[0])
+            dtypes[partner_path] = numeric_dtype
+        dtypes.update(dtype_overrides or {})
+        return cls(columns=columns, dtypes=dtypes, chunk_size=chunk_size)
+
+    def usecols(self):
+        """Column selector for ``pd.read_csv`` (tolerates columns missing from the file)"""
+        if not self.columns:
+            return None
+        columns = self.columns
+        return lambda column: column in columns
+
+
+def iter_csv_chunks(file_path: Union[str, BinaryIO], plan: Optional[CSVIngestionPlan] = None,
+                    hospitals: Optional[Iterable[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Yield typed DataFrame chunks, filtered to ``hospitals`` when given
+
+    Columns the file lacks are ignored. If a mapped column cannot be
+    parsed with its declared dtype the remaining chunks are read with only
+    the hospital id typed, so one malformed numeric column does not drop
+    the file.
+    """
+    plan = plan or CSVIngestionPlan()
+    hospital_set = set(hospitals) if hospitals is not None else None
+    chunks_read = 0
+
+    try:
+        for chunks_read, chunk in enumerate(_read_chunks(file_path, plan, plan.dtypes, hospital_set), 1):
+            yield chunk
+    except (ValueError, TypeError) as e:
+        if not isinstance(file_path, (str, os.PathLike)):
+            # A transfer stream cannot be re-read
+            raise
+        logger.warning(f"Typed read of {file_path} failed ({e}); retrying with inferred dtypes")
+        fallback = {column: dtype for column, dtype in plan.dtypes.items() if column == HOSPITAL_ID_COLUMN}
+        for index, chunk in enumerate(_read_chunks(file_path, plan, fallback, hospital_set)):
+            if index >= chunks_read:
+                yield chunk
+
+
+def _read_chunks(file_path: Union[str, BinaryIO], plan: CSVIngestionPlan, dtypes: Dict[str, str],
+                 hospital_set: Optional[Set[str]]) -> Iterator[pd.DataFrame]:
+    reader = pd.read_csv(
+        file_path,
+        usecols=plan.usecols(),
+        dtype=dtypes or None,
+        chunksize=plan.chunk_size
+    )
+    with reader:
+        for chunk in reader:
+            if hospital_set is not None and HOSPITAL_ID_COLUMN in chunk.columns:
+                chunk = chunk[chunk[HOSPITAL_ID_COLUMN].isin(hospital_set)]
+            if len(chunk):
+                yield chunk
+
+
+def _chunk_records(chunk: pd.DataFrame) -> Iterator[Dict[str, Any]]:
+    columns: List[str] = list(chunk.columns)
+    for values in chunk.itertuples(index=False, name=None):
+        yield {
+            column: (None if isinstance(value, float) and math.isnan(value) else value)
+            for column, value in zip(columns, values)
+        }
+
+
+def iter_csv_records(file_path: Union[str, BinaryIO], plan: Optional[CSVIngestionPlan] = None,
+                     hospitals: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Yield one dict per row via ``itertuples``; missing values become None"""
+    for chunk in iter_csv_chunks(file_path, plan, hospitals):
+        yield from _chunk_records(chunk)
+
+
+def read_latest_by_hospital(file_path: Union[str, BinaryIO], plan: Optional[CSVIngestionPlan] = None,
+                            hospitals: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Last row per hospital id, keyed by hospital id
+
+    Each chunk is de-duplicated before any row becomes a dict, so memory
+    grows with the number of hospitals rather than the size of the export.
+    Rows without a hospital id are kept under ``unknown_<n>`` keys.
+    """
+    latest: Dict[str, Dict[str, Any]] = {}
+    for chunk in iter_csv_chunks(file_path, plan, hospitals):
+        if HOSPITAL_ID_COLUMN in chunk.columns:
+            hospital_ids = chunk[HOSPITAL_ID_COLUMN]
+            chunk = chunk[~hospital_ids.duplicated(keep="last") | hospital_ids.isna()]
+        for record in _chunk_records(chunk):
+            latest[record.get(HOSPITAL_ID_COLUMN) or f"unknown_{len(latest)}"] = record
+    return latest
@@ -0,0 +1,431 @@
+"""
+Partner File Transfer
+Non-blocking, parallel FTP/SFTP downloads with incremental sync manifests
+
+Blocking ftplib/paramiko calls run on a dedicated thread pool, so the event
+loop stays responsive during transfers. Up to ``max_parallel`` files are
+transferred at once, each over its own connection, and every file is parsed
+directly from the transfer stream instead of being written to disk first.
+A per-partner manifest of remote size/mtime lets unchanged files skip the
+download and parse; their last parsed payload is served from the manifest.
+"""
+
+import asyncio
+import ftplib
+import hashlib
+import json
+import logging
+import os
+import posixpath
+import queue
+import stat
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RemoteFile:
+    """A file listed on a partner's FTP/SFTP server"""
+    name: str
+    path: str
+    size: Optional[int] = None
+    mtime: Optional[float] = None
+
+
+@dataclass
+class TransferResult:
+    """Outcome of one partner file sync"""
+    parsed: Dict[str, Any] = field(default_factory=dict)
+    downloaded: List[RemoteFile] = field(default_factory=list)
+    # Unchanged files; their payloads in ``parsed`` come from the manifest
+    skipped: List[RemoteFile] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    duration_seconds: float = 0.0
+
+    @property
+    def bytes_transferred(self) -> int:
+        return sum(remote.size or 0 for remote in self.downloaded)
+
+
+def _json_default(value: Any) -> Any:
+    """Serialise numpy scalars and timestamps found in parsed partner files"""
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class TransferManifest:
+    """
+    Persisted size/mtime and parsed payload of remote files already synced
+
+    Payloads are stored as JSON in a ``<manifest>.payloads`` directory next
+    to the manifest. ``parse_key`` identifies how a payload was parsed (for
+    example the hospital filter); a file recorded under a different key, or
+    whose payload is missing, counts as changed.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.payload_dir = self.path.with_name(self.path.stem + ".payloads")
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable transfer manifest {self.path}: {e}")
+
+    def is_unchanged(self, remote: RemoteFile, parse_key: str = "") -> bool:
+        """True when the remote file matches the size and mtime recorded at the last sync"""
+        entry = self._entries.get(remote.path)
+        if entry is None or remote.size is None or remote.mtime is None:
+            return False
+        return (entry.get("size") == remote.size and entry.get("mtime") == remote.mtime
+                and entry.get("parse_key", "") == parse_key and self._payload_path(remote).exists())
+
+    def load_payload(self, remote: RemoteFile) -> Any:
+        """Parsed payload stored when ``remote`` was last downloaded"""
+        with open(self._payload_path(remote), 'r') as f:
+            return json.load(f)
+
+    def record(self, remote: RemoteFile, payload: Any, parse_key: str = "") -> None:
+        """Store the parsed payload of a downloaded file and its size/mtime"""
+        payload_path = self._payload_path(remote)
+        payload_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = payload_path.with_suffix(".tmp")
+        with open(temp_path, 'w') as f:
+            json.dump(payload, f, default=_json_default)
+        os.replace(temp_path, payload_path)
+
+        self._entries[remote.path] = {
+            "size": remote.size,
+            "mtime": remote.mtime,
+            "parse_key": parse_key,
+            "synced_at": datetime.utcnow().isoformat()
+        }
+
+    def _payload_path(self, remote: RemoteFile) -> Path:
+        return self.payload_dir / f"{hashlib.sha1(remote.path.encode()).hexdigest()}.json"
+
+    def save(self) -> None:
+        """Write the manifest atomically"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(temp_path, 'w') as f:
+            json.dump(self._entries, f, indent=2)
+        os.replace(temp_path, self.path)
+
+
+class RemoteFileClient(ABC):
+    """Blocking remote file client; one instance is used by one thread at a time"""
+
+    @abstractmethod
+    def connect(self) -> None:
+        ...
+
+    @abstractmethod
+    def list_files(self, remote_path: str) -> List[RemoteFile]:
+        ...
+
+    @abstractmethod
+    def open_stream(self, remote: RemoteFile):
+        """Context manager yielding a binary stream of the remote file"""
+
+    @abstractmethod
+    def close(self) -> None:
+        ...
+
+
+def _join(remote_path: str, name: str) -> str:
+    return posixpath.join(remote_path, name) if remote_path else name
+
+
+def _parse_ftp_timestamp(value: Optional[str]) -> Optional[float]:
+    """Parse an MLSD/MDTM 'YYYYMMDDHHMMSS[.sss]' UTC timestamp"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.strptime(value[:14], "%Y%m%d%H%M%S")
+    except ValueError:
+        return None
+    return parsed.replace(tzinfo=timezone.utc).timestamp()
+
+
+class FTPFileClient(RemoteFileClient):
+    """ftplib client streaming files over a raw data connection"""
+
+    def __init__(self, host: str, port: int = 21, username: str = "", password: str = "",
+                 timeout: float = 60.0):
+        self.host = host
+        self.port = int(port)
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self._ftp: Optional[ftplib.FTP] = None
+
+    def connect(self) -> None:
+        self._ftp = ftplib.FTP()
+        self._ftp.connect(self.host, self.port, timeout=self.timeout)
+        self._ftp.login(self.username, self.password)
+
+    def list_files(self, remote_path: str) -> List[RemoteFile]:
+        try:
+            entries = self._ftp.mlsd(remote_path or "", facts=["type", "size", "modify"])
+            return [
+                RemoteFile(
+                    name=name,
+                    path=_join(remote_path, name),
+                    size=int(facts["size"]) if facts.get("size") else None,
+                    mtime=_parse_ftp_timestamp(facts.get("modify"))
+                )
+                for name, facts in entries
+                if facts.get("type", "file") == "file"
+            ]
+        except ftplib.error_perm:
+            # Server without MLSD: fall back to NLST plus SIZE/MDTM
+            return [self._stat(_join(remote_path, posixpath.basename(name)))
+                    for name in self._ftp.nlst(remote_path or "")]
+
+    def _stat(self, path: str) -> RemoteFile:
+        size = mtime = None
+        try:
+            self._ftp.voidcmd("TYPE I")
+            size = self._ftp.size(path)
+            mtime = _parse_ftp_timestamp(self._ftp.sendcmd(f"MDTM {path}").split()[-1])
+        except ftplib.error_perm:
+            pass
+        return RemoteFile(name=posixpath.basename(path), path=path, size=size, mtime=mtime)
+
+    @contextmanager
+    def open_stream(self, remote: RemoteFile) -> Iterator[BinaryIO]:
+        self._ftp.voidcmd("TYPE I")
+        connection = self._ftp.transfercmd(f"RETR {remote.path}")
+        stream = connection.makefile("rb")
+        try:
+            yield stream
+        finally:
+            stream.close()
+            connection.close()
+            self._ftp.voidresp()
+
+    def close(self) -> None:
+        if self._ftp is not None:
+            try:
+                self._ftp.quit()
+            except ftplib.all_errors:
+                self._ftp.close()
+            self._ftp = None
+
+
+class SFTPFileClient(RemoteFileClient):
+    """paramiko SFTP client with read-ahead prefetching"""
+
+    def __init__(self, host: str, port: int = 22, username: str = "", password: str = "",
+                 timeout: float = 60.0):
+        self.host = host
+        self.port = int(port)
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self._ssh = None
+        self._sftp = None
+
+    def connect(self) -> None:
+        import paramiko
+
+        self._ssh = paramiko.SSHClient()
+        self._ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        self._ssh.connect(self.host, port=self.port, username=self.username,
+                          password=self.password, timeout=self.timeout)
+        self._sftp = self._ssh.open_sftp()
+
+    def list_files(self, remote_path: str) -> List[RemoteFile]:
+        return [
+            RemoteFile(name=attr.filename, path=_join(remote_path, attr.filename),
+                       size=attr.st_size, mtime=attr.st_mtime)
+            for attr in self._sftp.listdir_attr(remote_path or ".")
+            if attr.st_mode is None or stat.S_ISREG(attr.st_mode)
+        ]
+
+    @contextmanager
+    def open_stream(self, remote: RemoteFile) -> Iterator[BinaryIO]:
+        stream = self._sftp.open(remote.path, "rb")
+        try:
+            stream.prefetch(remote.size)
+            yield stream
+        finally:
+            stream.close()
+
+    def close(self) -> None:
+        if self._sftp is not None:
+            self._sftp.close()
+            self._sftp = None
+        if self._ssh is not None:
+            self._ssh.close()
+            self._ssh = None
+
+
+class _ClientPool:
+    """Connected clients reused across transfers; at most one per concurrent transfer"""
+
+    def __init__(self, factory: Callable[[], RemoteFileClient]):
+        self._factory = factory
+        self._idle: "queue.LifoQueue[RemoteFileClient]" = queue.LifoQueue()
+        self._clients: List[RemoteFileClient] = []
+
+    @contextmanager
+    def lease(self) -> Iterator[RemoteFileClient]:
+        try:
+            client = self._idle.get_nowait()
+        except queue.Empty:
+            client = self._factory()
+            client.connect()
+            self._clients.append(client)
+
+        try:
+            yield client
+        except Exception:
+            # The connection state is unknown after a failed transfer
+            self._clients.remove(client)
+            self._close(client)
+            raise
+        self._idle.put(client)
+
+    def close_all(self) -> None:
+        for client in self._clients:
+            self._close(client)
+        self._clients.clear()
+
+    @staticmethod
+    def _close(client: RemoteFileClient) -> None:
+        try:
+            client.close()
+        except Exception as e:
+            logger.debug(f"Error closing remote file client: {e}")
+
+
+class PartnerFileTransfer:
+    """Parallel, incremental, stream-parsing sync of a partner's remote directory"""
+
+    def __init__(self, client_factory: Callable[[], RemoteFileClient], executor: Executor,
+                 max_parallel: int = 4):
+        self.client_factory = client_factory
+        self.executor = executor
+        self.max_parallel = max(1, max_parallel)
+
+    async def sync(self, remote_path: str,
+                   parse: Callable[[BinaryIO, RemoteFile], Any],
+                   select: Optional[Callable[[RemoteFile], bool]] = None,
+                   manifest: Optional[TransferManifest] = None,
+                   parse_key: str = "") -> TransferResult:
+        """
+        Download and parse the selected remote files
+
+        Args:
+            remote_path: Remote directory to sync
+            parse: Called on a transfer thread with the open stream; its return value is collected
+            select: Predicate choosing which listed files to transfer
+            manifest: Incremental sync manifest; unchanged files are not downloaded and
+                their stored payloads are returned instead. It is saved afterwards
+            parse_key: Identifies the parse settings; payloads stored under another key are not reused
+
+        Returns:
+            TransferResult with parsed data for every selected file, keyed by file name in listing order
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        pool = _ClientPool(self.client_factory)
+        result = TransferResult()
+
+        try:
+            listing = await loop.run_in_executor(self.executor, self._list, pool, remote_path)
+
+            selected = [remote for remote in listing if select is None or select(remote)]
+            parsed: Dict[str, Any] = {}
+            if manifest is not None:
+                # Manifest and payload reads are file I/O, so they stay off the loop too
+                cached = await loop.run_in_executor(self.executor, self._load_unchanged,
+                                                    manifest, selected, parse_key)
+                for remote in selected:
+                    if remote.path in cached:
+                        parsed[remote.name] = cached[remote.path]
+                        result.skipped.append(remote)
+            pending = [remote for remote in selected if remote.name not in parsed]
+
+            semaphore = asyncio.Semaphore(self.max_parallel)
+
+            async def transfer(remote: RemoteFile):
+                async with semaphore:
+                    return await loop.run_in_executor(self.executor, self._fetch, pool, remote, parse)
+
+            outcomes = await asyncio.gather(*(transfer(remote) for remote in pending), return_exceptions=True)
+
+            for remote, outcome in zip(pending, outcomes):
+                if isinstance(outcome, BaseException):
+                    logger.error(f"Transfer of {remote.path} failed: {outcome}")
+                    result.failed[remote.name] = str(outcome)
+                    continue
+                parsed[remote.name] = outcome
+                result.downloaded.append(remote)
+
+            result.parsed = {remote.name: parsed[remote.name] for remote in selected if remote.name in parsed}
+
+            if manifest is not None and result.downloaded:
+                await loop.run_in_executor(self.executor, self._record, manifest,
+                                           [(remote, parsed[remote.name]) for remote in result.downloaded],
+                                           parse_key)
+
+        finally:
+            await loop.run_in_executor(self.executor, pool.close_all)
+
+        result.duration_seconds = loop.time() - started
+        logger.info(
+            f"Synced {remote_path or '.'}: {len(result.downloaded)} downloaded, "
+            f"{len(result.skipped)} unchanged, {len(result.failed)} failed "
+            f"in {result.duration_seconds:.2f}s"
+        )
+        return result
+
+    @staticmethod
+    def _load_unchanged(manifest: TransferManifest, remotes: List[RemoteFile], parse_key: str) -> Dict[str, Any]:
+        """Stored payloads of unchanged files by remote path; unreadable ones are downloaded again"""
+        payloads = {}
+        for remote in remotes:
+            if not manifest.is_unchanged(remote, parse_key):
+                continue
+            try:
+                payloads[remote.path] = manifest.load_payload(remote)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Stored payload for {remote.path} unreadable ({e}); downloading again")
+        return payloads
+
+    @staticmethod
+    def _record(manifest: TransferManifest, downloaded: List[Tuple[RemoteFile, Any]], parse_key: str) -> None:
+        for remote, payload in downloaded:
+            try:
+                manifest.record(remote, payload, parse_key)
+            except (OSError, TypeError, ValueError) as e:
+                # Left unrecorded, so the next sync downloads it again
+                logger.warning(f"Could not store payload for {remote.path}: {e}")
+        manifest.save()
+
+    @staticmethod
+    def _list(pool: _ClientPool, remote_path: str) -> List[RemoteFile]:
+        with pool.lease() as client:
+            return client.list_files(remote_path)
+
+    @staticmethod
+    def _fetch(pool: _ClientPool, remote: RemoteFile,
+               parse: Callable[[BinaryIO, RemoteFile], Any]) -> Any:
+        with pool.lease() as client:
+            with client.open_stream(remote) as stream:
+                return parse(stream, remote)
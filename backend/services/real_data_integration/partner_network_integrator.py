@@ -7,25 +7,32 @@ import asyncio
 import logging
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, BinaryIO, Callable
 from dataclasses import dataclass
 from enum import Enum
 import json
+import hashlib
 import aiohttp
 from aiohttp import ClientSession, ClientTimeout
 import pandas as pd
 from pathlib import Path
-import ftplib
-import paramiko
 from urllib.parse import urlencode
 import xml.etree.ElementTree as ET
 from io import StringIO, BytesIO
+from concurrent.futures import ThreadPoolExecutor
 
 from ...models.hospital_benchmarks import (
  Hospital, CityTier, HospitalType, SpecialtyType
 )
 from ...config.advanced_config_manager import ConfigManager
 from ...services.shared.error_handling import ApplicationError
+from ...services.shared.xml_streaming import parse_xml_to_dict
+from .http_session_pool import HTTPSessionPool, get_session_pool
+from .field_mapping import CompiledFieldMapping, compile_path, convert_value
+from .partner_csv_ingestion import CSVIngestionPlan, read_latest_by_hospital
+from .partner_file_transfer import (
+ FTPFileClient, PartnerFileTransfer, RemoteFileClient, SFTPFileClient, TransferManifest
+)
 
 
 class PartnerType(Enum):
@@ -105,9 +112,10 @@ class PartnerDataIntegrationError(ApplicationError):
 class PartnerNetworkDataIntegrator:
  """Production Partner Network Data Integration Service"""
 
- def __init__(self, config: ConfigManager):
+ def __init__(self, config: ConfigManager, session_pool: Optional[HTTPSessionPool] = None):
  self.config = config
  self.logger = logging.getLogger(__name__)
+ self.session_pool = session_pool or get_session_pool()
 
  # Partner configurations
  self.partners: Dict[str, PartnerConfiguration] = {}
@@ -118,8 +126,12 @@ class PartnerNetworkDataIntegrator:
  # Data processing queue
  self.processing_queue: List[str] = []
 
+ # Thread pool for blocking FTP/SFTP transfers (created on first use)
+ self._transfer_executor: Optional[ThreadPoolExecutor] = None
+
  # Partner data mappings
  self.data_mappings = self._initialize_partner_mappings()
+ self._compiled_mappings: Dict[tuple, CompiledFieldMapping] = {}
 
  # Load existing partner configurations
  self._load_partner_configurations()
@@ -343,7 +355,7 @@ class PartnerNetworkDataIntegrator:
  return collected_data
 
  finally:
- await session.close()
+ self.session_pool.release(session)
 
  async def _collect_via_csv_file(self, partner: PartnerConfiguration,
  hospitals: List[str], 
@@ -356,6 +368,7 @@ class PartnerNetworkDataIntegrator:
  # This would implement the specific file collection mechanism
 
  csv_file_paths = await self._get_csv_files_from_partner(partner)
+ plan = self._build_csv_ingestion_plan(partner)
 
  for file_path in csv_file_paths:
  try:
@@ -364,22 +377,8 @@ class PartnerNetworkDataIntegrator:
  if data_type not in data_types:
  continue
 
- # Read and process CSV
- df = pd.read_csv(file_path)
-
- # Filter for target hospitals
- if 'hospital_id' in df.columns:
- df_filtered = df[df['hospital_id'].isin(hospitals)]
- else:
- df_filtered = df
-
- # Convert to dictionary format
- file_data = {}
- for _, row in df_filtered.iterrows():
- hospital_id = row.get('hospital_id', f'unknown_{len(file_data)}')
- file_data[hospital_id] = row.to_dict()
-
- collected_data[data_type] = file_data
+ # Stream typed chunks filtered to the target hospitals
+ collected_data[data_type] = read_latest_by_hospital(file_path, plan, hospitals)
 
  self.logger.info(f"Processed CSV file {file_path} for {data_type}")
 
@@ -388,6 +387,14 @@ class PartnerNetworkDataIntegrator:
 
  return collected_data
 
+ def _build_csv_ingestion_plan(self, partner: PartnerConfiguration) -> CSVIngestionPlan:
+ """Columns, dtypes and chunk size for reading this partner's CSV files"""
+ return CSVIngestionPlan.from_mapping(
+ self.data_mappings.get(partner.partner_id, {}),
+ chunk_size=self.config.get("partner_network.csv_chunk_size", 50000),
+ dtype_overrides=self.config.get(f"partner_network.csv_dtypes.{partner.partner_id}", None)
+ )
+
  async def _collect_via_ftp(self, partner: PartnerConfiguration,
  hospitals: List[str], 
  data_types: List[str]) -> Dict[str, Any]:
@@ -397,77 +404,69 @@ class PartnerNetworkDataIntegrator:
  raise PartnerDataIntegrationError("FTP configuration not available")
 
  collected_data = {}
-
- # Connect to FTP server
- ftp_host = partner.ftp_config.get("host")
- ftp_user = partner.ftp_config.get("username")
- ftp_pass = partner.ftp_config.get("password")
- ftp_port = partner.ftp_config.get("port", 21)
- use_sftp = partner.ftp_config.get("use_sftp", False)
+ ftp_config = partner.ftp_config
 
  try:
- if use_sftp:
- # SFTP connection
- ssh = paramiko.SSHClient()
- ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
- ssh.connect(ftp_host, port=ftp_port, username=ftp_user, password=ftp_pass)
-
- sftp = ssh.open_sftp()
-
- # List files in remote directory
- remote_files = sftp.listdir(partner.ftp_config.get("remote_path", "/"))
-
- for filename in remote_files:
- if self._is_relevant_file(filename, data_types):
- # Download file
- local_path = f"temp/{filename}"
- sftp.get(f"{partner.ftp_config.get('remote_path', '/')}/{filename}", local_path)
-
- # Process downloaded file
- file_data = await self._process_downloaded_file(local_path, filename)
+ transfer = PartnerFileTransfer(
+ self._build_remote_client_factory(ftp_config),
+ self._get_transfer_executor(),
+ max_parallel=int(ftp_config.get("max_parallel_downloads", 4))
+ )
+ manifest = None
+ if ftp_config.get("incremental_sync", True):
+ manifest = TransferManifest(Path("data/partner_transfer_manifests") / f"{partner.partner_id}.json")
+
+ plan = self._build_csv_ingestion_plan(partner)
+ # Stored payloads are filtered to these hospitals and columns, so they
+ # are only reused by syncs with the same selection
+ parse_key = hashlib.sha256(json.dumps(
+ [sorted(hospitals), sorted(plan.columns), plan.dtypes], sort_keys=True
+ ).encode()).hexdigest()[:16]
+
+ # SFTP paths are absolute from "/"; FTP starts in the login directory
+ default_remote_path = "/" if ftp_config.get("use_sftp", False) else ""
+ result = await transfer.sync(
+ ftp_config.get("remote_path", default_remote_path),
+ parse=lambda stream, remote: self._parse_file_stream(stream, remote.name, plan, hospitals),
+ select=lambda remote: self._is_relevant_file(remote.name, data_types),
+ manifest=manifest,
+ parse_key=parse_key
+ )
 
+ for filename, file_data in result.parsed.items():
  data_type = self._identify_data_type_from_filename(filename)
  if data_type in data_types:
  collected_data[data_type] = file_data
 
- sftp.close()
- ssh.close()
-
- else:
- # Regular FTP connection
- ftp = ftplib.FTP()
- ftp.connect(ftp_host, ftp_port)
- ftp.login(ftp_user, ftp_pass)
-
- # Change to data directory
- if partner.ftp_config.get("remote_path"):
- ftp.cwd(partner.ftp_config["remote_path"])
-
- # List files
- file_list = ftp.nlst()
-
- for filename in file_list:
- if self._is_relevant_file(filename, data_types):
- # Download file
- local_path = f"temp/{filename}"
+ return collected_data
 
- with open(local_path, 'wb') as local_file:
- ftp.retrbinary(f'RETR {filename}', local_file.write)
+ except Exception as e:
+ self.logger.error(f"FTP data collection failed: {str(e)}")
+ raise PartnerDataIntegrationError(f"FTP collection failed: {str(e)}")
 
- # Process downloaded file
- file_data = await self._process_downloaded_file(local_path, filename)
+ def _build_remote_client_factory(self, ftp_config: Dict[str, Any]) -> Callable[[], RemoteFileClient]:
+ """Factory creating one FTP or SFTP client per parallel transfer"""
 
- data_type = self._identify_data_type_from_filename(filename)
- if data_type in data_types:
- collected_data[data_type] = file_data
+ client_class = SFTPFileClient if ftp_config.get("use_sftp", False) else FTPFileClient
+ default_port = 22 if client_class is SFTPFileClient else 21
 
- ftp.quit()
+ return lambda: client_class(
+ host=ftp_config.get("host"),
+ port=ftp_config.get("port", default_port),
+ username=ftp_config.get("username", ""),
+ password=ftp_config.get("password", ""),
+ timeout=float(ftp_config.get("timeout_seconds", 60))
+ )
 
- return collected_data
+ def _get_transfer_executor(self) -> ThreadPoolExecutor:
+ """Dedicated thread pool for blocking FTP/SFTP transfers"""
 
- except Exception as e:
- self.logger.error(f"FTP data collection failed: {str(e)}")
- raise PartnerDataIntegrationError(f"FTP collection failed: {str(e)}")
+ if self._transfer_executor is None:
+ self._transfer_executor = ThreadPoolExecutor(
+ max_workers=self.config.get("partner_network.transfer_threads", 8),
+ thread_name_prefix="partner-transfer"
+ )
+ return self._transfer_executor
 
  async def _collect_via_database_export(self, partner: PartnerConfiguration,
  hospitals: List[str], 
@@ -559,13 +558,8 @@ class PartnerNetworkDataIntegrator:
  data_type: str) -> Dict[str, Any]:
  """Transform partner data using field mappings"""
 
- standardized_data = {}
-
  # Apply field mappings
- for standard_field, partner_field in mapping.items():
- value = self._extract_nested_value(raw_data, partner_field)
- if value is not None:
- standardized_data[standard_field] = self._convert_data_type(value)
+ standardized_data = self._compile_partner_mapping(mapping).apply(raw_data)
 
  # Add data type metadata
  standardized_data["data_type"] = data_type
@@ -573,43 +567,21 @@ class PartnerNetworkDataIntegrator:
 
  return standardized_data
 
+ def _compile_partner_mapping(self, mapping: Dict[str, str]) -> CompiledFieldMapping:
+ """Compiled form of a partner field mapping, built once per mapping"""
+ key = tuple(mapping.items())
+ compiled = self._compiled_mappings.get(key)
+ if compiled is None:
+ compiled = self._compiled_mappings[key] = CompiledFieldMapping(mapping)
+ return compiled
+
  def _extract_nested_value(self, data: Dict[str, Any], path: str) -> Any:
  """Extract value from nested dictionary using dot notation"""
- try:
- keys = path.split('.')
- current = data
-
- for key in keys:
- if isinstance(current, dict) and key in current:
- current = current[key]
- elif isinstance(current, list) and key.isdigit():
- current = current[int(key)]
- else:
- return None
-
- return current
-
- except (KeyError, IndexError, TypeError):
- return None
+ return compile_path(path)(data)
 
  def _convert_data_type(self, value: Any) -> Union[Decimal, int, float, str]:
  """Convert value to appropriate data type"""
- if value is None:
- return None
-
- if isinstance(value, (int, float)):
- return Decimal(str(value))
-
- if isinstance(value, str):
- try:
- if '.' in value:
- return Decimal(value)
- else:
- return int(value) if value.isdigit() else value
- except (ValueError, TypeError):
- return value
-
- return value
+ return convert_value(value)
 
  def _validate_partner_data_quality(self, data: Dict[str, Any], 
  data_type: str) -> int:
@@ -652,9 +624,7 @@ class PartnerNetworkDataIntegrator:
  return max(1, quality_score)
 
  async def _get_authenticated_session(self, partner: PartnerConfiguration) -> ClientSession:
- """Get authenticated HTTP session for partner API"""
-
- timeout = ClientTimeout(total=30, connect=10)
+ """Get pooled, authenticated HTTP session for partner API"""
 
  headers = {
  "User-Agent": "VerticalLight-Partner-Integrator/1.0",
@@ -675,14 +645,16 @@ class PartnerNetworkDataIntegrator:
  encoded_credentials = base64.b64encode(credentials.encode()).decode()
  headers["Authorization"] = f"Basic {encoded_credentials}"
 
- session = ClientSession(
+ # All partner auth schemes are header-based, so one session per partner
+ # and auth type picks up rotated keys/tokens by refreshing its headers
+ return await self.session_pool.get_session(
+ f"partner:{partner.partner_id}",
+ partner.api_endpoint,
  headers=headers,
- timeout=timeout,
- connector=aiohttp.TCPConnector(limit=5)
+ credential_id=f"{partner.partner_id}:{auth_type}",
+ per_host_limit=5
  )
 
- return session
-
  async def _test_partner_connection(self, partner: PartnerConfiguration) -> Dict[str, Any]:
  """Test connection to partner API"""
 
@@ -705,7 +677,7 @@ class PartnerNetworkDataIntegrator:
  return {"success": True, "message": "Base API connection successful"}
 
  finally:
- await session.close()
+ self.session_pool.release(session)
 
  elif partner.data_exchange_format == DataExchangeFormat.FTP_TRANSFER:
  # Test FTP connection
@@ -714,10 +686,13 @@ class PartnerNetworkDataIntegrator:
  return {"success": False, "error": "FTP configuration missing"}
 
  try:
- ftp = ftplib.FTP()
- ftp.connect(ftp_config["host"], ftp_config.get("port", 21))
- ftp.login(ftp_config["username"], ftp_config["password"])
- ftp.quit()
+ client = self._build_remote_client_factory(ftp_config)()
+
+ def connect_and_close():
+ client.connect()
+ client.close()
+
+ await asyncio.get_running_loop().run_in_executor(self._get_transfer_executor(), connect_and_close)
  return {"success": True, "message": "FTP connection successful"}
  except Exception as e:
  return {"success": False, "error": f"FTP connection failed: {str(e)}"}
@@ -884,50 +859,46 @@ class PartnerNetworkDataIntegrator:
  file_data_type = self._identify_data_type_from_filename(filename)
  return file_data_type in data_types or file_data_type != "unknown"
 
- async def _process_downloaded_file(self, file_path: str, filename: str) -> Dict[str, Any]:
+ async def _process_downloaded_file(self, file_path: str, filename: str,
+ plan: Optional[CSVIngestionPlan] = None,
+ hospitals: Optional[List[str]] = None) -> Dict[str, Any]:
  """Process downloaded file and extract data"""
 
  try:
- if filename.endswith('.csv'):
- df = pd.read_csv(file_path)
- return df.to_dict('records')
- elif filename.endswith('.xlsx'):
- df = pd.read_excel(file_path)
- return df.to_dict('records')
- elif filename.endswith('.json'):
- with open(file_path, 'r') as f:
- return json.load(f)
- elif filename.endswith('.xml'):
- tree = ET.parse(file_path)
- root = tree.getroot()
- return self._xml_to_dict(root)
- else:
- return {}
+ with open(file_path, 'rb') as stream:
+ return self._parse_file_stream(stream, filename, plan, hospitals)
 
  except Exception as e:
  self.logger.error(f"Failed to process file {file_path}: {str(e)}")
  return {}
 
- def _xml_to_dict(self, element) -> Dict[str, Any]:
- """Convert XML element to dictionary"""
+ def _parse_file_stream(self, stream: BinaryIO, filename: str,
+ plan: Optional[CSVIngestionPlan] = None,
+ hospitals: Optional[List[str]] = None) -> Any:
+ """Parse a partner file from a binary stream (local file or live transfer)
 
- result = {}
+ CSV exports are read in typed, column-pruned chunks filtered to
+ ``hospitals`` and reduced to the latest row per hospital.
+ """
 
- if element.text and element.text.strip():
- if len(element) == 0:
- return element.text.strip()
-
- for child in element:
- child_data = self._xml_to_dict(child)
-
- if child.tag in result:
- if not isinstance(result[child.tag], list):
- result[child.tag] = [result[child.tag]]
- result[child.tag].append(child_data)
+ if filename.endswith('.csv'):
+ return read_latest_by_hospital(stream, plan, hospitals)
+ elif filename.endswith('.xlsx'):
+ # Excel needs random access, so buffer the workbook
+ df = pd.read_excel(BytesIO(stream.read()))
+ return df.to_dict('records')
+ elif filename.endswith('.json'):
+ return json.load(stream)
+ elif filename.endswith('.xml'):
+ return parse_xml_to_dict(stream, include_attributes=False)
  else:
- result[child.tag] = child_data
+ return {}
 
- return result
+ def shutdown(self) -> None:
+ """Stop the file transfer thread pool"""
+ if self._transfer_executor is not None:
+ self._transfer_executor.shutdown(wait=True)
+ self._transfer_executor = None
 
  def get_partner_analytics(self, partner_id: Optional[str] = None) -> Dict[str, Any]:
  """Get analytics for partner data collection"""
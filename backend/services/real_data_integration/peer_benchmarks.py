@@ -0,0 +1,159 @@
+"""
+Peer Benchmark Distributions
+Cached per-peer-group metric distributions for enrichment percentiles
+
+Stored hospital metrics are loaded in one query, grouped by peer group
+(hospital type and city tier, with tier-wide and national fallbacks for
+thin groups) and kept as sorted arrays. A percentile rank is then one
+bisection per metric, so enriching a record never touches the database.
+The snapshot is refreshed in the background once it is older than the
+refresh interval; readers keep using the previous snapshot meanwhile.
+"""
+
+import asyncio
+import logging
+import math
+import re
+import time
+from bisect import bisect_right
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Record fields ranked against peers
+PEER_METRICS = (
+    "bed_occupancy_rate",
+    "average_length_of_stay",
+    "total_revenue",
+    "revenue_per_bed",
+    "profit_margin",
+    "government_scheme_dependency",
+)
+
+ALL_TYPES = "*"
+ALL_TIERS = "*"
+
+MetricsLoader = Callable[[], Awaitable[Iterable[Mapping[str, Any]]]]
+
+_TIER_PATTERN = re.compile(r"(?:tier[_ ]?)?([1-4])", re.IGNORECASE)
+
+
+def peer_group_key(hospital_type: Any, city_tier: Any) -> Tuple[str, str]:
+    """Normalized (type, tier) key; unknown parts become the wildcard"""
+    type_key = re.sub(r"[\s-]+", "_", str(hospital_type or "").strip().lower()) or ALL_TYPES
+    match = _TIER_PATTERN.fullmatch(str(city_tier or "").strip())
+    return type_key, match.group(1) if match else ALL_TIERS
+
+
+def _metric_value(value: Any) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def percentile_rank(sorted_values: List[float], value: float) -> float:
+    """Share of peers at or below ``value``, as a percentage"""
+    return round(bisect_right(sorted_values, value) / len(sorted_values) * 100, 1)
+
+
+class PeerDistributions:
+    """Sorted metric values per peer group, from one snapshot of stored metrics"""
+
+    def __init__(self, groups: Dict[Tuple[str, str], Dict[str, List[float]]],
+                 peer_counts: Dict[Tuple[str, str], int], min_peers: int = 5,
+                 built_at: Optional[datetime] = None):
+        self.groups = groups
+        self.peer_counts = peer_counts
+        self.min_peers = min_peers
+        self.built_at = built_at or datetime.utcnow()
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, Any]], min_peers: int = 5,
+                     metrics: Iterable[str] = PEER_METRICS) -> "PeerDistributions":
+        """
+        Group stored hospital metrics by peer group
+
+        Each record contributes to its own (type, tier) group, its tier
+        across all types, and the national group.
+        """
+        metrics = tuple(metrics)
+        groups: Dict[Tuple[str, str], Dict[str, List[float]]] = {}
+        peer_counts: Dict[Tuple[str, str], int] = {}
+        for record in records:
+            type_key, tier_key = peer_group_key(record.get("hospital_type"), record.get("city_tier"))
+            keys = {(type_key, tier_key), (ALL_TYPES, tier_key), (ALL_TYPES, ALL_TIERS)}
+            values = [(metric, _metric_value(record.get(metric))) for metric in metrics]
+            for key in keys:
+                peer_counts[key] = peer_counts.get(key, 0) + 1
+                group = groups.setdefault(key, {})
+                for metric, value in values:
+                    if value is not None:
+                        group.setdefault(metric, []).append(value)
+
+        for group in groups.values():
+            for values in group.values():
+                values.sort()
+        return cls(groups, peer_counts, min_peers)
+
+    def resolve_group(self, hospital_type: Any, city_tier: Any) -> Optional[Tuple[str, str]]:
+        """Narrowest group around the record with at least ``min_peers`` hospitals"""
+        type_key, tier_key = peer_group_key(hospital_type, city_tier)
+        for key in ((type_key, tier_key), (ALL_TYPES, tier_key), (ALL_TYPES, ALL_TIERS)):
+            if self.peer_counts.get(key, 0) >= self.min_peers:
+                return key
+        return None
+
+    def percentiles(self, group: Tuple[str, str], record: Mapping[str, Any]) -> Dict[str, float]:
+        """Percentile rank of each of the record's metrics within ``group``"""
+        ranks = {}
+        for metric, values in self.groups.get(group, {}).items():
+            value = _metric_value(record.get(metric))
+            if value is not None and len(values) >= self.min_peers:
+                ranks[metric] = percentile_rank(values, value)
+        return ranks
+
+
+class PeerBenchmarkCache:
+    """Holds the current PeerDistributions and refreshes it periodically"""
+
+    def __init__(self, loader: MetricsLoader, refresh_seconds: float = 3600.0, min_peers: int = 5):
+        self.loader = loader
+        self.refresh_seconds = refresh_seconds
+        self.min_peers = min_peers
+        self._distributions: Optional[PeerDistributions] = None
+        self._loaded_at = float("-inf")
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def get(self) -> Optional[PeerDistributions]:
+        """
+        Current distributions, loading them on first use
+
+        Once a snapshot exists, a stale one is returned immediately while a
+        single background refresh replaces it. Returns None if nothing could
+        be loaded yet.
+        """
+        if time.monotonic() - self._loaded_at >= self.refresh_seconds:
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.ensure_future(self.refresh())
+            if self._distributions is None:
+                await asyncio.shield(self._refresh_task)
+        return self._distributions
+
+    async def refresh(self) -> None:
+        """Rebuild the distributions from the loader, keeping the old ones on failure"""
+        started = time.monotonic()
+        try:
+            records = await self.loader()
+            self._distributions = PeerDistributions.from_records(records, self.min_peers)
+            logger.info(f"Peer benchmark distributions rebuilt for "
+                        f"{len(self._distributions.peer_counts)} peer groups")
+        except Exception as e:
+            logger.warning(f"Peer benchmark refresh failed: {str(e)}")
+        finally:
+            # Failed refreshes are retried after the same interval
+            self._loaded_at = started
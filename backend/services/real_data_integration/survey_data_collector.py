@@ -14,7 +14,7 @@ import json
 import aiohttp
 from aiohttp import ClientSession, ClientTimeout
 import pandas as pd
-from urllib.parse import urlencode, quote
+from urllib.parse import urlencode, quote, urlsplit
 import hashlib
 from pathlib import Path
 import smtplib
@@ -30,6 +30,11 @@ from ...models.hospital_benchmarks import (
 )
 from ...config.advanced_config_manager import ConfigManager
 from ...services.shared.error_handling import ApplicationError
+from .http_session_pool import get_session_pool
+from .survey_message_dispatcher import (
+ OutboxMessage, ProviderLimits, ProviderSendError, RateAwareDispatcher, SurveyOutbox, parse_retry_after
+)
+from .survey_mailer import BulkSMTPMailer, CampaignEmailTemplate, OutgoingEmail, SMTPSettings
 
 
 class SurveyPlatform(Enum):
@@ -137,6 +142,11 @@ class RealSurveyDataCollector:
 
  # Email configuration
  self.email_config = self._get_email_config()
+ self._bulk_mailer: Optional[BulkSMTPMailer] = None
+
+ # WhatsApp/SMS delivery
+ self.session_pool = get_session_pool()
+ self._message_dispatcher: Optional[RateAwareDispatcher] = None
 
  def _initialize_survey_templates(self) -> Dict[SurveyType, Dict[str, Any]]:
  """Initialize survey question templates for different data collection needs"""
@@ -368,7 +378,8 @@ class RealSurveyDataCollector:
  "username": self.config.get("email.username"),
  "password": self.config.get("email.password"),
  "from_name": self.config.get("email.from_name", "Hospital Benchmark Survey"),
- "from_email": self.config.get("email.from_email")
+ "from_email": self.config.get("email.from_email"),
+ "use_starttls": self.config.get("email.use_starttls", True)
  }
 
  async def create_survey_campaign(self, survey_type: SurveyType,
@@ -505,76 +516,83 @@ class RealSurveyDataCollector:
  survey_url: str) -> Dict[str, Any]:
  """Distribute survey via email"""
 
- success_count = 0
- failed_count = 0
- errors = []
-
  email_template = self._get_email_template(campaign["survey_type"])
 
- for contact in hospital_contacts:
- try:
- # Create personalized email
- email_content = email_template["content"].format(
- hospital_name=contact.primary_contact_name,
+ # Render campaign-wide fields once; only the recipient name varies
+ template = CampaignEmailTemplate(
+ email_template["subject"],
+ email_template["content"],
  survey_url=survey_url,
  deadline=campaign["survey_config"]["completion_deadline"],
  incentive=campaign["survey_config"].get("incentive_amount", ""),
  campaign_id=campaign["campaign_id"]
  )
 
- # Send email
- await self._send_email(
+ emails = [
+ OutgoingEmail(
  to_email=contact.primary_contact_email,
  to_name=contact.primary_contact_name,
- subject=email_template["subject"],
- content=email_content,
+ subject=template.subject,
+ html=template.render(contact.primary_contact_name),
  hospital_id=contact.hospital_id
  )
+ for contact in hospital_contacts
+ ]
 
- success_count += 1
- self.logger.info(f"Survey email sent to {contact.primary_contact_email}")
+ report = await self._get_bulk_mailer().send_all(emails)
 
- except Exception as e:
- failed_count += 1
- error_msg = f"Failed to send email to {contact.primary_contact_email}: {str(e)}"
+ errors = []
+ for outcome in report.outcomes:
+ if outcome.status == "sent":
+ self._log_email_sent(outcome.hospital_id, outcome.to_email, template.subject)
+ else:
+ error_msg = f"Failed to send email to {outcome.to_email}: {outcome.error}"
  errors.append(error_msg)
  self.logger.error(error_msg)
 
  return {
- "success": success_count,
- "failed": failed_count,
- "errors": errors
+ "success": report.sent,
+ "failed": report.failed,
+ "errors": errors,
+ "duration_seconds": round(report.duration_seconds, 3),
+ "messages_per_second": round(report.messages_per_second, 2),
+ "smtp_connections": report.connections_opened,
+ "recipient_outcomes": [outcome.__dict__ for outcome in report.outcomes]
  }
 
  async def _send_email(self, to_email: str, to_name: str, 
  subject: str, content: str, hospital_id: str) -> None:
  """Send individual email"""
 
- try:
- msg = MIMEMultipart('alternative')
- msg['From'] = f"{self.email_config['from_name']} <{self.email_config['from_email']}>"
- msg['To'] = f"{to_name} <{to_email}>"
- msg['Subject'] = subject
-
- # HTML content
- html_part = MIMEText(content, 'html')
- msg.attach(html_part)
+ report = await self._get_bulk_mailer().send_all([
+ OutgoingEmail(to_email=to_email, to_name=to_name, subject=subject,
+ html=content, hospital_id=hospital_id)
+ ])
+ outcome = report.outcomes[0]
 
- # Send via SMTP
- server = smtplib.SMTP(self.email_config['smtp_server'], self.email_config['smtp_port'])
- server.starttls()
- server.login(self.email_config['username'], self.email_config['password'])
-
- text = msg.as_string()
- server.sendmail(self.email_config['from_email'], to_email, text)
- server.quit()
+ if outcome.status != "sent":
+ self.logger.error(f"SMTP email sending failed: {outcome.error}")
+ raise SurveyDataCollectionError(f"Email to {to_email} failed: {outcome.error}")
 
  # Log email sent
  self._log_email_sent(hospital_id, to_email, subject)
 
- except Exception as e:
- self.logger.error(f"SMTP email sending failed: {str(e)}")
- raise
+ def _get_bulk_mailer(self) -> BulkSMTPMailer:
+ """Shared mailer holding persistent SMTP connections"""
+
+ if self._bulk_mailer is None:
+ self._bulk_mailer = BulkSMTPMailer(
+ SMTPSettings.from_email_config(self.email_config),
+ max_connections=self.config.get("email.max_connections", 4),
+ messages_per_connection=self.config.get("email.messages_per_connection", 100)
+ )
+ return self._bulk_mailer
+
+ def shutdown(self) -> None:
+ """Close pooled SMTP connections"""
+ if self._bulk_mailer is not None:
+ self._bulk_mailer.close()
+ self._bulk_mailer = None
 
  def _get_email_template(self, survey_type: str) -> Dict[str, str]:
  """Get email template for survey type"""
@@ -676,7 +694,6 @@ class RealSurveyDataCollector:
  survey_url: str) -> Dict[str, Any]:
  """Distribute survey via WhatsApp Business API"""
 
- success_count = 0
  failed_count = 0
  errors = []
 
@@ -687,8 +704,8 @@ class RealSurveyDataCollector:
  errors.append("WhatsApp API not configured")
  return {"success": 0, "failed": len(hospital_contacts), "errors": errors}
 
+ messages = []
  for contact in hospital_contacts:
- try:
  if contact.whatsapp_number:
  message = f"""
 🏥 *Hospital Performance Survey*
@@ -711,22 +728,22 @@ Thank you for your participation!
 
 _VerticalLight Healthcare Analytics_
  """
-
- await self._send_whatsapp_message(contact.whatsapp_number, message)
- success_count += 1
+ messages.append(OutboxMessage(
+ message_id=f"{campaign['campaign_id']}:whatsapp:{contact.hospital_id}",
+ provider="whatsapp",
+ recipient=contact.whatsapp_number,
+ body=message,
+ hospital_id=contact.hospital_id
+ ))
  else:
  failed_count += 1
  errors.append(f"No WhatsApp number for {contact.hospital_id}")
 
- except Exception as e:
- failed_count += 1
- errors.append(f"WhatsApp failed for {contact.hospital_id}: {str(e)}")
-
- return {
- "success": success_count,
- "failed": failed_count,
- "errors": errors
- }
+ results = await self._dispatch_messages(campaign["campaign_id"], "whatsapp", messages,
+ self._send_whatsapp_outbox_message)
+ results["failed"] += failed_count
+ results["errors"] = errors + results["errors"]
+ return results
 
  async def _send_whatsapp_message(self, phone_number: str, message: str) -> None:
  """Send WhatsApp message via Business API"""
@@ -749,24 +766,116 @@ _VerticalLight Healthcare Analytics_
  "text": {"body": message}
  }
 
- async with aiohttp.ClientSession() as session:
- async with session.post(url, headers=headers, json=data) as response:
- if response.status != 200:
- response_text = await response.text()
- raise Exception(f"WhatsApp API error: {response.status} - {response_text}")
+ await self._post_provider_message("whatsapp", url, headers, data)
+
+ async def _send_whatsapp_outbox_message(self, message: OutboxMessage) -> None:
+ await self._send_whatsapp_message(message.recipient, message.body)
 
  async def _distribute_via_sms(self, campaign: Dict[str, Any],
  hospital_contacts: List[HospitalContact],
  survey_url: str) -> Dict[str, Any]:
  """Distribute survey via SMS"""
 
- # SMS implementation would use services like Twilio, AWS SNS, or Indian SMS providers
+ sms_config = self.config.get("sms", {})
+
+ # SMS uses a generic JSON gateway (Indian DLT providers, AWS SNS proxies, Twilio-compatible relays)
+ if not sms_config.get("api_url"):
  return {
  "success": 0,
  "failed": len(hospital_contacts),
- "errors": ["SMS distribution not implemented yet"]
+ "errors": ["SMS gateway not configured"]
+ }
+
+ messages = [
+ OutboxMessage(
+ message_id=f"{campaign['campaign_id']}:sms:{contact.hospital_id}",
+ provider="sms",
+ recipient=contact.primary_contact_phone,
+ body=(f"Dear {contact.primary_contact_name}, please complete the hospital benchmarking "
+ f"survey by {campaign['survey_config']['completion_deadline']}: {survey_url}"),
+ hospital_id=contact.hospital_id
+ )
+ for contact in hospital_contacts
+ ]
+
+ return await self._dispatch_messages(campaign["campaign_id"], "sms", messages, self._send_sms_message)
+
+ async def _send_sms_message(self, message: OutboxMessage) -> None:
+ """Send one SMS via the configured gateway"""
+
+ sms_config = self.config.get("sms", {})
+ headers = {
+ "Authorization": f"Bearer {sms_config.get('api_key')}",
+ "Content-Type": "application/json"
+ }
+ data = {
+ "to": message.recipient,
+ "sender_id": sms_config.get("sender_id"),
+ "message": message.body
+ }
+
+ await self._post_provider_message("sms", sms_config["api_url"], headers, data)
+
+ async def _post_provider_message(self, provider: str, url: str,
+ headers: Dict[str, str], data: Dict[str, Any]) -> None:
+ """POST a message over the pooled provider session, raising ProviderSendError on failure"""
+
+ parts = urlsplit(url)
+ session = await self.session_pool.get_session(f"survey:{provider}", f"{parts.scheme}://{parts.netloc}",
+ headers=headers, credential_id=provider)
+ try:
+ async with session.post(url, json=data) as response:
+ if response.status != 200:
+ response_text = await response.text()
+ raise ProviderSendError(
+ f"{provider} API error: {response.status} - {response_text}",
+ status=response.status,
+ retry_after=parse_retry_after(response.headers.get("Retry-After"))
+ )
+ except aiohttp.ClientError as e:
+ raise ProviderSendError(f"{provider} request failed: {str(e)}")
+ finally:
+ self.session_pool.release(session)
+
+ async def _dispatch_messages(self, campaign_id: str, channel: str,
+ messages: List[OutboxMessage], sender) -> Dict[str, Any]:
+ """Queue messages in the campaign outbox and send everything still pending"""
+
+ outbox = await SurveyOutbox.open(Path("data/survey_outbox") / f"{campaign_id}_{channel}.jsonl")
+ outbox.enqueue(messages) # journalled off the loop; dispatch flushes it
+
+ report = await self._get_message_dispatcher().dispatch(outbox, {channel: sender})
+
+ return {
+ "success": report.sent + report.resumed_sent,
+ "failed": report.failed + report.resumed_failed,
+ "errors": report.errors,
+ "retries": report.retries,
+ "throttled": report.throttled,
+ "resumed_from_outbox": report.resumed_sent,
+ "duration_seconds": round(report.duration_seconds, 3)
  }
 
+ def _get_message_dispatcher(self) -> RateAwareDispatcher:
+ """Dispatcher with one token bucket per messaging provider"""
+
+ if self._message_dispatcher is None:
+ self._message_dispatcher = RateAwareDispatcher(
+ providers={
+ "whatsapp": ProviderLimits(
+ rate_per_second=self.config.get("whatsapp.rate_per_second", 20),
+ burst=self.config.get("whatsapp.burst", 20)
+ ),
+ "sms": ProviderLimits(
+ rate_per_second=self.config.get("sms.rate_per_second", 10),
+ burst=self.config.get("sms.burst", 10)
+ )
+ },
+ max_concurrency=self.config.get("survey_distribution.max_concurrency", 10),
+ max_attempts=self.config.get("survey_distribution.max_attempts", 5)
+ )
+ return self._message_dispatcher
+
  async def collect_survey_responses(self, campaign_id: str) -> Dict[str, Any]:
  """Collect and process survey responses"""
 
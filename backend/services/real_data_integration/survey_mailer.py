@@ -0,0 +1,273 @@
+"""
+Bulk Survey Mailer
+Campaign-scale email delivery over reused, authenticated SMTP connections
+
+Blocking smtplib sessions run on a dedicated worker pool so the event loop
+is never blocked. Each worker keeps its authenticated connection open across
+messages (reconnecting after ``messages_per_connection`` or on disconnect),
+concurrency is bounded by ``max_connections``, and campaign templates are
+rendered once with only the recipient name substituted per message.
+"""
+
+import asyncio
+import logging
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Placeholder kept through campaign-level rendering and filled per recipient
+_RECIPIENT_SENTINEL = "\x00hospital_name\x00"
+
+
+@dataclass
+class SMTPSettings:
+    """SMTP server and sender settings"""
+    host: str
+    port: int = 587
+    username: Optional[str] = None
+    password: Optional[str] = None
+    from_email: Optional[str] = None
+    from_name: str = ""
+    use_starttls: bool = True
+    timeout_seconds: float = 30.0
+
+    @classmethod
+    def from_email_config(cls, email_config: Dict[str, Any]) -> "SMTPSettings":
+        """Build from RealSurveyDataCollector's email configuration dict"""
+        return cls(
+            host=email_config["smtp_server"],
+            port=int(email_config.get("smtp_port", 587)),
+            username=email_config.get("username"),
+            password=email_config.get("password"),
+            from_email=email_config.get("from_email"),
+            from_name=email_config.get("from_name", ""),
+            use_starttls=email_config.get("use_starttls", True)
+        )
+
+
+class CampaignEmailTemplate:
+    """
+    Subject and HTML body rendered once per campaign
+
+    Campaign-wide placeholders (survey URL, deadline, incentive, campaign id)
+    are substituted up front; the body is kept as fragments around the
+    recipient name so personalising a message is a single join.
+    """
+
+    __slots__ = ("subject", "_fragments")
+
+    def __init__(self, subject: str, content: str, **campaign_fields: Any):
+        self.subject = subject
+        rendered = content.format(hospital_name=_RECIPIENT_SENTINEL, **campaign_fields)
+        self._fragments = rendered.split(_RECIPIENT_SENTINEL)
+
+    def render(self, hospital_name: str) -> str:
+        return hospital_name.join(self._fragments)
+
+
+@dataclass
+class OutgoingEmail:
+    """One personalised survey email"""
+    to_email: str
+    to_name: str
+    subject: str
+    html: str
+    hospital_id: str
+
+
+@dataclass
+class RecipientOutcome:
+    """Delivery outcome for one recipient"""
+    hospital_id: str
+    to_email: str
+    status: str  # sent, failed
+    attempts: int = 0
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+
+@dataclass
+class BulkSendReport:
+    """Throughput and per-recipient results for a bulk send"""
+    outcomes: List[RecipientOutcome] = field(default_factory=list)
+    duration_seconds: float = 0.0
+    connections_opened: int = 0
+
+    @property
+    def sent(self) -> int:
+        return sum(1 for outcome in self.outcomes if outcome.status == "sent")
+
+    @property
+    def failed(self) -> int:
+        return len(self.outcomes) - self.sent
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.sent / self.duration_seconds if self.duration_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "messages_per_second": round(self.messages_per_second, 2),
+            "connections_opened": self.connections_opened,
+            "outcomes": [outcome.__dict__ for outcome in self.outcomes]
+        }
+
+
+class _SMTPConnection:
+    """An authenticated SMTP session owned by one worker at a time"""
+
+    def __init__(self, settings: SMTPSettings):
+        self.settings = settings
+        self.server: Optional[smtplib.SMTP] = None
+        self.messages_sent = 0
+
+    def open(self) -> None:
+        settings = self.settings
+        server = smtplib.SMTP(settings.host, settings.port, timeout=settings.timeout_seconds)
+        try:
+            if settings.use_starttls:
+                server.starttls()
+            if settings.username:
+                server.login(settings.username, settings.password)
+        except Exception:
+            server.close()
+            raise
+        self.server = server
+        self.messages_sent = 0
+
+    def close(self) -> None:
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except smtplib.SMTPException:
+                self.server.close()
+            except OSError:
+                pass
+            self.server = None
+
+
+class BulkSMTPMailer:
+    """Sends campaign emails over a small pool of persistent SMTP connections"""
+
+    def __init__(self, settings: SMTPSettings, max_connections: int = 4,
+                 messages_per_connection: int = 100, max_attempts: int = 2):
+        self.settings = settings
+        self.max_connections = max(1, max_connections)
+        self.messages_per_connection = max(1, messages_per_connection)
+        self.max_attempts = max(1, max_attempts)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_connections,
+                                            thread_name_prefix="survey-smtp")
+        self._idle: List[_SMTPConnection] = []
+        self._lock = threading.Lock()
+        self._connections_opened = 0
+
+    async def send_all(self, emails: List[OutgoingEmail]) -> BulkSendReport:
+        """Send every email with at most ``max_connections`` in flight"""
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_connections)
+        opened_before = self._connections_opened
+        started = time.perf_counter()
+
+        async def send(email: OutgoingEmail) -> RecipientOutcome:
+            async with semaphore:
+                return await loop.run_in_executor(self._executor, self._send_blocking, email)
+
+        results = await asyncio.gather(*(send(email) for email in emails), return_exceptions=True)
+
+        # An unexpected error fails its own recipient, not the whole report
+        outcomes = []
+        for email, result in zip(emails, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Unexpected error sending to {email.to_email}: {result!r}")
+                result = RecipientOutcome(hospital_id=email.hospital_id, to_email=email.to_email,
+                                          status="failed", error=repr(result))
+            outcomes.append(result)
+
+        report = BulkSendReport(
+            outcomes=outcomes,
+            duration_seconds=time.perf_counter() - started,
+            connections_opened=self._connections_opened - opened_before
+        )
+        logger.info(
+            f"Bulk email: {report.sent} sent, {report.failed} failed in "
+            f"{report.duration_seconds:.2f}s ({report.messages_per_second:.1f} msg/s, "
+            f"{report.connections_opened} SMTP connections)"
+        )
+        return report
+
+    def close(self) -> None:
+        """Close pooled connections and stop the worker pool"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+        self._executor.shutdown(wait=True)
+
+    def _build_message(self, email: OutgoingEmail) -> str:
+        settings = self.settings
+        msg = MIMEMultipart('alternative')
+        msg['From'] = f"{settings.from_name} <{settings.from_email}>"
+        msg['To'] = f"{email.to_name} <{email.to_email}>"
+        msg['Subject'] = email.subject
+        msg.attach(MIMEText(email.html, 'html'))
+        return msg.as_string()
+
+    def _acquire(self) -> _SMTPConnection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        connection = _SMTPConnection(self.settings)
+        connection.open()
+        with self._lock:
+            self._connections_opened += 1
+        return connection
+
+    def _release(self, connection: _SMTPConnection) -> None:
+        if connection.messages_sent >= self.messages_per_connection:
+            # Stay under per-session message caps enforced by many providers
+            connection.close()
+            return
+        with self._lock:
+            self._idle.append(connection)
+
+    def _send_blocking(self, email: OutgoingEmail) -> RecipientOutcome:
+        """Runs on a worker thread"""
+        started = time.perf_counter()
+        outcome = RecipientOutcome(hospital_id=email.hospital_id, to_email=email.to_email, status="failed")
+        message = self._build_message(email)
+
+        while outcome.attempts < self.max_attempts:
+            outcome.attempts += 1
+            connection = None
+            try:
+                connection = self._acquire()
+                connection.server.sendmail(self.settings.from_email, email.to_email, message)
+                connection.messages_sent += 1
+                outcome.status = "sent"
+                outcome.error = None
+                self._release(connection)
+                break
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError) as e:
+                # Stale or dropped connection: discard it and retry on a fresh one
+                outcome.error = str(e)
+                if connection is not None:
+                    connection.close()
+            except smtplib.SMTPException as e:
+                # Recipient or message rejected; the session itself is still usable
+                outcome.error = str(e)
+                if connection is not None:
+                    self._release(connection)
+                break
+
+        outcome.elapsed_ms = (time.perf_counter() - started) * 1000
+        return outcome
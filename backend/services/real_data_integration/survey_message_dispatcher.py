@@ -0,0 +1,326 @@
+"""
+Rate-Aware Survey Message Dispatcher
+Concurrent WhatsApp/SMS fan-out with per-provider token buckets and a resumable outbox
+
+Each provider gets a token bucket sized to its documented send rate, sends
+run with bounded concurrency, throttling responses (429) and transient
+server errors are retried with full-jitter exponential backoff (honouring
+Retry-After), and every state change is appended to a per-campaign outbox
+journal so a crashed campaign resumes with only the unsent messages (and
+failed ones that still have attempts left).
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class ProviderSendError(Exception):
+    """A provider rejected a message; ``status`` and ``retry_after`` drive retries"""
+
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status is None or self.status in RETRYABLE_STATUSES
+
+
+@dataclass
+class ProviderLimits:
+    """Send rate allowed by a messaging provider"""
+    rate_per_second: float
+    burst: int = 1
+
+
+class TokenBucket:
+    """Async token bucket; callers wait until a token is available"""
+
+    def __init__(self, rate_per_second: float, burst: int = 1):
+        self.rate = max(rate_per_second, 1e-6)
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Stop issuing tokens for ``seconds`` (provider asked us to back off)"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+
+@dataclass
+class OutboxMessage:
+    """One queued survey message"""
+    message_id: str
+    provider: str
+    recipient: str
+    body: str
+    hospital_id: str
+    status: str = "pending"  # pending, sent, failed
+    attempts: int = 0
+    last_error: Optional[str] = None
+
+
+class SurveyOutbox:
+    """
+    Append-only JSON-lines journal of a campaign's messages
+
+    Enqueue, sent and failed events are appended as they happen; replaying
+    the journal on open restores each message's latest state. Inside an
+    event loop, events are batched in order and written by one writer task
+    on a worker thread; ``flush`` waits for them to reach the file. Async
+    callers should create outboxes with ``open`` so the replay runs off the
+    loop too.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.messages: Dict[str, OutboxMessage] = {}
+        self._unwritten: List[Dict[str, Any]] = []
+        self._writer: Optional[asyncio.Task] = None
+        self._replay()
+
+    @classmethod
+    async def open(cls, path: Path) -> "SurveyOutbox":
+        """Open an outbox, replaying its journal on a worker thread"""
+        return await asyncio.to_thread(cls, path)
+
+    def _replay(self) -> None:
+        if not self.path.exists():
+            return
+        with open(self.path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # Torn final write from a crash
+                    continue
+                if event["event"] == "enqueued":
+                    self.messages[event["message_id"]] = OutboxMessage(**event["message"])
+                elif event["message_id"] in self.messages:
+                    message = self.messages[event["message_id"]]
+                    message.status = event["event"]
+                    message.attempts = event.get("attempts", message.attempts)
+                    message.last_error = event.get("error")
+
+    def enqueue(self, messages: Iterable[OutboxMessage]) -> int:
+        """Add messages not already in the outbox; returns how many were added"""
+        new = [message for message in messages if message.message_id not in self.messages]
+        for message in new:
+            self.messages[message.message_id] = message
+        self._journal([{"event": "enqueued", "message_id": m.message_id, "message": dict(m.__dict__)}
+                       for m in new])
+        return len(new)
+
+    def pending(self) -> List[OutboxMessage]:
+        return [message for message in self.messages.values() if message.status == "pending"]
+
+    def sendable(self, max_attempts: int) -> List[OutboxMessage]:
+        """Pending messages plus failed ones with attempts left in the budget"""
+        return [message for message in self.messages.values()
+                if message.status == "pending"
+                or (message.status == "failed" and message.attempts < max_attempts)]
+
+    def mark(self, message: OutboxMessage, status: str, error: Optional[str] = None) -> None:
+        message.status = status
+        message.last_error = error
+        event = {
+            "event": status,
+            "message_id": message.message_id,
+            "attempts": message.attempts,
+            "error": error,
+            "at": datetime.now().isoformat()
+        }
+        self._journal([event])
+
+    def _journal(self, events: List[Dict[str, Any]]) -> None:
+        if not events:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._append(events)
+            return
+        self._unwritten.extend(events)
+        if self._writer is None or self._writer.done():
+            self._writer = loop.create_task(self._write_unwritten())
+
+    async def flush(self) -> None:
+        """Wait until every enqueued and marked event is in the journal"""
+        if self._writer is not None:
+            await self._writer
+        if self._unwritten:
+            # The writer task gave up after an I/O error; retry once and surface it
+            events, self._unwritten = self._unwritten, []
+            await asyncio.to_thread(self._append, events)
+
+    def counts(self) -> Dict[str, int]:
+        counts = {"pending": 0, "sent": 0, "failed": 0}
+        for message in self.messages.values():
+            counts[message.status] = counts.get(message.status, 0) + 1
+        return counts
+
+    async def _write_unwritten(self) -> None:
+        while self._unwritten:
+            events, self._unwritten = self._unwritten, []
+            try:
+                await asyncio.to_thread(self._append, events)
+            except OSError as e:
+                logger.error(f"Writing outbox journal {self.path} failed: {e}")
+                self._unwritten[:0] = events
+                return
+
+    def _append(self, events: List[Dict[str, Any]]) -> None:
+        if not events:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a') as f:
+            f.write("".join(json.dumps(event, default=str) + "\n" for event in events))
+            f.flush()
+
+
+@dataclass
+class DispatchReport:
+    """Outcome of one dispatch run over an outbox"""
+    sent: int = 0
+    failed: int = 0
+    retries: int = 0
+    throttled: int = 0
+    resumed_sent: int = 0
+    resumed_failed: int = 0  # failed in earlier runs with no attempts left
+    duration_seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+
+Sender = Callable[[OutboxMessage], Awaitable[None]]
+
+
+class RateAwareDispatcher:
+    """Sends outbox messages concurrently within each provider's rate limit"""
+
+    def __init__(self, providers: Dict[str, ProviderLimits], max_concurrency: int = 10,
+                 max_attempts: int = 5, base_backoff_seconds: float = 0.5,
+                 max_backoff_seconds: float = 30.0):
+        self.buckets = {name: TokenBucket(limits.rate_per_second, limits.burst)
+                        for name, limits in providers.items()}
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+
+    async def dispatch(self, outbox: SurveyOutbox, senders: Dict[str, Sender]) -> DispatchReport:
+        """
+        Send every pending message in ``outbox``
+
+        Messages that failed in a previous run are retried while their attempts
+        (counted across runs) are below ``max_attempts``; the rest are reported
+        in ``resumed_failed`` and ``errors``.
+
+        Args:
+            outbox: Campaign outbox; messages already sent in a previous run are skipped
+            senders: Provider name -> coroutine sending one message (raises ProviderSendError)
+        """
+        report = DispatchReport(resumed_sent=outbox.counts()["sent"])
+        to_send = outbox.sendable(self.max_attempts)
+        for message in outbox.messages.values():
+            if message.status == "failed" and message.attempts >= self.max_attempts:
+                report.resumed_failed += 1
+                report.errors.append(f"{message.hospital_id}: {message.last_error}")
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(message: OutboxMessage) -> None:
+            async with semaphore:
+                await self._send_with_retries(message, outbox, senders[message.provider], report)
+
+        try:
+            await asyncio.gather(*(run(message) for message in to_send))
+        finally:
+            await outbox.flush()
+
+        report.duration_seconds = time.monotonic() - started
+        logger.info(
+            f"Dispatched {report.sent} messages ({report.failed} failed, {report.retries} retries, "
+            f"{report.throttled} throttled, {report.resumed_sent} already sent, "
+            f"{report.resumed_failed} failed earlier) "
+            f"in {report.duration_seconds:.2f}s"
+        )
+        return report
+
+    async def _send_with_retries(self, message: OutboxMessage, outbox: SurveyOutbox,
+                                 send: Sender, report: DispatchReport) -> None:
+        bucket = self.buckets[message.provider]
+
+        while True:
+            await bucket.acquire()
+            message.attempts += 1
+            try:
+                await send(message)
+            except Exception as e:
+                error = e if isinstance(e, ProviderSendError) else ProviderSendError(str(e))
+                if error.status == 429:
+                    report.throttled += 1
+                    if error.retry_after:
+                        bucket.pause(error.retry_after)
+
+                if not error.retryable or message.attempts >= self.max_attempts:
+                    report.failed += 1
+                    report.errors.append(f"{message.hospital_id}: {error}")
+                    outbox.mark(message, "failed", str(error))
+                    return
+
+                report.retries += 1
+                await asyncio.sleep(self._backoff(message.attempts, error.retry_after))
+                continue
+
+            report.sent += 1
+            outbox.mark(message, "sent")
+            return
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Full-jitter exponential backoff, never shorter than Retry-After"""
+        ceiling = min(self.max_backoff_seconds, self.base_backoff_seconds * (2 ** (attempt - 1)))
+        delay = random.uniform(0, ceiling)
+        return max(delay, retry_after or 0.0)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds form only)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
@@ -27,6 +27,8 @@ from ...models.hospital_benchmarks import (
 )
 from ...config.advanced_config_manager import ConfigManager
 from ...services.shared.error_handling import ApplicationError
+from .analytics_batch import AnalyticsConsolidator, collect_platforms_concurrently
+from .analytics_columns import AnalyticsColumns, AnalyticsPointView, PointSource, parse_timestamps
 
 
 class AnalyticsPlatform(Enum):
@@ -454,12 +456,30 @@ class ThirdPartyAnalyticsIntegrator:
  platform_data_sources = [ds for ds in self.data_sources.values() 
  if ds.platform_config.platform_id == platform_id]
 
- for data_source in platform_data_sources:
- try:
- source_data = await self._collect_from_data_source(
+ # Fan out across data sources, capped per platform; results are
+ # recorded in configuration order
+ source_semaphore = asyncio.Semaphore(self._max_concurrent_sources(platform_id))
+
+ async def collect_source(data_source: AnalyticsDataSource) -> Dict[str, Any]:
+ async with source_semaphore:
+ return await self._collect_from_data_source(
  session, data_source, target_hospitals, date_range
  )
 
+ source_results = await asyncio.gather(
+ *(collect_source(data_source) for data_source in platform_data_sources),
+ return_exceptions=True
+ )
+
+ for data_source, source_data in zip(platform_data_sources, source_results):
+ if isinstance(source_data, BaseException):
+ if isinstance(source_data, asyncio.CancelledError):
+ raise source_data
+ error_msg = f"Failed to collect from data source {data_source.source_id}: {str(source_data)}"
+ collection_results["errors"].append(error_msg)
+ self.logger.error(error_msg)
+ continue
+
  if source_data:
  collection_results["collected_data"][data_source.source_id] = source_data
  collection_results["data_sources_processed"].append(data_source.source_id)
@@ -469,11 +489,6 @@ class ThirdPartyAnalyticsIntegrator:
  quality_score = self._calculate_data_quality_score(source_data)
  collection_results["quality_scores"][data_source.source_id] = quality_score
 
- except Exception as e:
- error_msg = f"Failed to collect from data source {data_source.source_id}: {str(e)}"
- collection_results["errors"].append(error_msg)
- self.logger.error(error_msg)
-
  # Calculate overall collection success
  collection_results["success"] = len(collection_results["data_sources_processed"]) > 0
 
@@ -708,7 +723,7 @@ class ThirdPartyAnalyticsIntegrator:
  views_data = await response.json()
 
  # Export data from each view
- collected_data_points = []
+ collected_columns = []
 
  for view in views_data.get("views", {}).get("view", []):
  view_id = view["id"]
@@ -735,19 +750,17 @@ class ThirdPartyAnalyticsIntegrator:
  else:
  df_filtered = df
 
- # Convert to data points
- view_data_points = self._convert_tableau_data_to_points(
+ # Convert to columnar data points
+ collected_columns.append(self._convert_tableau_data_to_points(
  df_filtered, data_source, view["name"]
- )
- collected_data_points.extend(view_data_points)
+ ))
 
  return {
  "data_source_id": data_source.source_id,
  "report_name": data_source.report_name,
  "visualization_type": data_source.visualization_type.value,
  "collection_timestamp": datetime.utcnow().isoformat(),
- "data_points": collected_data_points,
- "hospitals_covered": list(set([dp.hospital_id for dp in collected_data_points]))
+ **self._columnar_points(AnalyticsColumns.concat(collected_columns))
  }
 
  async def _collect_power_bi_data(self, session: ClientSession,
@@ -768,7 +781,7 @@ class ThirdPartyAnalyticsIntegrator:
 
  datasets_data = await response.json()
 
- collected_data_points = []
+ collected_columns = []
 
  for dataset in datasets_data.get("value", []):
  dataset_id = dataset["id"]
@@ -790,18 +803,16 @@ class ThirdPartyAnalyticsIntegrator:
  query_result = await query_response.json()
 
  # Process query results
- dataset_points = self._convert_power_bi_data_to_points(
+ collected_columns.append(self._convert_power_bi_data_to_points(
  query_result, data_source, dataset["name"]
- )
- collected_data_points.extend(dataset_points)
+ ))
 
  return {
  "data_source_id": data_source.source_id,
  "report_name": data_source.report_name,
  "visualization_type": data_source.visualization_type.value,
  "collection_timestamp": datetime.utcnow().isoformat(),
- "data_points": collected_data_points,
- "hospitals_covered": list(set([dp.hospital_id for dp in collected_data_points]))
+ **self._columnar_points(AnalyticsColumns.concat(collected_columns))
  }
 
  async def _collect_qlik_data(self, session: ClientSession,
@@ -821,7 +832,7 @@ class ThirdPartyAnalyticsIntegrator:
 
  apps_data = await response.json()
 
- collected_data_points = []
+ collected_columns = []
 
  for app in apps_data:
  if data_source.report_name.lower() in app.get("name", "").lower():
@@ -837,19 +848,17 @@ class ThirdPartyAnalyticsIntegrator:
  session, base_url, app_id, data_source, hospital_ids
  )
 
- # Convert to data points
- app_points = self._convert_qlik_data_to_points(
+ # Convert to columnar data points
+ collected_columns.append(self._convert_qlik_data_to_points(
  hypercube_data, data_source, app["name"]
- )
- collected_data_points.extend(app_points)
+ ))
 
  return {
  "data_source_id": data_source.source_id,
  "report_name": data_source.report_name,
  "visualization_type": data_source.visualization_type.value,
  "collection_timestamp": datetime.utcnow().isoformat(),
- "data_points": collected_data_points,
- "hospitals_covered": list(set([dp.hospital_id for dp in collected_data_points]))
+ **self._columnar_points(AnalyticsColumns.concat(collected_columns))
  }
 
  async def _collect_custom_dashboard_data(self, session: ClientSession,
@@ -886,8 +895,8 @@ class ThirdPartyAnalyticsIntegrator:
 
  api_data = await response.json()
 
- # Convert API response to data points
- data_points = self._convert_custom_api_data_to_points(
+ # Convert API response to columnar data points
+ columns = self._convert_custom_api_data_to_points(
  api_data, data_source
  )
 
@@ -896,44 +905,37 @@ class ThirdPartyAnalyticsIntegrator:
  "report_name": data_source.report_name,
  "visualization_type": data_source.visualization_type.value,
  "collection_timestamp": datetime.utcnow().isoformat(),
- "data_points": data_points,
- "hospitals_covered": list(set([dp.hospital_id for dp in data_points]))
+ **self._columnar_points(columns)
  }
 
  def _convert_tableau_data_to_points(self, df: pd.DataFrame,
  data_source: AnalyticsDataSource,
- view_name: str) -> List[AnalyticsDataPoint]:
- """Convert Tableau CSV data to analytics data points"""
+ view_name: str) -> AnalyticsColumns:
+ """Convert Tableau CSV data to columnar analytics data points"""
 
- data_points = []
  field_mapping = self.field_mappings.get("tableau_hospital_performance", {})
 
- for _, row in df.iterrows():
- hospital_id = row.get(data_source.hospital_filter_field, "unknown")
- measurement_date = datetime.utcnow()
+ if data_source.hospital_filter_field in df.columns:
+ hospitals = df[data_source.hospital_filter_field]
+ else:
+ hospitals = ["unknown"] * len(df)
 
- if data_source.date_filter_field in row:
- try:
- measurement_date = pd.to_datetime(row[data_source.date_filter_field])
- except:
- pass
+ timestamps = parse_timestamps(
+ df[data_source.date_filter_field] if data_source.date_filter_field in df.columns else None,
+ len(df)
+ )
 
- # Convert each mapped field to a data point
- for standard_field, tableau_field in field_mapping.items():
- if tableau_field in row and pd.notna(row[tableau_field]):
- data_point = AnalyticsDataPoint(
- hospital_id=str(hospital_id),
- metric_name=standard_field,
- metric_value=self._convert_metric_value(row[tableau_field]),
- metric_category=data_source.visualization_type.value,
- measurement_date=measurement_date,
+ return AnalyticsColumns.from_wide(
+ hospitals, timestamps,
+ {standard_field: df[tableau_field] for standard_field, tableau_field in field_mapping.items()
+ if tableau_field in df.columns},
+ PointSource(
  data_source=f"tableau_{view_name}",
+ metric_category=data_source.visualization_type.value,
  platform_type=AnalyticsPlatform.TABLEAU_SERVER,
  confidence_score=90
  )
- data_points.append(data_point)
-
- return data_points
+ )
 
  def _build_power_bi_dax_query(self, data_source: AnalyticsDataSource,
  hospital_ids: List[str],
@@ -966,35 +968,34 @@ class ThirdPartyAnalyticsIntegrator:
 
  def _convert_power_bi_data_to_points(self, query_result: Dict[str, Any],
  data_source: AnalyticsDataSource,
- dataset_name: str) -> List[AnalyticsDataPoint]:
- """Convert Power BI query results to analytics data points"""
-
- data_points = []
-
- for result in query_result.get("results", []):
- for table in result.get("tables", []):
- for row in table.get("rows", []):
- hospital_id = row[0] if row else "unknown"
- measurement_date = datetime.utcnow()
+ dataset_name: str) -> AnalyticsColumns:
+ """Convert Power BI query results to columnar analytics data points"""
 
- # Map Power BI columns to standard metrics
+ # Map Power BI columns (after the hospital column) to standard metrics
  field_mapping = self.field_mappings.get("powerbi_clinical_dashboard", {})
-
- for i, (standard_field, _) in enumerate(field_mapping.items()):
- if i + 1 < len(row) and row[i + 1] is not None:
- data_point = AnalyticsDataPoint(
- hospital_id=str(hospital_id),
- metric_name=standard_field,
- metric_value=self._convert_metric_value(row[i + 1]),
- metric_category=data_source.visualization_type.value,
- measurement_date=measurement_date,
+ source = PointSource(
  data_source=f"powerbi_{dataset_name}",
+ metric_category=data_source.visualization_type.value,
  platform_type=AnalyticsPlatform.POWER_BI,
  confidence_score=85
  )
- data_points.append(data_point)
 
- return data_points
+ tables = []
+ for result in query_result.get("results", []):
+ for table in result.get("tables", []):
+ rows = [row for row in table.get("rows", []) if row]
+ if not rows:
+ continue
+
+ frame = pd.DataFrame(rows)
+ tables.append(AnalyticsColumns.from_wide(
+ frame[0], parse_timestamps(None, len(frame)),
+ {standard_field: frame[i + 1] for i, standard_field in enumerate(field_mapping)
+ if i + 1 in frame.columns},
+ source
+ ))
+
+ return AnalyticsColumns.concat(tables)
 
  async def _execute_qlik_hypercube_query(self, session: ClientSession,
  base_url: str, app_id: str,
@@ -1048,45 +1049,41 @@ class ThirdPartyAnalyticsIntegrator:
 
  def _convert_qlik_data_to_points(self, hypercube_data: Dict[str, Any],
  data_source: AnalyticsDataSource,
- app_name: str) -> List[AnalyticsDataPoint]:
- """Convert QlikSense hypercube data to analytics data points"""
-
- data_points = []
+ app_name: str) -> AnalyticsColumns:
+ """Convert QlikSense hypercube data to columnar analytics data points"""
 
  layout = hypercube_data.get("qLayout", {})
  hypercube = layout.get("qHyperCube", {})
  data_pages = hypercube.get("qDataPages", [])
 
- for page in data_pages:
- for row in page.get("qMatrix", []):
- if row:
- hospital_id = row[0].get("qText", "unknown")
- measurement_date = datetime.utcnow()
-
- # Convert measures to data points
+ # Measures follow the hospital dimension in each row
  field_mapping = self.field_mappings.get("qlik_quality_scorecard", {})
-
- for i, (standard_field, _) in enumerate(field_mapping.items()):
- if i + 1 < len(row) and row[i + 1].get("qNum") is not None:
- data_point = AnalyticsDataPoint(
- hospital_id=str(hospital_id),
- metric_name=standard_field,
- metric_value=self._convert_metric_value(row[i + 1]["qNum"]),
- metric_category=data_source.visualization_type.value,
- measurement_date=measurement_date,
+ source = PointSource(
  data_source=f"qlik_{app_name}",
+ metric_category=data_source.visualization_type.value,
  platform_type=AnalyticsPlatform.QLIK_SENSE,
  confidence_score=88
  )
- data_points.append(data_point)
 
- return data_points
+ pages = []
+ for page in data_pages:
+ matrix = [row for row in page.get("qMatrix", []) if row]
+ if not matrix:
+ continue
 
- def _convert_custom_api_data_to_points(self, api_data: Dict[str, Any],
- data_source: AnalyticsDataSource) -> List[AnalyticsDataPoint]:
- """Convert custom API data to analytics data points"""
+ pages.append(AnalyticsColumns.from_wide(
+ [row[0].get("qText", "unknown") for row in matrix],
+ parse_timestamps(None, len(matrix)),
+ {standard_field: [row[i + 1].get("qNum") if i + 1 < len(row) else None for row in matrix]
+ for i, standard_field in enumerate(field_mapping)},
+ source
+ ))
 
- data_points = []
+ return AnalyticsColumns.concat(pages)
+
+ def _convert_custom_api_data_to_points(self, api_data: Dict[str, Any],
+ data_source: AnalyticsDataSource) -> AnalyticsColumns:
+ """Convert custom API data to columnar analytics data points"""
 
  # Handle different API response formats
  if "data" in api_data:
@@ -1098,32 +1095,26 @@ class ThirdPartyAnalyticsIntegrator:
 
  field_mapping = self.field_mappings.get("analytics_government_schemes", {})
 
- for record in records:
- hospital_id = record.get("hospital_id", record.get("id", "unknown"))
- measurement_date = datetime.utcnow()
-
- if "report_date" in record:
- try:
- measurement_date = datetime.fromisoformat(record["report_date"])
- except:
- pass
-
- # Convert each field to a data point
- for standard_field, api_field in field_mapping.items():
- if api_field in record and record[api_field] is not None:
- data_point = AnalyticsDataPoint(
- hospital_id=str(hospital_id),
- metric_name=standard_field,
- metric_value=self._convert_metric_value(record[api_field]),
- metric_category=data_source.visualization_type.value,
- measurement_date=measurement_date,
+ return AnalyticsColumns.from_wide(
+ [record.get("hospital_id", record.get("id", "unknown")) for record in records],
+ parse_timestamps([record.get("report_date") for record in records], len(records)),
+ {standard_field: [record.get(api_field) for record in records]
+ for standard_field, api_field in field_mapping.items()},
+ PointSource(
  data_source="custom_api",
+ metric_category=data_source.visualization_type.value,
  platform_type=AnalyticsPlatform.CUSTOM_DASHBOARD,
  confidence_score=80
  )
- data_points.append(data_point)
+ )
+
+ def _columnar_points(self, columns: AnalyticsColumns) -> Dict[str, Any]:
+ """Source-data entries for collected columns, with a lazy AnalyticsDataPoint view"""
 
- return data_points
+ return {
+ "data_points": AnalyticsPointView(columns, AnalyticsDataPoint),
+ "hospitals_covered": columns.hospitals_covered()
+ }
 
  def _convert_metric_value(self, value: Any) -> Union[Decimal, int, float, str]:
  """Convert metric value to appropriate type"""
@@ -1156,9 +1147,13 @@ class ThirdPartyAnalyticsIntegrator:
  return 0
 
  quality_score = 100
+ columns = getattr(data_points, "columns", None)
 
  # Completeness check
  total_expected_fields = len(source_data.get("data_fields", []))
+ if columns is not None:
+ actual_fields = len(columns.metric_names())
+ else:
  actual_fields = len(set([dp.metric_name for dp in data_points]))
 
  if total_expected_fields > 0:
@@ -1167,18 +1162,24 @@ class ThirdPartyAnalyticsIntegrator:
  quality_score -= (80 - completeness) * 0.5
 
  # Freshness check
- recent_data = [dp for dp in data_points 
- if (datetime.utcnow() - dp.measurement_date).days <= 7]
+ if columns is not None:
+ recent_count = columns.recent_count(datetime.utcnow(), days=7)
+ else:
+ recent_count = len([dp for dp in data_points 
+ if (datetime.utcnow() - dp.measurement_date).days <= 7])
 
- if len(recent_data) / len(data_points) < 0.8:
+ if recent_count / len(data_points) < 0.8:
  quality_score -= 15
 
  # Consistency check (no null/invalid values)
- invalid_values = [dp for dp in data_points 
- if dp.metric_value in ["N/A", None, "", "null"]]
+ if columns is not None:
+ invalid_count = columns.invalid_count()
+ else:
+ invalid_count = len([dp for dp in data_points 
+ if dp.metric_value in ["N/A", None, "", "null"]])
 
- if len(invalid_values) > 0:
- invalid_ratio = len(invalid_values) / len(data_points)
+ if invalid_count > 0:
+ invalid_ratio = invalid_count / len(data_points)
  quality_score -= invalid_ratio * 20
 
  return max(1, int(quality_score))
@@ -1200,25 +1201,23 @@ class ThirdPartyAnalyticsIntegrator:
  }
 
  try:
- # Collect from each platform
- for platform_id in target_platforms:
- try:
- platform_result = await self.collect_analytics_data(
- platform_id, hospital_ids
+ # Collect from platforms concurrently, merging each result into the
+ # consolidated view as soon as its platform finishes
+ consolidator = AnalyticsConsolidator()
+ platform_ranks = {platform_id: rank for rank, platform_id in enumerate(target_platforms)}
+
+ def merge_platform(platform_id: str, platform_result: Dict[str, Any]) -> None:
+ consolidator.add_platform(platform_id, platform_result, platform_ranks[platform_id])
+
+ batch_results["platform_results"] = await collect_platforms_concurrently(
+ target_platforms,
+ lambda platform_id: self.collect_analytics_data(platform_id, hospital_ids),
+ max_concurrency=self.config.get("analytics.max_concurrent_platforms", 4),
+ timeout_for=self._platform_timeout,
+ on_complete=merge_platform
  )
- batch_results["platform_results"][platform_id] = platform_result
-
- except Exception as e:
- batch_results["platform_results"][platform_id] = {
- "success": False,
- "error": str(e)
- }
 
- # Consolidate data across platforms
- consolidated_data = self._consolidate_analytics_data(
- batch_results["platform_results"]
- )
- batch_results["consolidated_data"] = consolidated_data
+ batch_results["consolidated_data"] = consolidator.result()
 
  # Calculate batch analytics
  successful_platforms = [r for r in batch_results["platform_results"].values() 
@@ -1255,87 +1254,28 @@ class ThirdPartyAnalyticsIntegrator:
 
  return batch_results
 
- def _consolidate_analytics_data(self, platform_results: Dict[str, Any]) -> Dict[str, Any]:
- """Consolidate analytics data from multiple platforms"""
-
- consolidated = {
- "hospitals": {},
- "metrics_summary": {},
- "data_sources": [],
- "quality_overview": {}
- }
-
- all_data_points = []
-
- # Collect all data points from successful platforms
- for platform_id, result in platform_results.items():
- if result.get("success") and result.get("collected_data"):
- for source_id, source_data in result["collected_data"].items():
- data_points = source_data.get("data_points", [])
- all_data_points.extend(data_points)
- consolidated["data_sources"].append({
- "platform_id": platform_id,
- "source_id": source_id,
- "data_points_count": len(data_points)
- })
-
- # Group data points by hospital
- for data_point in all_data_points:
- hospital_id = data_point.hospital_id
-
- if hospital_id not in consolidated["hospitals"]:
- consolidated["hospitals"][hospital_id] = {
- "hospital_id": hospital_id,
- "metrics": {},
- "data_sources": [],
- "last_updated": None
- }
-
- hospital_data = consolidated["hospitals"][hospital_id]
-
- # Add metric data
- metric_key = f"{data_point.metric_category}_{data_point.metric_name}"
- hospital_data["metrics"][metric_key] = {
- "value": str(data_point.metric_value),
- "measurement_date": data_point.measurement_date.isoformat(),
- "data_source": data_point.data_source,
- "confidence_score": data_point.confidence_score
- }
-
- # Track data sources
- if data_point.data_source not in hospital_data["data_sources"]:
- hospital_data["data_sources"].append(data_point.data_source)
-
- # Update last updated timestamp
- if (not hospital_data["last_updated"] or 
- data_point.measurement_date > datetime.fromisoformat(hospital_data["last_updated"])):
- hospital_data["last_updated"] = data_point.measurement_date.isoformat()
-
- # Generate metrics summary
- metric_names = set()
- for hospital_data in consolidated["hospitals"].values():
- metric_names.update(hospital_data["metrics"].keys())
+ def _platform_timeout(self, platform_id: str) -> Optional[float]:
+ """Per-platform collection timeout in seconds (None disables it)"""
+ timeout = self.config.get(
+ f"analytics.platform_timeouts.{platform_id}",
+ self.config.get("analytics.platform_timeout_seconds", 300)
+ )
+ return float(timeout) if timeout else None
 
- for metric_name in metric_names:
- values = []
- for hospital_data in consolidated["hospitals"].values():
- if metric_name in hospital_data["metrics"]:
- try:
- value = float(hospital_data["metrics"][metric_name]["value"])
- values.append(value)
- except (ValueError, TypeError):
- pass
+ def _max_concurrent_sources(self, platform_id: str) -> int:
+ """How many data sources of one platform are collected at once"""
+ return max(1, int(self.config.get(
+ f"analytics.platform_source_concurrency.{platform_id}",
+ self.config.get("analytics.max_concurrent_sources", 4)
+ )))
 
- if values:
- consolidated["metrics_summary"][metric_name] = {
- "hospitals_reporting": len(values),
- "min_value": min(values),
- "max_value": max(values),
- "average_value": sum(values) / len(values),
- "total_hospitals": len(consolidated["hospitals"])
- }
+ def _consolidate_analytics_data(self, platform_results: Dict[str, Any]) -> Dict[str, Any]:
+ """Consolidate analytics data from multiple platforms"""
 
- return consolidated
+ consolidator = AnalyticsConsolidator()
+ for rank, (platform_id, result) in enumerate(platform_results.items()):
+ consolidator.add_platform(platform_id, result, rank)
+ return consolidator.result()
 
  def get_analytics_integration_status(self) -> Dict[str, Any]:
  """Get status of analytics integration services"""
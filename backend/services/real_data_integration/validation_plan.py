@@ -0,0 +1,533 @@
+"""
+Compiled Validation Rule Plans
+Dispatch-table rule engine for hospital data quality validation
+
+Validation rules are compiled once into a plan: rules are grouped by the
+field they read, each rule is bound to its check function with parameters
+(and regexes) resolved up front, and severity counters are updated as rules
+run instead of in separate passes over the results. Plans also evaluate
+whole batches of records column by column, using vectorized checks for
+required fields, ranges, percentages, pincodes, city tiers, name formats and
+timestamps; only rows that fail a vectorized check are re-run through the
+scalar check to produce its exact message.
+"""
+
+import re
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+CheckResult = Tuple[bool, str]
+Check = Callable[[Any, Mapping[str, Any]], CheckResult]
+VectorCheck = Callable[["BatchColumns", str], np.ndarray]
+
+PINCODE_PATTERN = re.compile(r'^\d{6}$')
+PINCODE_VECTOR_PATTERN = r'[1-9]\d{5}'
+# Timestamps the vectorized freshness check parses; anything else is checked one by one
+ISO_TIMESTAMP_VECTOR_PATTERN = r'\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?)?'
+
+TEST_HOSPITAL_NAMES = frozenset(['test', 'demo', 'sample', 'example'])
+
+ESSENTIAL_FIELDS = (
+    "hospital_name", "bed_occupancy_rate", "average_length_of_stay",
+    "total_revenue", "patient_satisfaction_score"
+)
+
+
+# Scalar checks
+
+def check_required(value: Any) -> CheckResult:
+    """Validate that required field has a value"""
+    if value is None or value == "" or (isinstance(value, str) and value.strip() == ""):
+        return False, "Required field is empty or missing"
+    return True, "Required field validation passed"
+
+
+def check_hospital_name_format(value: Any) -> CheckResult:
+    """Validate hospital name format"""
+    if not value or not isinstance(value, str):
+        return False, "Hospital name must be a non-empty string"
+
+    name = value.strip()
+
+    # Check minimum length
+    if len(name) < 3:
+        return False, "Hospital name too short (minimum 3 characters)"
+
+    # Check for suspicious patterns
+    if name.lower() in TEST_HOSPITAL_NAMES:
+        return False, "Hospital name appears to be test data"
+
+    # Check for proper capitalization (basic check)
+    if name.islower() or name.isupper():
+        return False, "Hospital name should use proper capitalization"
+
+    return True, "Hospital name format validation passed"
+
+
+def compile_city_tier_check(valid_values: Sequence[str]) -> Callable[[Any], CheckResult]:
+    """City tier check with the accepted values lower-cased once"""
+    accepted = frozenset(v.lower() for v in valid_values)
+    listing = ', '.join(valid_values)
+
+    def check_city_tier(value: Any) -> CheckResult:
+        if not value:
+            return False, "City tier is required"
+        if str(value).lower().strip() not in accepted:
+            return False, f"Invalid city tier '{value}'. Valid values: {listing}"
+        return True, "City tier validation passed"
+
+    return check_city_tier
+
+
+def check_pincode_format(value: Any) -> CheckResult:
+    """Validate Indian pincode format"""
+    if not value:
+        return False, "Pincode is required"
+
+    pincode_str = str(value).strip()
+
+    # Indian pincode must be exactly 6 digits
+    if not PINCODE_PATTERN.match(pincode_str):
+        return False, "Pincode must be exactly 6 digits"
+
+    # Basic range validation (Indian pincodes start from 100000)
+    pincode_int = int(pincode_str)
+    if not (100000 <= pincode_int <= 999999):
+        return False, "Invalid pincode range"
+
+    return True, "Pincode format validation passed"
+
+
+def check_percentage_range(value: Any, min_val: float = 0, max_val: float = 100) -> CheckResult:
+    """Validate percentage value within range"""
+    if value is None:
+        return False, "Percentage value is required"
+
+    try:
+        num_value = float(value)
+        if not (min_val <= num_value <= max_val):
+            return False, f"Value {num_value}% is outside valid range ({min_val}%-{max_val}%)"
+        return True, "Percentage range validation passed"
+
+    except (ValueError, TypeError):
+        return False, f"Invalid percentage value: {value}"
+
+
+def check_numeric_range(value: Any, min_val: Optional[float] = None,
+                        max_val: Optional[float] = None) -> CheckResult:
+    """Validate numeric value within range"""
+    if value is None:
+        return False, "Numeric value is required"
+
+    try:
+        num_value = float(value)
+
+        if min_val is not None and num_value < min_val:
+            return False, f"Value {num_value} is below minimum ({min_val})"
+
+        if max_val is not None and num_value > max_val:
+            return False, f"Value {num_value} is above maximum ({max_val})"
+
+        return True, "Numeric range validation passed"
+
+    except (ValueError, TypeError):
+        return False, f"Invalid numeric value: {value}"
+
+
+def check_positive_value(value: Any) -> CheckResult:
+    """Validate that value is positive"""
+    if value is None:
+        return False, "Value is required"
+
+    try:
+        num_value = float(value)
+        if num_value <= 0:
+            return False, f"Value must be positive, got: {num_value}"
+
+        return True, "Positive value validation passed"
+
+    except (ValueError, TypeError):
+        return False, f"Invalid numeric value: {value}"
+
+
+def check_scheme_revenue_consistency(data: Mapping[str, Any]) -> CheckResult:
+    """Validate government scheme revenue consistency"""
+    try:
+        total_revenue = float(data.get("total_revenue", 0))
+        scheme_revenue = float(data.get("government_scheme_revenue", 0))
+
+        if scheme_revenue > total_revenue:
+            return False, "Government scheme revenue cannot exceed total revenue"
+
+        # Check if scheme revenue percentage is reasonable
+        if total_revenue > 0:
+            scheme_percentage = (scheme_revenue / total_revenue) * 100
+            if scheme_percentage > 80:  # More than 80% seems unusual
+                return False, f"Government scheme revenue ({scheme_percentage:.1f}%) seems unusually high"
+
+        return True, "Scheme revenue consistency validation passed"
+
+    except (ValueError, TypeError):
+        return False, "Invalid revenue values for consistency check"
+
+
+def check_data_completeness(data: Mapping[str, Any]) -> CheckResult:
+    """Validate essential data completeness"""
+    missing_fields = [field for field in ESSENTIAL_FIELDS
+                      if field not in data or data[field] is None or data[field] == ""]
+
+    if missing_fields:
+        return False, f"Missing essential fields: {', '.join(missing_fields)}"
+
+    return True, "Data completeness validation passed"
+
+
+def check_data_freshness(value: Any, max_age_days: int = 90) -> CheckResult:
+    """Validate data timestamp freshness"""
+    if not value:
+        return False, "Data timestamp is required"
+
+    try:
+        if isinstance(value, str):
+            timestamp = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        elif isinstance(value, datetime):
+            timestamp = value
+        else:
+            return False, "Invalid timestamp format"
+
+        cutoff_date = datetime.utcnow() - timedelta(days=max_age_days)
+
+        if timestamp < cutoff_date:
+            age_days = (datetime.utcnow() - timestamp).days
+            return False, f"Data is {age_days} days old (maximum {max_age_days} days)"
+
+        return True, "Data freshness validation passed"
+
+    except (ValueError, TypeError):
+        return False, "Invalid timestamp value"
+
+
+# Column access for batch evaluation
+
+class BatchColumns:
+    """Per-field columns over a batch of records, extracted once and cached"""
+
+    def __init__(self, records: Sequence[Mapping[str, Any]]):
+        self.records = records
+        self._values: Dict[Tuple[str, Any], List[Any]] = {}
+        self._series: Dict[Tuple[str, Any], pd.Series] = {}
+        self._numeric: Dict[Tuple[str, Any], np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def values(self, field: str, default: Any = None) -> List[Any]:
+        key = (field, default)
+        column = self._values.get(key)
+        if column is None:
+            column = self._values[key] = [record.get(field, default) for record in self.records]
+        return column
+
+    def series(self, field: str, default: Any = None) -> pd.Series:
+        key = (field, default)
+        column = self._series.get(key)
+        if column is None:
+            column = self._series[key] = pd.Series(self.values(field, default), dtype=object)
+        return column
+
+    def numeric(self, field: str, default: Any = None) -> np.ndarray:
+        """float64 column; NaN wherever ``float()`` would not give a number"""
+        key = (field, default)
+        column = self._numeric.get(key)
+        if column is None:
+            parsed = pd.to_numeric(self.series(field, default), errors="coerce")
+            column = self._numeric[key] = parsed.to_numpy(dtype=np.float64, na_value=np.nan)
+        return column
+
+    def present(self, field: str) -> np.ndarray:
+        """Not None/NaN and not an empty or blank string"""
+        series = self.series(field)
+        present = series.notna().to_numpy(copy=True)
+        is_text = series.map(type).eq(str).to_numpy()
+        if is_text.any():
+            present[is_text] &= series[is_text].str.strip().ne("").to_numpy(dtype=bool)
+        return present
+
+
+# Vectorized checks. Each returns a pass mask that never passes a value the
+# scalar check would fail; rows it fails are re-checked one by one.
+
+def _vector_required(columns: BatchColumns, field: str) -> np.ndarray:
+    return columns.present(field)
+
+
+def _vector_range(min_val: Optional[float], max_val: Optional[float]) -> VectorCheck:
+    def check(columns: BatchColumns, field: str) -> np.ndarray:
+        values = columns.numeric(field)
+        with np.errstate(invalid="ignore"):
+            passed = ~np.isnan(values)
+            if min_val is not None:
+                passed &= values >= min_val
+            if max_val is not None:
+                passed &= values <= max_val
+        return passed
+    return check
+
+
+def _vector_positive(columns: BatchColumns, field: str) -> np.ndarray:
+    values = columns.numeric(field)
+    with np.errstate(invalid="ignore"):
+        return values > 0
+
+
+def _vector_hospital_name(columns: BatchColumns, field: str) -> np.ndarray:
+    series = columns.series(field)
+    is_text = series.map(type).eq(str).to_numpy()
+    names = series.where(is_text, "").astype(str).str.strip()
+    return (is_text
+            & names.str.len().ge(3).to_numpy()
+            & ~names.str.lower().isin(list(TEST_HOSPITAL_NAMES)).to_numpy()
+            & ~names.str.islower().to_numpy(dtype=bool)
+            & ~names.str.isupper().to_numpy(dtype=bool))
+
+
+def _vector_freshness(max_age_days: int) -> VectorCheck:
+    def check(columns: BatchColumns, field: str) -> np.ndarray:
+        series = columns.series(field)
+        text = series.where(series.map(type).eq(str), "").astype(str)
+        iso = text.str.fullmatch(ISO_TIMESTAMP_VECTOR_PATTERN).to_numpy(dtype=bool)
+        parsed = pd.to_datetime(text.where(iso), errors="coerce", format="ISO8601")
+        cutoff = np.datetime64(datetime.utcnow() - timedelta(days=max_age_days), "us")
+        stamps = parsed.to_numpy(dtype="datetime64[us]")
+        return iso & ~np.isnat(stamps) & (stamps >= cutoff)
+    return check
+
+
+def _vector_pincode(columns: BatchColumns, field: str) -> np.ndarray:
+    text = columns.series(field).astype(str).str.strip()
+    return text.str.fullmatch(PINCODE_VECTOR_PATTERN).to_numpy(dtype=bool)
+
+
+def _vector_city_tier(valid_values: Sequence[str]) -> VectorCheck:
+    accepted = [v.lower() for v in valid_values]
+
+    def check(columns: BatchColumns, field: str) -> np.ndarray:
+        text = columns.series(field).astype(str).str.lower().str.strip()
+        return text.isin(accepted).to_numpy() & columns.series(field).notna().to_numpy()
+    return check
+
+
+def _vector_scheme_consistency(columns: BatchColumns, field: str) -> np.ndarray:
+    total = columns.numeric("total_revenue", 0)
+    scheme = columns.numeric("government_scheme_revenue", 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        share = np.where(total > 0, scheme / np.where(total > 0, total, 1) * 100, 0)
+        return ~np.isnan(total) & ~np.isnan(scheme) & (scheme <= total) & (share <= 80)
+
+
+def _vector_completeness(columns: BatchColumns, field: str) -> np.ndarray:
+    passed = np.ones(len(columns), dtype=bool)
+    for essential in ESSENTIAL_FIELDS:
+        passed &= columns.present(essential)
+    return passed
+
+
+def _value_check(check: Callable[[Any], CheckResult]) -> Check:
+    return lambda value, record: check(value)
+
+
+def _range_bounds(parameters: Mapping[str, Any], default_min: Any, default_max: Any) -> Tuple[Any, Any]:
+    return parameters.get("min_value", default_min), parameters.get("max_value", default_max)
+
+
+def _compile_percentage(parameters: Mapping[str, Any]) -> Tuple[Check, VectorCheck]:
+    min_val, max_val = _range_bounds(parameters, 0, 100)
+    return (lambda value, record: check_percentage_range(value, min_val, max_val),
+            _vector_range(min_val, max_val))
+
+
+def _compile_numeric(parameters: Mapping[str, Any]) -> Tuple[Check, VectorCheck]:
+    min_val, max_val = _range_bounds(parameters, None, None)
+    return (lambda value, record: check_numeric_range(value, min_val, max_val),
+            _vector_range(min_val, max_val))
+
+
+def _compile_city_tier(parameters: Mapping[str, Any]) -> Tuple[Check, VectorCheck]:
+    valid_values = parameters.get("valid_values", [])
+    return _value_check(compile_city_tier_check(valid_values)), _vector_city_tier(valid_values)
+
+
+def _compile_freshness(parameters: Mapping[str, Any]) -> Tuple[Check, VectorCheck]:
+    max_age_days = parameters.get("max_age_days", 90)
+    return lambda value, record: check_data_freshness(value, max_age_days), _vector_freshness(max_age_days)
+
+
+# validation_function -> parameters -> (scalar check, vectorized check or None)
+CHECK_COMPILERS: Dict[str, Callable[[Mapping[str, Any]], Tuple[Check, Optional[VectorCheck]]]] = {
+    "validate_required": lambda p: (_value_check(check_required), _vector_required),
+    "validate_hospital_name_format": lambda p: (_value_check(check_hospital_name_format), _vector_hospital_name),
+    "validate_city_tier": _compile_city_tier,
+    "validate_pincode_format": lambda p: (_value_check(check_pincode_format), _vector_pincode),
+    "validate_percentage_range": _compile_percentage,
+    "validate_numeric_range": _compile_numeric,
+    "validate_positive_value": lambda p: (_value_check(check_positive_value), _vector_positive),
+    "validate_scheme_revenue_consistency": lambda p: (
+        lambda value, record: check_scheme_revenue_consistency(record), _vector_scheme_consistency),
+    "validate_data_completeness": lambda p: (
+        lambda value, record: check_data_completeness(record), _vector_completeness),
+    "validate_data_freshness": _compile_freshness,
+}
+
+
+class CompiledRule:
+    """A validation rule bound to its check functions"""
+
+    __slots__ = ("rule", "severity", "check", "vector_check")
+
+    def __init__(self, rule: Any):
+        self.rule = rule
+        self.severity = rule.severity
+        compiler = CHECK_COMPILERS.get(rule.validation_function)
+        if compiler is None:
+            message = f"Unknown validation function: {rule.validation_function}"
+            self.check: Check = lambda value, record: (False, message)
+            self.vector_check: Optional[VectorCheck] = None
+        else:
+            self.check, self.vector_check = compiler(rule.parameters or {})
+
+
+class RuleCounts:
+    """Validation totals for one record, counted as rules run"""
+
+    __slots__ = ("total", "passed", "failed_by_severity")
+
+    def __init__(self, total: int = 0, passed: int = 0,
+                 failed_by_severity: Optional[Dict[Any, int]] = None):
+        self.total = total
+        self.passed = passed
+        self.failed_by_severity: Dict[Any, int] = failed_by_severity or {}
+
+    @property
+    def failed(self) -> int:
+        return self.total - self.passed
+
+    def failed_with(self, severity: Any) -> int:
+        return self.failed_by_severity.get(severity, 0)
+
+
+# emit(rule, passed, message, value, severity) / emit_batch(row, rule, ...)
+Emit = Callable[[Any, bool, str, Any, Any], None]
+BatchEmit = Callable[[int, Any, bool, str, Any, Any], None]
+
+
+class RulePlan:
+    """
+    Enabled validation rules compiled and grouped by field
+
+    Args:
+        rules: ValidationRule objects, in evaluation order within each field
+        error_severity: Severity reported when a check raises
+    """
+
+    def __init__(self, rules: Iterable[Any], error_severity: Any):
+        self.error_severity = error_severity
+        grouped: Dict[str, List[CompiledRule]] = {}
+        for rule in rules:
+            if rule.enabled:
+                grouped.setdefault(rule.field_name, []).append(CompiledRule(rule))
+        self.fields: Tuple[Tuple[str, Tuple[CompiledRule, ...]], ...] = tuple(
+            (field, tuple(compiled)) for field, compiled in grouped.items()
+        )
+        self.rule_count = sum(len(compiled) for _, compiled in self.fields)
+
+    def evaluate(self, record: Mapping[str, Any], emit: Optional[Emit] = None) -> RuleCounts:
+        """Run every rule against one record"""
+        counts = RuleCounts()
+        failed = counts.failed_by_severity
+        get = record.get
+
+        for field, compiled_rules in self.fields:
+            value = get(field)
+            for compiled in compiled_rules:
+                severity = compiled.severity
+                try:
+                    passed, message = compiled.check(value, record)
+                except Exception as e:
+                    passed, message = False, f"Validation execution error: {str(e)}"
+                    severity = self.error_severity
+
+                counts.total += 1
+                if passed:
+                    counts.passed += 1
+                else:
+                    failed[severity] = failed.get(severity, 0) + 1
+                if emit is not None:
+                    emit(compiled.rule, passed, message, value, severity)
+
+        return counts
+
+    def evaluate_batch(self, records: Sequence[Mapping[str, Any]],
+                       emit: Optional[BatchEmit] = None) -> List[RuleCounts]:
+        """Run every rule against a batch, one column at a time"""
+        columns = BatchColumns(records)
+        row_count = len(records)
+        passed_counts = np.zeros(row_count, dtype=np.int64)
+        failed_counts: Dict[Any, np.ndarray] = {}
+
+        for field, compiled_rules in self.fields:
+            values = columns.values(field)
+            for compiled in compiled_rules:
+                mask = None
+                if compiled.vector_check is not None and row_count:
+                    try:
+                        mask = compiled.vector_check(columns, field)
+                    except Exception:
+                        mask = None
+                if mask is None:
+                    mask = np.zeros(row_count, dtype=bool)
+                vector_passed = mask
+                mask = mask.copy()
+
+                pass_message = None
+                if emit is not None and vector_passed.any():
+                    first = int(np.argmax(vector_passed))
+                    pass_message = compiled.check(values[first], records[first])[1]
+
+                # Rows the vectorized check could not pass get the exact scalar verdict
+                for row in np.flatnonzero(~mask).tolist():
+                    severity = compiled.severity
+                    try:
+                        passed, message = compiled.check(values[row], records[row])
+                    except Exception as e:
+                        passed, message = False, f"Validation execution error: {str(e)}"
+                        severity = self.error_severity
+
+                    if passed:
+                        mask[row] = True
+                    else:
+                        counts = failed_counts.get(severity)
+                        if counts is None:
+                            counts = failed_counts[severity] = np.zeros(row_count, dtype=np.int64)
+                        counts[row] += 1
+                    if emit is not None:
+                        emit(row, compiled.rule, passed, message, values[row], severity)
+
+                passed_counts += mask
+                if emit is not None and pass_message is not None:
+                    rule, severity = compiled.rule, compiled.severity
+                    for row in np.flatnonzero(vector_passed).tolist():
+                        emit(row, rule, True, pass_message, values[row], severity)
+
+        failed_lists = {severity: counts.tolist() for severity, counts in failed_counts.items()}
+        return [
+            RuleCounts(
+                total=self.rule_count,
+                passed=int(passed),
+                failed_by_severity={severity: counts[row] for severity, counts in failed_lists.items()
+                                    if counts[row]}
+            )
+            for row, passed in enumerate(passed_counts.tolist())
+        ]
@@ -18,7 +18,6 @@ from enum import Enum
 import structlog
 from fastapi import Request, HTTPException, status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
 from pydantic import BaseModel, Field
 
 
@@ -401,20 +400,50 @@ class ErrorHandler:
  self.error_stats.clear()
 
 
-class ErrorMiddleware(BaseHTTPMiddleware):
+class ErrorMiddleware:
  """
- FastAPI middleware for handling errors and exceptions.
+ ASGI middleware for handling errors and exceptions.
+
+ The error context is only built when a request fails, from the scope as
+ it stands then (so routed path parameters are included).
  """
 
  def __init__(self, app, error_handler: Optional[ErrorHandler] = None):
- super().__init__(app)
+ self.app = app
  self.error_handler = error_handler or ErrorHandler()
 
- async def dispatch(self, request: Request, call_next):
+ async def __call__(self, scope, receive, send):
  """Process request and handle any errors."""
+ if scope["type"] != "http":
+ await self.app(scope, receive, send)
+ return
+
+ response_started = False
+
+ async def send_tracking(message):
+ nonlocal response_started
+ if message["type"] == "http.response.start":
+ response_started = True
+ await send(message)
+
  try:
- # Create error context from request
- context = ErrorContext(
+ await self.app(scope, receive, send_tracking)
+ except Exception as exc:
+ if response_started:
+ # Too late for an error response; let the server close the connection
+ raise
+
+ # Handle unexpected errors
+ error = self.error_handler.handle_error(exc, self.build_context(Request(scope)))
+
+ # Return appropriate HTTP response
+ response = self._create_error_response(error)
+ await response(scope, receive, send)
+
+ @staticmethod
+ def build_context(request: Request) -> ErrorContext:
+ """Create error context from a failed request."""
+ return ErrorContext(
  request_id=getattr(request.state, 'request_id', None),
  endpoint=str(request.url.path),
  method=request.method,
@@ -422,23 +451,10 @@ class ErrorMiddleware(BaseHTTPMiddleware):
  user_agent=request.headers.get('user-agent'),
  additional_data={
  'query_params': dict(request.query_params),
- 'path_params': dict(request.path_params) if hasattr(request, 'path_params') else {}
+ 'path_params': dict(request.path_params)
  }
  )
 
- # Add context to request state for use in handlers
- request.state.error_context = context
-
- response = await call_next(request)
- return response
-
- except Exception as exc:
- # Handle unexpected errors
- error = self.error_handler.handle_error(exc, context)
-
- # Return appropriate HTTP response
- return self._create_error_response(error)
-
  def _create_error_response(self, error: ApplicationError) -> JSONResponse:
  """Create HTTP error response from ApplicationError."""
  # Map error severity to HTTP status codes
@@ -0,0 +1,178 @@
+"""
+Request instrumentation for the hospital APIs.
+
+``RequestInstrumentationMiddleware`` is a plain ASGI middleware (no
+``BaseHTTPMiddleware`` task and stream wrapping) that records, per request:
+
+* latency in a histogram labelled by method, route template and status;
+* requests in flight in a gauge labelled by method;
+* completed requests in a counter labelled by method, route and status.
+
+``observe_stage`` feeds a per-stage histogram from ``stage_timing`` scopes.
+
+Routes are labelled by their template (``/analysis/{analysis_id}``) rather
+than the raw path so label cardinality stays bounded, and labelled metric
+children are cached so the per-request cost is a dict lookup and two
+observations. Request IDs come from a process-local counter instead of
+``uuid4``, and the access log line is formatted only if it will be emitted.
+``metrics_response`` renders the registry for a ``/metrics`` endpoint.
+"""
+
+import itertools
+import logging
+import os
+import re
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Seconds; the analysis endpoints run well past the default 10s top bucket
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+_KNOWN_METHODS = frozenset(("GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"))
+
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """Template of the route that handled the request, once routing has run"""
+    route = scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if path:
+        return scope.get("root_path", "") + path
+    return UNMATCHED_ROUTE
+
+
+class RequestMetrics:
+    """Prometheus collectors for HTTP requests, with cached label children"""
+
+    def __init__(self, registry: Optional[CollectorRegistry] = REGISTRY, namespace: str = "hospital_api",
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        """
+        Args:
+            registry: Registry to register with (the process default unless
+                given; tests pass a fresh ``CollectorRegistry``)
+            namespace: Metric name prefix
+            buckets: Latency histogram buckets in seconds
+        """
+        self.registry = registry
+        self.latency = Histogram("http_request_duration_seconds", "HTTP request latency",
+                                 ("method", "route", "status"), namespace=namespace,
+                                 buckets=tuple(buckets), registry=registry)
+        self.in_flight = Gauge("http_requests_in_progress", "HTTP requests currently being served",
+                               ("method",), namespace=namespace, registry=registry)
+        self.requests = Counter("http_requests", "HTTP requests completed",
+                                ("method", "route", "status"), namespace=namespace, registry=registry)
+        self.stage_latency = Histogram("stage_duration_seconds", "Analysis pipeline stage latency",
+                                       ("stage",), namespace=namespace, buckets=tuple(buckets),
+                                       registry=registry)
+        self._children: Dict[Tuple[str, str, int], Tuple[Any, Any]] = {}
+        self._in_flight_children: Dict[str, Any] = {}
+        self._stage_children: Dict[str, Any] = {}
+
+    def in_flight_for(self, method: str) -> Any:
+        child = self._in_flight_children.get(method)
+        if child is None:
+            child = self._in_flight_children[method] = self.in_flight.labels(method)
+        return child
+
+    def observe(self, method: str, route: str, status: int, duration: float) -> None:
+        key = (method, route, status)
+        children = self._children.get(key)
+        if children is None:
+            status_label = str(status)
+            children = self._children[key] = (self.latency.labels(method, route, status_label),
+                                              self.requests.labels(method, route, status_label))
+        children[0].observe(duration)
+        children[1].inc()
+
+    def observe_stage(self, stage: str, duration: float) -> None:
+        """Stage observer for ``stage_timing.add_stage_observer``"""
+        child = self._stage_children.get(stage)
+        if child is None:
+            child = self._stage_children[stage] = self.stage_latency.labels(stage)
+        child.observe(duration)
+
+
+def metrics_response(registry: Optional[CollectorRegistry] = None) -> Tuple[bytes, str]:
+    """Exposition body and content type for a ``/metrics`` endpoint"""
+    return generate_latest(registry if registry is not None else REGISTRY), CONTENT_TYPE_LATEST
+
+
+# Incoming IDs are echoed into headers and logs; anything else is replaced
+_VALID_REQUEST_ID = re.compile(rb"[A-Za-z0-9._:-]{1,128}")
+
+
+def _request_id_factory() -> Callable[[], str]:
+    prefix = f"{os.getpid():x}-{int(time.time()):x}"
+    counter = itertools.count(1)
+    return lambda: f"{prefix}-{next(counter):x}"
+
+
+class RequestInstrumentationMiddleware:
+    """
+    ASGI middleware recording request metrics, IDs and one access log line
+
+    Adds ``X-Request-ID`` (an incoming one is kept if it is at most 128
+    characters of ``[A-Za-z0-9._:-]``) and ``X-Processing-Time``
+    response headers, and exposes the ID as ``request.state.request_id``.
+    Add it with ``app.add_middleware(RequestInstrumentationMiddleware, metrics=...)``.
+    """
+
+    def __init__(self, app: Callable, metrics: RequestMetrics,
+                 access_logger: Optional[logging.Logger] = None,
+                 exempt_paths: Iterable[str] = ("/metrics",)):
+        self.app = app
+        self.metrics = metrics
+        self.access_logger = access_logger or logger
+        self.exempt_paths = frozenset(exempt_paths)
+        self._next_request_id = _request_id_factory()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers") or ():
+            if name == b"x-request-id":
+                if _VALID_REQUEST_ID.fullmatch(value):
+                    request_id = value.decode("ascii")
+                break
+        if request_id is None:
+            request_id = self._next_request_id()
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        method = scope.get("method", "GET")
+        if method not in _KNOWN_METHODS:
+            method = "OTHER"
+        status_code = 500
+        started = time.perf_counter()
+        in_flight = self.metrics.in_flight_for(method)
+        in_flight.inc()
+
+        async def send_with_headers(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message = dict(message)
+                message["headers"] = list(message.get("headers") or []) + [
+                    (b"x-request-id", request_id.encode("latin-1")),
+                    (b"x-processing-time", f"{time.perf_counter() - started:.6f}".encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            duration = time.perf_counter() - started
+            in_flight.dec()
+            route = route_template(scope)
+            self.metrics.observe(method, route, status_code, duration)
+            if self.access_logger.isEnabledFor(logging.INFO):
+                self.access_logger.info("Request %s: %s %s completed in %.3fs with status %d",
+                                        request_id, method, scope.get("path"), duration, status_code)
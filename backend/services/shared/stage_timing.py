@@ -0,0 +1,225 @@
+"""
+Per-stage timing and sampled profiling for the analysis pipeline.
+
+``track_stages`` opens a recording scope for one analysis (or request);
+inside it, ``span`` context managers and ``@timed`` functions add their
+wall-clock time to the scope's ``StageTimer`` under dotted names that follow
+the nesting (``benchmarking.lifecycle.velocity_score``). The active scope
+lives in a ``ContextVar``, so concurrent requests and tasks never mix their
+timings, and outside a scope - or with ``STAGE_TIMING=0`` - a span is one
+``ContextVar.get`` returning a shared no-op.
+
+When the outermost scope closes, every stage is passed to the registered
+observers (e.g. a Prometheus histogram). Setting ``PROFILE_SAMPLE_RATE``
+(0.0-1.0) also runs ``cProfile`` for that fraction of scopes and writes the
+stats to ``PROFILE_OUTPUT_DIR``; the profiler sees everything the thread
+runs meanwhile, including other requests' coroutines, so sample sparingly.
+
+Environment:
+    STAGE_TIMING          "0" disables recording (default enabled)
+    PROFILE_SAMPLE_RATE   Fraction of scopes to profile (default 0)
+    PROFILE_OUTPUT_DIR    Directory for .prof files (default: temp dir)
+"""
+
+import cProfile
+import functools
+import inspect
+import logging
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+StageObserver = Callable[[str, float], None]
+
+ENABLED = os.getenv("STAGE_TIMING", "1").lower() not in ("0", "false", "no", "off")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0") or 0)
+PROFILE_OUTPUT_DIR = Path(os.getenv("PROFILE_OUTPUT_DIR") or Path(tempfile.gettempdir()) / "hospital-profiles")
+
+_observers: List[StageObserver] = []
+_profiler_lock = threading.Lock()
+
+# (timer, dotted name of the enclosing span) for the current context
+_current: ContextVar[Optional[Tuple["StageTimer", str]]] = ContextVar("stage_timing", default=None)
+
+
+class StageTimer:
+    """Accumulated seconds per stage for one recording scope"""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.stages: Dict[str, float] = {}
+        self.started = time.perf_counter()
+        self.profile_path: Optional[Path] = None
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self, digits: int = 6) -> Dict[str, float]:
+        """Stage timings rounded for results and API responses"""
+        return {stage: round(seconds, digits) for stage, seconds in self.stages.items()}
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("timer", "name", "token", "started")
+
+    def __init__(self, timer: StageTimer, name: str):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.token = _current.set((self.timer, self.name))
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timer.add(self.name, time.perf_counter() - self.started)
+        _current.reset(self.token)
+        return False
+
+
+def span(name: str):
+    """Time the enclosed block as stage ``name`` (nested under any open span)"""
+    state = _current.get()
+    if state is None:
+        return _NOOP_SPAN
+    timer, parent = state
+    return _Span(timer, f"{parent}.{name}" if parent else name)
+
+
+def timed(name: Optional[str] = None):
+    """Decorator timing each call of a sync or async function as a stage"""
+
+    def decorate(func):
+        stage = name or func.__name__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+
+def current_timer() -> Optional[StageTimer]:
+    state = _current.get()
+    return state[0] if state is not None else None
+
+
+def add_stage_observer(observer: StageObserver) -> None:
+    """Receive ``(stage, seconds)`` for every stage when a scope completes"""
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def remove_stage_observer(observer: StageObserver) -> None:
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+@contextmanager
+def track_stages(label: str = "analysis", enabled: Optional[bool] = None,
+                 profile_rate: Optional[float] = None) -> Iterator[Optional[StageTimer]]:
+    """
+    Record stage timings for the enclosed block
+
+    Nested inside another scope, the enclosing timer is reused (and only the
+    outermost scope reports). Yields None when timing is disabled.
+
+    Args:
+        label: Scope name, used in profile file names
+        enabled: Overrides ``STAGE_TIMING``
+        profile_rate: Overrides ``PROFILE_SAMPLE_RATE``
+    """
+    state = _current.get()
+    if state is not None:
+        yield state[0]
+        return
+    if not (ENABLED if enabled is None else enabled):
+        yield None
+        return
+
+    timer = StageTimer(label)
+    token = _current.set((timer, ""))
+    profiler = _start_profiler(PROFILE_SAMPLE_RATE if profile_rate is None else profile_rate)
+    try:
+        yield timer
+    finally:
+        _current.reset(token)
+        if profiler is not None:
+            timer.profile_path = _stop_profiler(profiler, label)
+        _report(timer)
+
+
+def _report(timer: StageTimer) -> None:
+    for observer in list(_observers):
+        for stage, seconds in timer.stages.items():
+            try:
+                observer(stage, seconds)
+            except Exception as e:
+                logger.warning(f"Stage timing observer failed: {e}")
+                break
+
+
+def _start_profiler(rate: float) -> Optional[cProfile.Profile]:
+    if rate <= 0 or random.random() >= rate:
+        return None
+    # Only one profiler can be active per interpreter; skip the sample if busy
+    if not _profiler_lock.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        _profiler_lock.release()
+        return None
+    return profiler
+
+
+def _stop_profiler(profiler: cProfile.Profile, label: str) -> Optional[Path]:
+    try:
+        profiler.disable()
+        PROFILE_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        safe_label = re.sub(r"[^A-Za-z0-9_.-]+", "_", label) or "scope"
+        path = PROFILE_OUTPUT_DIR / f"{safe_label}-{int(time.time() * 1000)}-{os.getpid()}.prof"
+        profiler.dump_stats(str(path))
+        logger.info(f"Wrote profile for {label} to {path}")
+        return path
+    except OSError as e:
+        logger.warning(f"Could not write profile for {label}: {e}")
+        return None
+    finally:
+        _profiler_lock.release()
@@ -0,0 +1,257 @@
+"""
+Streaming XML parsing for HMS, eHospital and partner payloads.
+
+Documents are consumed incrementally with ``XMLPullParser`` and elements are
+cleared and detached from their parents as soon as they complete, so memory
+stays proportional to the deepest open element rather than the whole
+document. Two consumers are provided:
+
+* record streams - every completed ``record_tag`` element is turned into a
+  flat dict by a precompiled per-schema extractor and emitted immediately;
+* dict conversion - the nested-dict shape produced by the integrators'
+  recursive ``_xml_element_to_dict`` helpers, built without keeping a tree.
+"""
+
+import xml.etree.ElementTree as ET
+from typing import (Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterator, List,
+                    Mapping, Optional, Tuple, Union)
+
+XMLSource = Union[str, bytes, Any]
+RecordExtractor = Callable[[ET.Element], Dict[str, Any]]
+
+# field name -> (child tag, converter applied to the child's text, default when absent)
+FieldSpec = Tuple[str, Callable[[Optional[str]], Any], Any]
+
+READ_CHUNK_SIZE = 64 * 1024
+
+_MISSING = object()
+
+
+def local_name(tag: str) -> str:
+    """Tag without its ``{namespace}`` prefix"""
+    return tag.rsplit('}', 1)[-1] if tag[:1] == '{' else tag
+
+
+def compile_record_extractor(fields: Mapping[str, FieldSpec]) -> RecordExtractor:
+    """
+    Compile a per-schema extractor for flat record elements.
+
+    The returned function scans a record's direct children once, looking
+    each tag up in a prebuilt table, instead of calling ``find()`` per field.
+    Namespaced tags match on their local name.
+    """
+    by_tag: Dict[str, Tuple[str, Callable[[Optional[str]], Any]]] = {
+        tag: (name, converter) for name, (tag, converter, _) in fields.items()
+    }
+    defaults = {name: default for name, (_, _, default) in fields.items()}
+    resolved: Dict[str, Optional[Tuple[str, Callable[[Optional[str]], Any]]]] = {}
+
+    def extract(element: ET.Element) -> Dict[str, Any]:
+        values = dict(defaults)
+        for child in element:
+            spec = resolved.get(child.tag, _MISSING)
+            if spec is _MISSING:
+                spec = resolved[child.tag] = by_tag.get(local_name(child.tag))
+            if spec is not None:
+                name, converter = spec
+                values[name] = converter(child.text)
+        return values
+
+    return extract
+
+
+class _RecordCollector:
+    """Emits extracted records and discards everything outside them"""
+
+    def __init__(self, record_tag: str, extractor: RecordExtractor):
+        self.record_tag = record_tag
+        self.extractor = extractor
+        self.records: List[Dict[str, Any]] = []
+        self._open: List[ET.Element] = []
+        self._record: Optional[ET.Element] = None
+
+    def start(self, element: ET.Element) -> None:
+        self._open.append(element)
+        if self._record is None and local_name(element.tag) == self.record_tag:
+            self._record = element
+
+    def end(self, element: ET.Element) -> None:
+        self._open.pop()
+        if element is self._record:
+            self.records.append(self.extractor(element))
+            self._record = None
+        elif self._record is not None:
+            # Part of the record still being built
+            return
+        _release(element, self._open)
+
+    def result(self) -> List[Dict[str, Any]]:
+        records, self.records = self.records, []
+        return records
+
+
+class _DictBuilder:
+    """Builds the nested-dict representation while discarding completed elements"""
+
+    def __init__(self, include_attributes: bool):
+        self.include_attributes = include_attributes
+        self.value: Any = None
+        self._open: List[ET.Element] = []
+        # [child values, saw a child element] per open element
+        self._frames: List[list] = []
+
+    def start(self, element: ET.Element) -> None:
+        values: Dict[str, Any] = {}
+        if self.include_attributes:
+            for key, value in element.attrib.items():
+                values[f"@{key}"] = value
+        self._open.append(element)
+        self._frames.append([values, False])
+
+    def end(self, element: ET.Element) -> None:
+        self._open.pop()
+        values, has_children = self._frames.pop()
+        text = element.text
+        value = text.strip() if not has_children and text and text.strip() else values
+
+        if self._frames:
+            parent = self._frames[-1]
+            parent[1] = True
+            _add_child(parent[0], element.tag, value)
+        else:
+            self.value = value
+        _release(element, self._open)
+
+    def result(self) -> Any:
+        return {} if self.value is None else self.value
+
+
+def _add_child(values: Dict[str, Any], tag: str, value: Any) -> None:
+    """Add a child value, turning repeated tags into lists"""
+    existing = values.get(tag, _MISSING)
+    if existing is _MISSING:
+        values[tag] = value
+    elif isinstance(existing, list):
+        existing.append(value)
+    else:
+        values[tag] = [existing, value]
+
+
+def _release(element: ET.Element, open_elements: List[ET.Element]) -> None:
+    """Free a completed element and detach it from its parent"""
+    element.clear()
+    if open_elements:
+        # The completed element is the parent's only remaining child
+        open_elements[-1].remove(element)
+
+
+class _PullDriver:
+    """Feeds data into an XMLPullParser and dispatches start/end events"""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.parser = ET.XMLPullParser(events=("start", "end"))
+
+    def feed(self, data: Union[str, bytes]) -> None:
+        self.parser.feed(data)
+        self._dispatch()
+
+    def close(self) -> None:
+        self.parser.close()
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        handler = self.handler
+        for event, element in self.parser.read_events():
+            if event == "start":
+                handler.start(element)
+            else:
+                handler.end(element)
+
+
+def _iter_chunks(source: XMLSource) -> Iterator[Union[str, bytes]]:
+    """Split XML text/bytes, or read a file-like object, in bounded chunks"""
+    if isinstance(source, (str, bytes, bytearray)):
+        for offset in range(0, len(source), READ_CHUNK_SIZE):
+            yield source[offset:offset + READ_CHUNK_SIZE]
+        return
+    while True:
+        chunk = source.read(READ_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_xml_records(source: XMLSource, record_tag: str,
+                     extractor: RecordExtractor) -> Iterator[Dict[str, Any]]:
+    """
+    Yield one extracted dict per ``record_tag`` element as each completes
+
+    Args:
+        source: XML text, bytes or a readable file-like object
+        record_tag: Local name of the record element (e.g. 'Patient')
+        extractor: Function from compile_record_extractor()
+    """
+    collector = _RecordCollector(record_tag, extractor)
+    driver = _PullDriver(collector)
+    for chunk in _iter_chunks(source):
+        driver.feed(chunk)
+        yield from collector.result()
+    driver.close()
+    yield from collector.result()
+
+
+async def aiter_xml_records(chunks: AsyncIterable[Union[str, bytes]], record_tag: str,
+                            extractor: RecordExtractor) -> AsyncIterator[Dict[str, Any]]:
+    """Async variant of iter_xml_records for streamed HTTP bodies"""
+    collector = _RecordCollector(record_tag, extractor)
+    driver = _PullDriver(collector)
+    async for chunk in chunks:
+        driver.feed(chunk)
+        for record in collector.result():
+            yield record
+    driver.close()
+    for record in collector.result():
+        yield record
+
+
+def parse_xml_to_dict(source: XMLSource, include_attributes: bool = True) -> Any:
+    """
+    Convert an XML document to nested dicts without building a full tree
+
+    Leaf elements with text become their stripped text, repeated tags become
+    lists and, when ``include_attributes`` is set, attributes appear as
+    ``@name`` keys.
+    """
+    builder = _DictBuilder(include_attributes)
+    driver = _PullDriver(builder)
+    for chunk in _iter_chunks(source):
+        driver.feed(chunk)
+    driver.close()
+    return builder.result()
+
+
+async def parse_xml_stream_to_dict(chunks: AsyncIterable[Union[str, bytes]],
+                                   include_attributes: bool = True) -> Any:
+    """Async variant of parse_xml_to_dict for streamed HTTP bodies"""
+    builder = _DictBuilder(include_attributes)
+    driver = _PullDriver(builder)
+    async for chunk in chunks:
+        driver.feed(chunk)
+    driver.close()
+    return builder.result()
+
+
+def element_to_dict(element: ET.Element, include_attributes: bool = True) -> Any:
+    """Convert an already-parsed element with the same rules as parse_xml_to_dict"""
+    text = element.text
+    if len(element) == 0 and text and text.strip():
+        return text.strip()
+
+    values: Dict[str, Any] = {}
+    if include_attributes:
+        for key, value in element.attrib.items():
+            values[f"@{key}"] = value
+    for child in element:
+        _add_child(values, child.tag, element_to_dict(child, include_attributes))
+    return values
@@ -14,6 +14,10 @@ from jsonschema import validate, ValidationError
 from collections import defaultdict
 import threading
 from dataclasses import dataclass, field
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+
+from backend.config.config_view import FlatConfigView
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +33,19 @@ class ConfigurationError(Exception):
  """Raised when configuration loading or validation fails"""
  pass
 
+class ConfigDirectoryWatcher(FileSystemEventHandler):
+ """Forwards configuration file changes to the configuration manager"""
+
+ def __init__(self, config_manager: 'ConfigurationManager'):
+ self.config_manager = config_manager
+
+ def on_modified(self, event):
+ """Handle file modification events"""
+ if not event.is_directory and Path(event.src_path).suffix.lower() == '.json':
+ self.config_manager._handle_file_change(event.src_path)
+
+ on_created = on_modified
+
 class ConfigurationManager:
  """
  Manages environment-specific configurations with validation and hot-reloading.
@@ -64,12 +81,20 @@ class ConfigurationManager:
  self._config_loaded_at: Optional[datetime] = None
  self._file_timestamps: Dict[str, float] = {}
 
+ # Merged, pre-flattened view served by get(); swapped on every load
+ self._view: FlatConfigView = FlatConfigView.empty()
+ self._file_observer: Optional[Observer] = None
+
  # Load schema for validation
  self._schema = self._load_schema()
 
  # Load initial configuration
  self._load_configuration()
 
+ # File change detection runs on the watchdog thread, not on reads
+ if self.enable_hot_reload:
+ self._start_file_watching()
+
  logger.info(f"ConfigurationManager initialized for environment: {self.environment}")
 
  def _detect_environment(self) -> str:
@@ -131,6 +156,7 @@ class ConfigurationManager:
  # Update cache
  self._config_cache = validation_result.validated_config
  self._config_loaded_at = datetime.now()
+ self._view = FlatConfigView(self._config_cache)
 
  logger.info(f"Configuration loaded successfully for environment: {self.environment}")
 
@@ -290,20 +316,9 @@ class ConfigurationManager:
  Returns:
  Configuration value or default
  """
- with self._config_lock:
- # Check for hot-reload if enabled
- if self.enable_hot_reload and self._should_reload():
- self._load_configuration()
-
- # Navigate nested configuration
- current = self._config_cache
- for key_part in key.split('.'):
- if isinstance(current, dict) and key_part in current:
- current = current[key_part]
- else:
- return default
-
- return current
+ # Single lookup in the pre-flattened view; hot-reload swaps the view
+ # from the watchdog thread so reads never stat configuration files
+ return self._view.get(key, default)
 
  def get_section(self, section: str) -> Dict[str, Any]:
  """Get entire configuration section"""
@@ -332,6 +347,37 @@ class ConfigurationManager:
  logger.info("Manually reloading configuration")
  self._load_configuration()
 
+ def _start_file_watching(self):
+ """Start the watchdog observer that drives hot-reload"""
+ try:
+ self._file_observer = Observer()
+ self._file_observer.schedule(ConfigDirectoryWatcher(self), str(self.config_dir), recursive=True)
+ self._file_observer.daemon = True
+ self._file_observer.start()
+ logger.info(f"Watching configuration directory: {self.config_dir}")
+ except Exception as e:
+ self._file_observer = None
+ logger.warning(f"Could not start configuration file watching: {e}")
+
+ def _handle_file_change(self, file_path: str):
+ """Reload configuration when a tracked file changed (watchdog thread)"""
+ with self._config_lock:
+ if not self._should_reload():
+ return
+
+ try:
+ self._load_configuration()
+ except ConfigurationError as e:
+ # Keep serving the last valid view
+ logger.error(f"Hot-reload of {file_path} failed, keeping previous configuration: {e}")
+
+ def stop_file_watching(self):
+ """Stop the hot-reload observer"""
+ if self._file_observer:
+ self._file_observer.stop()
+ self._file_observer.join(timeout=5)
+ self._file_observer = None
+
  def validate_current_config(self) -> ConfigurationValidationResult:
  """Validate current loaded configuration"""
  with self._config_lock:
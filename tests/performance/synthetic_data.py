@@ -0,0 +1,357 @@
+"""
+Seeded synthetic data for the performance benchmarks.
+
+Every generator takes a record count and a seed and returns the same data
+on every run, so timings from different commits are comparable. Scales are
+named (``10``, ``1k``, ``100k``); ``BENCHMARK_SCALES`` selects which ones the
+parametrized benchmarks run, and the ``100k`` scale is opt-in because the
+per-record engines take minutes at that size:
+
+    BENCHMARK_SCALES=10,1k,100k pytest tests/performance/ --benchmark-only
+"""
+
+import csv
+import math
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+SCALES = {"10": 10, "1k": 1_000, "100k": 100_000}
+DEFAULT_SCALES = ("10", "1k")
+DEFAULT_SEED = 20250101
+
+CITIES = {
+    "tier_1": ["Mumbai", "Delhi", "Bangalore", "Chennai", "Hyderabad", "Kolkata"],
+    "tier_2": ["Pune", "Jaipur", "Lucknow", "Kochi", "Indore", "Coimbatore"],
+    "tier_3": ["Mysore", "Nashik", "Udaipur", "Guntur", "Siliguri", "Jhansi"],
+    "tier_4": ["Hosur", "Karad", "Palani", "Bhadrak", "Tezpur", "Sikar"],
+}
+PINCODE_PREFIXES = ["110", "400", "560", "600", "500", "700", "411", "302", "226", "682"]
+HOSPITAL_TYPES = ["multi_specialty", "super_specialty", "general", "nursing_home", "teaching"]
+COMPETITION = ["low", "medium", "high"]
+MATURITY = ["emerging", "growing", "mature"]
+
+# Partner CSV columns, matching the flat paths in PARTNER_MAPPING
+PARTNER_MAPPING = {
+    "bed_occupancy_rate": "occupancy_percentage",
+    "average_length_of_stay": "alos_days",
+    "patient_satisfaction_score": "satisfaction_score",
+    "total_revenue": "gross_revenue_monthly",
+    "total_costs": "total_expenses_monthly",
+}
+
+
+def selected_scales(*allowed: str) -> List[str]:
+    """Scale names to parametrize with: ``BENCHMARK_SCALES`` limited to ``allowed``"""
+    requested = [name.strip() for name in os.getenv("BENCHMARK_SCALES", ",".join(DEFAULT_SCALES)).split(",")]
+    unknown = [name for name in requested if name and name not in SCALES]
+    if unknown:
+        raise ValueError(f"Unknown benchmark scales {unknown}; choose from {sorted(SCALES)}")
+    return [name for name in requested if name in allowed]
+
+
+def _tier(rng: random.Random) -> str:
+    return rng.choices(list(CITIES), weights=(3, 4, 2, 1))[0]
+
+
+def lifecycle_inputs(count: int, seed: int = DEFAULT_SEED) -> List[Dict[str, Any]]:
+    """Hospital dicts in the shape ``LifecycleAwareBenchmarkingEngine`` takes"""
+    rng = random.Random(seed)
+    current_year = datetime.now(timezone.utc).year
+    records = []
+    for index in range(count):
+        tier = _tier(rng)
+        growth = rng.uniform(-0.05, 0.45)
+        records.append({
+            "name": f"Synthetic Hospital {index:06d}",
+            "hospital_id": f"SYN{index:06d}",
+            "established_year": current_year - rng.randint(0, 60),
+            "tier": tier,
+            "bed_count": rng.randint(20, 1500),
+            "annual_revenue": float(rng.randint(5 * 10**7, 5 * 10**10)),
+            "revenue_growth_rate": growth,
+            "bed_growth_rate": rng.uniform(0.0, 0.2),
+            "patient_growth_rate": growth * rng.uniform(0.6, 1.0),
+            "service_expansion_rate": rng.uniform(0.0, 4.0),
+            "occupancy_rate": rng.uniform(0.45, 0.95),
+            "operating_margin": rng.uniform(-0.1, 0.3),
+            "days_in_ar": rng.randint(20, 120),
+            "collection_rate": rng.uniform(0.7, 0.99),
+            "patient_satisfaction_score": rng.uniform(55, 95),
+            "staff_turnover_rate": rng.uniform(0.05, 0.4),
+            "competition_density": rng.choice(COMPETITION),
+            "market_maturity": rng.choice(MATURITY),
+        })
+    return records
+
+
+def intelligent_inputs(count: int, seed: int = DEFAULT_SEED) -> List[Dict[str, Any]]:
+    """Keyword arguments for ``IntelligentHospitalInput``"""
+    inputs = []
+    rng = random.Random(seed + 1)
+    for record in lifecycle_inputs(count, seed):
+        inputs.append({
+            "name": record["name"],
+            "city": rng.choice(CITIES[record["tier"]]),
+            "tier": record["tier"],
+            "bed_count": record["bed_count"],
+            "annual_revenue": record["annual_revenue"],
+            "established_year": record["established_year"],
+            "revenue_growth_rate": record["revenue_growth_rate"],
+            "patient_volume_growth_rate": record["patient_growth_rate"],
+            "bed_expansion_rate": record["bed_growth_rate"],
+            "service_expansion_rate": record["service_expansion_rate"],
+            "operating_margin": record["operating_margin"],
+            "days_in_ar": record["days_in_ar"],
+            "collection_rate": record["collection_rate"],
+            "occupancy_rate": record["occupancy_rate"],
+            "patient_satisfaction_score": record["patient_satisfaction_score"],
+            "staff_turnover_rate": record["staff_turnover_rate"],
+            "competition_density": record["competition_density"],
+            "market_maturity": record["market_maturity"],
+        })
+    return inputs
+
+
+def quality_records(count: int, seed: int = DEFAULT_SEED) -> List[Dict[str, Any]]:
+    """Hospital records for data-quality validation, with a realistic share of bad values"""
+    rng = random.Random(seed + 2)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    records = []
+    for index in range(count):
+        tier = _tier(rng)
+        revenue = rng.randint(10**6, 10**9)
+        dirty = rng.random() < 0.1
+        records.append({
+            "hospital_id": f"SYN{index:06d}",
+            "hospital_name": f"Synthetic {rng.choice(['Care', 'City', 'Life', 'Sunrise'])} Hospital {index}",
+            "hospital_type": rng.choice(HOSPITAL_TYPES),
+            "city": rng.choice(CITIES[tier]),
+            "city_tier": tier[-1] if not dirty else rng.choice(["5", "", None]),
+            "pincode": f"{rng.choice(PINCODE_PREFIXES)}{rng.randint(0, 999):03d}" if not dirty else "12",
+            "bed_occupancy_rate": round(rng.uniform(40, 98), 1) if not dirty else rng.choice([120, "n/a"]),
+            "average_length_of_stay": round(rng.uniform(2, 9), 1),
+            "patient_satisfaction_score": round(rng.uniform(6, 9.5), 1),
+            "total_revenue": revenue,
+            "government_scheme_revenue": int(revenue * rng.uniform(0, 0.6)),
+            "data_timestamp": (now - timedelta(days=rng.randint(0, 150))).isoformat(),
+        })
+    return records
+
+
+def hms_payloads(count: int, seed: int = DEFAULT_SEED) -> List[Dict[str, Any]]:
+    """Raw HMS API payloads laid out like the MedTech mapping expects"""
+    rng = random.Random(seed + 3)
+    payloads = []
+    for _ in range(count):
+        revenue = rng.randint(10**6, 10**8)
+        payloads.append({
+            "occupancy": {"bed_occupancy_percentage": round(rng.uniform(40, 98), 1)},
+            "patients": {"avg_los_days": round(rng.uniform(2, 9), 2)},
+            "feedback": {"patient_satisfaction_avg": f"{rng.uniform(3, 5):.2f}"},
+            "operations": {"or_utilization_pct": rng.uniform(40, 95), "total_surgeries_monthly": rng.randint(50, 3000)},
+            "emergency": {"avg_wait_time_minutes": rng.randint(5, 240)},
+            "staffing": {"nurse_patient_ratio": round(rng.uniform(0.1, 0.5), 3)},
+            "quality": {
+                "readmission_rate_30day": rng.uniform(2, 20),
+                "mortality_rate": rng.uniform(0.5, 5),
+                "hospital_acquired_infection_rate": rng.uniform(0.5, 8),
+            },
+            "finance": {
+                "total_revenue_monthly": revenue,
+                "total_costs_monthly": int(revenue * rng.uniform(0.7, 1.05)),
+                "ar_days": rng.randint(20, 120),
+                "cash_payer_percentage": rng.uniform(10, 60),
+                "insurance_payer_percentage": rng.uniform(10, 60),
+                "govt_scheme_percentage": rng.uniform(0, 40),
+                "bad_debt_percentage": rng.uniform(0, 8),
+                "ebitda_margin_pct": rng.uniform(-5, 30),
+            },
+            "census": {
+                "total_admissions_monthly": rng.randint(100, 10000),
+                "emergency_admissions": rng.randint(10, 3000),
+                "planned_admissions": rng.randint(50, 7000),
+                "opd_visits_monthly": rng.randint(1000, 100000),
+                "icu_admissions": rng.randint(5, 800),
+            },
+            "staff": {
+                "doctors_count": rng.randint(5, 600),
+                "nurses_count": rng.randint(10, 2000),
+                "support_staff_count": rng.randint(10, 3000),
+            },
+            "hr": {"turnover_rate_monthly": rng.uniform(0.5, 4), "staff_satisfaction_score": rng.uniform(2.5, 5)},
+            "schemes": {
+                "ayushman_cases_monthly": rng.randint(0, 2000),
+                "cghs_cases_monthly": rng.randint(0, 500),
+                "esi_cases_monthly": rng.randint(0, 800),
+                "state_scheme_cases_monthly": rng.randint(0, 1500),
+                "total_revenue_monthly": int(revenue * rng.uniform(0, 0.4)),
+                "avg_reimbursement_days": rng.randint(15, 180),
+            },
+        })
+    return payloads
+
+
+def write_partner_csv(path: Path, count: int, seed: int = DEFAULT_SEED) -> Path:
+    """Partner performance export with PARTNER_MAPPING columns plus unused ones"""
+    rng = random.Random(seed + 4)
+    with open(path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["hospital_id", *PARTNER_MAPPING.values(), "notes", "reporting_period"])
+        for index in range(count):
+            revenue = rng.randint(10**6, 10**8)
+            writer.writerow([
+                f"SYN{index:06d}",
+                round(rng.uniform(40, 98), 1),
+                round(rng.uniform(2, 9), 2),
+                "" if rng.random() < 0.05 else round(rng.uniform(3, 5), 2),
+                revenue,
+                int(revenue * rng.uniform(0.7, 1.05)),
+                rng.choice(["", "audited", "provisional"]),
+                "2025-01",
+            ])
+    return path
+
+
+def time_series(count: int, seed: int = DEFAULT_SEED) -> List[Dict[str, Any]]:
+    """Daily market observations with trend, seasonality and noise"""
+    rng = random.Random(seed + 5)
+    start = datetime(2020, 1, 1)
+    value = 100.0
+    points = []
+    for day in range(count):
+        value = max(1.0, value * (1 + 0.0005 + 0.01 * math.sin(day / 58.0) + rng.gauss(0, 0.01)))
+        points.append({
+            "timestamp": (start + timedelta(days=day)).isoformat(),
+            "value": value,
+            "volume": rng.randint(1000, 50000),
+            "metadata": {"source": f"source_{rng.randint(1, 5)}", "quality_score": rng.uniform(0.8, 1.0)},
+        })
+    return points
+
+
+def market_indicators(seed: int = DEFAULT_SEED) -> Dict[str, Any]:
+    rng = random.Random(seed + 6)
+    return {
+        "market_id": f"market-{seed}",
+        "sector": "healthcare",
+        "indicators": {
+            "market_cap": rng.uniform(1e9, 1e11),
+            "trading_volume": rng.uniform(1e7, 1e9),
+            "analyst_sentiment": rng.uniform(0.1, 1.0),
+        },
+        "economic_factors": {
+            "gdp_growth": rng.uniform(-0.02, 0.08),
+            "inflation_rate": rng.uniform(0.02, 0.08),
+            "interest_rate": rng.uniform(0.04, 0.08),
+        },
+        "competitive_metrics": {
+            "market_share_volatility": rng.uniform(0.05, 0.3),
+            "new_entrants_rate": rng.uniform(0.01, 0.2),
+            "innovation_index": rng.uniform(0.3, 1.0),
+        },
+    }
+
+
+def market_risk_data(history_days: int, seed: int = DEFAULT_SEED) -> Dict[str, Any]:
+    """Market data for risk assessment with ``history_days`` of risk history"""
+    rng = random.Random(seed + 7)
+    start = datetime(2020, 1, 1)
+    return {
+        "market_id": f"market-{seed}",
+        "market_size": rng.uniform(1e7, 1e9),
+        "growth_rate": rng.uniform(-0.05, 0.3),
+        "volatility_index": rng.uniform(0.1, 0.5),
+        "regulatory_environment": {
+            "stability_score": rng.uniform(0.3, 0.9),
+            "pending_regulations": rng.randint(0, 10),
+            "compliance_complexity": rng.uniform(0.2, 0.8),
+        },
+        "competitive_landscape": {
+            "intensity_score": rng.uniform(0.2, 0.9),
+            "new_entrants_threat": rng.uniform(0.1, 1.0),
+            "substitute_products_risk": rng.uniform(0.1, 1.0),
+        },
+        "financial_indicators": {
+            "market_stability": rng.uniform(0.4, 0.9),
+            "credit_risk": rng.uniform(0.1, 0.8),
+        },
+        "historical_data": [
+            {
+                "date": (start + timedelta(days=day)).isoformat(),
+                "risk_score": rng.uniform(0.1, 1.0),
+                "volatility": rng.uniform(0.05, 0.4),
+            }
+            for day in range(history_days)
+        ],
+    }
+
+
+def competitors(count: int, seed: int = DEFAULT_SEED) -> List[Dict[str, Any]]:
+    """Competitor profiles with market shares summing to one"""
+    rng = random.Random(seed + 8)
+    weights = [rng.paretovariate(1.5) for _ in range(count)]
+    total = sum(weights)
+    return [
+        {
+            "competitor_id": f"COMP{index:06d}",
+            "name": f"Competitor {index}",
+            "market_share": weight / total,
+            "revenue": rng.uniform(1e6, 1e9),
+            "growth_rate": rng.uniform(-0.2, 0.5),
+            "pricing_strategy": rng.choice(["premium", "value", "scheme_focused"]),
+            "innovation_score": rng.uniform(0, 1),
+            "customer_satisfaction": rng.uniform(0, 1),
+            "geographical_presence": rng.randint(1, 50),
+            "product_portfolio_size": rng.randint(1, 200),
+        }
+        for index, weight in enumerate(weights)
+    ]
+
+
+def competitive_market(seed: int = DEFAULT_SEED) -> Dict[str, Any]:
+    rng = random.Random(seed + 9)
+    return {
+        "market_id": f"market-{seed}",
+        "total_market_size": rng.uniform(1e7, 1e9),
+        "growth_rate": rng.uniform(-0.05, 0.3),
+        "maturity_level": rng.choice(["emerging", "growing", "mature"]),
+        "barriers_to_entry": rng.uniform(0.1, 1.0),
+        "regulatory_environment": rng.choice(["light", "moderate", "heavy"]),
+    }
+
+
+def analysis_request(seed: int = DEFAULT_SEED) -> Dict[str, Any]:
+    """Valid ``POST /analyze`` body"""
+    rng = random.Random(seed + 10)
+    beds = rng.randint(50, 800)
+    revenue = rng.uniform(1e7, 5e8)
+    return {
+        "hospital_name": f"Synthetic Hospital {seed}",
+        "hospital_age": rng.randint(1, 60),
+        "annual_revenue": revenue,
+        "annual_operating_expenses": revenue * 0.85,
+        "net_income": revenue * 0.15,
+        "total_assets": revenue * 2,
+        "total_liabilities": revenue * 0.8,
+        "total_beds": beds,
+        "occupied_beds": int(beds * 0.75),
+        "annual_admissions": beds * 40,
+        "average_length_of_stay": 4.5,
+        "emergency_visits": beds * 60,
+        "surgical_cases": beds * 10,
+        "patient_satisfaction_score": 82.0,
+        "readmission_rate": 9.5,
+        "infection_rate": 2.1,
+        "mortality_rate": 1.4,
+        "total_staff": beds * 4,
+        "physicians": beds // 3,
+        "nurses": beds,
+        "staff_turnover_rate": 14.0,
+        "technology_investment": revenue * 0.03,
+        "emr_implementation_level": 70.0,
+        "market_share": 12.0,
+        "number_of_competitors": 8,
+    }
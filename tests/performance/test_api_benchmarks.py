@@ -0,0 +1,100 @@
+"""
+Benchmarks: the hospital analysis API end to end over httpx's ASGI transport.
+
+Requests go through the full middleware stack (trusted hosts, CORS, rate
+limiting, instrumentation), authentication, request validation and response
+serialisation without a network hop. The analysis engine and database are
+stubbed for ``/analyze`` - the engines have their own benchmarks - so the
+numbers are the API layer's overhead. Scales are requests per round, issued
+concurrently.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+# Benchmarks issue far more requests than the default per-client limit allows
+os.environ.setdefault("RATE_LIMIT_REQUESTS", str(10**9))
+
+import httpx
+
+from backend.api import hospital_analysis_api
+from synthetic_data import SCALES, analysis_request, selected_scales
+
+API_HEADERS = {"X-API-Key": hospital_analysis_api.HOSPITAL_API_KEY}
+
+ANALYSIS_RESULT = {
+    "lifecycle_stage": "GROWTH",
+    "benchmark_target": 18.5,
+    "growth_velocity": "MODERATE",
+    "confidence_score": 0.82,
+    "data_quality_score": 0.9,
+    "strategic_recommendations": ["Expand specialty services", "Reduce staff turnover"],
+    "growth_opportunities": ["Cardiology"],
+    "risk_factors": ["Competitive pressure"],
+    "performance_metrics": {"occupancy_rate": 78.0, "operating_margin": 12.4},
+    "comparative_analysis": {"peer_percentile": 64},
+}
+
+
+class _StubDatabase:
+    async def save_analysis(self, analysis_result):
+        return analysis_result["analysis_id"]
+
+
+@pytest.fixture
+def stub_analysis(monkeypatch):
+    """Replace the analysis engine and database with fixed, instant results"""
+    async def analyze_hospital_comprehensive(request):
+        return dict(ANALYSIS_RESULT)
+
+    async def get_database():
+        return _StubDatabase()
+
+    monkeypatch.setattr(hospital_analysis_api.hospital_system, "analyze_hospital_comprehensive",
+                        analyze_hospital_comprehensive)
+    monkeypatch.setattr(hospital_analysis_api, "get_database", get_database)
+
+
+def _run_requests(method, path, count, **request_options):
+    async def send_all():
+        transport = httpx.ASGITransport(app=hospital_analysis_api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+            return await asyncio.gather(*(
+                client.request(method, path, headers=API_HEADERS, **request_options) for _ in range(count)
+            ))
+    return asyncio.run(send_all())
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("scale", selected_scales("10", "1k"))
+def test_api_rejects_invalid_analysis(benchmark, scale):
+    """Middleware, auth and validation cost without the analysis itself"""
+    benchmark.group = f"api_invalid_analysis_{scale}"
+    body = {**analysis_request(), "total_beds": 0}
+
+    responses = benchmark.pedantic(_run_requests, args=("POST", "/analyze", SCALES[scale]),
+                                   kwargs={"json": body}, rounds=3, iterations=1)
+    assert {response.status_code for response in responses} == {422}
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("scale", selected_scales("10", "1k"))
+def test_api_analysis(benchmark, stub_analysis, scale):
+    benchmark.group = f"api_analysis_{scale}"
+    body = analysis_request()
+
+    responses = benchmark.pedantic(_run_requests, args=("POST", "/analyze", SCALES[scale]),
+                                   kwargs={"json": body}, rounds=3, iterations=1)
+    assert {response.status_code for response in responses} == {200}
+    assert responses[0].json()["lifecycle_stage"] == ANALYSIS_RESULT["lifecycle_stage"]
+
+
+@pytest.mark.performance
+def test_api_metrics_scrape(benchmark):
+    benchmark.group = "api_metrics"
+    _run_requests("POST", "/analyze", 10, json={})  # populate some series
+
+    responses = benchmark.pedantic(_run_requests, args=("GET", "/metrics", 1), rounds=20, iterations=1)
+    assert responses[0].status_code == 200
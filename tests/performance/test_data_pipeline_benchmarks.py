@@ -0,0 +1,81 @@
+"""
+Benchmarks: data-quality assessment and HMS / partner data transforms.
+
+Scales are records per batch. Validation and enrichment use the batch
+entry points the integrators call; transforms use the compiled mappings.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.config.advanced_config_manager import get_config_manager
+from backend.services.real_data_integration.data_quality_validator import DataQualityValidator, DataSource
+from backend.services.real_data_integration.field_mapping import CompiledFieldMapping
+from backend.services.real_data_integration.hms_api_integrator import HMSDataMapping
+from backend.services.real_data_integration.partner_csv_ingestion import CSVIngestionPlan, iter_csv_records
+from synthetic_data import (
+    PARTNER_MAPPING,
+    SCALES,
+    hms_payloads,
+    quality_records,
+    selected_scales,
+    write_partner_csv,
+)
+
+
+@pytest.fixture(scope="module")
+def validator():
+    return DataQualityValidator(get_config_manager())
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("scale", selected_scales("10", "1k", "100k"))
+def test_data_quality_validation(benchmark, validator, scale):
+    benchmark.group = f"data_quality_validation_{scale}"
+    records = quality_records(SCALES[scale])
+
+    def validate():
+        return asyncio.run(validator.validate_hospital_data_batch(records, DataSource.USER_INPUT))
+
+    reports = benchmark.pedantic(validate, rounds=3, iterations=1)
+    assert len(reports) == len(records)
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("scale", selected_scales("10", "1k", "100k"))
+def test_data_quality_enrichment(benchmark, validator, scale):
+    benchmark.group = f"data_quality_enrichment_{scale}"
+    records = quality_records(SCALES[scale])
+
+    def enrich():
+        return asyncio.run(validator.enrich_hospital_data_batch(records))
+
+    enriched = benchmark.pedantic(enrich, rounds=3, iterations=1)
+    assert len(enriched) == len(records)
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("scale", selected_scales("10", "1k", "100k"))
+def test_hms_transform(benchmark, scale):
+    benchmark.group = f"hms_transform_{scale}"
+    compiled = HMSDataMapping.get_medtech_mapping().compile()
+    payloads = hms_payloads(SCALES[scale])
+
+    transformed = benchmark.pedantic(compiled.apply_batch, args=(payloads,), rounds=3, iterations=1)
+    assert transformed[0]["financial_metrics"]["total_revenue"] == payloads[0]["finance"]["total_revenue_monthly"]
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("scale", selected_scales("10", "1k", "100k"))
+def test_partner_csv_transform(benchmark, tmp_path, scale):
+    benchmark.group = f"partner_csv_transform_{scale}"
+    csv_path = str(write_partner_csv(tmp_path / "partner.csv", SCALES[scale]))
+    plan = CSVIngestionPlan.from_mapping(PARTNER_MAPPING)
+    compiled = CompiledFieldMapping(PARTNER_MAPPING)
+
+    def ingest():
+        return compiled.apply_batch(iter_csv_records(csv_path, plan))
+
+    transformed = benchmark.pedantic(ingest, rounds=3, iterations=1)
+    assert len(transformed) == SCALES[scale]
@@ -0,0 +1,69 @@
+"""
+Benchmarks: lifecycle-aware and intelligent benchmarking engines.
+
+Each round analyses every synthetic hospital at the given scale in turn.
+Run with ``pytest tests/performance/test_engine_benchmarks.py --benchmark-only``.
+"""
+
+import asyncio
+import contextlib
+import io
+from decimal import Decimal
+
+import pytest
+
+from backend.services.benchmarking.intelligent_benchmarking_engine import (
+    HospitalTier,
+    IntelligentHospitalInput,
+    IntelligentLifecycleBenchmarkingEngine,
+)
+from backend.services.benchmarking.lifecycle_benchmarking_engine import LifecycleAwareBenchmarkingEngine
+from synthetic_data import SCALES, intelligent_inputs, lifecycle_inputs, selected_scales
+
+
+@pytest.fixture(scope="module")
+def event_loop_runner():
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+def _quietly(run):
+    """The engines print progress; keep it off the terminal but in the timing"""
+    def wrapper():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return run()
+    return wrapper
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("scale", selected_scales("10", "1k", "100k"))
+def test_lifecycle_analysis(benchmark, event_loop_runner, scale):
+    benchmark.group = f"lifecycle_analysis_{scale}"
+    engine = LifecycleAwareBenchmarkingEngine()
+    hospitals = lifecycle_inputs(SCALES[scale])
+
+    async def analyse_all():
+        return [await engine.analyze_hospital_lifecycle(hospital) for hospital in hospitals]
+
+    results = benchmark.pedantic(_quietly(lambda: event_loop_runner(analyse_all())), rounds=3, iterations=1)
+    assert len(results) == len(hospitals)
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("scale", selected_scales("10", "1k", "100k"))
+def test_intelligent_benchmarking(benchmark, event_loop_runner, scale):
+    benchmark.group = f"intelligent_benchmarking_{scale}"
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = IntelligentLifecycleBenchmarkingEngine()
+    hospitals = [
+        IntelligentHospitalInput(**{**fields, "tier": HospitalTier(fields["tier"]),
+                                    "annual_revenue": Decimal(str(fields["annual_revenue"]))})
+        for fields in intelligent_inputs(SCALES[scale])
+    ]
+
+    async def analyse_all():
+        return [await engine.analyze_hospital_intelligently(hospital) for hospital in hospitals]
+
+    results = benchmark.pedantic(_quietly(lambda: event_loop_runner(analyse_all())), rounds=3, iterations=1)
+    assert len(results) == len(hospitals)
@@ -0,0 +1,93 @@
+"""
+Microbenchmark: compiled field mappings vs per-record dotted-path lookup.
+
+Run with ``pytest tests/performance/ --benchmark-only``.
+"""
+
+import random
+from decimal import Decimal
+
+import pytest
+
+from backend.services.real_data_integration.field_mapping import CompiledFieldMapping
+
+RECORD_COUNT = 100_000
+
+MAPPING = {
+    "bed_occupancy_rate": "census.occupancy_percentage",
+    "average_length_of_stay": "kpi.alos_days",
+    "patient_satisfaction": "quality.patient_satisfaction_score",
+    "total_revenue": "finance.gross_revenue_monthly",
+    "total_costs": "finance.total_expenses_monthly",
+    "top_department": "departments.0.name",
+}
+
+
+def _legacy_extract(data, path):
+    """The integrators' original per-call path walk."""
+    try:
+        current = data
+        for key in path.split('.'):
+            if isinstance(current, dict) and key in current:
+                current = current[key]
+            elif isinstance(current, list) and key.isdigit():
+                current = current[int(key)]
+            else:
+                return None
+        return current
+    except (KeyError, IndexError, TypeError):
+        return None
+
+
+def _legacy_convert(value):
+    if isinstance(value, (int, float)):
+        return Decimal(str(value))
+    if isinstance(value, str):
+        try:
+            if '.' in value:
+                return Decimal(value)
+            return int(value) if value.isdigit() else value
+        except (ValueError, TypeError):
+            return value
+    return value
+
+
+def _legacy_transform(records):
+    results = []
+    for record in records:
+        standardized = {}
+        for field, path in MAPPING.items():
+            value = _legacy_extract(record, path)
+            if value is not None:
+                standardized[field] = _legacy_convert(value)
+        results.append(standardized)
+    return results
+
+
+@pytest.fixture(scope="module")
+def records():
+    rng = random.Random(42)
+    return [
+        {
+            "census": {"occupancy_percentage": round(rng.uniform(40, 98), 1)},
+            "kpi": {"alos_days": rng.randint(2, 9)},
+            "quality": {"patient_satisfaction_score": f"{rng.uniform(3, 5):.2f}"},
+            "finance": {"gross_revenue_monthly": rng.randint(10**6, 10**8)},
+            "departments": [{"name": rng.choice(["cardiology", "oncology", "orthopaedics"])}],
+        }
+        for _ in range(RECORD_COUNT)
+    ]
+
+
+@pytest.mark.performance
+def test_legacy_path_lookup(benchmark, records):
+    benchmark.group = "field_mapping_100k"
+    benchmark.pedantic(_legacy_transform, args=(records,), rounds=3, iterations=1)
+
+
+@pytest.mark.performance
+def test_compiled_mapping(benchmark, records):
+    benchmark.group = "field_mapping_100k"
+    compiled = CompiledFieldMapping(MAPPING)
+    results = benchmark.pedantic(compiled.apply_batch, args=(records,), rounds=3, iterations=1)
+    assert results == _legacy_transform(records)
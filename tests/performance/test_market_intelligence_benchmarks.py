@@ -0,0 +1,66 @@
+"""
+Benchmarks: trend, risk and competitive market intelligence services.
+
+Scales are the time-series length (trend), days of risk history (risk) and
+number of competitors (competitive).
+"""
+
+import os
+import sys
+
+import pytest
+
+# The market intelligence services are deployed with backend/ as the import
+# root (``services.*``, ``config.*``); import them the same way so only one
+# copy of each module - and of the config registry - is loaded
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from services.market_intelligence.competitive_analysis_service import CompetitiveAnalysisService
+from services.market_intelligence.risk_assessment_service import RiskAssessmentService
+from services.market_intelligence.trend_analysis_service import TrendAnalysisService
+from synthetic_data import (
+    SCALES,
+    competitive_market,
+    competitors,
+    market_indicators,
+    market_risk_data,
+    selected_scales,
+    time_series,
+)
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("scale", selected_scales("10", "1k", "100k"))
+def test_trend_analysis(benchmark, scale):
+    benchmark.group = f"trend_analysis_{scale}"
+    service = TrendAnalysisService()
+    series, indicators = time_series(SCALES[scale]), market_indicators()
+
+    result = benchmark.pedantic(service.analyze_trends, args=(series, indicators), rounds=5, iterations=1)
+    assert "analysis_id" in result
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("scale", selected_scales("10", "1k", "100k"))
+def test_risk_assessment(benchmark, scale):
+    benchmark.group = f"risk_assessment_{scale}"
+    service = RiskAssessmentService()
+    market_data = market_risk_data(SCALES[scale])
+
+    result = benchmark.pedantic(service.assess_market_risks, args=(market_data,), rounds=5, iterations=1)
+    assert isinstance(result, dict)
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("scale", selected_scales("10", "1k", "100k"))
+def test_competitive_analysis(benchmark, scale):
+    benchmark.group = f"competitive_analysis_{scale}"
+    service = CompetitiveAnalysisService()
+    landscape, market = competitors(SCALES[scale]), competitive_market()
+
+    # The service caches analyses by input signature; time the uncached path
+    result = benchmark.pedantic(service.analyze_competitive_landscape, args=(landscape, market),
+                                setup=service.analysis_cache.clear, rounds=5, iterations=1)
+    assert isinstance(result, dict)
@@ -0,0 +1,126 @@
+"""
+Unit tests for concurrent analytics batch collection and consolidation.
+"""
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+from backend.services.real_data_integration.analytics_batch import (
+    AnalyticsConsolidator,
+    collect_platforms_concurrently,
+)
+from backend.services.real_data_integration.analytics_columns import (
+    AnalyticsColumns,
+    AnalyticsPointView,
+    PointSource,
+)
+
+
+def _point(hospital_id, name, value, day, source="tableau_performance"):
+    return SimpleNamespace(
+        hospital_id=hospital_id, metric_name=name, metric_value=value,
+        metric_category="performance", measurement_date=datetime(2024, 1, day),
+        data_source=source, confidence_score=90
+    )
+
+
+def _platform_result(source_id, points):
+    return {"success": True, "collected_data": {source_id: {"data_points": points}}}
+
+
+class TestAnalyticsConsolidator:
+    """Incremental consolidation must not depend on completion order."""
+
+    def test_later_platform_wins_regardless_of_merge_order(self):
+        first = _platform_result("tableau_performance", [_point("H1", "occupancy", 70, 1)])
+        second = _platform_result("powerbi_finance", [_point("H1", "occupancy", 85, 3, "powerbi_finance")])
+
+        consolidator = AnalyticsConsolidator()
+        consolidator.add_platform("powerbi", second, rank=1)
+        consolidator.add_platform("tableau", first, rank=0)
+        result = consolidator.result()
+
+        hospital = result["hospitals"]["H1"]
+        assert hospital["metrics"]["performance_occupancy"]["value"] == "85"
+        assert hospital["last_updated"] == datetime(2024, 1, 3).isoformat()
+        assert [s["platform_id"] for s in result["data_sources"]] == ["tableau", "powerbi"]
+        assert result["metrics_summary"]["performance_occupancy"]["hospitals_reporting"] == 1
+
+    def test_columnar_results_match_point_by_point_merge(self):
+        """Merging from columns gives the same view as iterating the data points."""
+        def block(source_name, hospitals, days, values):
+            source = PointSource(data_source=source_name, metric_category="performance",
+                                 platform_type="tableau_server", confidence_score=90)
+            stamps = [datetime(2024, 1, day) for day in days]
+            return AnalyticsColumns.from_wide(hospitals, stamps, {"occupancy": values, "alos": [3, 4, 5]}, source)
+
+        columns = AnalyticsColumns.concat([
+            block("tableau_a", ["H1", "H2", "H1"], [1, 2, 5], ["70%", "n/a", 72.5]),
+            block("tableau_b", ["H2", "H3", "H1"], [3, 1, 2], [80, 60, 71]),
+        ])
+        view = AnalyticsPointView(columns, SimpleNamespace)
+        earlier = _platform_result("powerbi", [_point("H3", "occupancy", 55, 9), _point("H1", "beds", 100, 1)])
+
+        columnar, by_point = AnalyticsConsolidator(), AnalyticsConsolidator()
+        columnar.add_platform("tableau", {"success": True, "collected_data": {"tableau": {"data_points": view}}}, 1)
+        by_point.add_platform("tableau", {"success": True, "collected_data": {"tableau": {"data_points": list(view)}}}, 1)
+        for consolidator in (columnar, by_point):
+            consolidator.add_platform("powerbi", earlier, 0)
+
+        assert columnar.result() == by_point.result()
+        hospitals = columnar.result()["hospitals"]
+        assert hospitals["H1"]["metrics"]["performance_occupancy"]["value"] == "71"
+        assert hospitals["H2"]["data_sources"] == ["tableau_a", "tableau_b"]
+        assert hospitals["H3"]["last_updated"] == datetime(2024, 1, 9).isoformat()
+
+    def test_failed_platforms_are_skipped(self):
+        consolidator = AnalyticsConsolidator()
+        assert consolidator.add_platform("qlik", {"success": False, "error": "down"}) == 0
+        assert consolidator.result()["hospitals"] == {}
+
+
+class TestCollectPlatformsConcurrently:
+    """Platforms run in parallel, each bounded by its own timeout."""
+
+    def test_slow_platform_times_out_without_blocking_others(self):
+        completed = []
+
+        async def collect(platform_id):
+            await asyncio.sleep(5 if platform_id == "tableau" else 0.01)
+            return {"success": True, "platform_id": platform_id}
+
+        results = asyncio.run(collect_platforms_concurrently(
+            ["tableau", "powerbi", "qlik"], collect, max_concurrency=3,
+            timeout_for=lambda platform_id: 0.2,
+            on_complete=lambda platform_id, result: completed.append(platform_id)
+        ))
+
+        assert list(results) == ["tableau", "powerbi", "qlik"]
+        assert results["tableau"]["timed_out"] is True
+        assert results["powerbi"]["success"] and results["qlik"]["success"]
+        assert completed[-1] == "tableau"
+
+    def test_concurrency_cap_and_errors(self):
+        in_flight = 0
+        peak = 0
+
+        async def collect(platform_id):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if platform_id == "broken":
+                raise RuntimeError("auth failed")
+            return {"success": True}
+
+        results = asyncio.run(collect_platforms_concurrently(
+            ["a", "b", "broken", "c", "d"], collect, max_concurrency=2
+        ))
+
+        assert peak == 2
+        assert results["broken"] == {"success": False, "platform_id": "broken",
+                                     "error": "auth failed",
+                                     "collection_seconds": results["broken"]["collection_seconds"]}
+        assert all(results[p]["success"] for p in "abcd")
@@ -0,0 +1,130 @@
+"""
+Unit tests for columnar analytics data points.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pandas as pd
+
+from backend.services.real_data_integration.analytics_columns import (
+    AnalyticsColumns,
+    AnalyticsPointView,
+    PointSource,
+    parse_metric_column,
+    parse_timestamps,
+)
+
+SOURCE = PointSource(data_source="tableau_overview", metric_category="performance_dashboard",
+                     platform_type="tableau_server", confidence_score=90)
+
+
+def _tableau_export():
+    return pd.DataFrame({
+        "Hospital ID": ["H1", "H2", "H3"],
+        "Bed Occupancy": ["85.5%", "1,200", "n/a"],
+        "ALOS": [3, None, 4],
+        "Report Date": ["2024-01-05", "not a date", None],
+    })
+
+
+class TestParseMetricColumn:
+    """Vectorized parsing matches the per-value converter."""
+
+    def test_strings_are_cleaned_and_parsed(self):
+        column = parse_metric_column(["85.5%", "1,200", "n/a", None])
+
+        assert column.present.tolist() == [True, True, True, False]
+        assert column.values[:2].tolist() == [85.5, 1200.0]
+        assert column.integral[:2].tolist() == [False, True]
+        assert column.text == {2: "n/a"}
+
+    def test_integer_columns_are_integral(self):
+        column = parse_metric_column([3, 4])
+        assert column.integral.all() and column.present.all()
+
+
+def _legacy_convert_metric_value(value):
+    """The per-value converter (_convert_metric_value) the columns replace"""
+    if value is None:
+        return "N/A"
+    if isinstance(value, str):
+        cleaned_value = value.replace(",", "").replace("%", "").strip()
+        try:
+            if "." in cleaned_value:
+                return Decimal(cleaned_value)
+            return int(cleaned_value)
+        except (ValueError, TypeError):
+            return value
+    if isinstance(value, (int, float)):
+        return Decimal(str(value))
+    return str(value)
+
+
+class TestAnalyticsColumns:
+    """Exports are unpivoted into hospital/metric/timestamp/value columns."""
+
+    def test_from_wide_orders_points_row_by_row(self):
+        df = _tableau_export()
+        fallback = datetime(2024, 2, 1)
+        columns = AnalyticsColumns.from_wide(
+            df["Hospital ID"], parse_timestamps(df["Report Date"], len(df), default=fallback),
+            {"bed_occupancy_rate": df["Bed Occupancy"], "average_length_of_stay": df["ALOS"]},
+            SOURCE
+        )
+
+        assert columns.hospital.tolist() == ["H1", "H1", "H2", "H3", "H3"]
+        assert columns.metric.tolist() == ["bed_occupancy_rate", "average_length_of_stay",
+                                           "bed_occupancy_rate", "bed_occupancy_rate",
+                                           "average_length_of_stay"]
+        assert columns.timestamp[0].item() == datetime(2024, 1, 5)
+        assert columns.timestamp[2].item() == fallback
+        assert columns.text == {3: "n/a"}
+        assert columns.hospitals_covered() == ["H1", "H2", "H3"]
+
+    def test_lazy_view_yields_data_points(self):
+        df = _tableau_export()
+        columns = AnalyticsColumns.from_wide(
+            df["Hospital ID"], parse_timestamps(df["Report Date"], len(df)),
+            {"bed_occupancy_rate": df["Bed Occupancy"]}, SOURCE
+        )
+        view = AnalyticsPointView(columns, SimpleNamespace)
+
+        points = list(view)
+        assert len(view) == 3
+        assert [point.metric_value for point in points] == [Decimal("85.5"), Decimal("1200"), "n/a"]
+        assert points[0].data_source == "tableau_overview"
+        assert points[0].confidence_score == 90
+        assert view[-1].hospital_id == "H3"
+
+    def test_concat_keeps_each_export_source(self):
+        first = AnalyticsColumns.from_wide(["H1"], parse_timestamps(None, 1), {"m": ["bad"]}, SOURCE)
+        other = PointSource("powerbi_clinical", "clinical_metrics", "power_bi", 85)
+        second = AnalyticsColumns.from_wide(["H2"], parse_timestamps(None, 1), {"m": [7]}, other)
+
+        combined = AnalyticsColumns.concat([first, AnalyticsColumns.empty(), second])
+        points = list(AnalyticsPointView(combined, SimpleNamespace))
+
+        assert [point.data_source for point in points] == ["tableau_overview", "powerbi_clinical"]
+        assert [point.metric_value for point in points] == ["bad", Decimal(7)]
+        assert combined.invalid_count() == 0
+
+    def test_metric_values_match_the_legacy_converter(self):
+        """Exact types and digits, including values float64 cannot hold."""
+        fields = {
+            "text": ["1,200", "12", "-7", "85.5%", "1.50", "123456789.123456789012",
+                     "98765432109876543210", "n/a"],
+            "ints": [1, 2 ** 60 + 1, -(2 ** 55) - 3, 0, 7, 2 ** 53, 9, 10],
+            "mixed": [2 ** 70, "3", 0.1, 5, "2.5", 123456789012345678, "x", 1.0],
+            "floats": [0.1, 1e-7, 123456.789, 3.0, 2.5, 1.0, 0.0, -4.25],
+        }
+        hospitals = [f"H{i}" for i in range(8)]
+        columns = AnalyticsColumns.from_wide(hospitals, parse_timestamps(None, 8, default=datetime(2024, 1, 1)),
+                                             fields, SOURCE)
+
+        for row in range(len(columns)):
+            raw = fields[columns.metric[row]][int(columns.hospital[row][1:])]
+            expected = _legacy_convert_metric_value(raw)
+            actual = columns.metric_value(row)
+            assert (type(actual), str(actual)) == (type(expected), str(expected)), raw
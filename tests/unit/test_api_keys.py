@@ -0,0 +1,68 @@
+"""
+Unit tests for the hashed API key store.
+"""
+
+import asyncio
+
+from backend.security.api_keys import ApiKeyStore
+
+
+def _store(**options):
+    return ApiKeyStore(pepper="test-pepper", iterations=1000, **options)
+
+
+class TestApiKeyStore:
+    """Keys verify against salted hashes and never stay in plaintext."""
+
+    def test_verifies_many_keys_with_permissions(self):
+        store = _store()
+        issued = [store.issue_key(f"client-{i}", ["read"]) for i in range(50)]
+        store.add_key("legacy-key", "Hospital System", ["read", "write", "admin"])
+
+        api_key, record = issued[17]
+        assert store.verify(api_key) is record
+        assert store.verify("legacy-key").has_permission("write")
+        assert not record.has_permission("write")
+        assert store.verify(api_key + "x") is None
+        assert store.verify("") is None and store.verify(None) is None
+        assert all("legacy-key" not in repr(r) for r in store.records())
+
+    def test_hash_is_checked_once_then_cached(self):
+        store = _store(cache_size=2)
+        keys = [store.issue_key(f"client-{i}", ["read"])[0] for i in range(3)]
+        hashes = []
+        original_hash = store._hash
+        store._hash = lambda key, salt: hashes.append(key) or original_hash(key, salt)
+
+        for _ in range(3):
+            store.verify(keys[0])
+        assert hashes == [keys[0]]
+
+        store.verify(keys[1])
+        store.verify(keys[2])  # evicts keys[0], the least recently verified
+        store.verify(keys[0])
+        assert hashes == [keys[0], keys[1], keys[2], keys[0]]
+
+    def test_revoked_keys_fail_even_when_cached(self):
+        store = _store()
+        api_key, record = store.issue_key("client", ["read"])
+        assert store.verify(api_key) is record
+
+        assert store.revoke(record.key_id)
+        assert store.verify(api_key) is None
+        assert not store.revoke(record.key_id)
+
+    def test_last_used_is_applied_in_batches(self):
+        store = _store()
+        api_key, record = store.issue_key("client", ["read"])
+        for _ in range(5):
+            store.verify(api_key)
+        assert record.last_used is None
+
+        flushed = []
+        updates = asyncio.run(store.flush_last_used(flushed.append))
+        assert list(updates) == [record.key_id]
+        assert record.last_used == updates[record.key_id]
+        assert flushed == [updates]
+        assert asyncio.run(store.flush_last_used(flushed.append)) == {}
+        assert len(flushed) == 1
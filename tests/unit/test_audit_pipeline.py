@@ -0,0 +1,174 @@
+"""
+Unit tests for the bounded audit pipeline.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import logging
+
+from backend.security.audit_pipeline import (
+    AuditPipeline,
+    JsonlAuditSink,
+    LoggingAuditSink,
+    PostgresAuditSink,
+    default_sinks,
+)
+
+
+class RecordingSink:
+    def __init__(self, failures=0):
+        self.batches = []
+        self.failures = failures
+
+    async def write_batch(self, records):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database unavailable")
+        self.batches.append(list(records))
+
+
+class TestAuditPipeline:
+    """Recording is bounded and never waits on the sinks."""
+
+    def test_ring_buffer_keeps_recent_events_per_category(self):
+        pipeline = AuditPipeline(buffer_size=3)
+        for i in range(5):
+            pipeline.record("security_events" if i % 2 else "hipaa_audit", {"n": i})
+
+        assert pipeline.recent_events(10) == [{"n": i} for i in range(5)]
+        assert pipeline.recent_events(3) == [{"n": 2}, {"n": 3}, {"n": 4}]
+        assert pipeline.recent_events(10, "hipaa_audit") == [{"n": 0}, {"n": 2}, {"n": 4}]
+        assert pipeline.recent_events(1, "hipaa_audit") == [{"n": 4}]
+        assert pipeline.metrics()["pending"] == 0  # nothing queued without sinks
+
+    def test_burst_in_one_category_keeps_the_others(self):
+        pipeline = AuditPipeline(buffer_size=3)
+        pipeline.record("hipaa_audit", {"action": "READ"})
+        for i in range(10):
+            pipeline.record("security_events", {"n": i})
+
+        assert pipeline.recent_events(10, "hipaa_audit") == [{"action": "READ"}]
+        assert pipeline.recent_events(10, "security_events") == [{"n": 7}, {"n": 8}, {"n": 9}]
+        assert pipeline.metrics()["buffered"] == 4
+
+    def test_full_queue_drops_and_counts(self):
+        async def scenario():
+            pipeline = AuditPipeline(sinks=[RecordingSink()], queue_size=2)
+            for i in range(5):
+                pipeline.record("security_events", {"n": i})  # the writer has not run yet
+            return pipeline
+
+        pipeline = asyncio.run(scenario())
+        metrics = pipeline.metrics()
+        assert (metrics["pending"], metrics["dropped"], metrics["recorded"]) == (2, 3, 5)
+        assert len(pipeline.recent_events()) == 5
+
+    def test_writer_starts_on_first_record_in_a_loop(self):
+        sink = RecordingSink()
+
+        async def scenario():
+            pipeline = AuditPipeline(sinks=[sink], flush_interval=0.01)
+            pipeline.record("hipaa_audit", {"action": "READ"})
+            assert pipeline.metrics()["writer_running"]
+            await asyncio.sleep(0.05)
+            return pipeline
+
+        asyncio.run(scenario())
+        assert sink.batches == [[("hipaa_audit", {"action": "READ"})]]
+
+    def test_records_outside_a_loop_are_written_through(self):
+        sink = RecordingSink()
+        pipeline = AuditPipeline(sinks=[sink])
+        pipeline.record("hipaa_audit", {"action": "READ"})
+
+        assert sink.batches == [[("hipaa_audit", {"action": "READ"})]]
+        assert pipeline.metrics()["pending"] == 0
+
+    def test_failing_sink_does_not_duplicate_or_starve_the_others(self):
+        good, failing = RecordingSink(), RecordingSink(failures=10)
+
+        async def scenario():
+            pipeline = AuditPipeline(sinks=[good, failing], queue_size=3)
+            pipeline.record("hipaa_audit", {"n": 0})
+            for _ in range(3):
+                assert await pipeline.flush() is False
+            for i in range(1, 5):
+                pipeline.record("hipaa_audit", {"n": i})
+                await pipeline.flush()
+            return pipeline.metrics()
+
+        metrics = asyncio.run(scenario())
+        assert [event["n"] for batch in good.batches for _, event in batch] == [0, 1, 2, 3, 4]
+        assert failing.batches == []
+        assert metrics["dropped"] == 2  # only the failing sink's queue overflowed
+
+    def test_writer_flushes_in_batches_and_on_stop(self):
+        sink = RecordingSink()
+
+        async def scenario():
+            pipeline = AuditPipeline(sinks=[sink], batch_size=3, flush_interval=60)
+            await pipeline.start()
+            for i in range(7):
+                pipeline.record("security_events", {"n": i})
+            await asyncio.sleep(0.01)
+            flushed_early = [len(batch) for batch in sink.batches]
+            pipeline.record("security_events", {"n": 7})  # below batch size, waits for the interval
+            await asyncio.sleep(0.01)
+            await pipeline.stop()
+            return flushed_early, pipeline.metrics()
+
+        flushed_early, metrics = asyncio.run(scenario())
+        assert flushed_early == [3, 3, 1]
+        assert [len(batch) for batch in sink.batches] == [3, 3, 1, 1]
+        assert metrics["written"] == 8 and metrics["pending"] == 0
+
+    def test_failed_batch_is_requeued_in_order(self):
+        sink = RecordingSink(failures=1)
+
+        async def scenario():
+            pipeline = AuditPipeline(sinks=[sink], batch_size=10)
+            for i in range(3):
+                pipeline.record("hipaa_audit", {"n": i})
+            assert await pipeline.flush() is False
+            pipeline.record("hipaa_audit", {"n": 3})
+            assert await pipeline.flush() is True
+            return pipeline.metrics()
+
+        metrics = asyncio.run(scenario())
+        assert [event["n"] for _, event in sink.batches[0]] == [0, 1, 2, 3]
+        assert metrics["write_failures"] == 1
+
+
+class TestAuditSinks:
+    """Sinks map events to their storage formats."""
+
+    def test_jsonl_sink_appends_lines(self, tmp_path):
+        sink = JsonlAuditSink(tmp_path / "audit" / "events.jsonl", fsync=False)
+        timestamp = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        asyncio.run(sink.write_batch([("security_events", {"event_type": "INVALID_API_KEY", "timestamp": timestamp})]))
+        asyncio.run(sink.write_batch([("hipaa_audit", {"action": "READ"})]))
+
+        lines = [json.loads(line) for line in sink.path.read_text().splitlines()]
+        assert lines[0] == {"category": "security_events", "event_type": "INVALID_API_KEY",
+                            "timestamp": "2025-01-01T00:00:00+00:00"}
+        assert lines[1]["action"] == "READ"
+
+    def test_default_sinks_log_and_optionally_append(self, tmp_path, caplog):
+        assert [type(sink) for sink in default_sinks()] == [LoggingAuditSink]
+        assert [type(sink) for sink in default_sinks(tmp_path / "audit.jsonl")] == [LoggingAuditSink, JsonlAuditSink]
+
+        with caplog.at_level(logging.INFO, logger="security.audit"):
+            asyncio.run(LoggingAuditSink().write_batch([("hipaa_audit", {"action": "READ"})]))
+        assert caplog.messages == ['hipaa_audit: {"action": "READ"}']
+
+    def test_postgres_rows(self):
+        row = PostgresAuditSink.to_row("security_events", {
+            "event_type": "SUCCESSFUL_AUTH",
+            "details": {"client_ip": "192.168.1.100", "api_key_name": "Hospital System"},
+        })
+        assert row[:3] == ("Hospital System", "SUCCESSFUL_AUTH", "security_events")
+        assert row[4] == "192.168.1.100"
+
+        assert PostgresAuditSink.to_row("hipaa_audit", {"action": "READ", "ip_address": "not-an-ip"})[4] is None
@@ -0,0 +1,114 @@
+"""
+Unit tests for the columnar claims aggregation engine.
+"""
+
+import asyncio
+from decimal import Decimal
+
+from backend.services.real_data_integration.claims_aggregation import (
+    ClaimsAggregationEngine,
+    to_paise,
+)
+
+
+PMJAY_TRANSACTIONS = [
+    {"transactionDate": "2025-01-05", "beneficiaryId": "b1", "billedAmount": 1000,
+     "approvedAmount": 800, "settledAmount": 800, "status": "approved",
+     "approvedDate": "2025-01-06", "settledDate": "2025-01-16",
+     "admissionType": "emergency", "procedureType": "General Surgery"},
+    {"transactionDate": "2025-01-20", "beneficiaryId": "b1", "billedAmount": "500.50",
+     "approvedAmount": 0, "settledAmount": 0, "status": "rejected",
+     "admissionType": "planned", "procedureType": "Medical"},
+    {"transactionDate": "2025-02-01", "beneficiaryId": "b2", "billedAmount": 200,
+     "approvedAmount": 200.25, "settledAmount": 0, "status": "approved"},
+]
+
+
+class TestClaimsAggregationEngine:
+    """Test cases for single-pass scheme metrics."""
+
+    def test_to_paise(self):
+        """Amounts of any numeric type become exact integer paise."""
+        assert to_paise(12) == 1200
+        assert to_paise(12.34) == 1234
+        assert to_paise("0.1") == 10
+        assert to_paise(None) == 0
+
+    def test_pmjay_metrics_per_month_from_stream(self):
+        """Each month gets its own totals; requested months without data map to {}."""
+        async def stream():
+            for txn in PMJAY_TRANSACTIONS:
+                yield txn
+
+        engine = ClaimsAggregationEngine(chunk_size=2)
+
+        async def run():
+            await engine.load_stream("pmjay", stream(), ["2025-01", "2025-03"])
+            return engine.monthly_metrics("pmjay", ["2025-01", "2025-03"])
+
+        results = asyncio.run(run())
+
+        january = results["2025-01"]
+        assert january["total_cases"] == 2
+        assert january["total_patients"] == 1
+        assert january["total_billed"] == Decimal("1500.50")
+        assert january["total_approved"] == Decimal("800")
+        assert january["approval_rate"] == Decimal("50.0")
+        assert january["rejection_rate"] == Decimal("50.0")
+        assert january["avg_reimbursement_days"] == 10
+        assert january["emergency_cases"] == 1
+        assert january["planned_cases"] == 1
+        assert january["surgery_cases"] == 1
+        assert january["avg_case_value"] == Decimal("400")
+        assert results["2025-03"] == {}
+        assert "2025-02" not in results
+
+    def test_reimbursement_days_convert_offsets_to_utc(self):
+        """Mixed +05:30 and Z timestamps are compared as instants, like aware datetimes."""
+        def reimbursement_days(approved, settled):
+            engine = ClaimsAggregationEngine()
+            engine.load("pmjay", [{"transactionDate": "2025-01-05", "beneficiaryId": "b1", "billedAmount": 100,
+                                   "approvedAmount": 100, "status": "approved",
+                                   "approvedDate": approved, "settledDate": settled}])
+            return engine.monthly_metrics("pmjay", ["2025-01"])["2025-01"]["avg_reimbursement_days"]
+
+        # 23.5 hours apart (29 hours if the offsets were dropped)
+        assert reimbursement_days("2025-01-06T20:00:00Z", "2025-01-08T01:00:00+05:30") == 0
+        # 2 days 30 minutes apart (1 day 19 hours if the offsets were dropped)
+        assert reimbursement_days("2025-01-10T03:00:00+05:30", "2025-01-11T22:00:00Z") == 2
+        # Settled before approval in UTC terms floors like timedelta.days
+        assert reimbursement_days("2025-01-06T22:00:00Z", "2025-01-07T03:00:00+05:30") == -1
+
+    def test_all_schemes_in_one_pass(self):
+        """CGHS and ESI metrics match the per-scheme shapes, grouped together with PM-JAY."""
+        engine = ClaimsAggregationEngine()
+        engine.load("pmjay", PMJAY_TRANSACTIONS)
+        engine.load("cghs", [
+            {"treatmentDate": "2025-01-03", "cghs_number": "c1", "billAmount": 300,
+             "approvedAmount": 250.5, "status": "approved"},
+            {"treatmentDate": "2025-01-09", "cghs_number": "c2", "billAmount": 100,
+             "approvedAmount": 0, "status": "pending"},
+        ])
+        engine.load("esi", [
+            {"esi_number": "e1", "claimedAmount": 400, "settledAmount": 400, "status": "settled"},
+            {"esi_number": "e1", "claimedAmount": 100, "settledAmount": 0, "status": "pending"},
+        ])
+
+        results = engine.aggregate()
+
+        assert results["pmjay"]["2025-02"]["total_approved"] == Decimal("200.25")
+        assert results["cghs"]["2025-01"] == {
+            "total_cases": 2,
+            "total_patients": 2,
+            "total_billed_amount": Decimal("400"),
+            "total_approved_amount": Decimal("250.50"),
+            "approval_rate": Decimal("50.0"),
+            "average_case_value": Decimal("125.25"),
+        }
+        assert results["esi"]["all"] == {
+            "total_cases": 2,
+            "total_patients": 1,
+            "total_billed_amount": Decimal("500"),
+            "total_approved_amount": Decimal("400"),
+            "approval_rate": Decimal("50.0"),
+        }
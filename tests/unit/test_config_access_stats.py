@@ -0,0 +1,39 @@
+"""
+Unit tests for lock-free configuration access counters.
+"""
+
+import threading
+
+from backend.config.access_stats import ThreadLocalAccessCounter
+
+
+class TestThreadLocalAccessCounter:
+    """Test cases for per-thread access counting."""
+
+    def test_counts_are_merged_across_threads(self):
+        """Increments from every thread appear in the merged snapshot."""
+        counter = ThreadLocalAccessCounter()
+
+        def worker():
+            for _ in range(1000):
+                counter.increment("database.host")
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        counter.increment("api.port")
+
+        assert counter.snapshot() == {"database.host": 8000, "api.port": 1}
+        assert counter.total() == 8001
+
+    def test_clear_resets_existing_threads(self):
+        """Threads that counted before clear() start from zero afterwards."""
+        counter = ThreadLocalAccessCounter()
+        counter.increment("a")
+        counter.clear()
+        counter.increment("a")
+
+        assert counter.snapshot() == {"a": 1}
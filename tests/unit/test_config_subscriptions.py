@@ -0,0 +1,80 @@
+"""
+Unit tests for configuration change subscriptions.
+"""
+
+import asyncio
+
+from backend.config.config_view import FlatConfigView
+from backend.config.subscriptions import ConfigSubscriptionRegistry, diff_config_views
+
+
+class TestDiffConfigViews:
+    """Test cases for view diffing."""
+
+    def test_leaf_change_reports_ancestors(self):
+        """A changed leaf marks every enclosing section as changed."""
+        old = FlatConfigView({"a": {"b": {"c": 1}, "x": 1}})
+        new = FlatConfigView({"a": {"b": {"c": 2}, "x": 1}})
+
+        assert diff_config_views(old, new) == {"a", "a.b", "a.b.c"}
+
+    def test_added_and_removed_keys(self):
+        """Keys present in only one view are reported."""
+        old = FlatConfigView({"old": 1})
+        new = FlatConfigView({"new": 1})
+
+        assert diff_config_views(old, new) == {"old", "new"}
+
+
+class TestConfigSubscriptionRegistry:
+    """Test cases for prefix subscriptions and delivery."""
+
+    def test_only_affected_prefixes_are_notified(self):
+        """Subscribers of unchanged prefixes receive nothing."""
+        registry = ConfigSubscriptionRegistry()
+        received = {"cache": [], "database": []}
+        registry.subscribe("cache", received["cache"].append)
+        registry.subscribe("database", received["database"].append)
+
+        old = FlatConfigView({"cache": {"ttl": 1}, "database": {"host": "a"}})
+        new = FlatConfigView({"cache": {"ttl": 2}, "database": {"host": "a"}}, version=2)
+
+        assert registry.publish(diff_config_views(old, new), new) == 1
+        assert registry.wait_until_idle(timeout=5)
+
+        assert received["database"] == []
+        event = received["cache"][0]
+        assert event.changed_keys == ["cache", "cache.ttl"]
+        assert event.values["cache.ttl"] == 2
+        assert event.version == 2
+        registry.shutdown()
+
+    def test_unsubscribe(self):
+        """Unsubscribed callbacks are no longer invoked."""
+        registry = ConfigSubscriptionRegistry()
+        received = []
+        subscription_id = registry.subscribe("", received.append)
+
+        assert registry.unsubscribe(subscription_id)
+        assert not registry.unsubscribe(subscription_id)
+
+        view = FlatConfigView({"a": 1})
+        assert registry.publish({"a"}, view) == 0
+        assert received == []
+
+    def test_coroutine_callback_runs_on_loop(self):
+        """Coroutine subscribers are scheduled on their event loop."""
+        registry = ConfigSubscriptionRegistry()
+
+        async def scenario():
+            received = asyncio.Queue()
+
+            async def on_change(event):
+                await received.put(event.prefix)
+
+            registry.subscribe("api", on_change, loop=asyncio.get_running_loop())
+            registry.publish({"api", "api.port"}, FlatConfigView({"api": {"port": 1}}))
+            return await asyncio.wait_for(received.get(), timeout=5)
+
+        assert asyncio.run(scenario()) == "api"
+        registry.shutdown()
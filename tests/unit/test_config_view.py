@@ -0,0 +1,71 @@
+"""
+Unit tests for the flattened configuration view.
+
+Covers layer merge precedence, service mounting and dotted-key lookups
+used by the configuration managers.
+"""
+
+from backend.config.config_view import FlatConfigView, flatten_config_tree
+
+
+class TestFlattenConfigTree:
+    """Test cases for flattening nested configuration."""
+
+    def test_sections_and_leaves_are_addressable(self):
+        """Both intermediate sections and leaves get dotted keys."""
+        flat = flatten_config_tree({"database": {"pool": {"size": 5}, "host": "db"}})
+
+        assert flat["database.pool.size"] == 5
+        assert flat["database.host"] == "db"
+        assert flat["database.pool"] == {"size": 5}
+        assert flat["database"]["host"] == "db"
+
+    def test_lists_are_leaf_values(self):
+        """Lists are not descended into."""
+        flat = flatten_config_tree({"hosts": [{"name": "a"}]})
+
+        assert flat == {"hosts": [{"name": "a"}]}
+
+
+class TestFlatConfigView:
+    """Test cases for layered view construction."""
+
+    def test_higher_priority_layers_override(self):
+        """Later layers win and nested sections are deep-merged."""
+        view = FlatConfigView.from_layers([
+            (None, {"api": {"timeout": 10, "retries": 3}}),
+            (None, {"api": {"timeout": 30}}),
+        ])
+
+        assert view.get("api.timeout") == 30
+        assert view.get("api.retries") == 3
+        assert view.get("api") == {"timeout": 30, "retries": 3}
+
+    def test_mounted_layers_are_nested_under_prefix(self):
+        """Service layers are addressable through their mount prefix."""
+        view = FlatConfigView.from_layers([
+            ("goal_parser", {"processing": {"batch_size": 50}}),
+        ])
+
+        assert view.get("goal_parser.processing.batch_size") == 50
+        assert "goal_parser" in view
+
+    def test_missing_key_returns_default(self):
+        """Unknown keys fall back to the supplied default."""
+        view = FlatConfigView.from_layers([(None, {"a": 1})])
+
+        assert view.get("b", "fallback") == "fallback"
+        assert view.get("a.b") is None
+
+    def test_source_layers_are_not_mutated(self):
+        """Merging copies nested dicts instead of aliasing the source layers."""
+        base = {"cache": {"ttl": 60}}
+        FlatConfigView.from_layers([(None, base), (None, {"cache": {"ttl": 5}})])
+
+        assert base == {"cache": {"ttl": 60}}
+
+    def test_keys_with_prefix(self):
+        """Prefix listing includes the section and its descendants only."""
+        view = FlatConfigView({"db": {"host": "x"}, "dbx": 1})
+
+        assert sorted(view.keys_with_prefix("db")) == ["db", "db.host"]
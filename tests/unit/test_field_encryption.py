@@ -0,0 +1,90 @@
+"""
+Unit tests for PHI field envelope encryption.
+"""
+
+import asyncio
+import base64
+
+import pytest
+from cryptography.fernet import Fernet
+
+from backend.security.field_encryption import (
+    FieldEncryptionError,
+    FieldEncryptor,
+    canonical_json,
+    decrypt_legacy,
+    is_envelope,
+    migrate_legacy,
+)
+
+PATIENT = {"name": "Asha Rao", "mrn": "MRN-0042", "age": 47, "allergies": ["penicillin"], "notes": None}
+
+
+class TestFieldEncryptor:
+    """Values round-trip through AES-GCM envelopes."""
+
+    def test_round_trip_and_canonical_json(self):
+        encryptor = FieldEncryptor.from_secret(Fernet.generate_key())
+        blobs = encryptor.encrypt_many([PATIENT, "plain text", 12.5, ["a", 1]], context="patients.record")
+
+        assert all(is_envelope(blob) for blob in blobs)
+        assert encryptor.decrypt_many(blobs, context="patients.record") == [PATIENT, "plain text", 12.5, ["a", 1]]
+        assert canonical_json({"b": 1, "a": "é"}) == '{"a":"é","b":1}'.encode()
+
+    def test_batch_shares_one_data_key_with_unique_nonces(self):
+        encryptor = FieldEncryptor({0: bytes(32)})
+        first, second = encryptor.encrypt_many(["same", "same"])
+        other = encryptor.encrypt("same")
+
+        assert first[:62] == second[:62] != other[:62]
+        assert first != second
+
+    def test_context_and_tampering_are_detected(self):
+        encryptor = FieldEncryptor({0: bytes(32)})
+        blob = encryptor.encrypt(PATIENT, context="patients.record")
+
+        with pytest.raises(FieldEncryptionError):
+            encryptor.decrypt(blob, context="patients.notes")
+        tampered = blob[:-1] + bytes([blob[-1] ^ 1])
+        with pytest.raises(FieldEncryptionError):
+            encryptor.decrypt(tampered, context="patients.record")
+        with pytest.raises(FieldEncryptionError):
+            encryptor.encrypt({"when": object()})
+
+    def test_key_rotation_keeps_old_blobs_readable(self):
+        old = FieldEncryptor({1: b"\x01" * 32})
+        blob = old.encrypt("legacy")
+        rotated = FieldEncryptor({1: b"\x01" * 32, 2: b"\x02" * 32})
+
+        assert rotated.decrypt(blob) == "legacy"
+        assert rotated.encrypt("new")[1] == 2
+        with pytest.raises(FieldEncryptionError):
+            FieldEncryptor({2: b"\x02" * 32}).decrypt(blob)
+
+    def test_parallel_and_async_batches(self):
+        encryptor = FieldEncryptor({0: bytes(32)}, parallel_threshold=8, max_workers=4)
+        values = [{"row": i} for i in range(100)]
+
+        blobs = encryptor.encrypt_many(values)
+        assert encryptor.decrypt_many(blobs) == values
+
+        async def scenario():
+            encrypted = await encryptor.encrypt_many_async(values, "export")
+            return await encryptor.decrypt_many_async(encrypted, "export")
+
+        assert asyncio.run(scenario()) == values
+
+
+class TestLegacyMigration:
+    """Old base64(Fernet(str(value))) strings can be read and rewritten."""
+
+    def test_migrates_legacy_tokens(self):
+        fernet = Fernet(Fernet.generate_key())
+        legacy = [base64.b64encode(fernet.encrypt(str(value).encode())).decode()
+                  for value in (PATIENT, "Ward 7")]
+
+        assert decrypt_legacy(legacy[0], fernet) == PATIENT
+        encryptor = FieldEncryptor({0: bytes(32)})
+        migrated = migrate_legacy(legacy, fernet, encryptor, context="phi")
+        assert encryptor.decrypt_many(migrated, context="phi") == [PATIENT, "Ward 7"]
+        assert len(migrated[1]) < len(legacy[1])
@@ -0,0 +1,67 @@
+"""
+Unit tests for compiled field mappings.
+"""
+
+from decimal import Decimal
+
+import numpy as np
+
+from backend.services.real_data_integration.field_mapping import (
+    CompiledFieldMapping,
+    compile_hms_mapping,
+    compile_path,
+    convert_value,
+)
+
+
+class TestCompiledFieldMapping:
+    """Test cases for compiled getters and converters."""
+
+    def test_paths_match_nested_lookup_rules(self):
+        """Dict keys, list indexes and misses behave like dotted-path lookup."""
+        data = {"a": {"b": 1, "items": [{"c": "x"}]}, "top": 5}
+
+        assert compile_path("top")(data) == 5
+        assert compile_path("a.b")(data) == 1
+        assert compile_path("a.items.0.c")(data) == "x"
+        assert compile_path("a.items.3.c")(data) is None
+        assert compile_path("a.b.c")(data) is None
+        assert compile_path("missing.b")(data) is None
+
+    def test_converters(self):
+        """Numbers become Decimal and numeric strings are parsed."""
+        assert convert_value(12) == Decimal("12")
+        assert convert_value(0.1) == Decimal("0.1")
+        assert convert_value("12.50") == Decimal("12.50")
+        assert convert_value("42") == 42
+        assert convert_value("n/a") == "n/a"
+        assert convert_value("1.2.3") == "1.2.3"
+
+    def test_numpy_scalars_and_number_subclasses_convert(self):
+        """Values outside the exact-type table still go through the numeric rules."""
+        class Amount(float):
+            pass
+
+        assert convert_value(np.float64(1.5)) == Decimal("1.5")
+        assert type(convert_value(np.float64(1.5))) is Decimal
+        assert convert_value(np.float32(0.1)) == Decimal("0.1")
+        assert convert_value(np.int64(7)) == Decimal("7")
+        assert convert_value(True) == Decimal("1")
+        assert convert_value(Amount(2.25)) == Decimal("2.25")
+        assert convert_value([1, 2]) == [1, 2]
+
+    def test_batch_apply_and_hms_sections(self):
+        """Mappings apply to batches and HMS mappings fill every section."""
+        mapping = CompiledFieldMapping({"occupancy": "census.rate", "name": "name"})
+        records = [{"census": {"rate": 81.5}, "name": "H1"}, {"name": "H2"}]
+
+        assert mapping.apply_batch(records) == [
+            {"occupancy": Decimal("81.5"), "name": "H1"},
+            {"name": "H2"},
+        ]
+
+        compiled = compile_hms_mapping({"financial_metrics": {"total_revenue": "finance.revenue"}})
+        assert compiled is compile_hms_mapping({"financial_metrics": {"total_revenue": "finance.revenue"}})
+        standardized = compiled.apply({"finance": {"revenue": "1000.00"}})
+        assert standardized["financial_metrics"] == {"total_revenue": Decimal("1000.00")}
+        assert standardized["performance_metrics"] == {}
@@ -0,0 +1,126 @@
+"""
+Unit tests for the shared HTTP session pool used by real data integrators.
+"""
+
+import asyncio
+
+from aiohttp import BasicAuth, web
+
+from backend.services.real_data_integration.http_session_pool import (
+    HTTPSessionPool, SessionPoolSettings
+)
+
+
+async def _start_server():
+    """Start a local HTTP stand-in for an HMS API."""
+    async def health(request):
+        return web.json_response({"status": "ok"})
+
+    app = web.Application()
+    app.router.add_get("/health", health)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+class TestHTTPSessionPool:
+    """Test cases for pooled session reuse and metrics."""
+
+    def test_sessions_are_shared_per_credential(self):
+        """Same integration, URL and credential share one session."""
+        async def scenario():
+            pool = HTTPSessionPool(SessionPoolSettings(shutdown_grace_seconds=0))
+            first = await pool.get_session("hms:medtech", "http://hms.local/", credential_id="key-a")
+            second = await pool.get_session("hms:medtech", "http://hms.local", credential_id="key-a")
+            other = await pool.get_session("hms:medtech", "http://hms.local", credential_id="key-b")
+            pool.release(first)
+            pool.release(second)
+            pool.release(other)
+            shared = first is second and first is not other
+            await pool.close()
+            return shared, first.closed
+
+        shared, closed = asyncio.run(scenario())
+        assert shared
+        assert closed
+
+    def test_connections_are_reused_and_reported(self):
+        """Keep-alive connections are reused across leases and counted."""
+        async def scenario():
+            runner, base_url = await _start_server()
+            pool = HTTPSessionPool(SessionPoolSettings(shutdown_grace_seconds=0))
+            try:
+                for _ in range(5):
+                    session = await pool.get_session("partner:p1", base_url, headers={"X-API-Key": "k"})
+                    try:
+                        async with session.get(f"{base_url}/health") as response:
+                            assert response.status == 200
+                            await response.json()
+                    finally:
+                        pool.release(session)
+                return pool.get_metrics()
+            finally:
+                await pool.close()
+                await runner.cleanup()
+
+        metrics = asyncio.run(scenario())
+        pool_metrics = metrics["pools"][0]
+        assert metrics["pool_count"] == 1
+        assert pool_metrics["requests"] == 5
+        assert pool_metrics["connections_created"] == 1
+        assert pool_metrics["connections_reused"] == 4
+        assert pool_metrics["active_leases"] == 0
+        assert metrics["reuse_ratio"] == 0.8
+        assert metrics["open_connections"] == 1
+
+    def test_rotated_headers_replace_the_session_without_credential_id(self):
+        """Without a credential id a token rotation replaces, not adds, a session."""
+        async def scenario():
+            pool = HTTPSessionPool(SessionPoolSettings(shutdown_grace_seconds=0))
+            old = await pool.get_session("survey:sms", "http://sms.local", headers={"Authorization": "Bearer 1"})
+            new = await pool.get_session("survey:sms", "http://sms.local", headers={"Authorization": "Bearer 2"})
+            pool_count = pool.get_metrics()["pool_count"]
+            old_closed_while_leased = old.closed
+
+            pool.release(old)
+            await asyncio.sleep(0)
+            pool.release(new)
+            await pool.close()
+            return old is not new, pool_count, old_closed_while_leased, old.closed
+
+        replaced, pool_count, old_closed_while_leased, old_closed = asyncio.run(scenario())
+        assert replaced
+        assert pool_count == 1
+        assert not old_closed_while_leased
+        assert old_closed
+
+    def test_rotated_secrets_keep_one_session_per_credential_id(self):
+        """Key rotation refreshes headers in place; new basic auth replaces the session."""
+        async def scenario():
+            pool = HTTPSessionPool(SessionPoolSettings(shutdown_grace_seconds=0))
+            first = await pool.get_session("hms:medtech", "http://hms.local", headers={"X-API-Key": "old"},
+                                           credential_id="tenant:a")
+            rotated = await pool.get_session("hms:medtech", "http://hms.local", headers={"X-API-Key": "new"},
+                                             credential_id="tenant:a")
+            header = rotated.headers["X-API-Key"]
+            for session in (first, rotated):
+                pool.release(session)
+
+            basic = await pool.get_session("partner:p1", "http://partner.local", auth=BasicAuth("u", "old"),
+                                           credential_id="p1:basic_auth")
+            pool.release(basic)
+            rebasic = await pool.get_session("partner:p1", "http://partner.local", auth=BasicAuth("u", "new"),
+                                             credential_id="p1:basic_auth")
+            await asyncio.sleep(0)
+            pool_count = pool.get_metrics()["pool_count"]
+            pool.release(rebasic)
+            await pool.close()
+            return first is rotated, header, basic is not rebasic, basic.closed, pool_count
+
+        same, header, replaced, old_closed, pool_count = asyncio.run(scenario())
+        assert same and header == "new"
+        assert replaced and old_closed
+        assert pool_count == 2
@@ -0,0 +1,161 @@
+"""
+Unit tests for the adaptive integration scheduler.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.services.real_data_integration.integration_scheduler import (
+    AIMDLimit,
+    IntegrationScheduler,
+    PoolSettings,
+)
+
+
+class TestAIMDLimit:
+    """Limits grow additively and shrink multiplicatively."""
+
+    def test_successes_raise_limit_by_one_per_window(self):
+        limit = AIMDLimit(PoolSettings(initial_limit=2, max_limit=4, latency_target_seconds=1.0))
+        for _ in range(3):
+            limit.record(0.1, success=True)
+        assert int(limit.limit) == 3
+
+        for _ in range(20):
+            limit.record(0.1, success=True)
+        assert limit.limit == 4
+
+    def test_errors_and_slow_tasks_halve_limit(self):
+        limit = AIMDLimit(PoolSettings(initial_limit=8, min_limit=2, latency_target_seconds=1.0))
+        limit.record(0.0, success=False)
+        assert limit.limit == 4
+        assert limit.error_rate > 0
+
+        limit._last_decrease = float("-inf")
+        limit.record(5.0, success=True)
+        limit._last_decrease = float("-inf")
+        limit.record(5.0, success=True)
+        assert limit.limit == 2
+
+
+class TestIntegrationScheduler:
+    """Jobs run per pool, in priority order, within each pool's limit."""
+
+    def test_priority_order_within_pool(self):
+        order = []
+
+        async def scenario():
+            scheduler = IntegrationScheduler({"government": PoolSettings(initial_limit=1, max_limit=1)})
+            blocker = asyncio.Event()
+
+            async def job(name):
+                if name == "first":
+                    await blocker.wait()
+                order.append(name)
+
+            first = asyncio.ensure_future(scheduler.run("government", 0, lambda: job("first")))
+            await asyncio.sleep(0)
+            low = asyncio.ensure_future(scheduler.run("government", 3, lambda: job("low")))
+            critical = asyncio.ensure_future(scheduler.run("government", 0, lambda: job("critical")))
+            await asyncio.sleep(0)
+            blocker.set()
+            await asyncio.gather(first, low, critical)
+
+        asyncio.run(scenario())
+        assert order == ["first", "critical", "low"]
+
+    def test_slow_pool_does_not_block_other_pools(self):
+        async def scenario():
+            scheduler = IntegrationScheduler({
+                "hms": PoolSettings(initial_limit=1, max_limit=1),
+                "survey": PoolSettings(initial_limit=2, max_limit=2),
+            })
+            slow_started = asyncio.Event()
+            release = asyncio.Event()
+
+            async def slow():
+                slow_started.set()
+                await release.wait()
+                return "hms"
+
+            slow_job = asyncio.ensure_future(scheduler.run("hms", 1, slow))
+            await slow_started.wait()
+            results = await asyncio.gather(*(scheduler.run("survey", 3, lambda: asyncio.sleep(0, "survey"))
+                                             for _ in range(4)))
+            stats = scheduler.stats()
+            release.set()
+            return results, await slow_job, stats
+
+        results, slow_result, stats = asyncio.run(scenario())
+        assert results == ["survey"] * 4
+        assert slow_result == "hms"
+        assert stats["hms"]["in_flight"] == 1
+        assert stats["survey"]["completed"] == 4
+
+    def test_failures_propagate_and_shrink_pool(self):
+        async def failing():
+            raise RuntimeError("gateway timeout")
+
+        async def scenario():
+            scheduler = IntegrationScheduler({"partner": PoolSettings(initial_limit=4)})
+            with pytest.raises(RuntimeError):
+                await scheduler.run("partner", 2, failing)
+            return scheduler.stats()["partner"]
+
+        stats = asyncio.run(scenario())
+        assert stats["failed"] == 1
+        assert stats["limit"] == 2
+
+    def test_wait_for_capacity_blocks_while_backlogged(self):
+        async def scenario():
+            scheduler = IntegrationScheduler({"analytics": PoolSettings(initial_limit=1, max_limit=1)})
+            release = asyncio.Event()
+            running = asyncio.ensure_future(scheduler.run("analytics", 2, release.wait))
+            queued = asyncio.ensure_future(scheduler.run("analytics", 2, release.wait))
+            await asyncio.sleep(0)
+
+            waiter = asyncio.ensure_future(scheduler.wait_for_capacity())
+            await asyncio.sleep(0.01)
+            blocked = not waiter.done()
+
+            release.set()
+            await asyncio.wait_for(waiter, 1)
+            await asyncio.gather(running, queued)
+            return blocked
+
+        assert asyncio.run(scenario()) is True
+
+    def test_retries_release_the_slot_and_are_recorded(self):
+        attempts = []
+
+        async def scenario():
+            scheduler = IntegrationScheduler({"hms": PoolSettings(initial_limit=1, max_limit=1)})
+            retried = []
+
+            async def flaky():
+                attempts.append("flaky")
+                if attempts.count("flaky") < 3:
+                    raise RuntimeError("connection reset")
+                return "ok"
+
+            async def other():
+                attempts.append("other")
+
+            flaky_run = asyncio.ensure_future(scheduler.run(
+                "hms", 0, flaky, max_retries=3, retry_delay_seconds=0.01,
+                on_retry=lambda attempt, error: retried.append(attempt),
+            ))
+            await asyncio.sleep(0)
+            other_run = asyncio.ensure_future(scheduler.run("hms", 3, other))
+            result = await flaky_run
+            await other_run
+            return result, retried, scheduler.stats()["hms"]
+
+        result, retried, stats = asyncio.run(scenario())
+        assert result == "ok"
+        assert retried == [1, 2]
+        # The lower-priority job ran while the failed one waited to retry
+        assert attempts.index("other") < len(attempts) - 1
+        assert stats["failed"] == 2
+        assert stats["completed"] == 2
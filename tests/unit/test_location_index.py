@@ -0,0 +1,95 @@
+"""
+Unit tests for the pincode location index.
+"""
+
+import numpy as np
+
+from backend.services.real_data_integration.location_index import (
+    NormalizedLookup,
+    PincodeIndex,
+    load_pincode_index,
+    read_pincode_directory,
+)
+
+
+ROWS = [
+    {"pincode": "57", "state": "Karnataka"},
+    {"pincode": "56", "state": "Karnataka"},
+    {"pincode": "560", "district": "Bengaluru", "state": "Karnataka", "tier": "1"},
+    {"pincode": "560100", "district": "BENGALURU URBAN", "state": "KARNATAKA", "tier": "tier_1"},
+    {"pincode": "11", "state": "Delhi"},
+    {"pincode": "abc", "state": "Nowhere"},
+]
+
+
+class TestPincodeIndex:
+    """Most specific directory row wins; gaps stay unmapped."""
+
+    def test_nested_prefixes_flatten_to_disjoint_ranges(self):
+        index = PincodeIndex.build(ROWS)
+        starts, ends = index.table["start"], index.table["end"]
+
+        assert np.all(starts[1:] > ends[:-1])
+        assert index.lookup("560100").district == "Bengaluru Urban"
+        assert index.lookup(560001).district == "Bengaluru"
+        assert index.lookup("560101").tier == "1"
+
+        tumakuru = index.lookup("572101")
+        assert (tumakuru.state, tumakuru.region, tumakuru.district, tumakuru.tier) == ("Karnataka", "South", None, None)
+        assert index.lookup("110001").as_enrichment() == {"state": "Delhi", "region": "North"}
+
+    def test_invalid_and_uncovered_pincodes(self):
+        index = PincodeIndex.build(ROWS)
+        for value in ("400001", "56000", "5600011", 560001.0, None, "", "12345a"):
+            assert index.lookup(value) is None
+
+    def test_lookup_many_matches_lookup(self):
+        index = PincodeIndex.build(ROWS)
+        values = ["560100", 560001, "400001", None, "110045", "999999", "100000", "560001.0"]
+
+        assert index.lookup_many(values) == [index.lookup(value) for value in values]
+        assert list(index.find_many([])) == []
+
+    def test_save_and_open_memory_mapped(self, tmp_path):
+        index = PincodeIndex.build(ROWS)
+        index.save(tmp_path / "index.npy")
+
+        opened = PincodeIndex.open(tmp_path / "index.npy")
+        assert isinstance(opened.table, np.memmap)
+        assert opened.lookup("560100") == index.lookup("560100")
+
+
+class TestDirectoryLoading:
+    """Directory CSVs are compiled once and cached by content."""
+
+    def test_india_post_headers_and_cache(self, tmp_path):
+        directory = tmp_path / "directory.csv"
+        directory.write_text("officename,Pincode,Districtname,StateName\n"
+                             "Koramangala S.O,560034,BENGALURU,KARNATAKA\n"
+                             "Koramangala VI Bk S.O,560034,BENGALURU,KARNATAKA\n", encoding="utf-8")
+        assert read_pincode_directory(directory)[0] == {
+            "pincode": "560034", "district": "BENGALURU", "state": "KARNATAKA"
+        }
+
+        index = load_pincode_index([directory], cache_dir=tmp_path / "cache")
+        assert index.lookup("560034").district == "Bengaluru"
+        assert len(list((tmp_path / "cache").glob("pincode_index-*.npy"))) == 1
+        assert load_pincode_index([directory], cache_dir=tmp_path / "cache") is index
+
+    def test_bundled_directory(self, tmp_path):
+        index = load_pincode_index(cache_dir=tmp_path)
+        assert index.lookup("400001").district == "Mumbai"
+        assert index.lookup("201301").district == "Gautam Buddha Nagar"
+        assert index.lookup("834001").state == "Jharkhand"
+
+
+class TestNormalizedLookup:
+    """Lookups ignore case and surrounding whitespace."""
+
+    def test_normalizes_and_memoizes(self):
+        lookup = NormalizedLookup({"Bangalore": "1", "pune ": "1"})
+
+        assert lookup.get("  BANGALORE ") == "1"
+        assert lookup.get("Pune") == "1"
+        assert lookup.get("Nowhere", "unknown") == "unknown"
+        assert lookup.get("Nowhere") is None
@@ -0,0 +1,69 @@
+"""
+Unit tests for concurrent page prefetching.
+"""
+
+import asyncio
+
+from backend.services.real_data_integration.paginated_fetcher import PaginatedFetcher
+
+
+def _page_source(total_records, page_size, delay=0.01):
+    """Build a fake paginated endpoint and a tracker of concurrent requests."""
+    tracker = {"in_flight": 0, "max_in_flight": 0, "requested": []}
+
+    async def fetch_page(page_number):
+        tracker["requested"].append(page_number)
+        tracker["in_flight"] += 1
+        tracker["max_in_flight"] = max(tracker["max_in_flight"], tracker["in_flight"])
+        try:
+            await asyncio.sleep(delay)
+            start = (page_number - 1) * page_size
+            return list(range(start, min(start + page_size, total_records)))
+        finally:
+            tracker["in_flight"] -= 1
+
+    return fetch_page, tracker
+
+
+class TestPaginatedFetcher:
+    """Test cases for bounded concurrent page prefetch."""
+
+    def test_records_stream_in_order_with_bounded_concurrency(self):
+        """All records arrive in order and the window caps concurrent pages."""
+        fetch_page, tracker = _page_source(total_records=95, page_size=10)
+        fetcher = PaginatedFetcher(fetch_page, page_size=10, prefetch_pages=3)
+
+        async def collect():
+            return [record async for record in fetcher]
+
+        records = asyncio.run(collect())
+
+        assert records == list(range(95))
+        assert tracker["max_in_flight"] == 3
+        assert fetcher.stats.pages_consumed == 10
+        assert fetcher.stats.records == 95
+
+    def test_speculative_pages_past_the_end_are_discarded(self):
+        """An empty page ends the stream and in-flight prefetches are cancelled."""
+        fetch_page, _ = _page_source(total_records=20, page_size=10)
+        fetcher = PaginatedFetcher(fetch_page, page_size=10, prefetch_pages=4)
+
+        async def collect():
+            return [record async for record in fetcher]
+
+        assert asyncio.run(collect()) == list(range(20))
+        assert fetcher.stats.pages_consumed == 2
+        assert fetcher.stats.pages_discarded >= 1
+
+    def test_failed_page_stops_pagination(self):
+        """A page returning None ends the stream after earlier pages."""
+        async def fetch_page(page_number):
+            return None if page_number == 2 else [page_number] * 5
+
+        fetcher = PaginatedFetcher(fetch_page, page_size=5, prefetch_pages=2)
+
+        async def collect():
+            return [record async for record in fetcher]
+
+        assert asyncio.run(collect()) == [1] * 5
+
@@ -0,0 +1,89 @@
+"""
+Unit tests for chunked partner CSV ingestion.
+"""
+
+from backend.services.real_data_integration.partner_csv_ingestion import (
+    CSVIngestionPlan,
+    iter_csv_chunks,
+    iter_csv_records,
+    read_latest_by_hospital,
+)
+
+
+MAPPING = {
+    "bed_occupancy_rate": "occupancy_percentage",
+    "total_revenue": "finance.gross_revenue_monthly",
+}
+
+
+def _write_csv(tmp_path, rows):
+    path = tmp_path / "performance.csv"
+    path.write_text("\n".join(rows) + "\n")
+    return str(path)
+
+
+class TestPartnerCSVIngestion:
+    """Test cases for typed, filtered chunk reading."""
+
+    def test_plan_prunes_columns_and_filters_hospitals(self, tmp_path):
+        """Only mapped columns are read and only target hospitals are emitted."""
+        file_path = _write_csv(tmp_path, [
+            "hospital_id,occupancy_percentage,unused_notes",
+            "H001,81.5,a",
+            "H002,70,b",
+            "H003,,c",
+            "H001,82,d",
+        ])
+        plan = CSVIngestionPlan.from_mapping(MAPPING, chunk_size=2)
+
+        records = list(iter_csv_records(file_path, plan, ["H001", "H003"]))
+
+        assert records == [
+            {"hospital_id": "H001", "occupancy_percentage": 81.5},
+            {"hospital_id": "H003", "occupancy_percentage": None},
+            {"hospital_id": "H001", "occupancy_percentage": 82.0},
+        ]
+
+    def test_chunks_are_bounded_and_typed(self, tmp_path):
+        """Chunks never exceed the plan's chunk size and keep declared dtypes."""
+        rows = ["hospital_id,occupancy_percentage"] + [f"{i:04d},{i}" for i in range(10)]
+        plan = CSVIngestionPlan.from_mapping(MAPPING, chunk_size=3)
+
+        chunks = list(iter_csv_chunks(_write_csv(tmp_path, rows), plan))
+
+        assert [len(chunk) for chunk in chunks] == [3, 3, 3, 1]
+        assert chunks[0]["hospital_id"].iloc[0] == "0000"
+        assert str(chunks[0]["occupancy_percentage"].dtype) == "float64"
+
+    def test_malformed_numeric_column_falls_back(self, tmp_path):
+        """A mapped column that is not numeric is read with inferred dtypes instead."""
+        file_path = _write_csv(tmp_path, [
+            "hospital_id,occupancy_percentage",
+            "H001,high",
+        ])
+        plan = CSVIngestionPlan.from_mapping(MAPPING)
+
+        assert list(iter_csv_records(file_path, plan)) == [
+            {"hospital_id": "H001", "occupancy_percentage": "high"},
+        ]
+
+    def test_latest_row_per_hospital_from_stream(self, tmp_path):
+        """Streams reduce to the last row per target hospital, across chunks."""
+        file_path = _write_csv(tmp_path, [
+            "hospital_id,occupancy_percentage,unused_notes",
+            "H001,81.5,a",
+            "H002,70,b",
+            "H001,82,c",
+            ",50,d",
+            "H001,83,e",
+        ])
+        plan = CSVIngestionPlan.from_mapping(MAPPING, chunk_size=2)
+
+        with open(file_path, "rb") as stream:
+            latest = read_latest_by_hospital(stream, plan, ["H001"])
+        with open(file_path, "rb") as stream:
+            unfiltered = read_latest_by_hospital(stream, plan)
+
+        assert latest == {"H001": {"hospital_id": "H001", "occupancy_percentage": 83.0}}
+        assert unfiltered["H002"] == {"hospital_id": "H002", "occupancy_percentage": 70.0}
+        assert unfiltered["unknown_2"] == {"hospital_id": None, "occupancy_percentage": 50.0}
@@ -0,0 +1,98 @@
+"""
+Unit tests for parallel, incremental partner FTP transfers.
+"""
+
+import asyncio
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.services.real_data_integration.partner_file_transfer import (
+    FTPFileClient,
+    PartnerFileTransfer,
+    TransferManifest,
+)
+
+pytest.importorskip("pyftpdlib")
+from pyftpdlib.authorizers import DummyAuthorizer  # noqa: E402
+from pyftpdlib.handlers import FTPHandler  # noqa: E402
+from pyftpdlib.servers import ThreadedFTPServer  # noqa: E402
+
+
+@pytest.fixture
+def ftp_server(tmp_path):
+    """Local FTP server serving tmp_path/remote."""
+    remote = tmp_path / "remote"
+    remote.mkdir()
+    authorizer = DummyAuthorizer()
+    authorizer.add_user("partner", "secret", str(remote), perm="elr")
+    handler = type("Handler", (FTPHandler,), {"authorizer": authorizer})
+    server = ThreadedFTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"timeout": 0.1}, daemon=True)
+    thread.start()
+    try:
+        yield remote, server.address[1]
+    finally:
+        server.close_all()
+        thread.join(timeout=5)
+
+
+def _sync(port, manifest, executor, parse_key=""):
+    transfer = PartnerFileTransfer(
+        lambda: FTPFileClient("127.0.0.1", port, "partner", "secret"),
+        executor,
+        max_parallel=3,
+    )
+    return asyncio.run(transfer.sync(
+        "",
+        parse=lambda stream, remote: json.load(stream),
+        select=lambda remote: remote.name.endswith(".json"),
+        manifest=manifest,
+        parse_key=parse_key,
+    ))
+
+
+class TestPartnerFileTransfer:
+    """Test cases for FTP downloads with manifests."""
+
+    def test_parallel_download_and_incremental_skip(self, ftp_server, tmp_path):
+        """All files are stream-parsed once; unchanged files are not downloaded again."""
+        remote, port = ftp_server
+        for index in range(5):
+            (remote / f"performance_{index}.json").write_text(json.dumps({"index": index}))
+        (remote / "readme.txt").write_text("ignored")
+        manifest_path = tmp_path / "manifest.json"
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            first = _sync(port, TransferManifest(manifest_path), executor)
+            assert first.failed == {}
+            assert first.parsed == {f"performance_{i}.json": {"index": i} for i in range(5)}
+
+            changed = remote / "performance_2.json"
+            changed.write_text(json.dumps({"index": 2, "revised": True}))
+            os.utime(changed, (1_800_000_000, 1_800_000_000))
+
+            second = _sync(port, TransferManifest(manifest_path), executor)
+
+        assert [remote.name for remote in second.downloaded] == ["performance_2.json"]
+        assert second.parsed["performance_2.json"]["revised"] is True
+        assert len(second.skipped) == 4
+
+    def test_unchanged_files_still_yield_their_records(self, ftp_server, tmp_path):
+        """A later sync, even with a fresh manifest instance, returns stored payloads."""
+        remote, port = ftp_server
+        (remote / "performance.json").write_text(json.dumps({"H001": {"occupancy": 81.5}}))
+        manifest_path = tmp_path / "manifest.json"
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = _sync(port, TransferManifest(manifest_path), executor, parse_key="H001")
+            second = _sync(port, TransferManifest(manifest_path), executor, parse_key="H001")
+            other_hospitals = _sync(port, TransferManifest(manifest_path), executor, parse_key="H002")
+
+        assert [r.name for r in second.skipped] == ["performance.json"]
+        assert second.downloaded == []
+        assert second.parsed == first.parsed == {"performance.json": {"H001": {"occupancy": 81.5}}}
+        assert [r.name for r in other_hospitals.downloaded] == ["performance.json"]
@@ -0,0 +1,132 @@
+"""
+Unit tests for cached peer benchmark distributions.
+"""
+
+import asyncio
+import contextlib
+
+import pytest
+
+from backend.services.real_data_integration.peer_benchmarks import (
+    PeerBenchmarkCache,
+    PeerDistributions,
+    peer_group_key,
+)
+
+
+def _peers(hospital_type, tier, occupancies):
+    return [
+        {"hospital_type": hospital_type, "city_tier": tier, "bed_occupancy_rate": occupancy,
+         "total_revenue": occupancy * 1_000_000}
+        for occupancy in occupancies
+    ]
+
+
+STORED = (
+    _peers("super_specialty", "tier_1", [55, 65, 75, 85, 95])
+    + _peers("government", "tier_1", [90, 92, 94])
+    + _peers("government", "tier_2", [40, 50])
+)
+
+
+class TestPeerDistributions:
+    """Percentiles come from the narrowest peer group with enough hospitals."""
+
+    def test_peer_group_key_normalizes_type_and_tier(self):
+        assert peer_group_key("Super-Specialty", "1") == ("super_specialty", "1")
+        assert peer_group_key("super specialty", "tier_1") == ("super_specialty", "1")
+        assert peer_group_key(None, "unknown") == ("*", "*")
+
+    def test_percentiles_within_peer_group(self):
+        distributions = PeerDistributions.from_records(STORED, min_peers=5)
+        group = distributions.resolve_group("Super-Specialty", "1")
+
+        assert group == ("super_specialty", "1")
+        ranks = distributions.percentiles(group, {"bed_occupancy_rate": "75", "total_revenue": None})
+        assert ranks == {"bed_occupancy_rate": 60.0}
+
+    def test_thin_groups_fall_back_to_tier_then_national(self):
+        distributions = PeerDistributions.from_records(STORED, min_peers=5)
+
+        assert distributions.resolve_group("Government", "1") == ("*", "1")
+        assert distributions.resolve_group("Government", "2") == ("*", "*")
+        assert distributions.peer_counts[("*", "*")] == 10
+        assert distributions.percentiles(("*", "*"), {"bed_occupancy_rate": 100}) == {"bed_occupancy_rate": 100.0}
+
+        assert PeerDistributions.from_records([], min_peers=5).resolve_group("Government", "1") is None
+
+
+class TestPeerBenchmarkCache:
+    """Snapshots load once and refresh in the background when stale."""
+
+    def test_loads_once_and_refreshes_when_stale(self):
+        calls = []
+
+        async def loader():
+            calls.append(None)
+            return STORED[:5] if len(calls) == 1 else STORED[:8]
+
+        async def scenario():
+            cache = PeerBenchmarkCache(loader, refresh_seconds=3600)
+            first, second = await asyncio.gather(cache.get(), cache.get())
+            assert first is second and len(calls) == 1
+
+            cache._loaded_at = float("-inf")
+            stale = await cache.get()
+            await cache._refresh_task
+            return first, stale, await cache.get()
+
+        first, stale, refreshed = asyncio.run(scenario())
+        assert stale is first
+        assert refreshed is not first
+        assert refreshed.peer_counts[("*", "*")] == 8
+
+    def test_failed_load_keeps_previous_snapshot(self):
+        responses = [STORED, RuntimeError("database unavailable")]
+
+        async def loader():
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        async def scenario():
+            cache = PeerBenchmarkCache(loader, refresh_seconds=3600)
+            loaded = await cache.get()
+            await cache.refresh()
+            return loaded, await cache.get()
+
+        loaded, after_failure = asyncio.run(scenario())
+        assert after_failure is loaded
+
+
+class TestPeerBenchmarkMetrics:
+    """Stored metrics are returned in the units of enriched records."""
+
+    def test_fractions_are_scaled_to_percent(self):
+        pytest.importorskip("asyncpg")
+        from backend.database.production_hospital_db import ProductionHospitalDatabase
+
+        row = {"hospital_type": "general", "tier": "tier_2", "bed_count": 100,
+               "annual_revenue": 50_000_000, "operating_margin": 0.12,
+               "government_scheme_percentage": 0.4, "occupancy_rate": 0.75,
+               "average_length_of_stay": 4.2}
+
+        class Connection:
+            async def fetch(self, sql):
+                return [row]
+
+        class Pool:
+            @contextlib.asynccontextmanager
+            async def acquire(self):
+                yield Connection()
+
+        database = ProductionHospitalDatabase("postgresql://unused")
+        database.pool = Pool()
+        metrics = asyncio.run(database.get_peer_benchmark_metrics())[0]
+
+        # Same unit as DataQualityValidator's derived profit_margin
+        assert metrics["profit_margin"] == pytest.approx(12.0)
+        assert metrics["government_scheme_dependency"] == pytest.approx(40.0)
+        assert metrics["bed_occupancy_rate"] == pytest.approx(75.0)
+        assert metrics["revenue_per_bed"] == 500_000
@@ -0,0 +1,131 @@
+"""
+Unit tests for the GCRA rate limiter and its ASGI middleware.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.security.api_keys import ApiKeyStore
+from backend.security.rate_limiting import (
+    InMemoryRateLimitStore,
+    RateLimiter,
+    RateLimitMiddleware,
+    api_key_client_key,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _limiter(max_requests=3, time_window=60, **store_options):
+    clock = FakeClock()
+    store = InMemoryRateLimitStore(clock=clock, **store_options)
+    return RateLimiter(max_requests=max_requests, time_window=time_window, store=store), clock
+
+
+class TestRateLimiter:
+    """Sliding-window limits with one timestamp of state per client."""
+
+    def test_allows_burst_then_refills_one_interval_at_a_time(self):
+        limiter, clock = _limiter()
+
+        decisions = [limiter.check("client") for _ in range(4)]
+        assert [d.allowed for d in decisions] == [True, True, True, False]
+        assert [d.remaining for d in decisions] == [2, 1, 0, 0]
+        assert decisions[-1].retry_after == pytest.approx(20)
+        assert decisions[-1].headers()["Retry-After"] == "20"
+
+        clock.now += 20
+        assert limiter.is_allowed("client")
+        assert not limiter.is_allowed("client")
+        assert limiter.is_allowed("other")
+
+    def test_client_stats(self):
+        limiter, clock = _limiter()
+        assert limiter.get_client_stats("client")["requests_remaining"] == 3
+
+        limiter.check("client")
+        limiter.check("client")
+        stats = limiter.get_client_stats("client")
+        assert (stats["requests_made"], stats["requests_remaining"]) == (2, 1)
+
+        clock.now += 60
+        assert limiter.get_client_stats("client")["requests_made"] == 0
+
+    def test_idle_clients_are_evicted(self):
+        limiter, clock = _limiter(max_clients=2)
+        for client in ("a", "b"):
+            limiter.check(client)
+        assert len(limiter.store) == 2
+
+        limiter.check("c")
+        assert len(limiter.store) == 2  # least recently seen dropped at capacity
+
+        clock.now += 61
+        limiter.check("d")
+        assert len(limiter.store) == 1
+
+    def test_rejects_invalid_limits(self):
+        with pytest.raises(ValueError):
+            RateLimiter(max_requests=0)
+
+
+class TestRateLimitMiddleware:
+    """Responses carry RateLimit headers; limited requests get a 429."""
+
+    def _request(self, middleware, path="/analysis", api_key=b"key-1"):
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "path": path, "headers": [(b"x-api-key", api_key)], "client": ("10.0.0.1", 5000)}
+        asyncio.run(middleware(scope, receive, send))
+        return messages[0]["status"], dict(messages[0]["headers"])
+
+    def test_headers_and_429(self):
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        limiter, _ = _limiter(max_requests=2)
+        middleware = RateLimitMiddleware(app, limiter)
+
+        status, headers = self._request(middleware)
+        assert status == 200
+        assert headers[b"ratelimit-limit"] == b"2"
+        assert headers[b"ratelimit-remaining"] == b"1"
+        assert headers[b"content-type"] == b"text/plain"
+
+        self._request(middleware)
+        status, headers = self._request(middleware)
+        assert status == 429
+        assert headers[b"retry-after"] == b"30"
+
+        assert self._request(middleware, api_key=b"key-2")[0] == 429
+        assert self._request(middleware, path="/health")[0] == 200
+
+    def test_only_verified_keys_get_their_own_allowance(self):
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        store = ApiKeyStore(pepper="test", iterations=1)
+        valid_key, record = store.issue_key("Partner", ["read"])
+        limiter, _ = _limiter(max_requests=2)
+        middleware = RateLimitMiddleware(app, limiter, key_func=api_key_client_key(store))
+
+        statuses = [self._request(middleware, api_key=f"bogus-{i}".encode())[0] for i in range(10)]
+        assert statuses == [200, 200] + [429] * 8
+
+        assert self._request(middleware, api_key=valid_key.encode())[0] == 200
+        assert set(limiter.store._tats) == {"ip:10.0.0.1", "key:" + record.key_id}
@@ -0,0 +1,139 @@
+"""
+Unit tests for the request instrumentation middleware.
+"""
+
+import asyncio
+import logging
+
+import pytest
+from prometheus_client import CollectorRegistry
+
+from backend.services.shared.request_metrics import (
+    UNMATCHED_ROUTE,
+    RequestInstrumentationMiddleware,
+    RequestMetrics,
+    metrics_response,
+)
+
+
+class FakeRoute:
+    def __init__(self, path):
+        self.path = path
+
+
+def _app(status=200, route="/analysis/{analysis_id}", fail=False):
+    async def app(scope, receive, send):
+        if route:
+            scope["route"] = FakeRoute(route)
+        if fail:
+            raise RuntimeError("boom")
+        await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", b"text/plain")]})
+        await send({"type": "http.response.body", "body": b"ok"})
+    return app
+
+
+def _request(middleware, path="/analysis/42", method="GET", headers=()):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": list(headers)}
+    asyncio.run(middleware(scope, receive, send))
+    return scope, messages
+
+
+def _sample(registry, name, **labels):
+    return registry.get_sample_value(f"hospital_api_{name}", labels)
+
+
+class TestRequestInstrumentationMiddleware:
+    """Metrics are labelled by route template; IDs and timing ride on headers."""
+
+    def test_records_latency_and_counts_by_route_template(self):
+        registry = CollectorRegistry()
+        middleware = RequestInstrumentationMiddleware(_app(), RequestMetrics(registry))
+
+        scope, messages = _request(middleware)
+        _request(middleware, path="/analysis/43")
+
+        labels = {"method": "GET", "route": "/analysis/{analysis_id}", "status": "200"}
+        assert _sample(registry, "http_requests_total", **labels) == 2
+        assert _sample(registry, "http_request_duration_seconds_count", **labels) == 2
+        assert _sample(registry, "http_requests_in_progress", method="GET") == 0
+
+        headers = dict(messages[0]["headers"])
+        assert headers[b"content-type"] == b"text/plain"
+        assert headers[b"x-request-id"].decode() == scope["state"]["request_id"]
+        assert float(headers[b"x-processing-time"]) >= 0
+
+    def test_request_ids_are_unique_unless_supplied(self):
+        middleware = RequestInstrumentationMiddleware(_app(), RequestMetrics(CollectorRegistry()))
+
+        first = _request(middleware)[0]["state"]["request_id"]
+        second = _request(middleware)[0]["state"]["request_id"]
+        supplied = _request(middleware, headers=[(b"x-request-id", b"upstream-1")])[0]["state"]["request_id"]
+
+        assert first != second
+        assert supplied == "upstream-1"
+
+    def test_malformed_request_ids_are_replaced(self):
+        middleware = RequestInstrumentationMiddleware(_app(), RequestMetrics(CollectorRegistry()))
+
+        for supplied in (b"x" * 129, b"abc\r\nSet-Cookie: a=b", b"id with spaces", b""):
+            scope, messages = _request(middleware, headers=[(b"x-request-id", supplied)])
+            request_id = scope["state"]["request_id"]
+            assert request_id and request_id.encode() != supplied
+            assert dict(messages[0]["headers"])[b"x-request-id"] == request_id.encode()
+
+    def test_failures_count_as_500_and_unmatched_routes_share_a_label(self):
+        registry = CollectorRegistry()
+        metrics = RequestMetrics(registry)
+
+        with pytest.raises(RuntimeError):
+            _request(RequestInstrumentationMiddleware(_app(fail=True), metrics))
+        _request(RequestInstrumentationMiddleware(_app(status=404, route=None), metrics), path="/nope")
+        _request(RequestInstrumentationMiddleware(_app(), metrics), method="BREW")
+
+        assert _sample(registry, "http_requests_total", method="GET",
+                       route="/analysis/{analysis_id}", status="500") == 1
+        assert _sample(registry, "http_requests_total", method="GET", route=UNMATCHED_ROUTE, status="404") == 1
+        assert _sample(registry, "http_requests_total", method="OTHER",
+                       route="/analysis/{analysis_id}", status="200") == 1
+        assert _sample(registry, "http_requests_in_progress", method="GET") == 0
+
+    def test_access_log_skipped_when_disabled(self, caplog):
+        access_logger = logging.getLogger("test.access")
+        middleware = RequestInstrumentationMiddleware(_app(), RequestMetrics(CollectorRegistry()),
+                                                      access_logger=access_logger)
+
+        with caplog.at_level(logging.WARNING, logger="test.access"):
+            _request(middleware)
+        assert not caplog.records
+
+        with caplog.at_level(logging.INFO, logger="test.access"):
+            _request(middleware)
+        assert len(caplog.records) == 1
+        assert "status 200" in caplog.records[0].getMessage()
+
+    def test_stage_observer_feeds_stage_histogram(self):
+        registry = CollectorRegistry()
+        metrics = RequestMetrics(registry)
+        metrics.observe_stage("benchmarking.lifecycle", 0.2)
+        metrics.observe_stage("benchmarking.lifecycle", 0.4)
+
+        assert _sample(registry, "stage_duration_seconds_count", stage="benchmarking.lifecycle") == 2
+        assert _sample(registry, "stage_duration_seconds_sum", stage="benchmarking.lifecycle") == pytest.approx(0.6)
+
+    def test_metrics_exposition(self):
+        registry = CollectorRegistry()
+        middleware = RequestInstrumentationMiddleware(_app(), RequestMetrics(registry))
+        _request(middleware)
+        _request(middleware, path="/metrics")  # scrapes are not counted
+
+        body, content_type = metrics_response(registry)
+        assert content_type.startswith("text/plain")
+        assert b'hospital_api_http_requests_total{method="GET",route="/analysis/{analysis_id}",status="200"} 1.0' in body
@@ -0,0 +1,98 @@
+"""
+Unit tests for per-stage timing and sampled profiling.
+"""
+
+import asyncio
+import pstats
+
+from backend.services.shared import stage_timing
+from backend.services.shared.stage_timing import (
+    add_stage_observer,
+    current_timer,
+    remove_stage_observer,
+    span,
+    timed,
+    track_stages,
+)
+
+
+@timed("scoring")
+def score():
+    with span("inner"):
+        return 42
+
+
+@timed()
+async def fetch(delay):
+    await asyncio.sleep(delay)
+    return delay
+
+
+class TestStageTiming:
+    """Spans nest into dotted stage names inside a recording scope."""
+
+    def test_spans_are_noops_outside_a_scope(self):
+        assert current_timer() is None
+        assert score() == 42
+        assert span("anything") is span("other")
+
+    def test_nested_spans_and_decorators_accumulate(self):
+        with track_stages(enabled=True) as timer:
+            with span("benchmarking"):
+                score()
+                score()
+            with track_stages(enabled=True) as inner:
+                assert inner is timer  # nested scopes share the outer timer
+
+        assert set(timer.stages) == {"benchmarking", "benchmarking.scoring", "benchmarking.scoring.inner"}
+        assert timer.stages["benchmarking"] >= timer.stages["benchmarking.scoring"]
+        assert current_timer() is None
+
+    def test_disabled_scope_records_nothing(self):
+        with track_stages(enabled=False) as timer:
+            assert timer is None
+            assert current_timer() is None
+
+    def test_concurrent_tasks_keep_separate_timers(self):
+        async def analysis(delay):
+            with track_stages(enabled=True) as timer:
+                await fetch(delay)
+                return timer
+
+        async def main():
+            return await asyncio.gather(analysis(0.01), analysis(0.02))
+
+        first, second = asyncio.run(main())
+        assert first is not second
+        assert list(first.stages) == list(second.stages) == ["fetch"]
+        assert second.stages["fetch"] > first.stages["fetch"]
+
+    def test_observers_receive_each_stage_once_per_outer_scope(self):
+        seen = []
+        observer = lambda stage, seconds: seen.append(stage)
+        add_stage_observer(observer)
+        try:
+            with track_stages(enabled=True):
+                score()
+                with track_stages(enabled=True):
+                    pass
+        finally:
+            remove_stage_observer(observer)
+        assert sorted(seen) == ["scoring", "scoring.inner"]
+
+
+class TestSampledProfiling:
+    """A sampled scope writes cProfile stats to the output directory."""
+
+    def test_profile_written_when_sampled(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(stage_timing, "PROFILE_OUTPUT_DIR", tmp_path)
+
+        with track_stages("analysis/1", enabled=True, profile_rate=1.0) as timer:
+            score()
+        assert timer.profile_path is not None and timer.profile_path.parent == tmp_path
+        assert "analysis_1" in timer.profile_path.name
+        assert pstats.Stats(str(timer.profile_path)).total_calls > 0
+
+        with track_stages(enabled=True, profile_rate=0.0) as timer:
+            score()
+        assert timer.profile_path is None
@@ -0,0 +1,122 @@
+"""
+Unit tests for the bulk survey mailer.
+"""
+
+import asyncio
+import socket
+
+import pytest
+
+from backend.services.real_data_integration.survey_mailer import (
+    BulkSMTPMailer,
+    CampaignEmailTemplate,
+    OutgoingEmail,
+    SMTPSettings,
+)
+
+pytest.importorskip("aiosmtpd")
+from aiosmtpd.controller import Controller  # noqa: E402
+
+
+class _RecordingHandler:
+    """Collects delivered envelopes and the sessions they arrived on."""
+
+    def __init__(self):
+        self.recipients = []
+        self.sessions = set()
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("bounce"):
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.recipients.extend(envelope.rcpt_tos)
+        self.sessions.add(id(session))
+        return "250 Message accepted"
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = _RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    try:
+        yield handler, controller.port
+    finally:
+        controller.stop()
+
+
+class TestBulkSMTPMailer:
+    """Test cases for connection reuse and per-recipient outcomes."""
+
+    def test_template_renders_campaign_fields_once(self):
+        """Campaign fields are fixed up front and the recipient name is filled per message."""
+        template = CampaignEmailTemplate(
+            "Survey", "<p>Dear {hospital_name}, visit {survey_url} ({hospital_name})</p>",
+            survey_url="https://example.org/s/1",
+        )
+
+        assert template.render("City Hospital") == (
+            "<p>Dear City Hospital, visit https://example.org/s/1 (City Hospital)</p>"
+        )
+
+    def test_bulk_send_reuses_connections(self, smtp_server):
+        """Many messages go over at most max_connections sessions; rejections are reported."""
+        handler, port = smtp_server
+        settings = SMTPSettings(host="127.0.0.1", port=port, from_email="survey@example.org",
+                                use_starttls=False)
+        mailer = BulkSMTPMailer(settings, max_connections=3)
+        emails = [
+            OutgoingEmail(f"admin{i}@example.org", f"Hospital {i}", "Survey", "<p>hi</p>", f"H{i}")
+            for i in range(30)
+        ]
+        emails.append(OutgoingEmail("bounce@example.org", "Bounce", "Survey", "<p>hi</p>", "HX"))
+
+        try:
+            report = asyncio.run(mailer.send_all(emails))
+        finally:
+            mailer.close()
+
+        assert report.sent == 30
+        assert report.failed == 1
+        assert report.outcomes[-1].status == "failed"
+        assert report.connections_opened <= 3
+        assert len(handler.sessions) <= 3
+        assert sorted(handler.recipients) == sorted(f"admin{i}@example.org" for i in range(30))
+        assert report.to_dict()["messages_per_second"] > 0
+
+    def test_unexpected_error_fails_only_its_recipient(self, smtp_server):
+        """An exception outside SMTP handling is reported as that recipient's failure."""
+        handler, port = smtp_server
+        settings = SMTPSettings(host="127.0.0.1", port=port, from_email="survey@example.org",
+                                use_starttls=False)
+        mailer = BulkSMTPMailer(settings, max_connections=2)
+        build_message = mailer._build_message
+
+        def flaky_build(email):
+            if email.hospital_id == "H1":
+                raise UnicodeEncodeError("ascii", "", 0, 1, "bad header")
+            return build_message(email)
+
+        mailer._build_message = flaky_build
+        emails = [
+            OutgoingEmail(f"admin{i}@example.org", f"Hospital {i}", "Survey", "<p>hi</p>", f"H{i}")
+            for i in range(3)
+        ]
+
+        try:
+            report = asyncio.run(mailer.send_all(emails))
+        finally:
+            mailer.close()
+
+        assert [outcome.status for outcome in report.outcomes] == ["sent", "failed", "sent"]
+        assert "UnicodeEncodeError" in report.outcomes[1].error
+        assert sorted(handler.recipients) == ["admin0@example.org", "admin2@example.org"]
@@ -0,0 +1,197 @@
+"""
+Unit tests for the rate-aware survey message dispatcher.
+"""
+
+import asyncio
+import threading
+
+import aiohttp
+from aiohttp import web
+
+from backend.services.real_data_integration.survey_message_dispatcher import (
+    OutboxMessage,
+    ProviderLimits,
+    ProviderSendError,
+    RateAwareDispatcher,
+    SurveyOutbox,
+    parse_retry_after,
+)
+
+
+def _messages(count):
+    return [
+        OutboxMessage(message_id=f"c1:whatsapp:H{i}", provider="whatsapp",
+                      recipient=f"9198765{i:05d}", body="survey", hospital_id=f"H{i}")
+        for i in range(count)
+    ]
+
+
+async def _run_against_mock_provider(outbox, dispatcher):
+    """Serve a provider that throttles each recipient's first attempt."""
+    seen = {}
+    delivered = []
+
+    async def handle(request):
+        payload = await request.json()
+        recipient = payload["to"]
+        seen[recipient] = seen.get(recipient, 0) + 1
+        if seen[recipient] == 1:
+            return web.Response(status=429, text="slow down", headers={"Retry-After": "0"})
+        delivered.append(recipient)
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_post("/messages", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            async def send(message):
+                async with session.post(f"http://127.0.0.1:{port}/messages",
+                                        json={"to": message.recipient}) as response:
+                    if response.status != 200:
+                        raise ProviderSendError(
+                            "provider error", status=response.status,
+                            retry_after=parse_retry_after(response.headers.get("Retry-After")),
+                        )
+
+            report = await dispatcher.dispatch(outbox, {"whatsapp": send})
+    finally:
+        await runner.cleanup()
+    return report, delivered
+
+
+class TestRateAwareDispatcher:
+    """Test cases for throttling retries and outbox resume."""
+
+    def test_retries_throttled_sends(self, tmp_path):
+        """429 responses are retried and every message is eventually delivered once."""
+        outbox = SurveyOutbox(tmp_path / "outbox.jsonl")
+        outbox.enqueue(_messages(12))
+        dispatcher = RateAwareDispatcher(
+            {"whatsapp": ProviderLimits(rate_per_second=500, burst=5)},
+            max_concurrency=4, base_backoff_seconds=0.01,
+        )
+
+        report, delivered = asyncio.run(_run_against_mock_provider(outbox, dispatcher))
+
+        assert report.sent == 12
+        assert report.throttled == 12
+        assert report.failed == 0
+        assert len(delivered) == len(set(delivered)) == 12
+        assert SurveyOutbox(tmp_path / "outbox.jsonl").counts() == {"pending": 0, "sent": 12, "failed": 0}
+
+    def test_outbox_resumes_only_pending_messages(self, tmp_path):
+        """Messages recorded as sent before a crash are not sent again."""
+        path = tmp_path / "outbox.jsonl"
+        outbox = SurveyOutbox(path)
+        messages = _messages(5)
+        outbox.enqueue(messages)
+        outbox.mark(messages[0], "sent")
+        outbox.mark(messages[1], "sent")
+        with open(path, "a") as f:
+            f.write('{"event": "sent", "message_id": "c1:wha')  # torn write
+
+        resumed = SurveyOutbox(path)
+        assert resumed.enqueue(_messages(5)) == 0
+        sent = []
+
+        async def send(message):
+            sent.append(message.hospital_id)
+
+        dispatcher = RateAwareDispatcher({"whatsapp": ProviderLimits(rate_per_second=1000, burst=10)})
+        report = asyncio.run(dispatcher.dispatch(resumed, {"whatsapp": send}))
+
+        assert sorted(sent) == ["H2", "H3", "H4"]
+        assert report.resumed_sent == 2
+
+    def test_non_retryable_errors_fail_fast(self, tmp_path):
+        """Client errors other than 429 are not retried."""
+        outbox = SurveyOutbox(tmp_path / "outbox.jsonl")
+        outbox.enqueue(_messages(1))
+
+        async def send(message):
+            raise ProviderSendError("bad number", status=400)
+
+        dispatcher = RateAwareDispatcher({"whatsapp": ProviderLimits(rate_per_second=1000, burst=10)})
+        report = asyncio.run(dispatcher.dispatch(outbox, {"whatsapp": send}))
+
+        assert report.failed == 1
+        assert outbox.messages["c1:whatsapp:H0"].attempts == 1
+
+    def test_marks_are_batched_off_the_event_loop(self, tmp_path):
+        """Sent events are journalled in batches and are all on disk after dispatch."""
+        outbox = SurveyOutbox(tmp_path / "outbox.jsonl")
+        outbox.enqueue(_messages(50))
+        writes = []
+        append = outbox._append
+
+        def recording_append(events):
+            writes.append(len(events))
+            append(events)
+
+        outbox._append = recording_append
+
+        async def send(message):
+            await asyncio.sleep(0)
+
+        dispatcher = RateAwareDispatcher({"whatsapp": ProviderLimits(rate_per_second=10000, burst=50)},
+                                         max_concurrency=50)
+        report = asyncio.run(dispatcher.dispatch(outbox, {"whatsapp": send}))
+
+        assert report.sent == 50
+        assert sum(writes) == 50
+        assert len(writes) < 50
+        assert SurveyOutbox(tmp_path / "outbox.jsonl").counts() == {"pending": 0, "sent": 50, "failed": 0}
+
+    def test_open_and_enqueue_stay_off_the_event_loop(self, tmp_path):
+        """Replay and enqueue journalling run on worker threads inside a loop."""
+        path = tmp_path / "outbox.jsonl"
+        SurveyOutbox(path).enqueue(_messages(2))
+        threads = []
+
+        async def scenario():
+            outbox = await SurveyOutbox.open(path)
+            append = outbox._append
+
+            def recording_append(events):
+                threads.append(threading.current_thread() is threading.main_thread())
+                append(events)
+
+            outbox._append = recording_append
+            added = outbox.enqueue(_messages(4))
+            await outbox.flush()
+            return outbox, added
+
+        outbox, added = asyncio.run(scenario())
+        assert len(outbox.messages) == 4 and added == 2
+        assert threads == [False]
+        assert SurveyOutbox(path).counts() == {"pending": 4, "sent": 0, "failed": 0}
+
+    def test_failed_messages_are_retried_within_the_budget_on_resume(self, tmp_path):
+        """Earlier failures are resent while attempts remain and reported once exhausted."""
+        path = tmp_path / "outbox.jsonl"
+        outbox = SurveyOutbox(path)
+        messages = _messages(3)
+        outbox.enqueue(messages)
+        messages[0].attempts = 1
+        outbox.mark(messages[0], "failed", "provider error")
+        messages[1].attempts = 3
+        outbox.mark(messages[1], "failed", "bad number")
+        sent = []
+
+        async def send(message):
+            sent.append(message.hospital_id)
+
+        dispatcher = RateAwareDispatcher({"whatsapp": ProviderLimits(rate_per_second=1000, burst=10)},
+                                         max_attempts=3)
+        report = asyncio.run(dispatcher.dispatch(SurveyOutbox(path), {"whatsapp": send}))
+
+        assert sorted(sent) == ["H0", "H2"]
+        assert (report.sent, report.failed, report.resumed_failed) == (2, 0, 1)
+        assert report.errors == ["H1: bad number"]
+        assert SurveyOutbox(path).counts() == {"pending": 0, "sent": 2, "failed": 1}
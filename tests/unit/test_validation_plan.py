@@ -0,0 +1,133 @@
+"""
+Unit tests for compiled validation rule plans.
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Dict
+
+from backend.services.real_data_integration.validation_plan import RulePlan
+
+
+class Severity(Enum):
+    CRITICAL = "critical"
+    HIGH = "high"
+    MEDIUM = "medium"
+
+
+@dataclass
+class Rule:
+    rule_id: str
+    field_name: str
+    severity: Severity
+    validation_function: str
+    parameters: Dict[str, Any] = field(default_factory=dict)
+    enabled: bool = True
+
+
+RULES = [
+    Rule("hospital_name_required", "hospital_name", Severity.CRITICAL, "validate_required"),
+    Rule("hospital_name_format", "hospital_name", Severity.MEDIUM, "validate_hospital_name_format"),
+    Rule("city_tier_valid", "city_tier", Severity.HIGH, "validate_city_tier",
+         {"valid_values": ["1", "2", "3", "4", "tier_1", "tier_2", "tier_3", "tier_4"]}),
+    Rule("pincode_format", "pincode", Severity.HIGH, "validate_pincode_format"),
+    Rule("bed_occupancy_range", "bed_occupancy_rate", Severity.HIGH, "validate_percentage_range",
+         {"min_value": 0, "max_value": 100}),
+    Rule("alos_reasonable", "average_length_of_stay", Severity.HIGH, "validate_numeric_range",
+         {"min_value": 0.1, "max_value": 30.0}),
+    Rule("revenue_positive", "total_revenue", Severity.CRITICAL, "validate_positive_value"),
+    Rule("scheme_revenue_consistency", "government_scheme_revenue", Severity.MEDIUM,
+         "validate_scheme_revenue_consistency"),
+    Rule("essential_metrics_complete", "data_completeness", Severity.HIGH, "validate_data_completeness"),
+    Rule("data_timestamp_recent", "data_timestamp", Severity.MEDIUM, "validate_data_freshness",
+         {"max_age_days": 90}),
+    Rule("disabled_rule", "pincode", Severity.HIGH, "validate_required", enabled=False),
+]
+
+
+def _random_record(rng):
+    choice = rng.choice
+    return {
+        "hospital_name": choice(["Apollo Hospital", "test", "AIIMS DELHI", "", None, "  ", "Fortis"]),
+        "city_tier": choice(["1", "Tier_2", " 3 ", "5", None, 2, ""]),
+        "pincode": choice(["560001", 110001, "012345", "56 0001", None, "5600011", 560001.0]),
+        "bed_occupancy_rate": choice([75.5, "82", "abc", None, 120, -1, "1e1", True]),
+        "average_length_of_stay": choice([4.2, 0.05, "31", None, "4"]),
+        "total_revenue": choice([1_000_000, 0, "-5", None, "2500000"]),
+        "government_scheme_revenue": choice([100_000, 900_000, 5_000_000, None, "x"]),
+        "patient_satisfaction_score": choice([8.1, None, ""]),
+        "data_timestamp": choice([
+            datetime.utcnow().isoformat(), (datetime.utcnow() - timedelta(days=200)).isoformat(),
+            "yesterday", None
+        ]),
+    }
+
+
+def _collect_single(plan, record):
+    results = []
+    counts = plan.evaluate(record, lambda rule, passed, message, value, severity:
+                           results.append((rule.rule_id, passed, message, severity)))
+    return counts, results
+
+
+class TestRulePlan:
+    """Compiled plans match per-rule evaluation."""
+
+    def test_groups_rules_by_field_and_skips_disabled(self):
+        plan = RulePlan(RULES, Severity.CRITICAL)
+
+        assert plan.rule_count == 10
+        assert [name for name, _ in plan.fields][:2] == ["hospital_name", "city_tier"]
+        assert len(dict(plan.fields)["hospital_name"]) == 2
+
+    def test_counts_failures_by_severity_inline(self):
+        plan = RulePlan(RULES, Severity.CRITICAL)
+        counts, results = _collect_single(plan, {"hospital_name": "Apollo Hospital", "pincode": "12"})
+
+        assert counts.total == 10
+        assert counts.passed == sum(1 for _, passed, _, _ in results if passed)
+        assert counts.failed_with(Severity.CRITICAL) == 1  # revenue missing
+        assert ("pincode_format", False, "Pincode must be exactly 6 digits", Severity.HIGH) in results
+
+    def test_unknown_function_and_raising_check(self):
+        rules = [
+            Rule("mystery", "x", Severity.MEDIUM, "validate_mystery"),
+            Rule("odd_pincode", "pincode", Severity.HIGH, "validate_pincode_format"),
+        ]
+        plan = RulePlan(rules, Severity.CRITICAL)
+
+        class Exploding:
+            def __bool__(self):
+                raise RuntimeError("boom")
+
+        counts, results = _collect_single(plan, {"pincode": Exploding()})
+        assert results[0][2] == "Unknown validation function: validate_mystery"
+        assert results[1][3] is Severity.CRITICAL
+        assert counts.failed_with(Severity.CRITICAL) == 1
+
+    def test_batch_matches_single_record_evaluation(self):
+        rng = random.Random(7)
+        records = [_random_record(rng) for _ in range(500)]
+        plan = RulePlan(RULES, Severity.CRITICAL)
+
+        batch_results = [[] for _ in records]
+        batch_counts = plan.evaluate_batch(
+            records,
+            lambda row, rule, passed, message, value, severity:
+                batch_results[row].append((rule.rule_id, passed, message, severity))
+        )
+
+        for record, counts, results in zip(records, batch_counts, batch_results):
+            single_counts, single_results = _collect_single(plan, record)
+            assert results == single_results
+            assert counts.passed == single_counts.passed
+            assert counts.failed_by_severity == single_counts.failed_by_severity
+
+    def test_batch_without_results(self):
+        plan = RulePlan(RULES, Severity.CRITICAL)
+        assert plan.evaluate_batch([]) == []
+
+        counts = plan.evaluate_batch([{"hospital_name": "Apollo Hospital"}])
+        assert counts[0].total == 10 and counts[0].passed >= 2
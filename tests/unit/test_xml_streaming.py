@@ -0,0 +1,76 @@
+"""
+Unit tests for streaming XML parsing.
+"""
+
+import asyncio
+import io
+import xml.etree.ElementTree as ET
+
+from backend.services.shared.xml_streaming import (
+    aiter_xml_records,
+    compile_record_extractor,
+    element_to_dict,
+    iter_xml_records,
+    parse_xml_to_dict,
+)
+
+
+PATIENT_FIELDS = {
+    "patient_id": ("PatientId", lambda text: text, ""),
+    "age": ("Age", int, 0),
+}
+
+
+def _soap_document(count):
+    patients = "".join(
+        f"<Patient><PatientId>P{i}</PatientId><Age>{20 + i}</Age><Notes>x</Notes></Patient>"
+        for i in range(count)
+    )
+    return (
+        '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">'
+        f"<soap:Body><GetPatientAdmissionsResult>{patients}<Patient/></GetPatientAdmissionsResult>"
+        "</soap:Body></soap:Envelope>"
+    )
+
+
+class TestXMLStreaming:
+    """Test cases for record streams and dict conversion."""
+
+    def test_records_use_compiled_extractor(self):
+        """Each Patient element yields one flat record with defaults for missing fields."""
+        extractor = compile_record_extractor(PATIENT_FIELDS)
+
+        records = list(iter_xml_records(_soap_document(2), "Patient", extractor))
+
+        assert records == [
+            {"patient_id": "P0", "age": 20},
+            {"patient_id": "P1", "age": 21},
+            {"patient_id": "", "age": 0},
+        ]
+
+    def test_async_records_from_chunks(self):
+        """Records are emitted from a body delivered in small chunks."""
+        extractor = compile_record_extractor(PATIENT_FIELDS)
+        body = _soap_document(50).encode()
+
+        async def chunks():
+            for offset in range(0, len(body), 7):
+                yield body[offset:offset + 7]
+
+        async def collect():
+            return [record async for record in aiter_xml_records(chunks(), "Patient", extractor)]
+
+        records = asyncio.run(collect())
+        assert len(records) == 51
+        assert records[49] == {"patient_id": "P49", "age": 69}
+
+    def test_dict_conversion_matches_tree_conversion(self):
+        """Streaming dict conversion matches converting a parsed tree."""
+        document = '<r a="1"><x>1</x><x>2</x><y b="2"><z>t</z></y><w/></r>'
+
+        assert parse_xml_to_dict(document) == element_to_dict(ET.fromstring(document)) == {
+            "@a": "1", "x": ["1", "2"], "y": {"@b": "2", "z": "t"}, "w": {},
+        }
+        assert parse_xml_to_dict(io.BytesIO(document.encode()), include_attributes=False) == {
+            "x": ["1", "2"], "y": {"z": "t"}, "w": {},
+        }